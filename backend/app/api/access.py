@@ -0,0 +1,49 @@
+"""
+Caller identity and org access for endpoints that use the service-role
+Supabase client.
+
+The service-role client bypasses row level security, so an endpoint that
+loads a row by id must check the row's org against the caller's
+memberships itself, and take the caller's role from that membership (a
+user can belong to several orgs with different roles).
+"""
+from typing import Optional
+from fastapi import HTTPException, Request
+from supabase import create_client
+from app.config import settings
+
+
+def get_user_id(request: Request) -> Optional[str]:
+    """The user id of the bearer token, or None for anonymous callers."""
+
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+
+    token = auth_header.replace("Bearer ", "")
+    try:
+        user_client = create_client(settings.supabase_url, settings.supabase_anon_key)
+        user_response = user_client.auth.get_user(token)
+        if user_response.user:
+            return user_response.user.id
+    except Exception as e:
+        print(f"Auth error: {e}")
+    return None
+
+
+def require_user(user_id: Optional[str]) -> None:
+    """Raise 401 for anonymous callers (AI generation is not open to them)."""
+
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+
+def get_org_role(supabase, user_id: str, org_id: Optional[str]) -> str:
+    """The user's role in org_id; raises 403 unless they are a member."""
+
+    membership = None
+    if org_id:
+        membership = supabase.table('org_memberships').select('role').eq('user_id', user_id).eq('org_id', org_id).limit(1).execute().data
+    if not membership:
+        raise HTTPException(status_code=403, detail="Access denied: not a member of this organization")
+    return membership[0]['role']
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.middleware import require_org_access, get_user_org
 from app.models import Artifact
+from app.services.document import DocumentService
 from app.config import settings
 
 router = APIRouter()
@@ -31,6 +32,7 @@ class ArtifactResponse(BaseModel):
 @router.post("/upload")
 async def upload_artifact(
     file: UploadFile = File(...),
+    bulk: bool = False,
     request: Request = None,
     db: AsyncSession = Depends(get_db),
     auth: tuple = Depends(get_user_org),
@@ -39,7 +41,8 @@ async def upload_artifact(
     Upload an artifact with authentication.
     
     Automatically uses the authenticated user's organization.
-    Saves to database and triggers AI processing.
+    Saves to database and triggers AI processing. Set bulk=true for
+    batch imports so their processing yields to interactive uploads.
     """
     org_id, user = auth
     
@@ -70,6 +73,7 @@ async def upload_artifact(
     
     # Calculate file size and hash
     file_size = os.path.getsize(file_path)
+    file_hash = DocumentService.calculate_file_hash(file_path)
     
     # Create artifact record
     artifact = Artifact(
@@ -79,6 +83,7 @@ async def upload_artifact(
         file_type=file_type,
         file_size=file_size,
         storage_path=storage_path,
+        sha256=file_hash,
         transcription_status="pending",
     )
     
@@ -87,8 +92,14 @@ async def upload_artifact(
     await db.refresh(artifact)
     
     # Trigger processing
+    from app.worker.celery_app import BULK_PRIORITY, INTERACTIVE_PRIORITY
     from app.worker.tasks.pipeline import process_artifact
-    process_artifact.delay(str(artifact.id), str(org_id))
+    priority = BULK_PRIORITY if bulk else INTERACTIVE_PRIORITY
+    process_artifact.apply_async(
+        (str(artifact.id), str(org_id)),
+        {"file_type": artifact.file_type, "priority": priority},
+        priority=priority,
+    )
     
     return {
         "id": str(artifact.id),
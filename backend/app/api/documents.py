@@ -1,11 +1,21 @@
 """
 Document download endpoints with Role-Based Access Control
-Serves pre-generated documents as downloads based on user permissions
+Serves pre-generated documents as downloads based on user permissions,
+and streams AI-generated documents and reports as server-sent events
 """
+import uuid
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 from supabase import create_client
+from typing import List, Optional, Tuple
+from app.api.access import get_org_role, get_user_id, require_user
+from app.api.sse import sse_response, sse_stream
 from app.config import settings
+from app.services.agent_2_analyzer import AnalysisResult
+from app.services.agent_3_researcher import ResearchResult
+from app.services.agent_4_question_generator import Question, QuestionSet
+from app.services.agent_5_content_generator import ContentGeneratorAgent, ContentType
+from app.services.document_generator import DocumentGenerator
 from app.services.rbac_service import RBACService, get_minimum_role_for_document
 from datetime import datetime
 
@@ -36,47 +46,11 @@ async def download_document(doc_type: str, language: str, meeting_id: str, reque
     
     supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
     
-    # Get user from token (if provided)
-    auth_header = request.headers.get("Authorization", "")
-    user_id = None
-    user_role = "viewer"  # Default to most restrictive
-    
-    if auth_header.startswith("Bearer "):
-        token = auth_header.replace("Bearer ", "")
-        try:
-            # Get user from Supabase
-            user_client = create_client(settings.supabase_url, settings.supabase_anon_key)
-            user_response = user_client.auth.get_user(token)
-            
-            if user_response.user:
-                user_id = user_response.user.id
-                
-                # Get user's role in org
-                membership_response = supabase.table('org_memberships').select('role').eq('user_id', user_id).limit(1).execute()
-                if membership_response.data:
-                    user_role = membership_response.data[0]['role']
-        except Exception as e:
-            print(f"Auth error: {e}")
-    
-    # Check minimum role required for document type
-    min_role_required = get_minimum_role_for_document(doc_type)
-    role_hierarchy = ['viewer', 'member', 'admin', 'owner']
-    
-    user_role_level = role_hierarchy.index(user_role) if user_role in role_hierarchy else 0
-    required_role_level = role_hierarchy.index(min_role_required) if min_role_required in role_hierarchy else 0
-    
-    if user_role_level < required_role_level:
-        raise HTTPException(
-            status_code=403,
-            detail=f"Access denied. {doc_type} requires {min_role_required} role or higher. You have {user_role}."
-        )
+    user_id, user_role = _get_user_role(request, supabase)
+    _check_document_access(doc_type, user_role)
     
     # Fetch meeting data
-    meeting_response = supabase.table('meetings').select('*').eq('id', meeting_id).execute()
-    if not meeting_response.data:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-    
-    meeting = meeting_response.data[0]
+    meeting = _get_meeting(supabase, meeting_id)
     
     # Check if user attended meeting (for Member/Viewer roles)
     if user_id and user_role in ['member', 'viewer']:
@@ -92,11 +66,7 @@ async def download_document(doc_type: str, language: str, meeting_id: str, reque
     print(f"Document access: {doc_type} ({language}) by role={user_role} for meeting={meeting_id[:8]}...")
     
     # Fetch related data
-    participants = supabase.table('meeting_participants').select('people(name, email, role)').eq('meeting_id', meeting_id).execute()
-    attendees = [p['people'] for p in participants.data if p.get('people')]
-    
-    decisions = supabase.table('decisions').select('*').eq('meeting_id', meeting_id).execute().data
-    actions = supabase.table('action_items').select('*').eq('meeting_id', meeting_id).execute().data
+    attendees, decisions, actions = _get_meeting_details(supabase, meeting_id)
     
     # Get metadata
     metadata = meeting.get('meeting_metadata', {}) if isinstance(meeting.get('meeting_metadata'), dict) else {}
@@ -114,6 +84,246 @@ async def download_document(doc_type: str, language: str, meeting_id: str, reque
     )
 
 
+@router.post("/generate/{doc_type}/{language}/stream")
+async def stream_generated_document(
+    doc_type: str,
+    language: str,
+    meeting_id: str,
+    request: Request,
+    context: Optional[str] = None
+):
+    """
+    Generate a document with AI and stream it as server-sent events.
+    
+    Same RBAC as /download, but generation is paid for, so anonymous
+    callers are rejected (401), the caller must be a member of the
+    meeting's org (403) and the role is the one held there. The endpoint
+    is POST. Emits `delta` events with the text as it is written, then `done` with the stored document ({id, title, type,
+    language}) or `error`. The document is saved to generated_documents
+    once the stream completes.
+    
+    Args:
+        doc_type: Any DocumentGenerator type (meeting_notes, proposal, ...)
+        language: Language code (sv, en)
+        meeting_id: Meeting ID
+        context: Extra context for generation
+    """
+    
+    supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    
+    user_id = get_user_id(request)
+    require_user(user_id)
+    
+    meeting = _get_meeting(supabase, meeting_id)
+    _check_document_access(doc_type, get_org_role(supabase, user_id, meeting.get('org_id')))
+    attendees, decisions, actions = _get_meeting_details(supabase, meeting_id)
+    
+    meeting_data = {
+        'meeting_info': meeting,
+        'attendees': attendees,
+        'decisions': decisions,
+        'action_items': actions
+    }
+    
+    try:
+        deltas, document = DocumentGenerator().stream_document(doc_type, meeting_data, language, context)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    async def save(content: str) -> dict:
+        now = datetime.utcnow().isoformat()
+        doc_id = str(uuid.uuid4())
+        supabase.table('generated_documents').insert({
+            'id': doc_id,
+            'meeting_id': meeting_id,
+            'org_id': meeting.get('org_id'),
+            'title': document['title'],
+            'doc_type': doc_type,
+            'language': language,
+            'format': document['format'],
+            'content': content,
+            'storage_path': f"/documents/{meeting_id}/{doc_type}_{language}.txt",
+            'created_at': now,
+            'updated_at': now
+        }).execute()
+        return {'id': doc_id, 'title': document['title'], 'type': doc_type, 'language': language}
+    
+    return sse_response(sse_stream(deltas, save))
+
+
+@router.post("/reports/{analysis_id}/{content_type}/stream")
+async def stream_report(
+    analysis_id: str,
+    content_type: ContentType,
+    request: Request,
+    company_name: Optional[str] = None
+):
+    """
+    Regenerate a due diligence report or investment memo for a stored
+    document analysis and stream it as server-sent events.
+    
+    Requires an authenticated member of the org that uploaded the
+    analysed document; the role is the one held there. Emits `delta` events with the
+    markdown as it is written, then `done` with the stored
+    generated_content row or `error`. The report is built from the same
+    inputs as ContentGeneratorAgent.generate (analysis, stored research
+    results, critical and high priority questions) and saved as the next
+    version of its content type once the stream completes.
+    """
+    
+    if content_type not in ContentGeneratorAgent.STREAMING_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Streaming not supported for {content_type.value}")
+    
+    supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    
+    user_id = get_user_id(request)
+    require_user(user_id)
+    
+    analysis_response = supabase.table("document_analyses").select("*").eq("id", analysis_id).execute()
+    if not analysis_response.data:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    document = supabase.table("uploaded_documents").select("org_id").eq("id", analysis_response.data[0]["document_id"]).execute().data
+    org_id = document[0]["org_id"] if document else None
+    _check_document_access(content_type.value, get_org_role(supabase, user_id, org_id))
+    
+    analysis = _stored_analysis(supabase, analysis_response.data[0])
+    research = _stored_research(supabase, analysis_id)
+    
+    question_rows = supabase.table("generated_questions").select("*").eq("analysis_id", analysis_id).in_("priority", ["critical", "high"]).execute().data
+    questions = QuestionSet(
+        critical=[Question(**_question_fields(q)) for q in question_rows if q["priority"] == "critical"],
+        high_priority=[Question(**_question_fields(q)) for q in question_rows if q["priority"] == "high"],
+        total_count=len(question_rows)
+    )
+    
+    try:
+        generator = ContentGeneratorAgent()
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    deltas = generator.stream(
+        content_type, analysis,
+        research_results=research,
+        questions=questions,
+        company_name=company_name
+    )
+    
+    async def save(content_md: str) -> dict:
+        content = generator.finalize(content_type, content_md, analysis)
+        latest = supabase.table("generated_content").select("version").eq("analysis_id", analysis_id).eq("content_type", content_type.value).order("version", desc=True).limit(1).execute().data
+        content_data = {
+            "analysis_id": analysis_id,
+            "content_type": content_type.value,
+            "content": content.content_markdown,
+            "content_html": content.content_html,
+            "sources_cited": [c.dict() for c in content.citations],
+            "confidence_level": content.confidence_level.value,
+            "citation_coverage": content.citation_coverage,
+            "disclaimer": content.disclaimer,
+            "generator_model": "gpt-4o-2024-08-06",
+            "generator_version": generator.version,
+            "version": (latest[0]["version"] + 1) if latest else 1
+        }
+        return supabase.table("generated_content").insert(content_data).execute().data[0]
+    
+    return sse_response(sse_stream(deltas, save))
+
+
+def _get_user_role(request: Request, supabase) -> Tuple[Optional[str], str]:
+    """(user_id, org role) from the bearer token; anonymous callers are viewers."""
+    
+    user_id = get_user_id(request)
+    user_role = "viewer"  # Default to most restrictive
+    
+    if user_id:
+        # Get user's role in org
+        membership_response = supabase.table('org_memberships').select('role').eq('user_id', user_id).limit(1).execute()
+        if membership_response.data:
+            user_role = membership_response.data[0]['role']
+    
+    return user_id, user_role
+
+
+def _check_document_access(doc_type: str, user_role: str) -> None:
+    """Raise 403 unless user_role may access doc_type."""
+    
+    min_role_required = get_minimum_role_for_document(doc_type)
+    role_hierarchy = ['viewer', 'member', 'admin', 'owner']
+    
+    user_role_level = role_hierarchy.index(user_role) if user_role in role_hierarchy else 0
+    required_role_level = role_hierarchy.index(min_role_required) if min_role_required in role_hierarchy else 0
+    
+    if user_role_level < required_role_level:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Access denied. {doc_type} requires {min_role_required} role or higher. You have {user_role}."
+        )
+
+
+def _get_meeting(supabase, meeting_id: str) -> dict:
+    meeting_response = supabase.table('meetings').select('*').eq('id', meeting_id).execute()
+    if not meeting_response.data:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting_response.data[0]
+
+
+def _get_meeting_details(supabase, meeting_id: str) -> Tuple[list, list, list]:
+    """Attendees, decisions and action items of a meeting."""
+    participants = supabase.table('meeting_participants').select('people(name, email, role)').eq('meeting_id', meeting_id).execute()
+    attendees = [p['people'] for p in participants.data if p.get('people')]
+    
+    decisions = supabase.table('decisions').select('*').eq('meeting_id', meeting_id).execute().data
+    actions = supabase.table('action_items').select('*').eq('meeting_id', meeting_id).execute().data
+    return attendees, decisions, actions
+
+
+def _stored_analysis(supabase, row: dict) -> AnalysisResult:
+    """AnalysisResult from a document_analyses row."""
+    
+    extraction = supabase.table("extracted_data").select("confidence_score").eq("id", row["extraction_id"]).execute().data
+    return AnalysisResult(
+        classification=row["classification"],
+        # Not stored; the overall confidence is the closest stand-in
+        classification_confidence=row["overall_confidence"],
+        key_metrics=row.get("key_metrics") or {},
+        insights=row.get("insights") or [],
+        risks_identified=row.get("risks_identified") or [],
+        opportunities_identified=row.get("opportunities_identified") or [],
+        confidence_breakdown=row.get("confidence_breakdown") or {},
+        overall_confidence=row["overall_confidence"],
+        data_completeness=row.get("data_completeness") or 0.0,
+        internal_consistency=row.get("internal_consistency", True),
+        gaps=row.get("gaps") or [],
+        requires_human_review=row.get("requires_human_review", False),
+        review_reason=row.get("review_reason"),
+        extraction_confidence=extraction[0]["confidence_score"] if extraction else row["overall_confidence"]
+    )
+
+
+def _stored_research(supabase, analysis_id: str) -> List[ResearchResult]:
+    """ResearchResults stored for a document analysis."""
+    
+    rows = supabase.table("research_results").select("*").eq("analysis_id", analysis_id).execute().data
+    return [
+        ResearchResult(
+            claim=row["claim"],
+            claim_source=row["claim_source"],
+            verification_status=row["verification_status"],
+            public_sources=row.get("public_sources") or [],
+            source_count=row.get("source_count") or 0,
+            discrepancies=row.get("discrepancies") or [],
+            additional_context=row.get("additional_context") or {},
+            confidence_adjustment=row.get("confidence_adjustment") or 0.0,
+            researched_at=row["researched_at"]
+        )
+        for row in rows
+    ]
+
+
+def _question_fields(row: dict) -> dict:
+    return {key: row[key] for key in ("question", "category", "priority", "triggered_by")}
+
+
 def generate_document_content(doc_type, meeting, attendees, decisions, actions, metadata, lang):
     """Generate document content based on type."""
     
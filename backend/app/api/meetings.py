@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from app.database import get_db
 from app.middleware import require_org_access
 from app.models import Meeting, Artifact, TranscriptChunk, Summary, ActionItem, Decision
+from app.services.vector_index import ChunkHit, get_vector_store
 from app.worker.tasks.pipeline import process_artifact
 
 router = APIRouter()
@@ -49,6 +50,31 @@ class MeetingResponse(BaseModel):
         from_attributes = True
 
 
+class TranscriptSearchHit(BaseModel):
+    """Transcript chunk matching a search query."""
+    chunk_id: str
+    meeting_id: str
+    score: float
+    sequence: int
+    speaker: Optional[str] = None
+    text: str
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+
+def _search_hit(hit: ChunkHit) -> TranscriptSearchHit:
+    return TranscriptSearchHit(
+        chunk_id=str(hit.chunk_id),
+        meeting_id=str(hit.meeting_id),
+        score=hit.score,
+        sequence=hit.sequence,
+        speaker=hit.speaker,
+        text=hit.text,
+        start_time=hit.start_time,
+        end_time=hit.end_time,
+    )
+
+
 class MeetingDetailResponse(MeetingResponse):
     """Meeting detail with related data."""
     transcript_chunks: list[dict] = []
@@ -92,6 +118,21 @@ async def list_meetings(
     ]
 
 
+@router.get("/search", response_model=list[TranscriptSearchHit])
+async def search_transcripts(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=500),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    auth: tuple = Depends(require_org_access),
+):
+    """Find where something was said across the organization's meetings."""
+    org_id, _ = auth
+    
+    hits = await get_vector_store().search(db, org_id, q, top_k=limit)
+    return [_search_hit(hit) for hit in hits]
+
+
 @router.post("/", response_model=MeetingResponse, status_code=status.HTTP_201_CREATED)
 async def create_meeting(
     meeting_data: MeetingCreate,
@@ -235,6 +276,33 @@ async def get_meeting(
     )
 
 
+@router.get("/{meeting_id}/search", response_model=list[TranscriptSearchHit])
+async def search_meeting_transcript(
+    meeting_id: uuid.UUID,
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=500),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    auth: tuple = Depends(require_org_access),
+):
+    """Find where something was said in one meeting."""
+    org_id, _ = auth
+    
+    result = await db.execute(
+        select(Meeting.id)
+        .where(Meeting.id == meeting_id)
+        .where(Meeting.org_id == org_id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found",
+        )
+    
+    hits = await get_vector_store().search(db, org_id, q, meeting_id=meeting_id, top_k=limit)
+    return [_search_hit(hit) for hit in hits]
+
+
 @router.patch("/{meeting_id}", response_model=MeetingResponse)
 async def update_meeting(
     meeting_id: uuid.UUID,
@@ -319,10 +387,16 @@ async def delete_meeting(
 async def process_meeting(
     meeting_id: uuid.UUID,
     request: Request,
+    force: bool = False,
     db: AsyncSession = Depends(get_db),
     auth: tuple = Depends(require_org_access),
 ):
-    """Trigger processing pipeline for meeting."""
+    """
+    Trigger processing pipeline for meeting.
+    
+    Set force=true to re-run transcription and extraction even if an
+    identical file was already processed.
+    """
     org_id, _ = auth
     
     result = await db.execute(
@@ -353,7 +427,12 @@ async def process_meeting(
     
     # Trigger processing for first artifact
     artifact = artifacts[0]
-    process_artifact.delay(str(artifact.id), str(org_id))
+    process_artifact.delay(
+        str(artifact.id),
+        str(org_id),
+        force_reprocess=force,
+        file_type=artifact.file_type,
+    )
     
     return {
         "status": "processing",
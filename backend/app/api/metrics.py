@@ -0,0 +1,70 @@
+"""
+Operational metrics endpoints.
+
+Every endpoint requires an org admin (Authorization bearer token plus
+X-Org-Id). LLM spend is reported for the caller's org only; the other
+endpoints expose process and pipeline counters that carry no org data.
+"""
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from app.middleware.auth import require_role
+from app.providers import transcription_provider_chain
+from app.providers.composite import get_latency_stats
+from app.services.llm_accounting import get_llm_usage, summarize_llm_calls
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_client import get_rate_limiter
+from app.worker.instrumentation import get_stage_histograms, render_prometheus
+
+# One callable, so FastAPI resolves it once per request for the router
+# and for endpoints that need the org
+require_admin = require_role("admin")
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/stages", response_class=PlainTextResponse)
+async def stage_latency_metrics():
+    """Per-stage pipeline latency histograms (Prometheus text format)."""
+    histograms = await get_stage_histograms()
+    return PlainTextResponse(
+        render_prometheus(histograms),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/stages.json")
+async def stage_latency_metrics_json():
+    """Per-stage pipeline latency histograms as JSON."""
+    return await get_stage_histograms()
+
+
+@router.get("/llm-cache")
+async def llm_cache_metrics():
+    """LLM response cache hit/miss counters for this process."""
+    return get_llm_cache().stats()
+
+
+@router.get("/llm")
+async def llm_usage_metrics(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    auth: tuple = Depends(require_admin),
+):
+    """
+    The caller's org's OpenAI spend, tokens and latency per service and
+    model over the last hours and today's spend against its budget, plus
+    this process's rate limiter and unflushed counters.
+    """
+    org_id, _ = auth
+    summary = await summarize_llm_calls(hours, org_id=org_id)
+    return {
+        **summary,
+        "rate_limiter": get_rate_limiter().stats(),
+        "process": get_llm_usage().stats(),
+    }
+
+
+@router.get("/providers")
+async def transcription_provider_metrics():
+    """Recent transcription latency (p50/p95) and outcomes per provider."""
+    return await get_latency_stats().summary(transcription_provider_chain())
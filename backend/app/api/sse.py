@@ -0,0 +1,54 @@
+"""
+Server-sent events for streamed LLM output.
+
+Endpoints that generate long text return
+``sse_response(sse_stream(deltas, finish))``. The client receives:
+
+- ``delta``: {"text": ...} for each chunk as the model writes it
+- ``done``: whatever finish(full_text) returns, e.g. the stored record
+- ``error``: {"detail": ...} if generation or finish fails
+
+A client that disconnects closes the stream, which stops the
+generation; finish is then never called and nothing is stored.
+"""
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Keep proxies (nginx) from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """One SSE message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str, ensure_ascii=False)}\n\n"
+
+
+async def sse_stream(
+    deltas: AsyncIterator[str],
+    finish: Callable[[str], Awaitable[Any]],
+) -> AsyncIterator[str]:
+    """SSE messages for generated text deltas, then finish's result."""
+    parts = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield sse_event("delta", {"text": delta})
+        result = await finish("".join(parts))
+    except Exception as e:
+        logger.warning(f"Streaming generation failed: {e}")
+        yield sse_event("error", {"detail": str(e)})
+        return
+    finally:
+        close = getattr(deltas, "aclose", None)
+        if close is not None:
+            await close()
+    yield sse_event("done", result)
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -2,10 +2,13 @@
 Task Assistance API
 Generates AI-powered guidance for action items and sends to assignees
 """
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
 from supabase import create_client
+from app.api.access import get_org_role, get_user_id, require_user
+from app.api.sse import sse_response, sse_stream
 from app.config import settings
 from app.services.task_assistant import TaskAssistant
 
@@ -86,6 +89,58 @@ async def generate_task_assistance(request: TaskAssistanceRequest):
         raise HTTPException(status_code=500, detail=f"Failed to generate assistance: {str(e)}")
 
 
+@router.post("/assist/{action_item_id}/stream")
+async def stream_task_assistance(action_item_id: str, request: Request, language: str = "sv"):
+    """
+    Streaming variant of /assist.
+    
+    Generation is paid for, so the endpoint is POST and requires an
+    authenticated member of the action item's org (401/403). Emits
+    `delta` events with the task analysis (JSON) as it is written, then
+    `done` with the same payload /assist returns, or `error`.
+    """
+    
+    supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    
+    user_id = get_user_id(request)
+    require_user(user_id)
+    
+    # Get action item
+    action_response = supabase.table('action_items').select('*').eq('id', action_item_id).execute()
+    if not action_response.data:
+        raise HTTPException(status_code=404, detail="Action item not found")
+    
+    action = action_response.data[0]
+    get_org_role(supabase, user_id, action.get('org_id'))
+    
+    # Get meeting context
+    meeting_response = supabase.table('meetings').select('*').eq('id', action['meeting_id']).execute()
+    meeting_context = meeting_response.data[0] if meeting_response.data else {}
+    
+    # Get assignee info
+    assignee_info = {
+        'name': action.get('owner_name', 'Team member'),
+        'email': action.get('owner_email')
+    }
+    
+    assistant = TaskAssistant()
+    if not assistant.client:
+        raise HTTPException(status_code=503, detail="OpenAI API required for task assistance")
+    
+    async def finish(text: str) -> dict:
+        analysis = json.loads(text)
+        email = await assistant.generate_assistance_email(action, analysis, assignee_info, language=language)
+        return TaskAssistanceResponse(
+            success=True,
+            email_subject=email['subject'],
+            email_preview=email['body'][:500],
+            ai_prompt=analysis.get('best_prompt', ''),
+            time_estimate=analysis.get('time_estimate', '')
+        ).dict()
+    
+    return sse_response(sse_stream(assistant.stream_analysis(action, meeting_context, assignee_info), finish))
+
+
 @router.get("/preview/{action_item_id}")
 async def preview_task_assistance(action_item_id: str, language: str = "sv"):
     """
@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import RedirectResponse, HTMLResponse
 from pydantic import BaseModel
 from typing import Optional
-import httpx
+from app.http_clients import get_http_client
 from datetime import datetime, timedelta
 
 from app.config import settings
@@ -396,25 +396,25 @@ async def linear_oauth_callback(code: str = Query(...), state: str = Query(...))
     user_id = state  # user_id was passed as state
     
     # Exchange code for token
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.linear.app/oauth/token",
-            data={
-                "grant_type": "authorization_code",
-                "client_id": settings.linear_oauth_client_id,
-                "client_secret": settings.linear_oauth_client_secret,
-                "redirect_uri": settings.linear_oauth_redirect_uri,
-                "code": code,
-            }
+    client = get_http_client("https://api.linear.app/oauth/token")
+    response = await client.post(
+        "https://api.linear.app/oauth/token",
+        data={
+            "grant_type": "authorization_code",
+            "client_id": settings.linear_oauth_client_id,
+            "client_secret": settings.linear_oauth_client_secret,
+            "redirect_uri": settings.linear_oauth_redirect_uri,
+            "code": code,
+        }
+    )
+    
+    if response.status_code != 200:
+        return RedirectResponse(
+            url="/user-integrations/settings?integration=linear&status=error",
+            status_code=302
         )
-        
-        if response.status_code != 200:
-            return RedirectResponse(
-                url="/user-integrations/settings?integration=linear&status=error",
-                status_code=302
-            )
-        
-        token_data = response.json()
+    
+    token_data = response.json()
     
     # Get user's org_id
     supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
@@ -0,0 +1,65 @@
+"""Inbound webhooks from external services."""
+import hashlib
+import hmac
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from app.config import settings
+from app.integrations.whisperflow_poller import TERMINAL_STATES
+from app.worker.transcription_jobs import get_pending_jobs
+
+router = APIRouter()
+
+
+def _valid_signature(body: bytes, signature: Optional[str]) -> bool:
+    """Check an HMAC-SHA256 hex signature of the raw body ("sha256=" prefix optional)."""
+    if not signature:
+        return False
+    expected = hmac.new(settings.whisperflow_webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.removeprefix("sha256="))
+
+
+@router.post("/whisperflow")
+async def whisperflow_webhook(
+    request: Request,
+    x_whisperflow_signature: Optional[str] = Header(None),
+):
+    """
+    Resume the pipeline of a deferred Whisperflow job.
+
+    Whisperflow calls this when a job finishes. Requests must be signed
+    with WHISPERFLOW_WEBHOOK_SECRET; the endpoint does not exist unless
+    both the webhook URL and the secret are configured. Unknown or already
+    resumed jobs and non-terminal states are acknowledged and ignored.
+    """
+    if not settings.whisperflow_webhook_enabled:
+        # Without a secret anyone could fail or resume pipelines
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Whisperflow webhook not configured")
+
+    body = await request.body()
+    if not _valid_signature(body, x_whisperflow_signature):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+
+    job_id = str(payload.get("id") or payload.get("transcription_id") or "")
+    state = payload.get("state") or payload.get("status")
+    if not job_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing transcription id")
+    if state not in TERMINAL_STATES:
+        return {"status": "ignored", "transcription_id": job_id, "state": state}
+
+    context = await get_pending_jobs().get(job_id)
+    if context is None:
+        return {"status": "ignored", "transcription_id": job_id, "reason": "not pending"}
+
+    from app.worker.tasks.pipeline import resume_pipeline
+    error = payload.get("error", "Unknown error") if state == "failed" else None
+    resume_pipeline(job_id, context, error=error)
+
+    return {"status": "accepted", "transcription_id": job_id}
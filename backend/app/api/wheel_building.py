@@ -5,7 +5,7 @@ from supabase import create_client
 from app.config import settings
 from app.api.styles import get_dv_styles
 from app.api.sidebar_component import get_admin_sidebar
-import httpx
+from app.http_clients import get_http_client
 import json
 from datetime import datetime, timedelta
 
@@ -2991,79 +2991,79 @@ async def fetch_linear_tasks():
         }
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                'https://api.linear.app/graphql',
-                json={'query': query},
-                headers={
-                    'Authorization': settings.linear_api_key,
-                    'Content-Type': 'application/json'
-                },
-                timeout=10.0
-            )
+        client = get_http_client('https://api.linear.app/graphql')
+        response = await client.post(
+            'https://api.linear.app/graphql',
+            json={'query': query},
+            headers={
+                'Authorization': settings.linear_api_key,
+                'Content-Type': 'application/json'
+            },
+            timeout=10.0
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            issues = data.get('data', {}).get('issues', {}).get('nodes', [])
             
-            if response.status_code == 200:
-                data = response.json()
-                issues = data.get('data', {}).get('issues', {}).get('nodes', [])
-                
-                # Get org_id (Disruptive Ventures)
-                supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
-                org_result = supabase.table('orgs').select('id').eq('name', 'Disruptive Ventures').execute()
-                org_id = org_result.data[0]['id'] if org_result.data else None
-                
-                if not org_id:
-                    print("⚠️ No org_id found for Disruptive Ventures - tasks won't be saved to database")
-                    print("   Tasks will display but editing won't work until org exists")
-                else:
-                    print(f"✅ Using org_id: {org_id}")
-                
-                # Convert Linear issues to our format and sync to database
-                tasks = []
-                for issue in issues:
-                    task_data = {
-                        'id': issue.get('id'),
-                        'title': issue.get('title'),
-                        'description': issue.get('description', ''),
-                        'owner_name': issue.get('assignee', {}).get('name') if issue.get('assignee') else 'Unassigned',
-                        'due_date': issue.get('dueDate'),
-                        'priority': map_linear_priority(issue.get('priority', 0)),
-                        'status': map_linear_status(issue.get('state', {}).get('name', 'Todo')),
-                        'linear_issue_url': issue.get('url'),
-                        'linear_issue_id': issue.get('identifier')
-                    }
-                    
-                    # Sync to database (upsert based on Linear ID)
-                    if org_id:
-                        try:
-                            # Get assignee email if available
-                            assignee_email = issue.get('assignee', {}).get('email') if issue.get('assignee') else None
-                            
-                            result = supabase.table('tasks').upsert({
-                                'id': issue.get('id'),
-                                'org_id': org_id,
-                                'title': issue.get('title'),
-                                'description': issue.get('description', ''),
-                                'status': task_data['status'],
-                                'priority': task_data['priority'],
-                                'due_date': issue.get('dueDate'),
-                                'assigned_to_email': assignee_email,
-                                'linear_issue_id': issue.get('identifier'),
-                                'source': 'linear',
-                                'last_synced_to_linear_at': datetime.utcnow().isoformat(),
-                                'sync_enabled': True
-                            }, on_conflict='id').execute()
-                            print(f"  ✅ Synced to DB: {issue.get('title')[:40]}...")
-                        except Exception as e:
-                            print(f"  ❌ DB sync error: {str(e)[:100]}")
-                    
-                    tasks.append(task_data)
-                
-                print(f"✅ Fetched and synced {len(tasks)} tasks from Linear")
-                return tasks
+            # Get org_id (Disruptive Ventures)
+            supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+            org_result = supabase.table('orgs').select('id').eq('name', 'Disruptive Ventures').execute()
+            org_id = org_result.data[0]['id'] if org_result.data else None
+            
+            if not org_id:
+                print("⚠️ No org_id found for Disruptive Ventures - tasks won't be saved to database")
+                print("   Tasks will display but editing won't work until org exists")
             else:
-                print(f"Linear API error: {response.status_code}")
-                return []
+                print(f"✅ Using org_id: {org_id}")
+            
+            # Convert Linear issues to our format and sync to database
+            tasks = []
+            for issue in issues:
+                task_data = {
+                    'id': issue.get('id'),
+                    'title': issue.get('title'),
+                    'description': issue.get('description', ''),
+                    'owner_name': issue.get('assignee', {}).get('name') if issue.get('assignee') else 'Unassigned',
+                    'due_date': issue.get('dueDate'),
+                    'priority': map_linear_priority(issue.get('priority', 0)),
+                    'status': map_linear_status(issue.get('state', {}).get('name', 'Todo')),
+                    'linear_issue_url': issue.get('url'),
+                    'linear_issue_id': issue.get('identifier')
+                }
+                
+                # Sync to database (upsert based on Linear ID)
+                if org_id:
+                    try:
+                        # Get assignee email if available
+                        assignee_email = issue.get('assignee', {}).get('email') if issue.get('assignee') else None
+                        
+                        result = supabase.table('tasks').upsert({
+                            'id': issue.get('id'),
+                            'org_id': org_id,
+                            'title': issue.get('title'),
+                            'description': issue.get('description', ''),
+                            'status': task_data['status'],
+                            'priority': task_data['priority'],
+                            'due_date': issue.get('dueDate'),
+                            'assigned_to_email': assignee_email,
+                            'linear_issue_id': issue.get('identifier'),
+                            'source': 'linear',
+                            'last_synced_to_linear_at': datetime.utcnow().isoformat(),
+                            'sync_enabled': True
+                        }, on_conflict='id').execute()
+                        print(f"  ✅ Synced to DB: {issue.get('title')[:40]}...")
+                    except Exception as e:
+                        print(f"  ❌ DB sync error: {str(e)[:100]}")
                 
+                tasks.append(task_data)
+            
+            print(f"✅ Fetched and synced {len(tasks)} tasks from Linear")
+            return tasks
+        else:
+            print(f"Linear API error: {response.status_code}")
+            return []
+            
     except Exception as e:
         print(f"Error fetching Linear tasks: {e}")
         return []
@@ -3139,59 +3139,59 @@ async def update_linear_issue_status(issue_id: str, new_status: str) -> bool:
         }
         """
         
-        async with httpx.AsyncClient() as client:
-            # Get workflow states
-            response = await client.post(
-                'https://api.linear.app/graphql',
-                json={'query': query},
-                headers={
-                    'Authorization': settings.linear_api_key,
-                    'Content-Type': 'application/json'
-                },
-                timeout=10.0
-            )
-            
-            if response.status_code != 200:
-                return False
-            
-            states = response.json().get('data', {}).get('workflowStates', {}).get('nodes', [])
-            state_id = next((s['id'] for s in states if s['name'].lower() == state_name.lower()), None)
-            
-            if not state_id:
-                print(f"Could not find Linear state for: {state_name}")
-                return False
-            
-            # Update the issue status
-            mutation = """
-            mutation UpdateIssueState($issueId: String!, $stateId: String!) {
-                issueUpdate(
-                    id: $issueId
-                    input: { stateId: $stateId }
-                ) {
-                    success
-                }
+        client = get_http_client('https://api.linear.app/graphql')
+        # Get workflow states
+        response = await client.post(
+            'https://api.linear.app/graphql',
+            json={'query': query},
+            headers={
+                'Authorization': settings.linear_api_key,
+                'Content-Type': 'application/json'
+            },
+            timeout=10.0
+        )
+        
+        if response.status_code != 200:
+            return False
+        
+        states = response.json().get('data', {}).get('workflowStates', {}).get('nodes', [])
+        state_id = next((s['id'] for s in states if s['name'].lower() == state_name.lower()), None)
+        
+        if not state_id:
+            print(f"Could not find Linear state for: {state_name}")
+            return False
+        
+        # Update the issue status
+        mutation = """
+        mutation UpdateIssueState($issueId: String!, $stateId: String!) {
+            issueUpdate(
+                id: $issueId
+                input: { stateId: $stateId }
+            ) {
+                success
             }
-            """
-            
-            response = await client.post(
-                'https://api.linear.app/graphql',
-                json={
-                    'query': mutation,
-                    'variables': {'issueId': issue_id, 'stateId': state_id}
-                },
-                headers={
-                    'Authorization': settings.linear_api_key,
-                    'Content-Type': 'application/json'
-                },
-                timeout=10.0
-            )
+        }
+        """
+        
+        response = await client.post(
+            'https://api.linear.app/graphql',
+            json={
+                'query': mutation,
+                'variables': {'issueId': issue_id, 'stateId': state_id}
+            },
+            headers={
+                'Authorization': settings.linear_api_key,
+                'Content-Type': 'application/json'
+            },
+            timeout=10.0
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('data', {}).get('issueUpdate', {}).get('success', False)
+        else:
+            return False
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('data', {}).get('issueUpdate', {}).get('success', False)
-            else:
-                return False
-                
     except Exception as e:
         print(f"Error updating Linear issue status: {e}")
         return False
@@ -3319,24 +3319,24 @@ async def update_linear_issue(issue_id: str, updates: dict) -> bool:
         }}
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                'https://api.linear.app/graphql',
-                json={'query': mutation, 'variables': variables},
-                headers={
-                    'Authorization': settings.linear_api_key,
-                    'Content-Type': 'application/json'
-                },
-                timeout=10.0
-            )
+        client = get_http_client('https://api.linear.app/graphql')
+        response = await client.post(
+            'https://api.linear.app/graphql',
+            json={'query': mutation, 'variables': variables},
+            headers={
+                'Authorization': settings.linear_api_key,
+                'Content-Type': 'application/json'
+            },
+            timeout=10.0
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('data', {}).get('issueUpdate', {}).get('success', False)
+        else:
+            print(f"Linear API error: {response.status_code}")
+            return False
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('data', {}).get('issueUpdate', {}).get('success', False)
-            else:
-                print(f"Linear API error: {response.status_code}")
-                return False
-                
     except Exception as e:
         print(f"Error updating Linear issue: {e}")
         return False
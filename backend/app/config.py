@@ -35,6 +35,13 @@ class Settings(BaseSettings):
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
     
+    # Per-worker Celery rate limits by queue ("" = unlimited)
+    celery_transcribe_rate_limit: str = "30/m"
+    celery_extract_rate_limit: str = "60/m"
+    celery_parse_rate_limit: str = ""
+    celery_distribute_rate_limit: str = ""
+    celery_sync_rate_limit: str = "60/m"
+    
     # Security
     encryption_key: str  # 32-byte base64-encoded key
     
@@ -56,8 +63,129 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     openai_org_id: str = ""
     
+    whisperflow_api_key: str = ""
+    whisperflow_api_url: str = "https://api.whisperflow.com/v1"
+    # Outstanding jobs are polled together; the interval backs off from
+    # min to max while no job changes
+    whisperflow_poll_min_seconds: float = 2.0
+    whisperflow_poll_max_seconds: float = 30.0
+    # Public URL of /webhooks/whisperflow. When set together with the
+    # signing secret, the pipeline submits Whisperflow jobs and resumes on
+    # the (signed) webhook instead of holding a worker slot; jobs whose
+    # webhook is lost are picked up by a sweep.
+    whisperflow_webhook_url: str = ""
+    whisperflow_webhook_secret: str = ""
+    whisperflow_sweep_seconds: float = 60.0
+    
+    @property
+    def whisperflow_webhook_enabled(self) -> bool:
+        """Webhook resumption needs both the URL and the signing secret."""
+        return bool(self.whisperflow_webhook_url and self.whisperflow_webhook_secret)
+    
     default_transcription_provider: str = "klang"
     
+    # "local" provider: synthetic transcripts for benchmarks and CI
+    local_transcription_segments: int = 120
+    local_transcription_latency_ms: float = 0.0
+    local_transcription_ms_per_segment: float = 0.0
+
+    # Ordered failover chain, e.g. "klang,mistral,openai" (empty = default
+    # provider only). Timeouts are per provider, e.g. "klang:120,openai:300".
+    transcription_providers: str = ""
+    transcription_provider_timeouts: str = ""
+    transcription_timeout_seconds: float = 300.0
+    # Hedging starts the next provider once the current one exceeds its
+    # observed latency percentile; the first result wins
+    transcription_hedging: bool = False
+    transcription_hedge_percentile: float = 0.95
+    transcription_hedge_default_seconds: float = 120.0
+
+    # Transcript chunks are flushed to the database in batches of this size
+    # while a streaming transcription is still running
+    transcript_flush_segments: int = 50
+    
+    # Audio preprocessing: 16 kHz mono, long silences shortened, split at
+    # silences into pieces that are transcribed concurrently. Only used with
+    # providers that accept local files (pieces are not uploaded to storage)
+    audio_chunking_enabled: bool = True
+    audio_chunk_minutes: float = 10.0
+    audio_chunk_overlap_seconds: float = 10.0
+    audio_max_silence_ms: int = 1500
+    audio_silence_offset_db: float = 16.0
+    audio_transcribe_concurrency: int = 4
+    
+    # Extraction (long transcripts are split into token windows)
+    extraction_window_tokens: int = 24000
+    extraction_window_overlap_tokens: int = 1000
+    extraction_max_concurrency: int = 4
+    
+    # Document intelligence: report generation calls in flight per process
+    document_generation_concurrency: int = 4
+    
+    # AI automation batch APIs: records packed per structured-output request
+    # (by count and total characters) and requests in flight per batch
+    automation_batch_size: int = 5
+    automation_batch_max_chars: int = 30000
+    automation_batch_concurrency: int = 4
+    
+    # Document research (Agent 3): claims researched at once, politeness per
+    # source domain (not the search API), and search result cache
+    research_max_concurrency: int = 5
+    research_domain_concurrency: int = 2
+    research_domain_interval_seconds: float = 1.0
+    research_search_cache_ttl_seconds: int = 6 * 3600
+    research_search_cache_max_entries: int = 2000
+    
+    # Translation: strings per request are capped by total characters;
+    # translations are remembered in the translation_memory table
+    translation_batch_max_chars: int = 12000
+    translation_memory_enabled: bool = True
+    translation_memory_max_entries: int = 20000
+    
+    # Semantic search over transcript chunks (chunk_embeddings table).
+    # "hashing" needs no network; "openai" uses embedding_model shortened
+    # to embedding_dimensions. Vectors are stored as int8 or float16, and
+    # each process keeps the indexes of vector_index_max_orgs orgs loaded.
+    embedding_provider: str = "hashing"
+    embedding_model: str = "text-embedding-3-small"
+    embedding_dimensions: int = 512
+    embedding_dtype: str = "int8"
+    vector_index_max_orgs: int = 32
+    
+    # PII scanning matches the names of each org's people and
+    # organizations; processes keep the name automata of
+    # pii_dictionary_max_orgs orgs and check those tables for changes at
+    # most every pii_dictionary_refresh_seconds.
+    pii_dictionary_refresh_seconds: float = 60.0
+    pii_dictionary_max_orgs: int = 32
+    
+    # OpenAI rate limits per model as "model:rpm:tpm" (longest prefix
+    # wins), shared by all processes through Redis (defaults to redis_url).
+    # Set these to your account's tier.
+    openai_rate_limits: str = "gpt-4o-mini:5000:2000000,gpt-4o:5000:800000,gpt-4:5000:300000"
+    openai_rate_limit_redis_url: str = ""
+    openai_rate_limit_burst_seconds: float = 10.0
+    openai_completion_token_estimate: int = 1000
+    openai_max_retries: int = 3
+    
+    # LLM call accounting (llm_calls table). Prices are USD per 1M tokens
+    # as "model:input:output" (longest prefix wins). Orgs over their daily
+    # budget (0 = none; per-org overrides as "org_id:usd") are switched to
+    # the fallback model ("model:cheaper_model").
+    llm_accounting_enabled: bool = True
+    llm_accounting_batch_size: int = 50
+    llm_accounting_flush_seconds: float = 5.0
+    llm_model_prices: str = "gpt-4o-mini:0.15:0.60,gpt-4o:2.50:10.00,gpt-4-turbo:10.00:30.00,gpt-4:30.00:60.00"
+    llm_org_daily_budget_usd: float = 0.0
+    llm_org_daily_budgets: str = ""
+    llm_budget_fallback_models: str = "gpt-4o:gpt-4o-mini,gpt-4:gpt-4o-mini"
+    
+    # LLM response cache (defaults to redis_url when no URL is set)
+    llm_cache_enabled: bool = True
+    llm_cache_redis_url: str = ""
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 50000
+    
     # Linear (API key for global/testing)
     linear_api_key: str = ""
     linear_api_url: str = "https://api.linear.app/graphql"
@@ -0,0 +1,126 @@
+"""Shared outbound HTTP clients.
+
+Providers and integrations get a long-lived ``httpx.AsyncClient`` per
+origin (scheme, host, port) from ``get_http_client`` instead of opening a
+client per call, so TLS sessions and keep-alive connections are reused.
+HTTP/2 is negotiated when the ``h2`` package is installed and the server
+supports it.
+
+Clients are bound to the event loop that created them; each loop gets its
+own set. The FastAPI lifespan and the Celery worker runtime close them on
+shutdown via ``close_http_clients``.
+"""
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Defaults; long calls (transcription, uploads) pass timeout= per request
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
+# Origins kept open per loop; scrapers touch many one-off hosts
+MAX_ORIGINS = 128
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    scheme = parts.scheme or "https"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{parts.hostname}:{port}"
+
+
+class HTTPClientRegistry:
+    """Per-loop, per-origin pool of AsyncClients."""
+
+    def __init__(
+        self,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = HTTP2_AVAILABLE,
+        max_origins: int = MAX_ORIGINS,
+    ):
+        self.timeout = timeout
+        self.limits = limits
+        self.http2 = http2
+        self.max_origins = max_origins
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OrderedDict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """
+        Client for the origin of ``url`` on the running event loop.
+
+        Requests must still use absolute URLs; the client is not bound
+        to a base URL so one origin's client serves all its paths. The
+        least recently used origin is closed beyond max_origins.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            clients = self._clients[loop] = OrderedDict()
+        key = _origin(url)
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            clients[key] = client
+        clients.move_to_end(key)
+
+        while len(clients) > self.max_origins:
+            _, evicted = clients.popitem(last=False)
+            loop.create_task(evicted.aclose())
+        return client
+
+    def stats(self) -> dict[str, int]:
+        """Open client count per origin (all loops)."""
+        counts: dict[str, int] = {}
+        for clients in list(self._clients.values()):
+            for origin, client in clients.items():
+                if not client.is_closed:
+                    counts[origin] = counts.get(origin, 0) + 1
+        return counts
+
+    async def aclose(self) -> None:
+        """Close the running loop's clients."""
+        loop = asyncio.get_running_loop()
+        clients = self._clients.pop(loop, {})
+        for origin, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing HTTP client for {origin}: {e}")
+
+
+# Process-wide registry
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """Shared keep-alive client for the origin of ``url``."""
+    return http_clients.get(url)
+
+
+async def close_http_clients(registry: Optional[HTTPClientRegistry] = None) -> None:
+    """Close pooled clients for the running loop (call on shutdown)."""
+    await (registry or http_clients).aclose()
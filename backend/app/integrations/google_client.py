@@ -1,4 +1,9 @@
-"""Google Workspace integration (Gmail + Calendar)."""
+"""Google Workspace integration (Gmail + Calendar).
+
+googleapiclient is synchronous; service discovery and request execution
+run in a worker thread so they don't block the event loop.
+"""
+import asyncio
 import base64
 from typing import Optional
 from datetime import datetime, timedelta
@@ -67,7 +72,7 @@ class GoogleClient:
         Returns:
             Draft data with ID
         """
-        service = self.get_gmail_service()
+        service = await asyncio.to_thread(self.get_gmail_service)
         
         # Create message
         message = MIMEText(body_html, "html")
@@ -84,10 +89,10 @@ class GoogleClient:
         
         # Create draft
         try:
-            draft = service.users().drafts().create(
+            draft = await asyncio.to_thread(service.users().drafts().create(
                 userId="me",
                 body={"message": {"raw": raw_message}},
-            ).execute()
+            ).execute)
             
             return {
                 "id": draft["id"],
@@ -118,7 +123,7 @@ class GoogleClient:
         Returns:
             Sent message data
         """
-        service = self.get_gmail_service()
+        service = await asyncio.to_thread(self.get_gmail_service)
         
         # Create message
         message = MIMEText(body_html, "html")
@@ -135,10 +140,10 @@ class GoogleClient:
         
         # Send
         try:
-            sent = service.users().messages().send(
+            sent = await asyncio.to_thread(service.users().messages().send(
                 userId="me",
                 body={"raw": raw_message},
-            ).execute()
+            ).execute)
             
             return {
                 "id": sent["id"],
@@ -173,7 +178,7 @@ class GoogleClient:
         Returns:
             Created event data
         """
-        service = self.get_calendar_service()
+        service = await asyncio.to_thread(self.get_calendar_service)
         
         event = {
             "summary": summary,
@@ -195,11 +200,11 @@ class GoogleClient:
             event["attendees"] = [{"email": email} for email in attendees]
         
         try:
-            created_event = service.events().insert(
+            created_event = await asyncio.to_thread(service.events().insert(
                 calendarId="primary",
                 body=event,
                 sendUpdates="all" if send_updates else "none",
-            ).execute()
+            ).execute)
             
             return {
                 "id": created_event["id"],
@@ -227,17 +232,17 @@ class GoogleClient:
         Returns:
             List of events
         """
-        service = self.get_calendar_service()
+        service = await asyncio.to_thread(self.get_calendar_service)
         
         try:
-            events_result = service.events().list(
+            events_result = await asyncio.to_thread(service.events().list(
                 calendarId="primary",
                 timeMin=time_min.isoformat() + "Z",
                 timeMax=time_max.isoformat() + "Z",
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy="startTime",
-            ).execute()
+            ).execute)
             
             return events_result.get("items", [])
         
@@ -174,27 +174,27 @@ class SimpleGoogleSheetsClient:
         Returns:
             Dict with values
         """
-        import httpx
+        from app.http_clients import get_http_client
         
         url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/gviz/tq?tqx=out:json&sheet=Sheet1&range={range_name}"
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
+            client = get_http_client(url)
+            response = await client.get(url)
+            
+            if response.status_code == 200:
+                # Parse Google Visualization API response
+                # It's wrapped in a function call, need to extract JSON
+                text = response.text
+                
+                if text.startswith('/*'):
+                    text = text.split('(', 1)[1].rsplit(')', 1)[0]
                 
-                if response.status_code == 200:
-                    # Parse Google Visualization API response
-                    # It's wrapped in a function call, need to extract JSON
-                    text = response.text
-                    
-                    if text.startswith('/*'):
-                        text = text.split('(', 1)[1].rsplit(')', 1)[0]
-                    
-                    data = json.loads(text)
-                    return data
-                else:
-                    print(f"Error: Sheet might not be public or doesn't exist")
-                    return None
+                data = json.loads(text)
+                return data
+            else:
+                print(f"Error: Sheet might not be public or doesn't exist")
+                return None
         
         except Exception as e:
             print(f"Error reading public sheet: {e}")
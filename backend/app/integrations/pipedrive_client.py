@@ -4,10 +4,11 @@ Pipedrive CRM Integration Client
 Fetches deals, organizations, and persons from Pipedrive API
 """
 
-import httpx
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from app.http_clients import get_http_client
+
 
 class PipedriveClient:
     """Client for Pipedrive CRM API."""
@@ -52,17 +53,17 @@ class PipedriveClient:
             params["stage_id"] = stage_id
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/deals",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get('success') and data.get('data'):
-                    return data['data']
-                return []
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/deals",
+                params=params
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get('success') and data.get('data'):
+                return data['data']
+            return []
         
         except Exception as e:
             print(f"Error fetching Pipedrive deals: {e}")
@@ -73,17 +74,17 @@ class PipedriveClient:
         params = {"api_token": self.api_token}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/stages",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get('success') and data.get('data'):
-                    return data['data']
-                return []
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/stages",
+                params=params
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get('success') and data.get('data'):
+                return data['data']
+            return []
         
         except Exception as e:
             print(f"Error fetching Pipedrive stages: {e}")
@@ -97,17 +98,17 @@ class PipedriveClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/organizations",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get('success') and data.get('data'):
-                    return data['data']
-                return []
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/organizations",
+                params=params
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get('success') and data.get('data'):
+                return data['data']
+            return []
         
         except Exception as e:
             print(f"Error fetching Pipedrive organizations: {e}")
@@ -121,17 +122,17 @@ class PipedriveClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/persons",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get('success') and data.get('data'):
-                    return data['data']
-                return []
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/persons",
+                params=params
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get('success') and data.get('data'):
+                return data['data']
+            return []
         
         except Exception as e:
             print(f"Error fetching Pipedrive persons: {e}")
@@ -2,11 +2,13 @@
 Whisperflow integration client for DV VC Operating System.
 Transcription service for meetings across all 4 wheels.
 """
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 import httpx
 import asyncio
 import logging
 
+from app.http_clients import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,45 +70,46 @@ class WhisperflowClient:
             job_id = result['id']
         """
         try:
-            async with httpx.AsyncClient() as client:
-                if audio_url:
-                    # Submit URL for transcription
-                    payload = {
-                        "audio_url": audio_url,
-                        "language": language,
-                        "speaker_diarization": speaker_diarization,
-                        "timestamps": timestamps,
-                        **kwargs
-                    }
-                    
-                    response = await client.post(
-                        f"{self.base_url}/transcribe",
-                        headers=self.headers,
-                        json=payload
-                    )
-                
-                elif audio_file:
-                    # Upload file for transcription
-                    files = {"file": audio_file}
-                    data = {
-                        "language": language,
-                        "speaker_diarization": speaker_diarization,
-                        "timestamps": timestamps,
-                        **kwargs
-                    }
-                    
-                    response = await client.post(
-                        f"{self.base_url}/transcribe/upload",
-                        headers={"Authorization": f"Bearer {self.api_key}"},
-                        files=files,
-                        data=data
-                    )
+            client = get_http_client(self.base_url)
+            if audio_url:
+                # Submit URL for transcription
+                payload = {
+                    "audio_url": audio_url,
+                    "language": language,
+                    "speaker_diarization": speaker_diarization,
+                    "timestamps": timestamps,
+                    **kwargs
+                }
                 
-                else:
-                    raise ValueError("Either audio_url or audio_file must be provided")
+                response = await client.post(
+                    f"{self.base_url}/transcribe",
+                    headers=self.headers,
+                    json=payload
+                )
+            
+            elif audio_file:
+                # Upload file for transcription
+                files = {"file": audio_file}
+                data = {
+                    "language": language,
+                    "speaker_diarization": speaker_diarization,
+                    "timestamps": timestamps,
+                    **kwargs
+                }
                 
-                response.raise_for_status()
-                return response.json()
+                response = await client.post(
+                    f"{self.base_url}/transcribe/upload",
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                    files=files,
+                    data=data,
+                    timeout=300.0
+                )
+            
+            else:
+                raise ValueError("Either audio_url or audio_file must be provided")
+            
+            response.raise_for_status()
+            return response.json()
         
         except httpx.HTTPStatusError as e:
             logger.error(f"Whisperflow API error: {e.response.status_code} - {e.response.text}")
@@ -131,13 +134,13 @@ class WhisperflowClient:
                 result = await whisperflow.get_transcription_result(job_id)
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/transcribe/{transcription_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/transcribe/{transcription_id}",
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
         
         except httpx.HTTPStatusError as e:
             logger.error(f"Error getting transcription status: {e.response.status_code} - {e.response.text}")
@@ -162,13 +165,13 @@ class WhisperflowClient:
             speakers = result['speakers']  # [{speaker: "Speaker 1", text: "...", start: 0.0, end: 5.2}]
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/transcribe/{transcription_id}/result",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/transcribe/{transcription_id}/result",
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
         
         except httpx.HTTPStatusError as e:
             logger.error(f"Error getting transcription result: {e.response.status_code} - {e.response.text}")
@@ -184,12 +187,18 @@ class WhisperflowClient:
         poll_interval_seconds: int = 5
     ) -> Dict[str, Any]:
         """
-        Wait for transcription to complete (blocking).
+        Wait for transcription to complete.
+        
+        The job is tracked by the shared per-process poller, which checks
+        all outstanding jobs with batched status calls and backs off while
+        nothing changes, instead of polling this one job on a fixed timer.
         
         Args:
             transcription_id: Job ID
             max_wait_seconds: Maximum time to wait
-            poll_interval_seconds: How often to check status
+            poll_interval_seconds: Unused; the shared poller adapts its
+                interval between WHISPERFLOW_POLL_MIN_SECONDS and
+                WHISPERFLOW_POLL_MAX_SECONDS
         
         Returns:
             Completed transcription result
@@ -204,27 +213,9 @@ class WhisperflowClient:
             result = await whisperflow.wait_for_transcription(job['id'])
             transcript = result['text']
         """
-        elapsed = 0
-        
-        while elapsed < max_wait_seconds:
-            status = await self.get_transcription_status(transcription_id)
-            state = status.get('state')
-            
-            if state == 'completed':
-                return await self.get_transcription_result(transcription_id)
-            
-            elif state == 'failed':
-                error_msg = status.get('error', 'Unknown error')
-                raise ValueError(f"Transcription failed: {error_msg}")
-            
-            elif state in ('queued', 'processing'):
-                await asyncio.sleep(poll_interval_seconds)
-                elapsed += poll_interval_seconds
-            
-            else:
-                raise ValueError(f"Unknown transcription state: {state}")
+        from app.integrations.whisperflow_poller import get_job_poller
         
-        raise TimeoutError(f"Transcription did not complete within {max_wait_seconds} seconds")
+        return await get_job_poller(self).wait(transcription_id, max_wait_seconds)
     
     async def transcribe_and_wait(
         self,
@@ -284,14 +275,14 @@ class WhisperflowClient:
             List of transcription jobs
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/transcribe",
-                    headers=self.headers,
-                    params={"limit": limit, "offset": offset}
-                )
-                response.raise_for_status()
-                return response.json()
+            client = get_http_client(self.base_url)
+            response = await client.get(
+                f"{self.base_url}/transcribe",
+                headers=self.headers,
+                params={"limit": limit, "offset": offset}
+            )
+            response.raise_for_status()
+            return response.json()
         
         except httpx.HTTPStatusError as e:
             logger.error(f"Error listing transcriptions: {e.response.status_code} - {e.response.text}")
@@ -300,6 +291,56 @@ class WhisperflowClient:
             logger.error(f"Error listing Whisperflow transcriptions: {str(e)}")
             raise
     
+    async def get_transcription_statuses(
+        self,
+        transcription_ids: Iterable[str],
+        page_size: int = 100,
+        max_pages: int = 5,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Status of many jobs with as few requests as possible.
+        
+        Pages through list_transcriptions (newest first) until every
+        requested job has been seen; jobs older than max_pages pages are
+        checked individually.
+        
+        Args:
+            transcription_ids: Job IDs to look up
+            page_size: Jobs per list request
+            max_pages: Max list requests before falling back
+        
+        Returns:
+            Job ID -> status data, for the jobs that could be found
+        """
+        wanted = set(transcription_ids)
+        statuses: Dict[str, Dict[str, Any]] = {}
+        
+        for page in range(max_pages):
+            if not wanted - statuses.keys():
+                break
+            data = await self.list_transcriptions(limit=page_size, offset=page * page_size)
+            jobs = _list_items(data)
+            for job in jobs:
+                job_id = str(job.get('id', ''))
+                if job_id in wanted:
+                    statuses[job_id] = job
+            if len(jobs) < page_size:
+                break
+        
+        missing = list(wanted - statuses.keys())
+        if missing:
+            results = await asyncio.gather(
+                *(self.get_transcription_status(job_id) for job_id in missing),
+                return_exceptions=True,
+            )
+            for job_id, status in zip(missing, results):
+                if isinstance(status, Exception):
+                    logger.warning(f"Whisperflow status check for {job_id} failed: {status}")
+                else:
+                    statuses[job_id] = status
+        
+        return statuses
+    
     async def delete_transcription(self, transcription_id: str) -> bool:
         """
         Delete a transcription job.
@@ -311,13 +352,13 @@ class WhisperflowClient:
             True if deleted successfully
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.base_url}/transcribe/{transcription_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return True
+            client = get_http_client(self.base_url)
+            response = await client.delete(
+                f"{self.base_url}/transcribe/{transcription_id}",
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return True
         
         except httpx.HTTPStatusError as e:
             logger.error(f"Error deleting transcription: {e.response.status_code} - {e.response.text}")
@@ -327,6 +368,16 @@ class WhisperflowClient:
             raise
 
 
+def _list_items(data: Any) -> List[Dict[str, Any]]:
+    """Jobs from a list_transcriptions response (bare list or wrapped)."""
+    if isinstance(data, list):
+        return data
+    for key in ('transcriptions', 'data', 'items', 'results'):
+        if isinstance(data.get(key), list):
+            return data[key]
+    return []
+
+
 # Helper functions for converting Whisperflow output to DV format
 
 def whisperflow_to_dv_format(whisperflow_result: Dict) -> Dict:
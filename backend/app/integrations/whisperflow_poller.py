@@ -0,0 +1,190 @@
+"""Shared status poller for Whisperflow transcription jobs.
+
+Instead of every waiting coroutine polling its own job on a fixed timer,
+one background task per event loop (and Whisperflow account) checks all
+outstanding jobs with a batched ``get_transcription_statuses`` call per
+sweep. The interval starts at WHISPERFLOW_POLL_MIN_SECONDS, grows while
+no job changes and drops back when one does or a new job is tracked:
+
+    poller = get_job_poller(client)
+    result = await poller.wait(job_id, max_wait_seconds=600)
+"""
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATES = {"queued", "processing"}
+TERMINAL_STATES = {"completed", "failed"}
+
+
+def _status_key(status: Dict[str, Any]) -> tuple:
+    """What counts as a change: state, partial segments, progress."""
+    return (
+        status.get("state"),
+        len(status.get("segments") or ()),
+        status.get("progress"),
+    )
+
+
+class WhisperflowJobPoller:
+    """Tracks many transcription IDs with one polling task."""
+
+    def __init__(
+        self,
+        client,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        backoff: float = 2.0,
+    ):
+        self.client = client
+        self.min_interval = min_interval or settings.whisperflow_poll_min_seconds
+        self.max_interval = max(self.min_interval, max_interval or settings.whisperflow_poll_max_seconds)
+        self.backoff = backoff
+        self.interval = self.min_interval
+        self.sweeps = 0
+        self._watchers: dict[str, list[asyncio.Queue]] = {}
+        self._last: dict[str, tuple[tuple, Dict[str, Any]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def tracked(self) -> int:
+        """Number of jobs currently being polled."""
+        return len(self._watchers)
+
+    async def watch(
+        self,
+        transcription_id: str,
+        max_wait_seconds: float = 600,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job's status each time it changes.
+
+        The last status yielded is the terminal one ("completed" or
+        "failed"); the caller decides how to handle a failure.
+
+        Raises:
+            TimeoutError: If the job doesn't finish in time
+            ValueError: On an unknown job state
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(transcription_id, []).append(queue)
+        if transcription_id in self._last:
+            queue.put_nowait(self._last[transcription_id][1])
+        self.interval = self.min_interval
+        self._ensure_running()
+
+        deadline = time.monotonic() + max_wait_seconds
+        try:
+            while True:
+                try:
+                    status = await asyncio.wait_for(queue.get(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"Transcription did not complete within {max_wait_seconds} seconds"
+                    ) from None
+
+                state = status.get("state")
+                if state not in ACTIVE_STATES | TERMINAL_STATES:
+                    raise ValueError(f"Unknown transcription state: {state}")
+                yield status
+                if state in TERMINAL_STATES:
+                    return
+        finally:
+            self._untrack(transcription_id, queue)
+
+    async def wait(self, transcription_id: str, max_wait_seconds: float = 600) -> Dict[str, Any]:
+        """
+        Wait for a job to complete and return its result.
+
+        Raises:
+            TimeoutError: If the job doesn't finish in time
+            ValueError: If the job fails
+        """
+        statuses = self.watch(transcription_id, max_wait_seconds)
+        try:
+            async for status in statuses:
+                if status.get("state") == "failed":
+                    raise ValueError(f"Transcription failed: {status.get('error', 'Unknown error')}")
+                if status.get("state") == "completed":
+                    break
+        finally:
+            await statuses.aclose()
+        return await self.client.get_transcription_result(transcription_id)
+
+    def _untrack(self, transcription_id: str, queue: asyncio.Queue) -> None:
+        queues = self._watchers.get(transcription_id)
+        if queues is None:
+            return
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            del self._watchers[transcription_id]
+            self._last.pop(transcription_id, None)
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._watchers:
+            await asyncio.sleep(self.interval)
+            if not self._watchers:
+                break
+            await self.sweep()
+        self._task = None
+
+    async def sweep(self) -> bool:
+        """
+        Check every tracked job once and notify watchers of changes.
+
+        Returns:
+            Whether any job changed (the interval is reset if so,
+            otherwise backed off)
+        """
+        try:
+            statuses = await self.client.get_transcription_statuses(list(self._watchers))
+        except Exception as e:
+            logger.warning(f"Whisperflow status sweep failed: {e}")
+            statuses = {}
+        self.sweeps += 1
+
+        changed = False
+        for job_id, status in statuses.items():
+            key = _status_key(status)
+            previous = self._last.get(job_id)
+            if previous is not None and previous[0] == key:
+                continue
+            self._last[job_id] = (key, status)
+            changed = True
+            for queue in self._watchers.get(job_id, ()):
+                queue.put_nowait(status)
+
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return changed
+
+
+_pollers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str], WhisperflowJobPoller]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_job_poller(client) -> WhisperflowJobPoller:
+    """Poller shared by all clients for the same account on the running loop."""
+    loop = asyncio.get_running_loop()
+    pollers = _pollers.get(loop)
+    if pollers is None:
+        pollers = _pollers[loop] = {}
+    key = (client.base_url, client.api_key)
+    poller = pollers.get(key)
+    if poller is None:
+        poller = pollers[key] = WhisperflowJobPoller(client)
+    return poller
@@ -9,6 +9,8 @@ import os
 
 from app.config import settings
 from app.database import init_db, close_db
+from app.http_clients import close_http_clients
+from app.services.llm_accounting import flush_llm_usage
 from app.middleware import AuthMiddleware
 from app.api import (
     auth_router,
@@ -51,6 +53,8 @@ from app.api.logo_scraper import router as logo_scraper_router
 from app.api.settings import router as settings_router
 from app.api.help import router as help_router
 from app.api.pipedrive_sync import router as pipedrive_sync_router
+from app.api.metrics import router as metrics_router
+from app.api.webhooks import router as webhooks_router
 
 
 # Initialize Sentry if configured
@@ -74,6 +78,8 @@ async def lifespan(app: FastAPI):
         print("⚠ Server will run in limited mode (upload UI available, but API endpoints disabled)")
     yield
     # Shutdown
+    await flush_llm_usage()
+    await close_http_clients()
     try:
         await close_db()
     except Exception:
@@ -147,6 +153,8 @@ app.include_router(logo_scraper_router, tags=["Logo Scraper"])
 app.include_router(settings_router, tags=["Settings"])
 app.include_router(help_router, tags=["Help"])
 app.include_router(pipedrive_sync_router, tags=["Pipedrive Sync"])
+app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
+app.include_router(webhooks_router, prefix="/webhooks", tags=["Webhooks"])
 
 
 @app.get("/health")
@@ -8,6 +8,7 @@ from app.models.meeting import (
     MeetingParticipant,
     Artifact,
     TranscriptChunk,
+    ChunkEmbedding,
     Summary,
     ActionItem,
     Decision,
@@ -17,7 +18,7 @@ from app.models.meeting import (
     MeetingEntity,
     Link,
 )
-from app.models.operational import ProcessingRun, ExternalRef, Integration
+from app.models.operational import ProcessingRun, ExternalRef, Integration, LLMCall
 
 __all__ = [
     "Base",
@@ -29,6 +30,7 @@ __all__ = [
     "MeetingParticipant",
     "Artifact",
     "TranscriptChunk",
+    "ChunkEmbedding",
     "Summary",
     "ActionItem",
     "Decision",
@@ -40,6 +42,7 @@ __all__ = [
     "ProcessingRun",
     "ExternalRef",
     "Integration",
+    "LLMCall",
 ]
 
 
@@ -4,7 +4,7 @@ from datetime import datetime, date
 from typing import Optional
 from sqlalchemy import (
     String, Text, ForeignKey, DateTime, Date, Float, Integer,
-    Boolean, Index, JSON
+    Boolean, Index, JSON, LargeBinary, UniqueConstraint, func
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -267,6 +267,39 @@ class TranscriptChunk(Base, UUIDMixin, TimestampMixin):
     )
 
 
+class ChunkEmbedding(Base, UUIDMixin):
+    """Embedding of a transcript chunk, stored quantized (see app.services.vector_index)."""
+    
+    __tablename__ = "chunk_embeddings"
+    
+    chunk_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("transcript_chunks.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    
+    org_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    meeting_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    
+    embedder: Mapped[str] = mapped_column(String(100), nullable=False)  # e.g. hashing-512
+    dtype: Mapped[str] = mapped_column(String(10), nullable=False)  # int8, float16
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    scale: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)  # int8 dequantization
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # sha256 of the chunk text
+    
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    
+    __table_args__ = (
+        UniqueConstraint("chunk_id", "embedder", name="uq_chunk_embeddings_chunk_embedder"),
+        Index("ix_chunk_embeddings_org_created", "org_id", "embedder", "created_at"),
+        Index("ix_chunk_embeddings_text_hash", "org_id", "embedder", "text_hash"),
+    )
+
+
 class Summary(Base, UUIDMixin, TimestampMixin):
     """Meeting summary."""
     
@@ -460,7 +493,7 @@ class Entity(Base, UUIDMixin, TimestampMixin):
     canonical_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
     __table_args__ = (
-        Index("ix_entities_org_kind_name", "org_id", "kind", "name"),
+        Index("ix_entities_org_kind_name", "org_id", "kind", "name", unique=True),
     )
 
 
@@ -2,7 +2,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, ForeignKey, DateTime, Index
+from sqlalchemy import String, Text, ForeignKey, DateTime, Index, Integer, Float, Boolean, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base, UUIDMixin, TimestampMixin
@@ -35,7 +35,7 @@ class ProcessingRun(Base, UUIDMixin, TimestampMixin):
     stage: Mapped[str] = mapped_column(
         String(100),
         nullable=False,
-    )  # ingest, transcribe, extract, sync_linear, sync_google_email, sync_google_calendar
+    )  # ingest, transcribe, extract, sync_linear, sync_google_email, sync_google_calendar, index_chunks
     
     status: Mapped[str] = mapped_column(
         String(50),
@@ -131,3 +131,47 @@ class Integration(Base, UUIDMixin, TimestampMixin):
         Index("ix_integrations_org_provider", "org_id", "provider", unique=True),
     )
 
+
+class LLMCall(Base, UUIDMixin):
+    """One chat completion call (or cache hit) with its tokens, cost and latency."""
+    
+    __tablename__ = "llm_calls"
+    
+    # No FK: calls are also made outside any org, and rows are kept after
+    # an org is deleted for spend reporting
+    org_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    
+    service: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+    )  # extraction, translation, automation, documents.analyzer, tasks.assistant, ...
+    
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Set when the org's daily budget switched the call to a cheaper model
+    requested_model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    queue_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # rate limiter wait
+    cache_hit: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="ok",
+    )  # ok, error
+    
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    
+    __table_args__ = (
+        Index("ix_llm_calls_created_at", "created_at"),
+        Index("ix_llm_calls_org_created", "org_id", "created_at"),
+        Index("ix_llm_calls_service_created", "service", "created_at"),
+    )
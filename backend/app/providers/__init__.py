@@ -1,18 +1,33 @@
 """Provider adapters for transcription and extraction."""
-from app.providers.base import TranscriptionProvider, TranscriptionResult, TranscriptionSegment
+from app.providers.base import (
+    IncompleteTranscription,
+    TranscriptionProvider,
+    TranscriptionResult,
+    TranscriptionSegment,
+    TranscriptionUpdate,
+)
+from app.providers.composite import CompositeProvider
 from app.providers.klang import KlangProvider
+from app.providers.local import LocalProvider
 from app.providers.mistral import MistralProvider
 from app.providers.openai_provider import OpenAIProvider
-from app.providers.factory import get_transcription_provider
+from app.providers.whisperflow import WhisperflowProvider
+from app.providers.factory import get_transcription_provider, transcription_provider_chain
 
 __all__ = [
+    "IncompleteTranscription",
     "TranscriptionProvider",
     "TranscriptionResult",
     "TranscriptionSegment",
+    "TranscriptionUpdate",
+    "CompositeProvider",
     "KlangProvider",
+    "LocalProvider",
     "MistralProvider",
     "OpenAIProvider",
+    "WhisperflowProvider",
     "get_transcription_provider",
+    "transcription_provider_chain",
 ]
 
 
@@ -1,7 +1,7 @@
 """Base transcription provider interface."""
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
 
 
 @dataclass
@@ -14,6 +14,17 @@ class TranscriptionSegment:
     confidence: Optional[float] = None
 
 
+def parse_segment(seg: dict) -> TranscriptionSegment:
+    """Segment from a provider's JSON segment object."""
+    return TranscriptionSegment(
+        start=seg.get("start", 0.0),
+        end=seg.get("end", 0.0),
+        text=seg.get("text", ""),
+        speaker=seg.get("speaker"),
+        confidence=seg.get("confidence"),
+    )
+
+
 @dataclass
 class TranscriptionResult:
     """Result of audio transcription."""
@@ -21,6 +32,22 @@ class TranscriptionResult:
     segments: list[TranscriptionSegment]
     duration: Optional[float] = None
     model: Optional[str] = None
+    provider: Optional[str] = None  # set when a composite provider picked one
+
+
+@dataclass
+class TranscriptionUpdate:
+    """Incremental output of a streaming transcription."""
+    segments: list[TranscriptionSegment] = field(default_factory=list)
+    language: Optional[str] = None
+    duration: Optional[float] = None
+    model: Optional[str] = None
+    provider: Optional[str] = None
+    final: bool = False
+
+
+class IncompleteTranscription(RuntimeError):
+    """A transcription stream ended before its final update."""
 
 
 class TranscriptionProvider(ABC):
@@ -44,6 +71,45 @@ class TranscriptionProvider(ABC):
         """
         pass
     
+    async def transcribe_stream(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> AsyncIterator[TranscriptionUpdate]:
+        """
+        Transcribe audio file, yielding segments as they become available.
+        
+        Providers without a streaming API use this buffered fallback,
+        which yields a single final update once transcription completes.
+        
+        Args:
+            file_url: URL to audio file (can be signed URL)
+            language_hint: Optional language hint (ISO 639-1 code)
+        
+        Yields:
+            TranscriptionUpdate batches; the last one has final=True.
+            Streams that end without it raise IncompleteTranscription.
+        """
+        result = await self.transcribe(file_url, language_hint)
+        yield TranscriptionUpdate(
+            segments=result.segments,
+            language=result.language,
+            duration=result.duration,
+            model=result.model,
+            provider=result.provider,
+            final=True,
+        )
+    
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether transcribe_stream yields segments before completion."""
+        return False
+    
+    @property
+    def accepts_local_files(self) -> bool:
+        """Whether file_url may be a local file path instead of a URL."""
+        return False
+    
     @property
     @abstractmethod
     def name(self) -> str:
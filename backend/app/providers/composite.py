@@ -0,0 +1,390 @@
+"""Composite transcription provider with failover and hedged requests."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from app.config import settings
+from app.providers.base import (
+    IncompleteTranscription,
+    TranscriptionProvider,
+    TranscriptionResult,
+    TranscriptionUpdate,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LATENCY_KEY = "metrics:provider_latency"
+
+# Samples kept per provider, and needed before the observed p95 is trusted
+WINDOW_SIZE = 500
+MIN_SAMPLES = 20
+
+# How long a process reuses a percentile read from Redis
+REFRESH_SECONDS = 30.0
+
+
+class ProviderLatencyStats:
+    """
+    Rolling latency samples per provider.
+
+    Samples are pushed to a capped Redis list so every worker contributes
+    to (and reads) the same window; if Redis is unavailable an in-process
+    window is used.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, window: int = WINDOW_SIZE):
+        self.window = window
+        self.redis_url = redis_url if redis_url is not None else settings.redis_url
+        self._redis = None
+        self._local: dict[str, deque] = {}
+        self._cached: dict[str, tuple[float, list[float]]] = {}
+
+    def _get_redis(self):
+        if self._redis is None and self.redis_url:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    async def record(self, provider: str, seconds: float, ok: bool = True, censored: bool = False) -> None:
+        """
+        Record one call. Failed calls are counted but not used as latency.
+
+        A censored call was cancelled (it lost a hedge race) after running
+        for seconds; its latency is at least that, so it is kept as a
+        sample. Dropping it would leave only the fast calls in the window
+        and ratchet the p95 down.
+        """
+        if ok:
+            self._local.setdefault(provider, deque(maxlen=self.window)).append(seconds)
+        try:
+            client = self._get_redis()
+            if client is None:
+                return
+            pipe = client.pipeline(transaction=False)
+            if ok:
+                pipe.lpush(f"{LATENCY_KEY}:{provider}", round(seconds, 3))
+                pipe.ltrim(f"{LATENCY_KEY}:{provider}", 0, self.window - 1)
+            outcome = "cancelled" if censored else "ok" if ok else "failed"
+            pipe.hincrby(f"{LATENCY_KEY}:{provider}:calls", outcome, 1)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Failed to record provider latency: {e}")
+
+    async def samples(self, provider: str) -> list[float]:
+        cached = self._cached.get(provider)
+        if cached and time.monotonic() - cached[0] < REFRESH_SECONDS:
+            return cached[1]
+        values = list(self._local.get(provider, ()))
+        try:
+            client = self._get_redis()
+            if client is not None:
+                raw = await client.lrange(f"{LATENCY_KEY}:{provider}", 0, -1)
+                if raw:
+                    values = [float(v) for v in raw]
+        except Exception as e:
+            logger.debug(f"Failed to read provider latency: {e}")
+        self._cached[provider] = (time.monotonic(), values)
+        return values
+
+    async def percentile(self, provider: str, q: float) -> Optional[float]:
+        """The q-quantile (0-1) of recent latencies, or None with too few samples."""
+        values = sorted(await self.samples(provider))
+        if len(values) < MIN_SAMPLES:
+            return None
+        idx = min(len(values) - 1, int(round(q * (len(values) - 1))))
+        return values[idx]
+
+    async def summary(self, providers: list[str]) -> dict[str, dict]:
+        result = {}
+        for name in providers:
+            values = sorted(await self.samples(name))
+            calls = {}
+            try:
+                client = self._get_redis()
+                if client is not None:
+                    calls = {
+                        (k.decode() if isinstance(k, bytes) else k): int(v)
+                        for k, v in (await client.hgetall(f"{LATENCY_KEY}:{name}:calls")).items()
+                    }
+            except Exception as e:
+                logger.debug(f"Failed to read provider call counts: {e}")
+            result[name] = {
+                "samples": len(values),
+                "p50": values[len(values) // 2] if values else None,
+                "p95": values[min(len(values) - 1, int(0.95 * len(values)))] if values else None,
+                "ok": calls.get("ok", 0),
+                "failed": calls.get("failed", 0),
+                "cancelled": calls.get("cancelled", 0),
+            }
+        return result
+
+
+_latency_stats: Optional[ProviderLatencyStats] = None
+
+
+def get_latency_stats() -> ProviderLatencyStats:
+    """Get or create the process-wide provider latency stats."""
+    global _latency_stats
+    if _latency_stats is None:
+        _latency_stats = ProviderLatencyStats()
+    return _latency_stats
+
+
+class AllProvidersFailed(RuntimeError):
+    """Every provider in the chain failed or timed out."""
+
+    def __init__(self, errors: list[tuple[str, Exception]]):
+        self.errors = errors
+        detail = "; ".join(f"{name}: {type(e).__name__}: {e}" for name, e in errors)
+        super().__init__(f"All transcription providers failed ({detail})")
+
+
+class CompositeProvider(TranscriptionProvider):
+    """
+    Tries providers in order, failing over on errors and timeouts.
+
+    In hedged mode, if the current provider has not answered within its
+    observed p95 latency, the next provider is started as well and the
+    first successful result wins; the other request is cancelled.
+
+    Streams get the same treatment up to their first update: the wait
+    for it is bounded by the provider's timeout (and hedged), after which
+    each gap between updates is bounded by the same timeout.
+    """
+
+    def __init__(
+        self,
+        providers: list[TranscriptionProvider],
+        timeouts: Optional[dict[str, float]] = None,
+        default_timeout: Optional[float] = None,
+        hedge: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_default_seconds: Optional[float] = None,
+        stats: Optional[ProviderLatencyStats] = None,
+    ):
+        if not providers:
+            raise ValueError("CompositeProvider needs at least one provider")
+        self.providers = providers
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout or settings.transcription_timeout_seconds
+        self.hedge = settings.transcription_hedging if hedge is None else hedge
+        self.hedge_percentile = hedge_percentile or settings.transcription_hedge_percentile
+        self.hedge_default_seconds = hedge_default_seconds or settings.transcription_hedge_default_seconds
+        self.stats = stats or get_latency_stats()
+
+    @property
+    def name(self) -> str:
+        # Results record the provider that actually served them
+        return self.providers[0].name
+
+    @property
+    def supports_speaker_diarization(self) -> bool:
+        return self.providers[0].supports_speaker_diarization
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.providers[0].supports_streaming
+
+    @property
+    def accepts_local_files(self) -> bool:
+        return all(p.accepts_local_files for p in self.providers)
+
+    def timeout_for(self, provider: TranscriptionProvider) -> float:
+        return self.timeouts.get(provider.name, self.default_timeout)
+
+    async def hedge_delay(self, provider: TranscriptionProvider) -> float:
+        """Seconds to wait before starting a hedge request."""
+        observed = await self.stats.percentile(provider.name, self.hedge_percentile)
+        delay = observed if observed is not None else self.hedge_default_seconds
+        return min(delay, self.timeout_for(provider))
+
+    async def _attempt(
+        self,
+        provider: TranscriptionProvider,
+        file_url: str,
+        language_hint: Optional[str],
+    ) -> TranscriptionResult:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                provider.transcribe(file_url, language_hint),
+                timeout=self.timeout_for(provider),
+            )
+        except asyncio.CancelledError:
+            await self.stats.record(provider.name, time.perf_counter() - started, censored=True)
+            raise
+        except Exception:
+            await self.stats.record(provider.name, time.perf_counter() - started, ok=False)
+            raise
+        await self.stats.record(provider.name, time.perf_counter() - started)
+        result.provider = result.provider or provider.name
+        return result
+
+    async def _hedged(
+        self,
+        primary: TranscriptionProvider,
+        backup: TranscriptionProvider,
+        attempt: Callable[[TranscriptionProvider], Awaitable[T]],
+        errors: list[tuple[str, Exception]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> tuple[Optional[T], bool]:
+        """
+        Race attempt(primary) against a delayed attempt(backup).
+
+        discard releases a successful result that lost the race.
+
+        Returns:
+            (result or None if every started attempt failed,
+             whether the backup was started)
+        """
+        tasks = {asyncio.create_task(attempt(primary)): primary}
+        done, _ = await asyncio.wait(tasks, timeout=await self.hedge_delay(primary))
+        if done:
+            task = done.pop()
+            if task.exception() is None:
+                return task.result(), False
+            errors.append((primary.name, task.exception()))
+            return None, False
+
+        logger.info(f"Hedging slow {primary.name} transcription with {backup.name}")
+        tasks[asyncio.create_task(attempt(backup))] = backup
+        pending = set(tasks)
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append((tasks[task].name, task.exception()))
+                    elif winner is None:
+                        winner = task
+                    elif discard is not None:
+                        await discard(task.result())
+            return (winner.result() if winner else None), True
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def transcribe(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> TranscriptionResult:
+        """Transcribe with the first provider that succeeds."""
+        errors: list[tuple[str, Exception]] = []
+        remaining = list(self.providers)
+
+        while remaining:
+            provider = remaining.pop(0)
+            if self.hedge and remaining:
+                result, backup_used = await self._hedged(
+                    provider,
+                    remaining[0],
+                    lambda p: self._attempt(p, file_url, language_hint),
+                    errors,
+                )
+                if backup_used:
+                    remaining.pop(0)
+                if result is not None:
+                    return result
+                continue
+
+            try:
+                return await self._attempt(provider, file_url, language_hint)
+            except Exception as e:
+                errors.append((provider.name, e))
+                logger.warning(f"Transcription via {provider.name} failed, trying next provider: {type(e).__name__}: {e}")
+
+        raise AllProvidersFailed(errors)
+
+    async def _open_stream(
+        self,
+        provider: TranscriptionProvider,
+        file_url: str,
+        language_hint: Optional[str],
+    ) -> tuple[TranscriptionProvider, AsyncIterator[TranscriptionUpdate], TranscriptionUpdate, float]:
+        """Start provider's stream and wait (bounded) for its first update."""
+        started = time.perf_counter()
+        stream = provider.transcribe_stream(file_url, language_hint)
+        try:
+            first = await asyncio.wait_for(stream.__anext__(), timeout=self.timeout_for(provider))
+        except StopAsyncIteration:
+            await self.stats.record(provider.name, time.perf_counter() - started, ok=False)
+            raise IncompleteTranscription(f"{provider.name} stream ended without updates")
+        except asyncio.CancelledError:
+            await stream.aclose()
+            await self.stats.record(provider.name, time.perf_counter() - started, censored=True)
+            raise
+        except Exception:
+            await stream.aclose()
+            await self.stats.record(provider.name, time.perf_counter() - started, ok=False)
+            raise
+        first.provider = first.provider or provider.name
+        return provider, stream, first, started
+
+    @staticmethod
+    async def _close_stream(opened) -> None:
+        await opened[1].aclose()
+
+    async def transcribe_stream(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> AsyncIterator[TranscriptionUpdate]:
+        """
+        Stream from the first provider that works.
+
+        Until a provider's first update arrives, errors and timeouts fail
+        over (hedged like transcribe). After that, partial output has been
+        consumed, so an error, or a gap between updates longer than the
+        provider's timeout, propagates (the caller discards the partial
+        transcript and retries).
+        """
+        errors: list[tuple[str, Exception]] = []
+        remaining = list(self.providers)
+        opened = None
+
+        while remaining and opened is None:
+            provider = remaining.pop(0)
+            if self.hedge and remaining:
+                opened, backup_used = await self._hedged(
+                    provider,
+                    remaining[0],
+                    lambda p: self._open_stream(p, file_url, language_hint),
+                    errors,
+                    discard=self._close_stream,
+                )
+                if backup_used:
+                    remaining.pop(0)
+                continue
+
+            try:
+                opened = await self._open_stream(provider, file_url, language_hint)
+            except Exception as e:
+                errors.append((provider.name, e))
+                logger.warning(f"Streaming transcription via {provider.name} failed, trying next provider: {type(e).__name__}: {e}")
+
+        if opened is None:
+            raise AllProvidersFailed(errors)
+
+        provider, stream, update, started = opened
+        timeout = self.timeout_for(provider)
+        try:
+            yield update
+            while True:
+                try:
+                    update = await asyncio.wait_for(stream.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    await self.stats.record(provider.name, time.perf_counter() - started, ok=False)
+                    raise
+                update.provider = update.provider or provider.name
+                yield update
+        finally:
+            await stream.aclose()
+        await self.stats.record(provider.name, time.perf_counter() - started)
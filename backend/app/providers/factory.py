@@ -1,10 +1,39 @@
 """Provider factory."""
+import logging
 from typing import Optional
 from app.config import settings
 from app.providers.base import TranscriptionProvider
+from app.providers.composite import CompositeProvider
 from app.providers.klang import KlangProvider
+from app.providers.local import LocalProvider
 from app.providers.mistral import MistralProvider
 from app.providers.openai_provider import OpenAIProvider
+from app.providers.whisperflow import WhisperflowProvider
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = {
+    "klang": KlangProvider,
+    "mistral": MistralProvider,
+    "openai": OpenAIProvider,
+    "whisperflow": WhisperflowProvider,
+    "local": LocalProvider,
+}
+
+
+def transcription_provider_chain() -> list[str]:
+    """Configured provider names in failover order (primary first)."""
+    chain = [n.strip().lower() for n in settings.transcription_providers.split(",") if n.strip()]
+    return chain or [settings.default_transcription_provider.lower()]
+
+
+def _parse_timeouts(value: str) -> dict[str, float]:
+    timeouts = {}
+    for item in value.split(","):
+        name, _, seconds = item.partition(":")
+        if name.strip() and seconds.strip():
+            timeouts[name.strip().lower()] = float(seconds)
+    return timeouts
 
 
 def get_transcription_provider(
@@ -12,38 +41,52 @@ def get_transcription_provider(
 ) -> TranscriptionProvider:
     """
     Get transcription provider by name.
-    
+
+    Without a name, returns the configured TRANSCRIPTION_PROVIDERS chain as
+    a CompositeProvider (unconfigured providers are skipped), or the
+    default provider if no chain is set.
+
     Args:
-        provider_name: Provider name (klang, mistral, openai).
+        provider_name: Provider name (klang, mistral, openai, whisperflow, local).
                       Defaults to DEFAULT_TRANSCRIPTION_PROVIDER from config.
-    
+
     Returns:
         TranscriptionProvider instance
-    
+
     Raises:
         ValueError: If provider not found or not configured
     """
+    if provider_name is None and settings.transcription_providers.strip():
+        return _get_composite_provider()
+
     name = provider_name or settings.default_transcription_provider
-    
-    providers = {
-        "klang": KlangProvider,
-        "mistral": MistralProvider,
-        "openai": OpenAIProvider,
-    }
-    
-    provider_class = providers.get(name.lower())
+
+    provider_class = PROVIDERS.get(name.lower())
     if not provider_class:
         raise ValueError(
             f"Unknown transcription provider: {name}. "
-            f"Available: {', '.join(providers.keys())}"
+            f"Available: {', '.join(PROVIDERS.keys())}"
         )
-    
+
     try:
         return provider_class()
     except ValueError as e:
         raise ValueError(f"Provider {name} not configured: {e}") from e
 
 
+def _get_composite_provider() -> TranscriptionProvider:
+    providers = []
+    for name in transcription_provider_chain():
+        try:
+            providers.append(get_transcription_provider(name))
+        except ValueError as e:
+            logger.warning(f"Skipping transcription provider in chain: {e}")
 
-
-
+    if not providers:
+        raise ValueError(
+            f"No configured provider in TRANSCRIPTION_PROVIDERS={settings.transcription_providers}"
+        )
+    return CompositeProvider(
+        providers,
+        timeouts=_parse_timeouts(settings.transcription_provider_timeouts),
+    )
@@ -1,11 +1,14 @@
 """Klang transcription provider."""
-import httpx
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional
 from app.config import settings
+from app.http_clients import get_http_client
 from app.providers.base import (
+    IncompleteTranscription,
     TranscriptionProvider,
     TranscriptionResult,
-    TranscriptionSegment,
+    TranscriptionUpdate,
+    parse_segment,
 )
 
 
@@ -27,6 +30,16 @@ class KlangProvider(TranscriptionProvider):
     def supports_speaker_diarization(self) -> bool:
         return True
     
+    @property
+    def supports_streaming(self) -> bool:
+        return True
+    
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+    
     async def transcribe(
         self,
         file_url: str,
@@ -38,10 +51,7 @@ class KlangProvider(TranscriptionProvider):
         Note: This is a placeholder implementation.
         Adjust based on actual Klang API documentation.
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = self._headers()
         
         payload = {
             "audio_url": file_url,
@@ -51,28 +61,20 @@ class KlangProvider(TranscriptionProvider):
         if language_hint:
             payload["language"] = language_hint
         
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(
-                f"{self.api_url}/transcribe",
-                headers=headers,
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-        
+        client = get_http_client(self.api_url)
+        response = await client.post(
+            f"{self.api_url}/transcribe",
+            headers=headers,
+            json=payload,
+            timeout=300.0,
+        )
+        response.raise_for_status()
+        return self._parse_result(response.json(), language_hint)
+    
+    def _parse_result(self, data: dict, language_hint: Optional[str]) -> TranscriptionResult:
         # Parse Klang response format
         # Adjust based on actual API response structure
-        segments = []
-        for seg in data.get("segments", []):
-            segments.append(
-                TranscriptionSegment(
-                    start=seg.get("start", 0.0),
-                    end=seg.get("end", 0.0),
-                    text=seg.get("text", ""),
-                    speaker=seg.get("speaker"),
-                    confidence=seg.get("confidence"),
-                )
-            )
+        segments = [parse_segment(seg) for seg in data.get("segments", [])]
         
         return TranscriptionResult(
             language=data.get("language", language_hint or "en"),
@@ -80,8 +82,71 @@ class KlangProvider(TranscriptionProvider):
             duration=data.get("duration"),
             model=data.get("model", "klang-default"),
         )
-
-
-
-
-
+    
+    async def transcribe_stream(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> AsyncIterator[TranscriptionUpdate]:
+        """
+        Stream a Klang transcription as newline-delimited JSON.
+        
+        Each line is either {"segment": {...}} or a final
+        {"done": true, "language", "duration", "model"} record; a stream
+        that ends without it raises IncompleteTranscription. A plain
+        application/json response is parsed like transcribe() and yielded
+        as a single final update.
+        
+        Note: This is a placeholder implementation.
+        Adjust based on actual Klang API documentation.
+        """
+        payload = {
+            "audio_url": file_url,
+            "enable_diarization": True,
+            "stream": True,
+        }
+        
+        if language_hint:
+            payload["language"] = language_hint
+        
+        client = get_http_client(self.api_url)
+        async with client.stream(
+            "POST",
+            f"{self.api_url}/transcribe",
+            headers=self._headers(),
+            json=payload,
+            timeout=300.0,
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type.split(";")[0].strip() == "application/json":
+                await response.aread()
+                result = self._parse_result(response.json(), language_hint)
+                yield TranscriptionUpdate(
+                    segments=result.segments,
+                    language=result.language,
+                    duration=result.duration,
+                    model=result.model,
+                    final=True,
+                )
+                return
+            
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                
+                if data.get("segment"):
+                    yield TranscriptionUpdate(segments=[parse_segment(data["segment"])])
+                
+                if data.get("done"):
+                    yield TranscriptionUpdate(
+                        language=data.get("language", language_hint or "en"),
+                        duration=data.get("duration"),
+                        model=data.get("model", "klang-default"),
+                        final=True,
+                    )
+                    return
+        
+        # Dropped connection
+        raise IncompleteTranscription("Klang stream ended without a done record")
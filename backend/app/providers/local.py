@@ -0,0 +1,85 @@
+"""Deterministic local transcription provider (benchmarks and CI)."""
+import asyncio
+import hashlib
+import random
+from typing import Optional
+from app.config import settings
+from app.providers.base import (
+    TranscriptionProvider,
+    TranscriptionResult,
+    TranscriptionSegment,
+)
+
+SPEAKERS = ["Anna", "Erik", "Sofia", "Johan", "Maria"]
+VOCABULARY = (
+    "revenue pipeline runway hiring portfolio board budget quarter forecast customer "
+    "churn pricing roadmap launch partner investor valuation burn marketing product "
+    "team deadline review contract legal compliance sales growth metrics target"
+).split()
+
+SEGMENT_SECONDS = 20.0
+WORDS_PER_SEGMENT = 50
+
+
+class LocalProvider(TranscriptionProvider):
+    """
+    Synthesizes a transcript without any network call.
+
+    The transcript is seeded from the file URL, so the same file always
+    yields the same segments. Latency is simulated as
+    LOCAL_TRANSCRIPTION_LATENCY_MS plus LOCAL_TRANSCRIPTION_MS_PER_SEGMENT
+    per segment. Select it with DEFAULT_TRANSCRIPTION_PROVIDER=local.
+    """
+
+    def __init__(
+        self,
+        segments: Optional[int] = None,
+        latency_ms: Optional[float] = None,
+        ms_per_segment: Optional[float] = None,
+    ):
+        self.segments = segments if segments is not None else settings.local_transcription_segments
+        self.latency_ms = latency_ms if latency_ms is not None else settings.local_transcription_latency_ms
+        self.ms_per_segment = (
+            ms_per_segment if ms_per_segment is not None else settings.local_transcription_ms_per_segment
+        )
+
+    @property
+    def name(self) -> str:
+        return "local"
+
+    @property
+    def supports_speaker_diarization(self) -> bool:
+        return True
+
+    @property
+    def accepts_local_files(self) -> bool:
+        return True
+
+    async def transcribe(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> TranscriptionResult:
+        """Return a synthetic transcript derived from file_url."""
+        rng = random.Random(hashlib.sha256(file_url.encode("utf-8")).hexdigest())
+        segments = [
+            TranscriptionSegment(
+                start=i * SEGMENT_SECONDS,
+                end=(i + 1) * SEGMENT_SECONDS,
+                text=" ".join(rng.choice(VOCABULARY) for _ in range(WORDS_PER_SEGMENT)),
+                speaker=SPEAKERS[i % len(SPEAKERS)],
+                confidence=1.0,
+            )
+            for i in range(self.segments)
+        ]
+
+        delay_ms = self.latency_ms + self.ms_per_segment * self.segments
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        return TranscriptionResult(
+            language=language_hint or "en",
+            segments=segments,
+            duration=self.segments * SEGMENT_SECONDS,
+            model="local-synthetic",
+        )
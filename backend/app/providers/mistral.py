@@ -1,11 +1,14 @@
 """Mistral transcription provider."""
-import httpx
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional
 from app.config import settings
+from app.http_clients import get_http_client
 from app.providers.base import (
+    IncompleteTranscription,
     TranscriptionProvider,
     TranscriptionResult,
-    TranscriptionSegment,
+    TranscriptionUpdate,
+    parse_segment,
 )
 
 
@@ -23,6 +26,16 @@ class MistralProvider(TranscriptionProvider):
     def name(self) -> str:
         return "mistral"
     
+    @property
+    def supports_streaming(self) -> bool:
+        return True
+    
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+    
     async def transcribe(
         self,
         file_url: str,
@@ -34,10 +47,7 @@ class MistralProvider(TranscriptionProvider):
         Note: This is a placeholder implementation.
         Adjust based on actual Mistral API documentation.
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = self._headers()
         
         payload = {
             "audio_url": file_url,
@@ -46,28 +56,20 @@ class MistralProvider(TranscriptionProvider):
         if language_hint:
             payload["language"] = language_hint
         
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(
-                f"{self.api_url}/audio/transcriptions",
-                headers=headers,
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-        
+        client = get_http_client(self.api_url)
+        response = await client.post(
+            f"{self.api_url}/audio/transcriptions",
+            headers=headers,
+            json=payload,
+            timeout=300.0,
+        )
+        response.raise_for_status()
+        return self._parse_result(response.json(), language_hint)
+    
+    def _parse_result(self, data: dict, language_hint: Optional[str]) -> TranscriptionResult:
         # Parse Mistral response format
         # Adjust based on actual API response structure
-        segments = []
-        for seg in data.get("segments", []):
-            segments.append(
-                TranscriptionSegment(
-                    start=seg.get("start", 0.0),
-                    end=seg.get("end", 0.0),
-                    text=seg.get("text", ""),
-                    speaker=seg.get("speaker"),
-                    confidence=seg.get("confidence"),
-                )
-            )
+        segments = [parse_segment(seg) for seg in data.get("segments", [])]
         
         return TranscriptionResult(
             language=data.get("language", language_hint or "en"),
@@ -75,8 +77,84 @@ class MistralProvider(TranscriptionProvider):
             duration=data.get("duration"),
             model=data.get("model", "mistral-whisper"),
         )
-
-
-
-
-
+    
+    async def transcribe_stream(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> AsyncIterator[TranscriptionUpdate]:
+        """
+        Stream a Mistral transcription as server-sent events.
+        
+        Handles "transcription.language", "transcription.segment" and
+        "transcription.done" events; text deltas are ignored since
+        segments carry the same text with timestamps. A stream that ends
+        without "transcription.done" raises IncompleteTranscription. A
+        response that is not text/event-stream is parsed like transcribe()
+        and yielded as a single final update.
+        
+        Note: This is a placeholder implementation.
+        Adjust based on actual Mistral API documentation.
+        """
+        payload = {
+            "audio_url": file_url,
+            "stream": True,
+            "timestamp_granularities": ["segment"],
+        }
+        
+        if language_hint:
+            payload["language"] = language_hint
+        
+        language = language_hint
+        
+        client = get_http_client(self.api_url)
+        async with client.stream(
+            "POST",
+            f"{self.api_url}/audio/transcriptions",
+            headers={**self._headers(), "Accept": "text/event-stream"},
+            json=payload,
+            timeout=300.0,
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type.split(";")[0].strip() != "text/event-stream":
+                await response.aread()
+                result = self._parse_result(response.json(), language_hint)
+                yield TranscriptionUpdate(
+                    segments=result.segments,
+                    language=result.language,
+                    duration=result.duration,
+                    model=result.model,
+                    final=True,
+                )
+                return
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                body = line[len("data:"):].strip()
+                if not body or body == "[DONE]":
+                    continue
+                event = json.loads(body)
+                event_type = event.get("type")
+                
+                if event_type == "transcription.language":
+                    language = event.get("audio_language", language)
+                
+                elif event_type == "transcription.segment":
+                    yield TranscriptionUpdate(
+                        segments=[parse_segment(event)],
+                        language=language,
+                    )
+                
+                elif event_type == "transcription.done":
+                    yield TranscriptionUpdate(
+                        language=event.get("language") or language or "en",
+                        duration=(event.get("usage") or {}).get("prompt_audio_seconds"),
+                        model=event.get("model", "mistral-whisper"),
+                        final=True,
+                    )
+                    return
+        
+        # Dropped connection
+        raise IncompleteTranscription("Mistral stream ended without transcription.done")
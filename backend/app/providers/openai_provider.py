@@ -1,9 +1,10 @@
 """OpenAI transcription provider."""
+import os
 import tempfile
 from typing import Optional
-import httpx
 from openai import AsyncOpenAI
 from app.config import settings
+from app.http_clients import get_http_client
 from app.providers.base import (
     TranscriptionProvider,
     TranscriptionResult,
@@ -12,7 +13,12 @@ from app.providers.base import (
 
 
 class OpenAIProvider(TranscriptionProvider):
-    """OpenAI Whisper transcription provider."""
+    """
+    OpenAI Whisper transcription provider.
+    
+    The Whisper API only returns complete transcripts, so
+    transcribe_stream uses the buffered fallback from the base class.
+    """
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.openai_api_key
@@ -26,6 +32,10 @@ class OpenAIProvider(TranscriptionProvider):
     def name(self) -> str:
         return "openai"
     
+    @property
+    def accepts_local_files(self) -> bool:
+        return True
+    
     async def transcribe(
         self,
         file_url: str,
@@ -34,13 +44,16 @@ class OpenAIProvider(TranscriptionProvider):
         """
         Transcribe audio using OpenAI Whisper API.
         
-        Note: OpenAI requires file upload, so we download and re-upload.
+        Note: OpenAI requires file upload, so URLs are downloaded and
+        re-uploaded. Local file paths are uploaded directly.
         """
+        if os.path.isfile(file_url):
+            return await self._transcribe_file(file_url, language_hint)
+        
         # Download audio file
-        async with httpx.AsyncClient() as client:
-            response = await client.get(file_url, timeout=300.0)
-            response.raise_for_status()
-            audio_data = response.content
+        response = await get_http_client(file_url).get(file_url, timeout=300.0)
+        response.raise_for_status()
+        audio_data = response.content
         
         # Write to temporary file
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_file:
@@ -48,54 +61,56 @@ class OpenAIProvider(TranscriptionProvider):
             tmp_file_path = tmp_file.name
         
         try:
-            # Transcribe with timestamps
-            with open(tmp_file_path, "rb") as audio_file:
-                transcription = await self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="verbose_json",
-                    language=language_hint,
-                )
-            
-            # Parse segments
-            segments = []
-            if hasattr(transcription, "segments") and transcription.segments:
-                for seg in transcription.segments:
-                    segments.append(
-                        TranscriptionSegment(
-                            start=seg.get("start", 0.0),
-                            end=seg.get("end", 0.0),
-                            text=seg.get("text", ""),
-                            speaker=None,  # OpenAI doesn't provide diarization
-                            confidence=seg.get("avg_logprob"),
-                        )
-                    )
-            else:
-                # Fallback if no segments
+            return await self._transcribe_file(tmp_file_path, language_hint)
+        
+        finally:
+            # Clean up temp file
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
+    
+    async def _transcribe_file(
+        self,
+        path: str,
+        language_hint: Optional[str] = None,
+    ) -> TranscriptionResult:
+        """Upload a local audio file to the Whisper API."""
+        # Transcribe with timestamps
+        with open(path, "rb") as audio_file:
+            transcription = await self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file,
+                response_format="verbose_json",
+                language=language_hint,
+            )
+        
+        # Parse segments
+        segments = []
+        if hasattr(transcription, "segments") and transcription.segments:
+            for seg in transcription.segments:
                 segments.append(
                     TranscriptionSegment(
-                        start=0.0,
-                        end=0.0,
-                        text=transcription.text,
-                        speaker=None,
-                        confidence=None,
+                        start=seg.get("start", 0.0),
+                        end=seg.get("end", 0.0),
+                        text=seg.get("text", ""),
+                        speaker=None,  # OpenAI doesn't provide diarization
+                        confidence=seg.get("avg_logprob"),
                     )
                 )
-            
-            return TranscriptionResult(
-                language=getattr(transcription, "language", language_hint or "en"),
-                segments=segments,
-                duration=getattr(transcription, "duration", None),
-                model="whisper-1",
+        else:
+            # Fallback if no segments
+            segments.append(
+                TranscriptionSegment(
+                    start=0.0,
+                    end=0.0,
+                    text=transcription.text,
+                    speaker=None,
+                    confidence=None,
+                )
             )
         
-        finally:
-            # Clean up temp file
-            import os
-            if os.path.exists(tmp_file_path):
-                os.remove(tmp_file_path)
-
-
-
-
-
+        return TranscriptionResult(
+            language=getattr(transcription, "language", language_hint or "en"),
+            segments=segments,
+            duration=getattr(transcription, "duration", None),
+            model="whisper-1",
+        )
@@ -0,0 +1,138 @@
+"""Whisperflow transcription provider."""
+from typing import AsyncIterator, Optional
+from app.config import settings
+from app.integrations.whisperflow_client import WhisperflowClient
+from app.integrations.whisperflow_poller import get_job_poller
+from app.providers.base import (
+    TranscriptionProvider,
+    TranscriptionResult,
+    TranscriptionUpdate,
+    parse_segment,
+)
+
+
+def _parse_result(data: dict, language_hint: Optional[str] = None) -> TranscriptionResult:
+    return TranscriptionResult(
+        language=data.get("language", language_hint or "en"),
+        segments=[parse_segment(seg) for seg in data.get("segments", [])],
+        duration=data.get("duration"),
+        model=data.get("model", "whisperflow"),
+    )
+
+
+class WhisperflowProvider(TranscriptionProvider):
+    """Whisperflow transcription provider (asynchronous jobs)."""
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        max_wait_seconds: int = 3600,
+    ):
+        self.api_key = api_key or settings.whisperflow_api_key
+        self.api_url = api_url or settings.whisperflow_api_url
+        
+        if not self.api_key:
+            raise ValueError("Whisperflow API key not configured")
+        
+        self.client = WhisperflowClient(self.api_key, self.api_url)
+        self.max_wait_seconds = max_wait_seconds
+    
+    @property
+    def name(self) -> str:
+        return "whisperflow"
+    
+    @property
+    def supports_speaker_diarization(self) -> bool:
+        return True
+    
+    @property
+    def supports_streaming(self) -> bool:
+        return True
+    
+    async def submit(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+    ) -> str:
+        """
+        Start a Whisperflow job without waiting for it.
+        
+        Args:
+            file_url: URL to audio file
+            language_hint: Optional language hint
+            webhook_url: Called by Whisperflow when the job finishes
+        
+        Returns:
+            Transcription job ID
+        """
+        extra = {"webhook_url": webhook_url} if webhook_url else {}
+        job = await self.client.transcribe_audio(
+            audio_url=file_url,
+            language=language_hint or "en",
+            **extra,
+        )
+        return str(job["id"])
+    
+    async def fetch_result(
+        self,
+        transcription_id: str,
+        language_hint: Optional[str] = None,
+    ) -> TranscriptionResult:
+        """Result of a completed job."""
+        data = await self.client.get_transcription_result(transcription_id)
+        return _parse_result(data, language_hint)
+    
+    async def transcribe(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> TranscriptionResult:
+        """Transcribe audio using a Whisperflow job and wait for the result."""
+        transcription_id = await self.submit(file_url, language_hint)
+        poller = get_job_poller(self.client)
+        data = await poller.wait(transcription_id, self.max_wait_seconds)
+        return _parse_result(data, language_hint)
+    
+    async def transcribe_stream(
+        self,
+        file_url: str,
+        language_hint: Optional[str] = None,
+    ) -> AsyncIterator[TranscriptionUpdate]:
+        """
+        Follow a Whisperflow job, yielding segments as they are reported.
+        
+        Jobs that include partial "segments" in their status payload while
+        processing are streamed; otherwise all segments arrive with the
+        final result. Status comes from the shared job poller.
+        """
+        transcription_id = await self.submit(file_url, language_hint)
+        emitted = 0
+        
+        statuses = get_job_poller(self.client).watch(transcription_id, self.max_wait_seconds)
+        try:
+            async for status in statuses:
+                state = status.get("state")
+                if state == "failed":
+                    raise ValueError(f"Transcription failed: {status.get('error', 'Unknown error')}")
+                if state == "completed":
+                    break
+                partial = status.get("segments") or []
+                if len(partial) > emitted:
+                    yield TranscriptionUpdate(
+                        segments=[parse_segment(seg) for seg in partial[emitted:]],
+                        language=status.get("language"),
+                    )
+                    emitted = len(partial)
+        finally:
+            await statuses.aclose()
+        
+        result = await self.fetch_result(transcription_id, language_hint)
+        yield TranscriptionUpdate(
+            segments=result.segments[emitted:],
+            language=result.language,
+            duration=result.duration,
+            model=result.model,
+            final=True,
+        )
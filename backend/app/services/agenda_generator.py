@@ -3,9 +3,10 @@ import json
 from typing import Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
 
 from app.config import settings
+from app.services.llm_cache import with_llm_cache
+from app.services.llm_client import get_openai_client
 
 
 class AgendaTopic(BaseModel):
@@ -59,7 +60,7 @@ class AgendaGeneratorService:
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = with_llm_cache(get_openai_client(self.api_key, service="agenda"))
     
     async def generate_agenda(
         self,
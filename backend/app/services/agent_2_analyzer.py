@@ -10,10 +10,11 @@ from enum import Enum
 from datetime import datetime
 
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
 
 from app.config import settings
+from app.services.llm_cache import with_llm_cache
 from app.services.agent_1_extractor import ExtractionResult
+from app.services.llm_client import get_openai_client
 
 
 class DocumentClassification(str, Enum):
@@ -113,7 +114,7 @@ class AnalyzerAgent:
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = with_llm_cache(get_openai_client(self.api_key, service="documents.analyzer"))
         self.version = "1.0.0"
         self.model = "gpt-4o-2024-08-06"
     
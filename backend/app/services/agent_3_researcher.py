@@ -4,18 +4,23 @@ Purpose: Find corroborating public data to verify or enrich extracted informatio
 Rule: ONLY use approved sources - flag discrepancies
 """
 
+import asyncio
 import json
-from typing import Optional, Dict, Any, List
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Dict, Any, List
 from enum import Enum
 from datetime import datetime
+from urllib.parse import urlsplit
 import re
 
 from pydantic import BaseModel, Field
-import httpx
-from openai import AsyncOpenAI
 
 from app.config import settings
+from app.http_clients import get_http_client
 from app.services.agent_2_analyzer import AnalysisResult, MetricValue
+from app.services.llm_cache import MemoryCacheBackend
+from app.services.llm_client import get_openai_client
 
 
 class VerificationStatus(str, Enum):
@@ -64,6 +69,34 @@ class ResearchResult(BaseModel):
     researched_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+def normalize_query(query: str) -> str:
+    """Cache key for a search query: case, punctuation and word order ignored."""
+    return " ".join(sorted(set(re.findall(r"\w+", query.lower()))))
+
+
+class DomainLimiter:
+    """Per-domain politeness for requests to source sites: bounded concurrency and spacing."""
+    
+    def __init__(self, max_concurrent: int, min_interval_seconds: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval_seconds = min_interval_seconds
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a request slot for the URL's domain."""
+        domain = urlsplit(url).hostname or url
+        semaphore = self._slots.setdefault(domain, asyncio.Semaphore(self.max_concurrent))
+        async with semaphore:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(domain, 0.0))
+            self._next_start[domain] = start + self.min_interval_seconds
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
 class ResearcherAgent:
     """
     Agent 3: Researcher
@@ -88,10 +121,25 @@ class ResearcherAgent:
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.client = get_openai_client(self.api_key, service="documents.researcher")
         self.version = "1.0.0"
         
+        # Search backend (see _fetch_search_results)
+        self.search_endpoint = "https://www.googleapis.com/customsearch/v1"
+        
+        # Claims researched at once, politeness per source domain, and
+        # search results shared between claims (keyed by normalized query)
+        self.max_concurrent_claims = settings.research_max_concurrency
+        self.domain_limits = DomainLimiter(
+            settings.research_domain_concurrency,
+            settings.research_domain_interval_seconds,
+        )
+        self.search_cache = MemoryCacheBackend(
+            max_entries=settings.research_search_cache_max_entries,
+            ttl_seconds=settings.research_search_cache_ttl_seconds,
+        )
+        self._searches_in_flight: Dict[str, asyncio.Future] = {}
+        
         # Approved source domains
         self.approved_sources = {
             "crunchbase.com": SourceReliability.HIGH,
@@ -122,32 +170,36 @@ class ResearcherAgent:
         
         Returns:
             List of research results for each claim verified
-        """
         
-        research_results = []
+        Claims are researched concurrently (RESEARCH_MAX_CONCURRENCY);
+        searches are cached by query, and source links are checked under a
+        per-domain limit.
+        """
         
         # Identify key claims to verify
         claims_to_verify = self._prioritize_claims(analysis_result, max_claims_to_verify)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_claims))
         
-        for claim_info in claims_to_verify:
+        async def research(claim_info: Dict[str, str]) -> ResearchResult:
             try:
-                result = await self._research_single_claim(
-                    claim=claim_info["claim"],
-                    claim_source=claim_info["source"],
-                    company_name=company_name
-                )
-                research_results.append(result)
+                async with semaphore:
+                    return await self._research_single_claim(
+                        claim=claim_info["claim"],
+                        claim_source=claim_info["source"],
+                        company_name=company_name
+                    )
             except Exception as e:
                 # Log error but continue with other claims
                 print(f"Research error for claim '{claim_info['claim']}': {str(e)}")
-                research_results.append(ResearchResult(
+                return ResearchResult(
                     claim=claim_info["claim"],
                     claim_source=claim_info["source"],
                     verification_status=VerificationStatus.UNCERTAIN,
                     additional_context={"error": str(e)}
-                ))
+                )
         
-        return research_results
+        # Claims are independent; results keep priority order
+        return list(await asyncio.gather(*(research(c) for c in claims_to_verify)))
     
     def _prioritize_claims(
         self,
@@ -202,17 +254,19 @@ class ResearcherAgent:
         # Use LLM to generate search queries
         search_queries = await self._generate_search_queries(claim, company_name)
         
-        # Search for information
-        all_sources = []
-        for query in search_queries[:3]:  # Limit to 3 queries
-            sources = await self._search_web(query)
-            all_sources.extend(sources)
+        # Search for information (limit to 3 queries, run together)
+        results = await asyncio.gather(*(
+            self._search_web(query) for query in search_queries[:3]
+        ))
+        all_sources = [src for sources in results for src in sources]
         
-        # Filter to approved sources only
+        # Filter to approved sources only, dropping dead links
         approved_sources = [
             src for src in all_sources
             if self._is_approved_source(src.url)
         ]
+        live = await asyncio.gather(*(self._check_link(src.url) for src in approved_sources))
+        approved_sources = [src for src, ok in zip(approved_sources, live) if ok]
         
         # Analyze findings
         if not approved_sources:
@@ -276,27 +330,92 @@ Return ONLY the search queries, one per line."""
     
     async def _search_web(self, query: str) -> List[PublicSource]:
         """
-        Search web for information.
+        Search web for information, reusing recent results.
+        
+        Results are cached by normalized query for
+        RESEARCH_SEARCH_CACHE_TTL_SECONDS, so claims about the same
+        company share fetched sources; identical searches already in
+        flight are awaited instead of repeated.
+        """
+        key = normalize_query(query)
+        cached = await self.search_cache.get(key)
+        if cached is not None:
+            return [PublicSource.model_validate(src) for src in json.loads(cached)]
+        
+        pending = self._searches_in_flight.get(key)
+        if pending is not None:
+            try:
+                return list(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The search we were waiting on was cancelled; run our own
+        
+        future = asyncio.get_running_loop().create_future()
+        self._searches_in_flight[key] = future
+        try:
+            sources = await self._fetch_search_results(query)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(sources)
+            await self.search_cache.set(
+                key, json.dumps([src.model_dump(mode="json") for src in sources])
+            )
+            return sources
+        finally:
+            if self._searches_in_flight.get(key) is future:
+                del self._searches_in_flight[key]
+    
+    async def _fetch_search_results(self, query: str) -> List[PublicSource]:
+        """
+        Query the search backend.
         
         Note: This is a placeholder. In production, integrate with:
         - Google Custom Search API
         - Bing Search API
         - Or dedicated APIs (Crunchbase, etc.)
-        """
         
+        The search API call itself is governed by the API's quota; requests
+        to a source's own site go through _check_link.
+        """
         # TODO: Integrate with actual search API
         # For now, return empty to avoid fake data
         
         # Example structure (when real API is integrated):
-        # response = await self.http_client.get(
-        #     "https://api.search.com/search",
-        #     params={"q": query, "api_key": settings.search_api_key}
+        # response = await get_http_client(self.search_endpoint).get(
+        #     self.search_endpoint,
+        #     params={"q": query, "key": settings.search_api_key}
         # )
         # results = response.json()
         # return [self._parse_search_result(r) for r in results["items"]]
         
         return []
     
+    async def _check_link(self, url: str) -> bool:
+        """
+        Whether a source URL still resolves.
+        
+        Holds the domain's slot from self.domain_limits, so claims sharing a
+        source site don't hit it all at once. Only a 4xx answer marks the
+        link dead; network errors and 5xx keep the source (uncertain, not
+        disproven).
+        """
+        try:
+            async with self.domain_limits.slot(url):
+                async with get_http_client(url).stream(
+                    "GET", url, follow_redirects=True, timeout=10.0
+                ) as response:
+                    return not 400 <= response.status_code < 500
+        except Exception as e:
+            print(f"Link check failed for {url}: {str(e)}")
+            return True
+    
     def _is_approved_source(self, url: str) -> bool:
         """Check if URL is from an approved source."""
         
@@ -399,8 +518,8 @@ Return JSON:
         return result
     
     async def close(self):
-        """Close HTTP client."""
-        await self.http_client.aclose()
+        """Nothing to release; shared HTTP clients close with the app."""
+        pass
 
 
 # Singleton instance
@@ -10,11 +10,12 @@ from enum import Enum
 from datetime import datetime
 
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
 
 from app.config import settings
+from app.services.llm_cache import with_llm_cache
 from app.services.agent_2_analyzer import AnalysisResult
 from app.services.agent_3_researcher import ResearchResult, VerificationStatus
+from app.services.llm_client import get_openai_client
 
 
 class QuestionPriority(str, Enum):
@@ -81,7 +82,7 @@ class QuestionGeneratorAgent:
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = with_llm_cache(get_openai_client(self.api_key, service="documents.questions"))
         self.version = "1.0.0"
     
     async def generate_questions(
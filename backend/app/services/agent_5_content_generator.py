@@ -5,18 +5,19 @@ Rule: EVERY statement must be cited - distinguish document vs research vs analys
 """
 
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from enum import Enum
 from datetime import datetime
 
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
 import markdown
 
 from app.config import settings
+from app.services.llm_cache import with_llm_cache
 from app.services.agent_2_analyzer import AnalysisResult
 from app.services.agent_3_researcher import ResearchResult
 from app.services.agent_4_question_generator import QuestionSet
+from app.services.llm_client import get_openai_client, stream_text
 
 
 class ContentType(str, Enum):
@@ -78,12 +79,18 @@ class ContentGeneratorAgent:
     - Use professional, objective tone
     """
     
+    # Content types that can be streamed, with their request builders
+    STREAMING_CONTENT_TYPES = {
+        ContentType.DUE_DILIGENCE: "_due_diligence_request",
+        ContentType.INVESTMENT_MEMO: "_investment_memo_request",
+    }
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.openai_api_key
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = with_llm_cache(get_openai_client(self.api_key, service="documents.content"))
         self.version = "1.0.0"
     
     async def generate(
@@ -130,6 +137,47 @@ class ContentGeneratorAgent:
         else:
             content_md = await self._generate_generic_report(context, content_type)
         
+        return self.finalize(content_type, content_md, analysis_result, document_date)
+    
+    async def stream(
+        self,
+        content_type: ContentType,
+        analysis_result: AnalysisResult,
+        research_results: Optional[List[ResearchResult]] = None,
+        questions: Optional[QuestionSet] = None,
+        company_name: Optional[str] = None,
+        document_date: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the markdown of a report as it is generated.
+        
+        Supports the long reports (STREAMING_CONTENT_TYPES). Pass the
+        joined text to finalize() for the same GeneratedContent that
+        generate() returns.
+        """
+        
+        if content_type not in self.STREAMING_CONTENT_TYPES:
+            raise ValueError(f"Streaming not supported for {content_type.value}")
+        
+        context = self._build_context(
+            analysis_result, research_results, questions,
+            company_name, document_date
+        )
+        request = getattr(self, self.STREAMING_CONTENT_TYPES[content_type])(context)
+        
+        stream = await self.client.chat.completions.create(**request, stream=True)
+        async for delta in stream_text(stream):
+            yield delta
+    
+    def finalize(
+        self,
+        content_type: ContentType,
+        content_md: str,
+        analysis_result: AnalysisResult,
+        document_date: Optional[str] = None
+    ) -> GeneratedContent:
+        """Citations, quality metrics and HTML for generated markdown."""
+        
         # Parse citations
         citations = self._extract_citations(content_md)
         
@@ -233,6 +281,13 @@ class ContentGeneratorAgent:
     async def _generate_due_diligence(self, context: Dict[str, Any]) -> str:
         """Generate due diligence report."""
         
+        response = await self.client.chat.completions.create(**self._due_diligence_request(context))
+        
+        return response.choices[0].message.content
+    
+    def _due_diligence_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Completion request for the due diligence report."""
+        
         system_prompt = """You are a venture capital analyst writing a due diligence report.
 
 CRITICAL RULES:
@@ -289,7 +344,7 @@ STRUCTURE:
 
 Remember: Every claim must be cited. If data is missing, explicitly state "Not disclosed in provided materials"."""
 
-        response = await self.client.chat.completions.create(
+        return dict(
             model="gpt-4o-2024-08-06",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -298,8 +353,6 @@ Remember: Every claim must be cited. If data is missing, explicitly state "Not d
             temperature=0.2,
             max_tokens=4000
         )
-        
-        return response.choices[0].message.content
     
     async def _generate_swot(self, context: Dict[str, Any]) -> str:
         """Generate SWOT analysis."""
@@ -381,6 +434,13 @@ All claims cited."""
     async def _generate_investment_memo(self, context: Dict[str, Any]) -> str:
         """Generate investment committee memo."""
         
+        response = await self.client.chat.completions.create(**self._investment_memo_request(context))
+        
+        return response.choices[0].message.content
+    
+    def _investment_memo_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Completion request for the investment committee memo."""
+        
         system_prompt = """Generate investment memo for IC presentation.
 
 Structure:
@@ -395,7 +455,7 @@ Professional tone, all cited."""
 
         user_prompt = f"""Context: {json.dumps(context, indent=2)}"""
 
-        response = await self.client.chat.completions.create(
+        return dict(
             model="gpt-4o-2024-08-06",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -404,8 +464,6 @@ Professional tone, all cited."""
             temperature=0.2,
             max_tokens=3000
         )
-        
-        return response.choices[0].message.content
     
     async def _generate_risk_assessment(self, context: Dict[str, Any]) -> str:
         """Generate risk assessment report."""
@@ -450,7 +508,7 @@ Rules: Professional tone, all claims cited, include sources section."""
 
         user_prompt = f"""Context: {json.dumps(context, indent=2)}"""
 
-        response = await self.client.chat.completions.create(
+        return dict(
             model="gpt-4o-2024-08-06",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -459,8 +517,6 @@ Rules: Professional tone, all claims cited, include sources section."""
             temperature=0.2,
             max_tokens=3000
         )
-        
-        return response.choices[0].message.content
     
     def _extract_citations(self, content: str) -> List[Citation]:
         """Extract all citations from markdown content."""
@@ -10,17 +10,163 @@ Follows RETT/SAFE cultural principles:
 
 Uses existing 3-agent workflow for all operations (zero fabrication policy).
 """
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator, Awaitable, Callable
 from sqlalchemy.ext.asyncio import AsyncSession
-from openai import AsyncOpenAI
 from pydantic import BaseModel
+import asyncio
+import inspect
+import json
 import logging
 
+from app.config import settings
 from app.services.three_agent_workflow import ThreeAgentWorkflow
+from app.services.llm_cache import with_llm_cache
+from app.services.llm_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
 
+class BatchItemResult(BaseModel):
+    """Outcome of one record in a batch call (result or error, never both)."""
+    index: int  # Position in the input list
+    id: Optional[str] = None  # The record's "id", if it had one
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+# Called after every finished record with (done, total, item); may be async
+ProgressCallback = Callable[[int, int, BatchItemResult], Optional[Awaitable[None]]]
+
+
+def _string_list() -> Dict[str, Any]:
+    return {"type": "array", "items": {"type": "string"}}
+
+
+def _packed_schema(name: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict structured-output format: {"results": [{"index": n, **properties}]}."""
+    item = {
+        "type": "object",
+        "properties": {"index": {"type": "integer"}, **properties},
+        "required": ["index", *properties],
+        "additionalProperties": False
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"results": {"type": "array", "items": item}},
+                "required": ["results"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+SCREENING_SCHEMA = _packed_schema("candidate_screenings", {
+    "score": {"type": "integer"},
+    "strengths": _string_list(),
+    "concerns": _string_list(),
+    "culture_fit_indicators": _string_list(),
+    "recommendation": {"type": "string", "enum": ["interview", "pass", "maybe"]},
+    "reasoning": {"type": "string"}
+})
+
+LEAD_QUALIFICATION_SCHEMA = _packed_schema("lead_qualifications", {
+    "score": {"type": "integer"},
+    "meets_thesis": {"type": "boolean"},
+    "reasoning": {"type": "string"},
+    "key_strengths": _string_list(),
+    "key_concerns": _string_list(),
+    "next_steps": {"type": "string"}
+})
+
+
+def _packs(records: List[Dict[str, Any]], text: Callable[[Dict[str, Any]], str]) -> List[List[int]]:
+    """
+    Group record positions into packs for one request each.
+    
+    A pack holds at most AUTOMATION_BATCH_SIZE records and
+    AUTOMATION_BATCH_MAX_CHARS of record text; a longer record goes alone.
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    size = 0
+    for index, record in enumerate(records):
+        length = len(text(record))
+        if current and (
+            len(current) >= settings.automation_batch_size
+            or size + length > settings.automation_batch_max_chars
+        ):
+            packs.append(current)
+            current, size = [], 0
+        current.append(index)
+        size += length
+    if current:
+        packs.append(current)
+    return packs
+
+
+async def _stream_batch(
+    records: List[Dict[str, Any]],
+    packs: List[List[int]],
+    run_pack: Callable[[List[int]], Awaitable[Dict[int, Dict[str, Any]]]],
+    max_concurrency: Optional[int],
+    on_progress: Optional[ProgressCallback],
+) -> AsyncIterator[BatchItemResult]:
+    """
+    Run packs with bounded concurrency and yield results as they finish.
+    
+    run_pack returns {position: result} for a whole pack or raises. A
+    failed pack, or one whose results do not cover every record, is split
+    in half and retried, so one bad record only fails itself.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.automation_batch_concurrency))
+    
+    def item(index: int, result=None, error=None) -> BatchItemResult:
+        record_id = records[index].get("id")
+        return BatchItemResult(
+            index=index,
+            id=str(record_id) if record_id is not None else None,
+            result=result,
+            error=error
+        )
+    
+    async def run(pack: List[int]) -> None:
+        try:
+            async with semaphore:
+                results = await run_pack(pack)
+            missing = [index for index in pack if index not in results]
+            if missing:
+                raise ValueError(f"No result for record(s) {missing}")
+        except Exception as e:
+            if len(pack) > 1:
+                middle = len(pack) // 2
+                await asyncio.gather(run(pack[:middle]), run(pack[middle:]))
+                return
+            logger.warning("Batch record %s failed: %s", pack[0], e)
+            queue.put_nowait(item(pack[0], error=str(e)))
+            return
+        for index in pack:
+            queue.put_nowait(item(index, result=results[index]))
+    
+    tasks = [asyncio.create_task(run(pack)) for pack in packs]
+    try:
+        for done in range(1, len(records) + 1):
+            result = await queue.get()
+            if on_progress is not None:
+                outcome = on_progress(done, len(records), result)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 class AIAutomationEngine:
     """
     Central AI service for all automations across 4 wheels.
@@ -34,7 +180,7 @@ class AIAutomationEngine:
     
     def __init__(self, db: AsyncSession, openai_api_key: str):
         self.db = db
-        self.openai = AsyncOpenAI(api_key=openai_api_key)
+        self.openai = with_llm_cache(get_openai_client(openai_api_key, service="automation"))
         self.workflow = ThreeAgentWorkflow(db)
     
     # ========================================================================
@@ -408,6 +554,71 @@ class AIAutomationEngine:
         result = json.loads(response.choices[0].message.content)
         return result
     
+    async def batch_screen_candidates(
+        self,
+        candidates: List[Dict[str, Any]],
+        role_requirements: List[str],
+        company_culture: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Screen many candidates for one role, yielding results as they finish.
+        
+        Several resumes are scored per structured-output request (see
+        AUTOMATION_BATCH_SIZE / AUTOMATION_BATCH_MAX_CHARS); requests run
+        with bounded concurrency. Results arrive in completion order, so
+        use BatchItemResult.index (or .id) to match them to the input.
+        
+        Args:
+            candidates: Dicts with "resume_text" and optionally "id"
+            role_requirements: Required skills/experience
+            company_culture: Company's culture framework (e.g., "SAFE", "RETT")
+            max_concurrency: Requests in flight (default AUTOMATION_BATCH_CONCURRENCY)
+            on_progress: Called with (done, total, item) after each candidate
+        
+        Yields:
+            BatchItemResult whose result has the screen_candidate fields
+        """
+        
+        async def run_pack(pack: List[int]) -> Dict[int, Dict[str, Any]]:
+            resumes = "\n\n".join(
+                f"=== Candidate {index} ===\n{candidates[index].get('resume_text') or ''}"
+                for index in pack
+            )
+            prompt = f"""
+        Evaluate each candidate below against the role requirements,
+        independently of the other candidates.
+        
+        Role requirements: {role_requirements}
+        Company culture: {company_culture or 'Not specified'}
+        
+        Evaluation criteria (RETT/SAFE):
+        - RESULTAT: Look for concrete achievements, not just responsibilities
+        - ANSVAR: Evidence of ownership and follow-through
+        - TEAM: Collaboration indicators
+        - TYDLIGHET: Clear communication in resume
+        
+        For each candidate give a score (0-100), strengths and concerns with
+        SPECIFIC evidence from their resume, culture fit indicators, and a
+        recommendation (interview/pass/maybe) with reasoning.
+        
+        Be honest but fair. Use evidence only.
+        Return one result per candidate, with "index" set to the candidate number.
+        
+        {resumes}
+        """
+            return await self._packed_request(
+                system="You are an expert recruiter. Evaluate candidates fairly using only evidence from their resume. No assumptions or biases.",
+                prompt=prompt,
+                response_format=SCREENING_SCHEMA,
+                pack=pack
+            )
+        
+        packs = _packs(candidates, lambda candidate: candidate.get("resume_text") or "")
+        async for result in _stream_batch(candidates, packs, run_pack, max_concurrency, on_progress):
+            yield result
+    
     # ========================================================================
     # DEALFLOW WHEEL AI
     # ========================================================================
@@ -477,6 +688,75 @@ class AIAutomationEngine:
         result = json.loads(response.choices[0].message.content)
         return result
     
+    async def batch_qualify_leads(
+        self,
+        leads: List[Dict[str, Any]],
+        investment_thesis: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Score many leads against the thesis, yielding results as they finish.
+        
+        Packs several leads per structured-output request like
+        batch_screen_candidates.
+        
+        Args:
+            leads: company_data dicts as for qualify_lead, optionally with "id"
+            investment_thesis: DV's criteria
+            max_concurrency: Requests in flight (default AUTOMATION_BATCH_CONCURRENCY)
+            on_progress: Called with (done, total, item) after each lead
+        
+        Yields:
+            BatchItemResult whose result has the qualify_lead fields
+        """
+        
+        def describe(lead: Dict[str, Any]) -> str:
+            return (
+                f"Company: {lead.get('company_name')}\n"
+                f"Stage: {lead.get('company_stage')}\n"
+                f"Market: {lead.get('one_liner')}"
+            )
+        
+        async def run_pack(pack: List[int]) -> Dict[int, Dict[str, Any]]:
+            companies = "\n\n".join(
+                f"=== Lead {index} ===\n{describe(leads[index])}"
+                for index in pack
+            )
+            prompt = f"""
+        Evaluate each lead below against DV investment thesis,
+        independently of the other leads.
+        
+        DV Thesis: {investment_thesis}
+        
+        Evaluation framework (RETT):
+        - RESULTAT: Do they have traction/results?
+        - TEAM: Quality of founders and team
+        - TYDLIGHET: Clear value proposition and business model
+        - Market fit: TAM, timing, competition
+        
+        Score 0-100:
+        - Stage fit (0-25): Seed/Series A match
+        - Sector fit (0-25): B2B SaaS, fintech, etc.
+        - Traction (0-25): Real results, not just plans
+        - Team (0-25): Founder quality and completeness
+        
+        Be specific. Use evidence only.
+        Return one result per lead, with "index" set to the lead number.
+        
+        {companies}
+        """
+            return await self._packed_request(
+                system="You are a VC investment analyst. Evaluate startups rigorously using evidence and frameworks.",
+                prompt=prompt,
+                response_format=LEAD_QUALIFICATION_SCHEMA,
+                pack=pack
+            )
+        
+        packs = _packs(leads, describe)
+        async for result in _stream_batch(leads, packs, run_pack, max_concurrency, on_progress):
+            yield result
+    
     async def research_company(
         self,
         company_name: str,
@@ -756,6 +1036,38 @@ class AIAutomationEngine:
         result = json.loads(response.choices[0].message.content)
         return result
     
+    async def batch_calculate_qualification_scores(
+        self,
+        companies: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Run calculate_qualification_score for many companies.
+        
+        Each company has its own criteria and metrics, so there is one
+        request per company; requests run with bounded concurrency and
+        results are yielded as they finish.
+        
+        Args:
+            companies: Dicts with portfolio_company_id, criteria and
+                current_metrics (and optionally "id")
+            max_concurrency: Requests in flight (default AUTOMATION_BATCH_CONCURRENCY)
+            on_progress: Called with (done, total, item) after each company
+        """
+        
+        async def run_pack(pack: List[int]) -> Dict[int, Dict[str, Any]]:
+            company = companies[pack[0]]
+            return {pack[0]: await self.calculate_qualification_score(
+                portfolio_company_id=company.get("portfolio_company_id"),
+                criteria=company.get("criteria") or [],
+                current_metrics=company.get("current_metrics") or {}
+            )}
+        
+        packs = [[index] for index in range(len(companies))]
+        async for result in _stream_batch(companies, packs, run_pack, max_concurrency, on_progress):
+            yield result
+    
     async def generate_ceo_recommendations(
         self,
         company_data: Dict[str, Any],
@@ -1015,6 +1327,33 @@ class AIAutomationEngine:
         import json
         result = json.loads(response.choices[0].message.content)
         return result
+    
+    async def _packed_request(
+        self,
+        system: str,
+        prompt: str,
+        response_format: Dict[str, Any],
+        pack: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """One structured-output request for a pack; results keyed by "index"."""
+        response = await self.openai.chat.completions.create(
+            model="gpt-4o",
+            messages=[{
+                "role": "system",
+                "content": system
+            }, {
+                "role": "user",
+                "content": prompt
+            }],
+            response_format=response_format
+        )
+        
+        results = {}
+        for result in json.loads(response.choices[0].message.content).get("results", []):
+            index = result.pop("index", None)
+            if index in pack:
+                results[index] = result
+        return results
 
 
 # ============================================================================
@@ -0,0 +1,241 @@
+"""Content-addressed reuse of previously processed artifacts.
+
+When the same file (same sha256) is uploaded again in an org, the
+transcript and extracted intelligence of the earlier, completed artifact
+are copied into the new meeting instead of calling the transcription
+provider and the LLM again.
+"""
+import uuid
+from typing import Optional
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    ActionItem, Artifact, Decision, MeetingEntity, MeetingTag,
+    Summary, TranscriptChunk,
+)
+
+
+async def find_reusable_artifact(
+    db: AsyncSession,
+    artifact: Artifact,
+    provider_name: Optional[str] = None,
+) -> Optional[Artifact]:
+    """
+    Find an earlier completed artifact with identical content.
+
+    Matches on org, sha256 and file type. Audio must also match the
+    transcription provider and, if the new upload has a language hint,
+    the language. Artifacts of the same meeting are never matched: their
+    transcript and intelligence are already in it, and cloning would
+    duplicate them.
+
+    Returns:
+        The most recent matching artifact that has transcript chunks,
+        or None
+    """
+    if not artifact.sha256:
+        return None
+
+    has_chunks = (
+        select(TranscriptChunk.id)
+        .where(TranscriptChunk.artifact_id == Artifact.id)
+        .exists()
+    )
+
+    query = (
+        select(Artifact)
+        .where(Artifact.org_id == artifact.org_id)
+        .where(Artifact.sha256 == artifact.sha256)
+        .where(Artifact.file_type == artifact.file_type)
+        .where(Artifact.id != artifact.id)
+        .where(Artifact.meeting_id.is_not(None))
+        .where(Artifact.meeting_id != artifact.meeting_id)
+        .where(Artifact.transcription_status == "completed")
+        .where(has_chunks)
+        .order_by(Artifact.created_at.desc())
+        .limit(1)
+    )
+
+    if artifact.file_type != "docx":
+        if provider_name:
+            query = query.where(Artifact.transcription_provider == provider_name)
+        if artifact.language:
+            query = query.where(Artifact.language == artifact.language)
+
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
+async def clone_transcript(
+    db: AsyncSession,
+    source: Artifact,
+    target: Artifact,
+) -> int:
+    """
+    Copy the source artifact's transcript chunks onto the target.
+
+    Also copies the artifact-level transcription fields. Runs as a single
+    INSERT ... SELECT. Does not commit.
+
+    Returns:
+        Number of chunks copied
+    """
+    columns = [
+        TranscriptChunk.id, TranscriptChunk.org_id, TranscriptChunk.meeting_id,
+        TranscriptChunk.artifact_id, TranscriptChunk.sequence, TranscriptChunk.speaker,
+        TranscriptChunk.text, TranscriptChunk.start_time, TranscriptChunk.end_time,
+        TranscriptChunk.confidence, TranscriptChunk.language,
+    ]
+    rows = (
+        select(
+            func.gen_random_uuid(),
+            literal(target.org_id),
+            literal(target.meeting_id),
+            literal(target.id),
+            TranscriptChunk.sequence,
+            TranscriptChunk.speaker,
+            TranscriptChunk.text,
+            TranscriptChunk.start_time,
+            TranscriptChunk.end_time,
+            TranscriptChunk.confidence,
+            TranscriptChunk.language,
+        )
+        .where(TranscriptChunk.artifact_id == source.id)
+    )
+    result = await db.execute(
+        pg_insert(TranscriptChunk).from_select([c.key for c in columns], rows)
+    )
+
+    target.content_text = source.content_text
+    target.language = source.language
+    target.duration_seconds = source.duration_seconds
+    target.transcription_provider = source.transcription_provider
+    target.transcription_status = "completed"
+
+    return result.rowcount or 0
+
+
+async def clone_intelligence(
+    db: AsyncSession,
+    source_meeting_id: uuid.UUID,
+    target_meeting_id: uuid.UUID,
+    org_id: uuid.UUID,
+    source_artifact_id: uuid.UUID,
+    target_artifact_id: uuid.UUID,
+) -> Optional[dict[str, int]]:
+    """
+    Copy summary, decisions, action items, tags and entities between meetings.
+
+    Source chunk references are remapped to the chunks cloned from the
+    source artifact onto the target artifact, by sequence, so transcripts
+    must be cloned first. Does not commit.
+
+    Returns:
+        Row counts per table, or None if the source has no completed
+        extraction (no summary)
+    """
+    has_summary = await db.execute(
+        select(Summary.id).where(Summary.meeting_id == source_meeting_id).limit(1)
+    )
+    if has_summary.scalar_one_or_none() is None:
+        return None
+
+    # source chunk id -> target chunk id, matched on sequence within the
+    # cloned artifact (a meeting can hold several artifacts' chunks)
+    src = TranscriptChunk.__table__.alias("src")
+    dst = TranscriptChunk.__table__.alias("dst")
+    chunk_map = dict((await db.execute(
+        select(src.c.id, dst.c.id)
+        .join(dst, dst.c.sequence == src.c.sequence)
+        .where(src.c.meeting_id == source_meeting_id)
+        .where(src.c.artifact_id == source_artifact_id)
+        .where(dst.c.meeting_id == target_meeting_id)
+        .where(dst.c.artifact_id == target_artifact_id)
+    )).all())
+
+    counts = {}
+
+    summaries = (await db.execute(
+        select(Summary).where(Summary.meeting_id == source_meeting_id)
+    )).scalars().all()
+    for summary in summaries:
+        db.add(Summary(
+            org_id=org_id,
+            meeting_id=target_meeting_id,
+            summary_type=summary.summary_type,
+            content_md=summary.content_md,
+            model=summary.model,
+            prompt_tokens=summary.prompt_tokens,
+            completion_tokens=summary.completion_tokens,
+        ))
+    counts["summaries"] = len(summaries)
+
+    decisions = (await db.execute(
+        select(Decision).where(Decision.meeting_id == source_meeting_id)
+    )).scalars().all()
+    if decisions:
+        await db.execute(pg_insert(Decision).values([
+            {
+                "id": uuid.uuid4(),
+                "org_id": org_id,
+                "meeting_id": target_meeting_id,
+                "decision": d.decision,
+                "rationale": d.rationale,
+                "source_chunk_id": chunk_map.get(d.source_chunk_id),
+                "source_quote": d.source_quote,
+                "confidence": d.confidence,
+            }
+            for d in decisions
+        ]))
+    counts["decisions"] = len(decisions)
+
+    # Action item status is per meeting; copies start open again
+    actions = (await db.execute(
+        select(ActionItem).where(ActionItem.meeting_id == source_meeting_id)
+    )).scalars().all()
+    if actions:
+        await db.execute(pg_insert(ActionItem).values([
+            {
+                "id": uuid.uuid4(),
+                "org_id": org_id,
+                "meeting_id": target_meeting_id,
+                "title": a.title,
+                "description": a.description,
+                "owner_name": a.owner_name,
+                "owner_email": a.owner_email,
+                "status": "open",
+                "due_date": a.due_date,
+                "priority": a.priority,
+                "source_chunk_id": chunk_map.get(a.source_chunk_id),
+                "source_quote": a.source_quote,
+                "confidence": a.confidence,
+            }
+            for a in actions
+        ]))
+    counts["action_items"] = len(actions)
+
+    tag_rows = select(
+        func.gen_random_uuid(), literal(target_meeting_id), MeetingTag.tag_id,
+    ).where(MeetingTag.meeting_id == source_meeting_id)
+    result = await db.execute(
+        pg_insert(MeetingTag)
+        .from_select(["id", "meeting_id", "tag_id"], tag_rows)
+        .on_conflict_do_nothing(index_elements=[MeetingTag.meeting_id, MeetingTag.tag_id])
+    )
+    counts["tags"] = result.rowcount or 0
+
+    entity_rows = select(
+        func.gen_random_uuid(), literal(target_meeting_id),
+        MeetingEntity.entity_id, MeetingEntity.mention_count,
+    ).where(MeetingEntity.meeting_id == source_meeting_id)
+    result = await db.execute(
+        pg_insert(MeetingEntity)
+        .from_select(["id", "meeting_id", "entity_id", "mention_count"], entity_rows)
+        .on_conflict_do_nothing(index_elements=[MeetingEntity.meeting_id, MeetingEntity.entity_id])
+    )
+    counts["entities"] = result.rowcount or 0
+
+    return counts
@@ -0,0 +1,339 @@
+"""Audio preprocessing and parallel chunked transcription.
+
+Long recordings are normalized to 16 kHz mono, long silences are
+shortened, and the result is split at silence boundaries into pieces of
+roughly ``audio_chunk_minutes``. Pieces overlap slightly so speakers can
+be matched across the cut; they are transcribed concurrently and the
+segments are stitched back onto the original timeline.
+"""
+import asyncio
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+
+from app.config import settings
+from app.providers.base import (
+    TranscriptionProvider,
+    TranscriptionResult,
+    TranscriptionSegment,
+)
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Silence detection step; 1 ms (pydub's default) is needlessly slow on hours of audio
+SILENCE_SEEK_MS = 20
+
+
+class TimeMap:
+    """
+    Maps times on the silence-trimmed timeline back to the original.
+
+    Built from the kept spans of the original audio, in order.
+    """
+
+    def __init__(self, kept_spans: list[tuple[float, float]]):
+        self.original_starts: list[float] = []
+        self.processed_starts: list[float] = []
+        self.lengths: list[float] = []
+        position = 0.0
+        for start, end in kept_spans:
+            if end <= start:
+                continue
+            self.original_starts.append(start)
+            self.processed_starts.append(position)
+            self.lengths.append(end - start)
+            position += end - start
+        self.duration = position
+
+    def to_original(self, seconds: float) -> float:
+        if not self.processed_starts:
+            return seconds
+        idx = max(0, bisect_right(self.processed_starts, seconds) - 1)
+        offset = min(seconds - self.processed_starts[idx], self.lengths[idx])
+        return self.original_starts[idx] + max(0.0, offset)
+
+    def to_processed(self, seconds: float) -> float:
+        """Processed time of an original instant (removed gaps collapse to a point)."""
+        if not self.original_starts:
+            return seconds
+        idx = max(0, bisect_right(self.original_starts, seconds) - 1)
+        offset = min(max(0.0, seconds - self.original_starts[idx]), self.lengths[idx])
+        return self.processed_starts[idx] + offset
+
+
+@dataclass
+class AudioPiece:
+    """A slice of the processed audio. Times are on the processed timeline."""
+    index: int
+    path: str
+    audio_start: float
+    audio_end: float
+    # Region this piece is authoritative for (excludes the overlap)
+    core_start: float
+    core_end: float
+
+
+@dataclass
+class PreparedAudio:
+    pieces: list[AudioPiece]
+    time_map: TimeMap
+    duration: float
+    trimmed_seconds: float = 0.0
+
+
+def choose_cut_points(
+    total: float,
+    candidates: list[float],
+    target: float,
+    tolerance: float = 0.25,
+) -> list[float]:
+    """
+    Pick cut points roughly every ``target`` seconds.
+
+    Each cut is the candidate (silence midpoint) closest to the ideal
+    position within +/- tolerance * target, or a hard cut at the ideal
+    position if there is none.
+    """
+    candidates = sorted(candidates)
+    cuts = []
+    start = 0.0
+    while total - start > target * (1 + tolerance):
+        ideal = start + target
+        lo = bisect_left(candidates, start + target * (1 - tolerance))
+        hi = bisect_right(candidates, start + target * (1 + tolerance))
+        window = candidates[lo:hi]
+        cut = min(window, key=lambda c: abs(c - ideal)) if window else ideal
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def prepare_audio(
+    path: str,
+    out_dir: str,
+    piece_seconds: Optional[float] = None,
+    overlap_seconds: Optional[float] = None,
+    max_silence_ms: Optional[int] = None,
+    split_silence_ms: int = 400,
+    silence_offset_db: Optional[float] = None,
+) -> PreparedAudio:
+    """
+    Normalize, trim and split an audio file into pieces (CPU bound).
+
+    Silences longer than max_silence_ms are shortened to max_silence_ms.
+    Pieces are written as 16 kHz mono WAV files in out_dir.
+    """
+    piece_seconds = piece_seconds or settings.audio_chunk_minutes * 60
+    overlap_seconds = settings.audio_chunk_overlap_seconds if overlap_seconds is None else overlap_seconds
+    max_silence_ms = max_silence_ms or settings.audio_max_silence_ms
+    silence_offset_db = settings.audio_silence_offset_db if silence_offset_db is None else silence_offset_db
+
+    audio = AudioSegment.from_file(path).set_channels(1).set_frame_rate(SAMPLE_RATE)
+    duration = len(audio) / 1000
+
+    silences: list[list[int]] = []
+    if audio.dBFS != float("-inf"):
+        silences = detect_silence(
+            audio,
+            min_silence_len=split_silence_ms,
+            silence_thresh=audio.dBFS - silence_offset_db,
+            seek_step=SILENCE_SEEK_MS,
+        )
+
+    # Shorten long silences, keeping half of max_silence_ms on each side
+    kept_ms: list[tuple[int, int]] = []
+    cursor = 0
+    half = max_silence_ms // 2
+    for start, end in silences:
+        if end - start > max_silence_ms:
+            kept_ms.append((cursor, start + half))
+            cursor = end - half
+    kept_ms.append((cursor, len(audio)))
+
+    time_map = TimeMap([(a / 1000, b / 1000) for a, b in kept_ms])
+    processed = audio._spawn(b"".join(audio[a:b].raw_data for a, b in kept_ms))
+    total = len(processed) / 1000
+
+    candidates = [time_map.to_processed((s + e) / 2000) for s, e in silences]
+    bounds = [0.0, *choose_cut_points(total, candidates, piece_seconds), total]
+
+    os.makedirs(out_dir, exist_ok=True)
+    pieces = []
+    for i, (core_start, core_end) in enumerate(zip(bounds, bounds[1:])):
+        audio_start = max(0.0, core_start - overlap_seconds)
+        audio_end = min(total, core_end + overlap_seconds)
+        piece_path = os.path.join(out_dir, f"piece_{i:03d}.wav")
+        processed[int(audio_start * 1000):int(audio_end * 1000)].export(piece_path, format="wav")
+        pieces.append(AudioPiece(
+            index=i,
+            path=piece_path,
+            audio_start=audio_start,
+            audio_end=audio_end,
+            core_start=core_start,
+            core_end=core_end,
+        ))
+
+    return PreparedAudio(
+        pieces=pieces,
+        time_map=time_map,
+        duration=duration,
+        trimmed_seconds=round(duration - total, 3),
+    )
+
+
+def _overlap(a_start: float, a_end: float, b_start: float, b_end: float) -> float:
+    return max(0.0, min(a_end, b_end) - max(a_start, b_start))
+
+
+def _new_label(used: set[str]) -> str:
+    n = len(used) + 1
+    while f"Speaker {n}" in used:
+        n += 1
+    return f"Speaker {n}"
+
+
+def _match_speakers(
+    previous: list[TranscriptionSegment],
+    current: list[TranscriptionSegment],
+    window: tuple[float, float],
+    used: set[str],
+) -> dict[str, str]:
+    """
+    Map a piece's local speaker labels to global labels.
+
+    Labels are matched one-to-one by how long they speak at the same
+    time in the overlap window; unmatched labels get new global labels.
+    """
+    lo, hi = window
+    scores: dict[tuple[str, str], float] = {}
+    for cur in current:
+        if cur.speaker is None or cur.end <= lo or cur.start >= hi:
+            continue
+        for prev in previous:
+            if prev.speaker is None:
+                continue
+            shared = _overlap(
+                max(cur.start, lo), min(cur.end, hi),
+                max(prev.start, lo), min(prev.end, hi),
+            )
+            if shared > 0:
+                key = (cur.speaker, prev.speaker)
+                scores[key] = scores.get(key, 0.0) + shared
+
+    mapping: dict[str, str] = {}
+    taken: set[str] = set()
+    for (local, global_label), _ in sorted(scores.items(), key=lambda kv: kv[1], reverse=True):
+        if local not in mapping and global_label not in taken:
+            mapping[local] = global_label
+            taken.add(global_label)
+
+    for seg in current:
+        if seg.speaker is not None and seg.speaker not in mapping:
+            label = _new_label(used)
+            mapping[seg.speaker] = label
+            used.add(label)
+    return mapping
+
+
+def stitch_segments(
+    pieces: list[AudioPiece],
+    piece_segments: list[list[TranscriptionSegment]],
+    time_map: Optional[TimeMap] = None,
+) -> list[TranscriptionSegment]:
+    """
+    Merge per-piece segments into one transcript.
+
+    Piece-relative times are shifted by the piece offset, speakers are
+    relabelled consistently across pieces, overlap duplicates are dropped
+    (each piece keeps segments whose midpoint is in its core region) and
+    times are mapped back to the original, untrimmed recording.
+    """
+    stitched: list[TranscriptionSegment] = []
+    previous: list[TranscriptionSegment] = []
+    previous_piece: Optional[AudioPiece] = None
+    used: set[str] = set()
+
+    for piece, segments in zip(pieces, piece_segments):
+        shifted = [
+            TranscriptionSegment(
+                start=piece.audio_start + seg.start,
+                end=piece.audio_start + seg.end,
+                text=seg.text,
+                speaker=seg.speaker,
+                confidence=seg.confidence,
+            )
+            for seg in segments
+        ]
+
+        if previous_piece is None:
+            mapping = {s.speaker: s.speaker for s in shifted if s.speaker is not None}
+            used.update(mapping.values())
+        else:
+            window = (piece.audio_start, previous_piece.audio_end)
+            mapping = _match_speakers(previous, shifted, window, used)
+
+        for seg in shifted:
+            seg.speaker = mapping.get(seg.speaker) if seg.speaker is not None else None
+
+        last = piece.index == len(pieces) - 1
+        for seg in shifted:
+            midpoint = (seg.start + seg.end) / 2
+            if piece.core_start <= midpoint and (midpoint < piece.core_end or last):
+                stitched.append(seg)
+        previous = shifted
+        previous_piece = piece
+
+    if time_map is not None:
+        for seg in stitched:
+            seg.start = round(time_map.to_original(seg.start), 3)
+            seg.end = round(time_map.to_original(seg.end), 3)
+
+    stitched.sort(key=lambda s: (s.start, s.end))
+    return stitched
+
+
+async def transcribe_pieces(
+    provider: TranscriptionProvider,
+    prepared: PreparedAudio,
+    locate: Callable[[AudioPiece], Awaitable[str]],
+    language_hint: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+) -> TranscriptionResult:
+    """
+    Transcribe prepared pieces concurrently and stitch the result.
+
+    Args:
+        provider: Transcription provider
+        prepared: Output of prepare_audio
+        locate: Returns the URL (or local path) the provider should read
+            a piece from, uploading it if needed
+        language_hint: Optional language hint
+        max_concurrency: Pieces in flight at once
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.audio_transcribe_concurrency)
+
+    async def transcribe(piece: AudioPiece) -> TranscriptionResult:
+        async with semaphore:
+            return await provider.transcribe(await locate(piece), language_hint)
+
+    results = await asyncio.gather(*(transcribe(p) for p in prepared.pieces))
+
+    languages = [r.language for r in results if r.language]
+    language = max(set(languages), key=languages.count) if languages else (language_hint or "en")
+    served_by = [r.provider for r in results if r.provider]
+
+    return TranscriptionResult(
+        language=language,
+        segments=stitch_segments(prepared.pieces, [r.segments for r in results], prepared.time_map),
+        duration=prepared.duration,
+        model=results[0].model if results else None,
+        provider=max(set(served_by), key=served_by.count) if served_by else None,
+    )
+
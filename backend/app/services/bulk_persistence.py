@@ -0,0 +1,334 @@
+"""Bulk persistence of extracted meeting intelligence.
+
+Tags, entities and their meeting links are written with one
+``INSERT ... ON CONFLICT`` per table instead of a find-or-create round trip
+per row. Tag and entity IDs are cached per org so repeat names across
+meetings skip the upsert entirely. IDs fetched in a session only reach the
+cache once that session commits; a rollback discards them.
+"""
+import re
+import uuid
+from collections import Counter, OrderedDict
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    ActionItem, Decision, Entity, MeetingEntity, MeetingTag, Summary, Tag,
+)
+from app.services.extraction import MeetingIntelligence
+
+
+CONFIDENCE_SCORES = {"high": 0.9, "medium": 0.7}
+DEFAULT_CONFIDENCE_SCORE = 0.5
+
+
+class OrgIdCache:
+    """Bounded, org-scoped cache of natural key -> row ID."""
+
+    def __init__(self, max_orgs: int = 256, max_keys_per_org: int = 10_000):
+        self.max_orgs = max_orgs
+        self.max_keys_per_org = max_keys_per_org
+        self._orgs: "OrderedDict[uuid.UUID, OrderedDict]" = OrderedDict()
+
+    def get_many(self, org_id: uuid.UUID, keys: Iterable) -> dict:
+        """Return cached IDs for the given keys (misses are omitted)."""
+        bucket = self._orgs.get(org_id)
+        if bucket is None:
+            return {}
+        self._orgs.move_to_end(org_id)
+        return {key: bucket[key] for key in keys if key in bucket}
+
+    def put_many(self, org_id: uuid.UUID, mapping: dict) -> None:
+        """Store IDs for an org, evicting least recently used entries."""
+        bucket = self._orgs.get(org_id)
+        if bucket is None:
+            bucket = OrderedDict()
+            self._orgs[org_id] = bucket
+            if len(self._orgs) > self.max_orgs:
+                self._orgs.popitem(last=False)
+        self._orgs.move_to_end(org_id)
+
+        bucket.update(mapping)
+        while len(bucket) > self.max_keys_per_org:
+            bucket.popitem(last=False)
+
+    def invalidate(self, org_id: Optional[uuid.UUID] = None) -> None:
+        """Drop cached IDs for one org, or for all orgs."""
+        if org_id is None:
+            self._orgs.clear()
+        else:
+            self._orgs.pop(org_id, None)
+
+
+tag_id_cache = OrgIdCache()
+entity_id_cache = OrgIdCache()
+
+# Session.info key of the (cache, org_id, ids) waiting for a commit
+_PENDING_IDS = "bulk_persistence.pending_ids"
+
+
+def _publish_pending_ids(session) -> None:
+    for cache, org_id, ids in session.info.pop(_PENDING_IDS, []):
+        cache.put_many(org_id, ids)
+
+
+def _discard_pending_ids(session) -> None:
+    session.info.pop(_PENDING_IDS, None)
+
+
+def _cache_after_commit(
+    db: AsyncSession,
+    cache: OrgIdCache,
+    org_id: uuid.UUID,
+    ids: dict,
+) -> None:
+    """Add IDs to the cache when db commits (and forget them on rollback)."""
+    session = db.sync_session
+    if _PENDING_IDS not in session.info:
+        session.info[_PENDING_IDS] = []
+        if not event.contains(session, "after_commit", _publish_pending_ids):
+            event.listen(session, "after_commit", _publish_pending_ids)
+            event.listen(session, "after_rollback", _discard_pending_ids)
+    session.info[_PENDING_IDS].append((cache, org_id, ids))
+
+
+def confidence_score(confidence: Optional[str]) -> float:
+    """Map a high/medium/low label to the stored numeric confidence."""
+    return CONFIDENCE_SCORES.get(confidence or "", DEFAULT_CONFIDENCE_SCORE)
+
+
+def _parse_due_date(value: Optional[str]) -> Optional[date]:
+    """Parse a YYYY-MM-DD due date, ignoring anything the model made up."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _source_for(indices: list[int], chunks: list) -> tuple[Optional[uuid.UUID], Optional[str]]:
+    """Resolve the first valid source chunk index to (chunk_id, quote)."""
+    for idx in indices or []:
+        if 0 <= idx < len(chunks):
+            return chunks[idx].id, chunks[idx].text[:500]
+    return None, None
+
+
+def count_entity_mentions(
+    entities: list[tuple[str, str]],
+    chunks: list,
+) -> Counter:
+    """
+    Count mentions per (kind, name).
+
+    Uses whole-word occurrences in the transcript, falling back to the
+    number of times the extractor listed the entity (at least 1).
+    """
+    extracted = Counter(entities)
+    corpus = "\n".join(chunk.text for chunk in chunks).lower()
+
+    counts: Counter = Counter()
+    for key, listed in extracted.items():
+        _, name = key
+        pattern = re.compile(rf"(?<!\w){re.escape(name.lower())}(?!\w)")
+        in_text = len(pattern.findall(corpus)) if name else 0
+        counts[key] = max(in_text, listed, 1)
+    return counts
+
+
+async def upsert_tags(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    names: Iterable[str],
+) -> dict[str, uuid.UUID]:
+    """Find or create tags by name in a single statement."""
+    wanted = list(dict.fromkeys(n.strip()[:100] for n in names if n and n.strip()))
+    if not wanted:
+        return {}
+
+    ids = tag_id_cache.get_many(org_id, wanted)
+    missing = [name for name in wanted if name not in ids]
+
+    if missing:
+        stmt = pg_insert(Tag).values(
+            [{"id": uuid.uuid4(), "org_id": org_id, "name": name} for name in missing]
+        )
+        # DO UPDATE (not DO NOTHING) so existing rows are returned too
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Tag.org_id, Tag.name],
+            set_={"name": stmt.excluded.name},
+        ).returning(Tag.id, Tag.name)
+        result = await db.execute(stmt)
+        fetched = {row.name: row.id for row in result}
+        _cache_after_commit(db, tag_id_cache, org_id, fetched)
+        ids.update(fetched)
+
+    return ids
+
+
+async def upsert_entities(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    keys: Iterable[tuple[str, str]],
+) -> dict[tuple[str, str], uuid.UUID]:
+    """Find or create entities by (kind, name) in a single statement."""
+    wanted = list(dict.fromkeys(
+        (kind[:50], name.strip()[:255]) for kind, name in keys if name and name.strip()
+    ))
+    if not wanted:
+        return {}
+
+    ids = entity_id_cache.get_many(org_id, wanted)
+    missing = [key for key in wanted if key not in ids]
+
+    if missing:
+        stmt = pg_insert(Entity).values([
+            {"id": uuid.uuid4(), "org_id": org_id, "kind": kind, "name": name}
+            for kind, name in missing
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Entity.org_id, Entity.kind, Entity.name],
+            set_={"name": stmt.excluded.name},
+        ).returning(Entity.id, Entity.kind, Entity.name)
+        result = await db.execute(stmt)
+        fetched = {(row.kind, row.name): row.id for row in result}
+        _cache_after_commit(db, entity_id_cache, org_id, fetched)
+        ids.update(fetched)
+
+    return ids
+
+
+async def persist_intelligence(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    meeting_id: uuid.UUID,
+    intelligence: MeetingIntelligence,
+    chunks: list,
+) -> dict[str, int]:
+    """
+    Write decisions, action items, tags and entities for a meeting.
+
+    Issues at most one INSERT per table. Does not commit.
+
+    Args:
+        db: Open session (caller commits)
+        org_id: Owning org
+        meeting_id: Meeting the intelligence belongs to
+        intelligence: Extraction output
+        chunks: Transcript chunks in sequence order (for source indices)
+
+    Returns:
+        Row counts written per table
+    """
+    counts = {"decisions": 0, "action_items": 0, "tags": 0, "entities": 0}
+
+    decision_rows = []
+    for dec in intelligence.decisions:
+        source_chunk_id, source_quote = _source_for(dec.source_chunk_indices, chunks)
+        decision_rows.append({
+            "id": uuid.uuid4(),
+            "org_id": org_id,
+            "meeting_id": meeting_id,
+            "decision": dec.decision,
+            "rationale": dec.rationale,
+            "source_chunk_id": source_chunk_id,
+            "source_quote": source_quote,
+            "confidence": confidence_score(dec.confidence),
+        })
+    if decision_rows:
+        await db.execute(
+            pg_insert(Decision).values(decision_rows).on_conflict_do_nothing()
+        )
+        counts["decisions"] = len(decision_rows)
+
+    action_rows = []
+    for item in intelligence.action_items:
+        source_chunk_id, source_quote = _source_for(item.source_chunk_indices, chunks)
+        action_rows.append({
+            "id": uuid.uuid4(),
+            "org_id": org_id,
+            "meeting_id": meeting_id,
+            "title": item.title[:500],
+            "description": item.description,
+            "owner_name": item.owner_name,
+            "owner_email": item.owner_email,
+            "status": item.status or "open",
+            "due_date": _parse_due_date(item.due_date),
+            "priority": item.priority,
+            "source_chunk_id": source_chunk_id,
+            "source_quote": source_quote,
+            "confidence": confidence_score(item.confidence),
+        })
+    if action_rows:
+        await db.execute(
+            pg_insert(ActionItem).values(action_rows).on_conflict_do_nothing()
+        )
+        counts["action_items"] = len(action_rows)
+
+    tag_ids = await upsert_tags(db, org_id, intelligence.tags)
+    if tag_ids:
+        await db.execute(
+            pg_insert(MeetingTag)
+            .values([
+                {"id": uuid.uuid4(), "meeting_id": meeting_id, "tag_id": tag_id}
+                for tag_id in tag_ids.values()
+            ])
+            .on_conflict_do_nothing(
+                index_elements=[MeetingTag.meeting_id, MeetingTag.tag_id]
+            )
+        )
+        counts["tags"] = len(tag_ids)
+
+    entity_keys = [
+        (ent.kind[:50], ent.name.strip()[:255])
+        for ent in intelligence.entities
+        if ent.name and ent.name.strip()
+    ]
+    entity_ids = await upsert_entities(db, org_id, entity_keys)
+    if entity_ids:
+        mentions = count_entity_mentions(entity_keys, chunks)
+        stmt = pg_insert(MeetingEntity).values([
+            {
+                "id": uuid.uuid4(),
+                "meeting_id": meeting_id,
+                "entity_id": entity_id,
+                "mention_count": mentions[key],
+            }
+            for key, entity_id in entity_ids.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MeetingEntity.meeting_id, MeetingEntity.entity_id],
+            set_={"mention_count": stmt.excluded.mention_count},
+        )
+        await db.execute(stmt)
+        counts["entities"] = len(entity_ids)
+
+    return counts
+
+
+async def clear_intelligence(db: AsyncSession, meeting_id: uuid.UUID) -> dict[str, int]:
+    """
+    Delete a meeting's extracted intelligence before it is re-extracted.
+
+    Removes summaries, decisions, action items and tag/entity links; the
+    org-level tags and entities themselves are kept. Does not commit.
+
+    Returns:
+        Rows deleted per table
+    """
+    counts = {}
+    for table, model in (
+        ("summaries", Summary),
+        ("decisions", Decision),
+        ("action_items", ActionItem),
+        ("tags", MeetingTag),
+        ("entities", MeetingEntity),
+    ):
+        result = await db.execute(delete(model).where(model.meeting_id == meeting_id))
+        counts[table] = result.rowcount or 0
+    return counts
@@ -5,7 +5,7 @@ Uses Clearbit Logo API + direct website scraping as fallback.
 """
 import re
 from typing import Optional, Dict, List
-import httpx
+from app.http_clients import get_http_client
 from urllib.parse import quote, urljoin
 from bs4 import BeautifulSoup
 import base64
@@ -134,34 +134,34 @@ async def fetch_company_details_clearbit(domain: str, api_key: Optional[str] = N
         }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f'https://company.clearbit.com/v2/companies/find?domain={domain}',
-                headers={'Authorization': f'Bearer {api_key}'},
-                timeout=5.0
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'domain': domain,
-                    'name': data.get('name', get_company_name_from_domain(domain)),
-                    'logo': data.get('logo', get_company_logo_url(domain)),
-                    'description': data.get('description'),
-                    'industry': data.get('category', {}).get('industry'),
-                    'employees': data.get('metrics', {}).get('employees'),
-                    'founded': data.get('foundedYear'),
-                    'location': data.get('location'),
-                    'linkedin': data.get('linkedin', {}).get('handle'),
-                    'twitter': data.get('twitter', {}).get('handle'),
-                }
-            else:
-                # Fallback to basic info
-                return {
-                    'domain': domain,
-                    'name': get_company_name_from_domain(domain),
-                    'logo': get_company_logo_url(domain),
-                }
+        client = get_http_client('https://company.clearbit.com')
+        response = await client.get(
+            f'https://company.clearbit.com/v2/companies/find?domain={domain}',
+            headers={'Authorization': f'Bearer {api_key}'},
+            timeout=5.0
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                'domain': domain,
+                'name': data.get('name', get_company_name_from_domain(domain)),
+                'logo': data.get('logo', get_company_logo_url(domain)),
+                'description': data.get('description'),
+                'industry': data.get('category', {}).get('industry'),
+                'employees': data.get('metrics', {}).get('employees'),
+                'founded': data.get('foundedYear'),
+                'location': data.get('location'),
+                'linkedin': data.get('linkedin', {}).get('handle'),
+                'twitter': data.get('twitter', {}).get('handle'),
+            }
+        else:
+            # Fallback to basic info
+            return {
+                'domain': domain,
+                'name': get_company_name_from_domain(domain),
+                'logo': get_company_logo_url(domain),
+            }
     except Exception as e:
         print(f"Error fetching Clearbit data for {domain}: {e}")
         return {
@@ -193,46 +193,47 @@ async def scrape_logo_from_website(domain: str, timeout: float = 10.0) -> Option
     try:
         website_url = f'https://{domain}'
         
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                website_url,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                },
-                timeout=timeout
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Priority 1: Apple touch icon (usually high quality)
-            apple_icon = soup.find('link', rel=lambda x: x and 'apple-touch-icon' in x.lower())
-            if apple_icon and apple_icon.get('href'):
-                return urljoin(website_url, apple_icon['href'])
-            
-            # Priority 2: Open Graph image
-            og_image = soup.find('meta', property='og:image')
-            if og_image and og_image.get('content'):
-                og_url = og_image['content']
-                # Filter out social media placeholders
-                if 'logo' in og_url.lower() or 'icon' in og_url.lower():
-                    return urljoin(website_url, og_url)
-            
-            # Priority 3: Standard favicon with size hints
-            large_icon = soup.find('link', rel='icon', sizes=lambda x: x and any(s in x for s in ['192', '256', '512']))
-            if large_icon and large_icon.get('href'):
-                return urljoin(website_url, large_icon['href'])
-            
-            # Priority 4: Any favicon
-            favicon = soup.find('link', rel=lambda x: x and 'icon' in x.lower())
-            if favicon and favicon.get('href'):
-                return urljoin(website_url, favicon['href'])
-            
-            # Priority 5: Default favicon location
-            return f'{website_url}/favicon.ico'
-            
+        client = get_http_client(website_url)
+        response = await client.get(
+            website_url,
+            follow_redirects=True,
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            },
+            timeout=timeout
+        )
+        
+        if response.status_code != 200:
+            return None
+        
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # Priority 1: Apple touch icon (usually high quality)
+        apple_icon = soup.find('link', rel=lambda x: x and 'apple-touch-icon' in x.lower())
+        if apple_icon and apple_icon.get('href'):
+            return urljoin(website_url, apple_icon['href'])
+        
+        # Priority 2: Open Graph image
+        og_image = soup.find('meta', property='og:image')
+        if og_image and og_image.get('content'):
+            og_url = og_image['content']
+            # Filter out social media placeholders
+            if 'logo' in og_url.lower() or 'icon' in og_url.lower():
+                return urljoin(website_url, og_url)
+        
+        # Priority 3: Standard favicon with size hints
+        large_icon = soup.find('link', rel='icon', sizes=lambda x: x and any(s in x for s in ['192', '256', '512']))
+        if large_icon and large_icon.get('href'):
+            return urljoin(website_url, large_icon['href'])
+        
+        # Priority 4: Any favicon
+        favicon = soup.find('link', rel=lambda x: x and 'icon' in x.lower())
+        if favicon and favicon.get('href'):
+            return urljoin(website_url, favicon['href'])
+        
+        # Priority 5: Default favicon location
+        return f'{website_url}/favicon.ico'
+        
     except Exception as e:
         print(f"Error scraping logo from {domain}: {e}")
         return None
@@ -258,10 +259,10 @@ async def get_best_logo_url(domain: str, try_scraping: bool = True) -> Optional[
     
     # Verify Clearbit has the logo (they return 404 image if not found)
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.head(clearbit_url, timeout=3.0)
-            if response.status_code == 200:
-                return clearbit_url
+        client = get_http_client(clearbit_url)
+        response = await client.head(clearbit_url, timeout=3.0)
+        if response.status_code == 200:
+            return clearbit_url
     except Exception:
         pass
     
@@ -8,17 +8,17 @@ Generates ANY type of document based on meeting content:
 - Reports
 - Proposals
 """
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
-from openai import AsyncOpenAI
 from app.config import settings
+from app.services.llm_client import get_openai_client, stream_text
 
 
 class DocumentGenerator:
     """Generate documents dynamically based on meeting content."""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self.client = get_openai_client(settings.openai_api_key, service="documents.generator") if settings.openai_api_key else None
     
     async def generate_document(
         self,
@@ -40,29 +40,67 @@ class DocumentGenerator:
             Dict with 'content', 'title', 'format'
         """
         
+        request, document = self._prepare(document_type, meeting_data, language, additional_context)
+        
+        response = await self.client.chat.completions.create(**request)
+        
+        return {'content': response.choices[0].message.content, **document}
+    
+    def stream_document(
+        self,
+        document_type: str,
+        meeting_data: Dict,
+        language: str = "sv",
+        additional_context: Optional[str] = None
+    ) -> Tuple[AsyncIterator[str], Dict[str, str]]:
+        """
+        Streaming variant of generate_document.
+        
+        Returns the content deltas and the document's 'title' and
+        'format'; the joined deltas are the document's 'content'.
+        """
+        
+        request, document = self._prepare(document_type, meeting_data, language, additional_context)
+        
+        async def deltas() -> AsyncIterator[str]:
+            stream = await self.client.chat.completions.create(**request, stream=True)
+            async for delta in stream_text(stream):
+                yield delta
+        
+        return deltas(), document
+    
+    def _prepare(
+        self,
+        document_type: str,
+        meeting_data: Dict,
+        language: str,
+        additional_context: Optional[str]
+    ) -> Tuple[Dict, Dict[str, str]]:
+        """Completion request plus 'title' and 'format' for a document type."""
+        
         if not self.client:
             raise ValueError("OpenAI API key required for document generation")
         
         # Route to appropriate generator
         generators = {
-            'meeting_notes': self._generate_meeting_notes,
-            'email_decision_update': self._generate_decision_email,
-            'email_action_reminder': self._generate_action_reminder,
-            'email_meeting_summary': self._generate_summary_email,
-            'contract_draft': self._generate_contract,
-            'market_analysis': self._generate_market_analysis,
-            'status_report': self._generate_status_report,
-            'proposal': self._generate_proposal
+            'meeting_notes': self._meeting_notes_request,
+            'email_decision_update': self._decision_email_request,
+            'email_action_reminder': self._action_reminder_request,
+            'email_meeting_summary': self._summary_email_request,
+            'contract_draft': self._contract_request,
+            'market_analysis': self._market_analysis_request,
+            'status_report': self._status_report_request,
+            'proposal': self._proposal_request
         }
         
         generator_func = generators.get(document_type)
         if not generator_func:
             # Use AI to generate any custom document type
-            return await self._generate_custom_document(document_type, meeting_data, language, additional_context)
+            return self._custom_document_request(document_type, meeting_data, language, additional_context)
         
-        return await generator_func(meeting_data, language, additional_context)
+        return generator_func(meeting_data, language, additional_context)
     
-    async def _generate_meeting_notes(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _meeting_notes_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate formal 1-page meeting notes."""
         
         meeting = meeting_data.get('meeting_info', {})
@@ -90,7 +128,7 @@ Format as professional business document with:
 
 Use clear, professional language. Be concise but complete."""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a professional meeting secretary creating formal meeting minutes."},
@@ -99,13 +137,9 @@ Use clear, professional language. Be concise but complete."""
             temperature=0.3
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': f"Meeting Notes - {meeting.get('title', 'Meeting')}",
-            'format': 'markdown'
-        }
+        return request, {'title': f"Meeting Notes - {meeting.get('title', 'Meeting')}", 'format': 'markdown'}
     
-    async def _generate_decision_email(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _decision_email_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate email template for decision updates."""
         
         decisions = meeting_data.get('decisions', [])
@@ -127,7 +161,7 @@ For each decision, include:
 Tone: Professional but friendly
 Format: Email with subject line"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a professional business communicator writing decision update emails."},
@@ -136,13 +170,9 @@ Format: Email with subject line"""
             temperature=0.4
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': f"Decision Update - {meeting.get('title', 'Meeting')}",
-            'format': 'email'
-        }
+        return request, {'title': f"Decision Update - {meeting.get('title', 'Meeting')}", 'format': 'email'}
     
-    async def _generate_action_reminder(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _action_reminder_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate action item reminder email."""
         
         actions = meeting_data.get('action_items', [])
@@ -160,7 +190,7 @@ Format:
 - Clear call-to-action
 - Professional closing"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a project coordinator sending friendly action reminders."},
@@ -169,13 +199,9 @@ Format:
             temperature=0.4
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': "Action Items Reminder",
-            'format': 'email'
-        }
+        return request, {'title': "Action Items Reminder", 'format': 'email'}
     
-    async def _generate_summary_email(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _summary_email_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate meeting summary email for distribution."""
         
         meeting = meeting_data.get('meeting_info', {})
@@ -197,7 +223,7 @@ Format:
 
 Tone: Professional, concise"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are an executive assistant writing meeting summaries."},
@@ -206,13 +232,9 @@ Tone: Professional, concise"""
             temperature=0.3
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': f"Meeting Summary - {meeting.get('title', 'Meeting')}",
-            'format': 'email'
-        }
+        return request, {'title': f"Meeting Summary - {meeting.get('title', 'Meeting')}", 'format': 'email'}
     
-    async def _generate_contract(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _contract_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate contract draft based on decisions."""
         
         decisions = meeting_data.get('decisions', [])
@@ -231,7 +253,7 @@ Create formal contract with:
 
 Language: Professional legal language"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a legal professional drafting contracts. Create professional but clear legal documents."},
@@ -240,13 +262,9 @@ Language: Professional legal language"""
             temperature=0.2
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': "Contract Draft",
-            'format': 'legal_document'
-        }
+        return request, {'title': "Contract Draft", 'format': 'legal_document'}
     
-    async def _generate_market_analysis(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _market_analysis_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate market analysis based on meeting discussions."""
         
         meeting = meeting_data.get('meeting_info', {})
@@ -266,7 +284,7 @@ Include:
 
 Format: Professional business analysis"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a market analyst creating professional market analyses."},
@@ -275,13 +293,9 @@ Format: Professional business analysis"""
             temperature=0.4
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': "Market Analysis",
-            'format': 'report'
-        }
+        return request, {'title': "Market Analysis", 'format': 'report'}
     
-    async def _generate_status_report(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _status_report_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate status report from meeting."""
         
         actions = meeting_data.get('action_items', [])
@@ -300,7 +314,7 @@ Format:
 - Risks/Blockers
 - Next Steps"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are an executive creating status reports for leadership."},
@@ -309,13 +323,9 @@ Format:
             temperature=0.3
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': "Status Report",
-            'format': 'report'
-        }
+        return request, {'title': "Status Report", 'format': 'report'}
     
-    async def _generate_proposal(self, meeting_data: Dict, language: str, context: Optional[str]) -> Dict:
+    def _proposal_request(self, meeting_data: Dict, language: str, context: Optional[str]) -> Tuple[Dict, Dict[str, str]]:
         """Generate business proposal from meeting decisions."""
         
         decisions = meeting_data.get('decisions', [])
@@ -334,7 +344,7 @@ Include:
 - Timeline
 - Expected Outcomes"""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a business development professional creating winning proposals."},
@@ -343,19 +353,15 @@ Include:
             temperature=0.4
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': "Business Proposal",
-            'format': 'proposal'
-        }
+        return request, {'title': "Business Proposal", 'format': 'proposal'}
     
-    async def _generate_custom_document(
+    def _custom_document_request(
         self,
         document_type: str,
         meeting_data: Dict,
         language: str,
         context: Optional[str]
-    ) -> Dict:
+    ) -> Tuple[Dict, Dict[str, str]]:
         """Generate any custom document type using AI."""
         
         prompt = f"""Generate a '{document_type}' based on this meeting data.
@@ -370,7 +376,7 @@ Meeting had:
 
 Create a professional, well-structured {document_type} that would be useful for this business context."""
         
-        response = await self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": f"You are a professional creating a {document_type}. Generate high-quality business documents."},
@@ -379,11 +385,7 @@ Create a professional, well-structured {document_type} that would be useful for
             temperature=0.4
         )
         
-        return {
-            'content': response.choices[0].message.content,
-            'title': document_type.replace('_', ' ').title(),
-            'format': 'custom'
-        }
+        return request, {'title': document_type.replace('_', ' ').title(), 'format': 'custom'}
 
 
 
@@ -11,6 +11,7 @@ import hashlib
 
 from pydantic import BaseModel, Field
 
+from app.config import settings
 from app.services.agent_1_extractor import get_extractor_agent, ExtractionResult
 from app.services.agent_2_analyzer import get_analyzer_agent, AnalysisResult
 from app.services.agent_3_researcher import get_researcher_agent, ResearchResult
@@ -79,6 +80,15 @@ class DocumentProcessingResult(BaseModel):
     failed_stage: Optional[ProcessingStage] = None
 
 
+class _StageError(Exception):
+    """Wraps a failure from a concurrent stage with the stage it happened in."""
+    
+    def __init__(self, stage: ProcessingStage, error: Exception):
+        super().__init__(str(error))
+        self.stage = stage
+        self.error = error
+
+
 class DocumentProcessor:
     """
     Document Processor Orchestrator
@@ -92,9 +102,14 @@ class DocumentProcessor:
     6. Agent 6: Verify quality before release
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrent_generations: Optional[int] = None):
         self.version = "1.0.0"
         
+        # Content generation calls in flight across all documents
+        self._generation_slots = asyncio.Semaphore(
+            max_concurrent_generations or settings.document_generation_concurrency
+        )
+        
         # Initialize all agents
         self.extractor = get_extractor_agent()
         self.analyzer = get_analyzer_agent()
@@ -184,39 +199,20 @@ class DocumentProcessor:
                 company_name=company_name
             )
             
-            # STAGE 5: CONTENT GENERATION
+            # STAGES 5+6: CONTENT GENERATION AND VERIFICATION
+            # Each content type is generated concurrently (bounded by the
+            # processor-wide budget) and verified as soon as it is ready
             result.current_stage = ProcessingStage.CONTENT_GENERATION
             
             if generate_content_types is None:
                 generate_content_types = self._get_default_content_types(document_type)
             
-            result.generated_content = {}
-            for content_type in generate_content_types:
-                content = await self._run_content_generation(
-                    content_type,
-                    result.analysis,
-                    result.research,
-                    result.questions,
-                    company_name=company_name,
-                    document_date=document_date
-                )
-                result.generated_content[content_type] = content
-            
-            # STAGE 6: VERIFICATION
-            result.current_stage = ProcessingStage.VERIFICATION
-            result.verification = {}
-            
-            for content_type, content in result.generated_content.items():
-                verification = await self._run_verification(
-                    content,
-                    output_mode="internal"
-                )
-                result.verification[content_type] = verification
-                
-                if not verification.approved:
-                    result.requires_human_review = True
-                    if not result.review_reason:
-                        result.review_reason = "Content failed QA verification"
+            await self._generate_and_verify_all(
+                result,
+                generate_content_types,
+                company_name=company_name,
+                document_date=document_date
+            )
             
             # Calculate overall confidence
             result.overall_confidence = self._calculate_overall_confidence(result)
@@ -230,6 +226,9 @@ class DocumentProcessor:
             )
             
         except Exception as e:
+            if isinstance(e, _StageError):
+                result.current_stage = e.stage
+                e = e.error
             result.status = ProcessingStatus.FAILED
             result.error_message = str(e)
             result.failed_stage = result.current_stage
@@ -245,6 +244,66 @@ class DocumentProcessor:
         
         return result
     
+    async def _generate_and_verify_all(
+        self,
+        result: DocumentProcessingResult,
+        content_types: List[ContentType],
+        company_name: Optional[str],
+        document_date: Optional[str]
+    ) -> None:
+        """
+        Run Agents 5 and 6 as one task per content type.
+        
+        Fills result.generated_content and result.verification in
+        content_types order. On the first failure the other tasks are
+        cancelled and the error is raised as a _StageError; results that
+        completed before it are kept.
+        """
+        generated: Dict[ContentType, GeneratedContent] = {}
+        verified: Dict[ContentType, VerificationResult] = {}
+        
+        async def generate_and_verify(content_type: ContentType) -> None:
+            try:
+                async with self._generation_slots:
+                    content = await self._run_content_generation(
+                        content_type,
+                        result.analysis,
+                        result.research,
+                        result.questions,
+                        company_name=company_name,
+                        document_date=document_date
+                    )
+            except Exception as e:
+                raise _StageError(ProcessingStage.CONTENT_GENERATION, e) from e
+            generated[content_type] = content
+            
+            try:
+                verified[content_type] = await self._run_verification(
+                    content,
+                    output_mode="internal"
+                )
+            except Exception as e:
+                raise _StageError(ProcessingStage.VERIFICATION, e) from e
+        
+        tasks = [asyncio.create_task(generate_and_verify(ct)) for ct in content_types]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            result.generated_content = {ct: generated[ct] for ct in content_types if ct in generated}
+            result.verification = {ct: verified[ct] for ct in content_types if ct in verified}
+        
+        result.current_stage = ProcessingStage.VERIFICATION
+        for verification in result.verification.values():
+            if not verification.approved:
+                result.requires_human_review = True
+                if not result.review_reason:
+                    result.review_reason = "Content failed QA verification"
+    
     async def _run_extraction(
         self,
         file_content: bytes,
@@ -389,9 +448,13 @@ class DocumentProcessor:
         """
         Process multiple documents concurrently.
         
+        Content generation shares the processor-wide budget
+        (DOCUMENT_GENERATION_CONCURRENCY), so the number of GPT-4o calls
+        in flight does not grow with max_concurrent.
+        
         Args:
             documents: List of dicts with file_content, filename, etc.
-            max_concurrent: Maximum concurrent processing jobs
+            max_concurrent: Maximum documents processed at once
         
         Returns:
             List of DocumentProcessingResults
@@ -1,10 +1,14 @@
 """LLM extraction service for meeting intelligence."""
+import asyncio
 import json
+import re
 from typing import Optional
 from pydantic import BaseModel, Field
-from openai import AsyncOpenAI
+import tiktoken
 
 from app.config import settings
+from app.services.llm_cache import with_llm_cache
+from app.services.llm_client import APPROXIMATE_ENCODING, get_openai_client
 
 
 # Pydantic models for structured output
@@ -62,6 +66,166 @@ class MeetingIntelligence(BaseModel):
     )
 
 
+EXTRACTION_MODEL = "gpt-4o-2024-08-06"  # Model with structured outputs
+
+
+def get_encoding(model: str = EXTRACTION_MODEL) -> "tiktoken.Encoding":
+    """
+    Tokenizer for a model, falling back to cl100k_base.
+    
+    If tiktoken cannot load either (its files are downloaded on first
+    use), windows are sized with a characters / 4 estimate instead.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return APPROXIMATE_ENCODING
+
+
+def build_token_windows(
+    token_counts: list[int],
+    max_tokens: int,
+    overlap_tokens: int = 0,
+) -> list[tuple[int, int]]:
+    """
+    Split a sequence of chunks into overlapping windows by token budget.
+    
+    Args:
+        token_counts: Token count of each chunk, in order
+        max_tokens: Token budget per window
+        overlap_tokens: Approximate tokens repeated from the end of the
+                        previous window (whole chunks only)
+    
+    Returns:
+        List of (start, end) chunk index ranges, end exclusive. A chunk
+        larger than the budget gets a window of its own.
+    """
+    windows = []
+    n = len(token_counts)
+    start = 0
+    while start < n:
+        end = start
+        used = 0
+        while end < n and (end == start or used + token_counts[end] <= max_tokens):
+            used += token_counts[end]
+            end += 1
+        windows.append((start, end))
+        if end >= n:
+            break
+        
+        # Step back over trailing chunks to create the overlap
+        next_start = end
+        carried = 0
+        while next_start - 1 > start and carried + token_counts[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            carried += token_counts[next_start]
+        start = next_start
+    return windows
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (text or "").lower())).strip()
+
+
+def _similar(a: str, b: str, threshold: float = 0.8) -> bool:
+    """Token Jaccard similarity of two normalized strings."""
+    if a == b:
+        return True
+    ta, tb = set(a.split()), set(b.split())
+    if not ta or not tb:
+        return False
+    return len(ta & tb) / len(ta | tb) >= threshold
+
+
+def _same_owner(a: str, b: str) -> bool:
+    """Owners match if equal or if either side is unknown."""
+    return not a or not b or a == b
+
+
+_CONFIDENCE_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def _merge_into(kept: BaseModel, dup: BaseModel) -> None:
+    """Fold a duplicate extraction into the kept one."""
+    kept.source_chunk_indices = sorted(set(kept.source_chunk_indices) | set(dup.source_chunk_indices))
+    if _CONFIDENCE_RANK.get(dup.confidence, 0) > _CONFIDENCE_RANK.get(kept.confidence, 0):
+        kept.confidence = dup.confidence
+    for field, value in dup:
+        if getattr(kept, field) in (None, "") and value not in (None, ""):
+            setattr(kept, field, value)
+
+
+def merge_window_results(
+    results: list[tuple[int, MeetingIntelligence]],
+    total_chunks: int,
+) -> MeetingIntelligence:
+    """
+    Merge per-window extractions into one result.
+    
+    Source chunk indices are remapped from window-local to global
+    positions. Decisions and action items repeated across overlapping
+    windows are deduplicated by normalized text similarity; tags and
+    entities are deduplicated case-insensitively. The summary field holds
+    the window summaries joined in order (callers may condense it).
+    
+    Args:
+        results: (window start offset, window extraction) pairs, in order
+        total_chunks: Number of chunks in the full transcript
+    """
+    def remap(indices: list[int], offset: int) -> list[int]:
+        return sorted({offset + i for i in indices if 0 <= offset + i < total_chunks})
+    
+    decisions: list[tuple[str, ExtractedDecision]] = []
+    actions: list[tuple[str, ExtractedActionItem]] = []
+    tags: dict[str, str] = {}
+    entities: dict[tuple[str, str], ExtractedEntity] = {}
+    summaries = []
+    
+    for offset, result in results:
+        if result.summary_md.strip():
+            summaries.append(result.summary_md.strip())
+        
+        for dec in result.decisions:
+            dec = dec.model_copy(update={"source_chunk_indices": remap(dec.source_chunk_indices, offset)})
+            key = _normalize(dec.decision)
+            match = next((kept for k, kept in decisions if _similar(k, key)), None)
+            if match:
+                _merge_into(match, dec)
+            else:
+                decisions.append((key, dec))
+        
+        for item in result.action_items:
+            item = item.model_copy(update={"source_chunk_indices": remap(item.source_chunk_indices, offset)})
+            key = _normalize(item.title)
+            owner = _normalize(item.owner_name)
+            match = next(
+                (kept for k, kept in actions
+                 if _similar(k, key) and _same_owner(_normalize(kept.owner_name), owner)),
+                None,
+            )
+            if match:
+                _merge_into(match, item)
+            else:
+                actions.append((key, item))
+        
+        for tag in result.tags:
+            tags.setdefault(tag.strip().lower(), tag.strip())
+        
+        for ent in result.entities:
+            entities.setdefault((ent.kind.lower(), _normalize(ent.name)), ent)
+    
+    return MeetingIntelligence(
+        summary_md="\n\n".join(summaries),
+        decisions=[d for _, d in decisions],
+        action_items=[a for _, a in actions],
+        tags=list(tags.values()),
+        entities=list(entities.values()),
+    )
+
+
 class ExtractionService:
     """Service for extracting meeting intelligence using LLM."""
     
@@ -70,32 +234,96 @@ class ExtractionService:
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = with_llm_cache(get_openai_client(self.api_key, service="extraction"))
+        self.encoding = get_encoding(EXTRACTION_MODEL)
     
     async def extract_intelligence(
         self,
         transcript_chunks: list[dict],
         meeting_metadata: Optional[dict] = None,
         participants: Optional[list[str]] = None,
+        windowed: Optional[bool] = None,
+        use_cache: bool = True,
     ) -> MeetingIntelligence:
         """
         Extract structured meeting intelligence from transcript.
         
+        Long transcripts are split into overlapping token windows that are
+        extracted concurrently and then merged (map-reduce).
+        
         Args:
             transcript_chunks: List of transcript chunks with 'text', 'speaker', etc.
             meeting_metadata: Optional meeting metadata (title, date, etc.)
             participants: Optional list of participant names/emails
+            windowed: Force windowed (True) or single-request (False) mode.
+                      Default: windowed when the transcript exceeds
+                      settings.extraction_window_tokens.
+            use_cache: Set False to bypass the LLM response cache (forced
+                       reprocessing)
         
         Returns:
             MeetingIntelligence with structured outputs
         """
-        # Build context
-        transcript_text = self._build_transcript_text(transcript_chunks)
         system_prompt = self._build_system_prompt(meeting_metadata, participants)
+        lines = self._build_transcript_lines(transcript_chunks)
+        token_counts = [len(self.encoding.encode(line)) + 1 for line in lines]
+        
+        if windowed is None:
+            windowed = sum(token_counts) > settings.extraction_window_tokens
         
+        if not windowed:
+            return await self._extract_window(system_prompt, "\n".join(lines), use_cache)
+        
+        return await self._extract_windowed(
+            transcript_chunks, token_counts, system_prompt, use_cache,
+        )
+    
+    async def _extract_windowed(
+        self,
+        transcript_chunks: list[dict],
+        token_counts: list[int],
+        system_prompt: str,
+        use_cache: bool = True,
+    ) -> MeetingIntelligence:
+        """Map: extract each window concurrently. Reduce: merge and condense."""
+        windows = build_token_windows(
+            token_counts,
+            max_tokens=settings.extraction_window_tokens,
+            overlap_tokens=settings.extraction_window_overlap_tokens,
+        )
+        semaphore = asyncio.Semaphore(settings.extraction_max_concurrency)
+        
+        async def run(part: int, start: int, end: int) -> tuple[int, MeetingIntelligence]:
+            # Indices are local to the window; merge remaps them
+            text = "\n".join(self._build_transcript_lines(transcript_chunks[start:end]))
+            prompt = (
+                f"{system_prompt}\n\n"
+                f"This is part {part} of {len(windows)} of a long meeting. "
+                "Only extract what appears in this part."
+            )
+            async with semaphore:
+                return start, await self._extract_window(prompt, text, use_cache)
+        
+        results = await asyncio.gather(*(
+            run(part, start, end) for part, (start, end) in enumerate(windows, 1)
+        ))
+        merged = merge_window_results(list(results), total_chunks=len(transcript_chunks))
+        
+        if len(windows) > 1 and merged.summary_md:
+            merged.summary_md = await self._condense_summaries(merged.summary_md, use_cache)
+        return merged
+    
+    async def _extract_window(
+        self,
+        system_prompt: str,
+        transcript_text: str,
+        use_cache: bool = True,
+    ) -> MeetingIntelligence:
+        """Run one structured extraction request."""
         # Call OpenAI with strict JSON schema
         response = await self.client.chat.completions.create(
-            model="gpt-4o-2024-08-06",  # Model with structured outputs
+            use_cache=use_cache,
+            model=EXTRACTION_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": f"Transcript:\n\n{transcript_text}"},
@@ -117,15 +345,38 @@ class ExtractionService:
         
         return MeetingIntelligence(**data)
     
-    def _build_transcript_text(self, chunks: list[dict]) -> str:
-        """Build formatted transcript text with chunk indices."""
+    async def _condense_summaries(self, partial_summaries: str, use_cache: bool = True) -> str:
+        """Reduce step: merge per-window summaries into one summary."""
+        response = await self.client.chat.completions.create(
+            use_cache=use_cache,
+            model=EXTRACTION_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "Merge these consecutive partial summaries of one meeting into a single "
+                        "concise markdown summary (2-4 paragraphs). Remove repetition. "
+                        "Do not add information that is not in the input."
+                    ),
+                },
+                {"role": "user", "content": partial_summaries},
+            ],
+            temperature=0.1,
+        )
+        return response.choices[0].message.content or partial_summaries
+    
+    def _build_transcript_lines(self, chunks: list[dict]) -> list[str]:
+        """Format transcript lines with chunk indices."""
         lines = []
         for i, chunk in enumerate(chunks):
             speaker = chunk.get("speaker", "Unknown")
             text = chunk.get("text", "")
             lines.append(f"[{i}] {speaker}: {text}")
-        
-        return "\n".join(lines)
+        return lines
+    
+    def _build_transcript_text(self, chunks: list[dict]) -> str:
+        """Build formatted transcript text with chunk indices."""
+        return "\n".join(self._build_transcript_lines(chunks))
     
     def _build_system_prompt(
         self,
@@ -13,11 +13,11 @@ ZERO FABRICATION POLICY:
 - Attach all sources to generated document
 """
 from typing import Dict, List, Optional
-from openai import AsyncOpenAI
-import httpx
+from app.http_clients import get_http_client
 import json
 from datetime import datetime
 from app.config import settings
+from app.services.llm_client import get_openai_client
 
 
 class ResearchAgent:
@@ -30,7 +30,7 @@ class ResearchAgent:
     """
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client(settings.openai_api_key, service="tasks.completion")
         self.verified_sources = []
     
     async def research_task(self, task_title: str, task_description: str) -> Dict:
@@ -101,13 +101,13 @@ Return as JSON with: topics (array), source_types (array), trusted_sources (arra
         
         for key, source in trusted_sources.items():
             try:
-                async with httpx.AsyncClient() as client:
-                    check = await client.head(source['url'], timeout=10.0, follow_redirects=True)
-                    if check.status_code == 200:
-                        verified_sources.append(source)
-                        print(f"  ✓ {source['title']} - Link verified")
-                    else:
-                        print(f"  ❌ {source['title']} - Link returned {check.status_code}")
+                client = get_http_client(source['url'])
+                check = await client.head(source['url'], timeout=10.0, follow_redirects=True)
+                if check.status_code == 200:
+                    verified_sources.append(source)
+                    print(f"  ✓ {source['title']} - Link verified")
+                else:
+                    print(f"  ❌ {source['title']} - Link returned {check.status_code}")
             except Exception as e:
                 print(f"  ⚠ {source['title']} - Could not verify: {e}")
         
@@ -131,7 +131,7 @@ class GeneratorAgent:
     """
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client(settings.openai_api_key, service="tasks.completion")
     
     async def generate_solution(
         self,
@@ -220,7 +220,7 @@ class MatcherAgent:
     """
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client(settings.openai_api_key, service="tasks.completion")
     
     async def match_to_requirements(
         self,
@@ -336,13 +336,13 @@ class QAAgent:
         
         for source in sources_used:
             try:
-                async with httpx.AsyncClient() as client:
-                    check = await client.head(source['url'], timeout=10.0, follow_redirects=True)
-                    if check.status_code != 200:
-                        broken_links.append(f"{source['title']} - Status {check.status_code}")
-                        issues.append(f"Broken link: {source['url']}")
-                    else:
-                        print(f"   ✓ {source['title']} - Link works")
+                client = get_http_client(source['url'])
+                check = await client.head(source['url'], timeout=10.0, follow_redirects=True)
+                if check.status_code != 200:
+                    broken_links.append(f"{source['title']} - Status {check.status_code}")
+                    issues.append(f"Broken link: {source['url']}")
+                else:
+                    print(f"   ✓ {source['title']} - Link works")
             except Exception as e:
                 broken_links.append(f"{source['title']} - Error: {str(e)[:50]}")
                 issues.append(f"Link verification failed: {source['url']}")
@@ -4,7 +4,7 @@ Transforms raw transcripts into normalized, compliant form
 """
 import hashlib
 import uuid
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -70,10 +70,13 @@ class Layer2NormalizationService:
             org_id
         )
         
-        # Detect PII in all segments
+        # Detect PII in all segments (one batch, with the org's known names)
+        segment_pii = await self.pii_detector.detect_pii_batch(
+            [segment.text for segment in segments],
+            org_id=org_id
+        )
         all_pii: List[Tuple[int, List[PIIEntity]]] = []
-        for i, segment in enumerate(segments):
-            pii_entities = self.pii_detector.detect_pii(segment.text)
+        for i, (segment, pii_entities) in enumerate(zip(segments, segment_pii)):
             if pii_entities:
                 all_pii.append((i, pii_entities))
                 segment.has_pii = True
@@ -171,7 +171,11 @@ class Layer3IntelligenceService:
             data = result.content.content.data
             
             # Check for fabricated fields
-            fabrication_check = self._check_fabrication(data, result.content.evidence)
+            fabrication_check = self._check_fabrication(
+                data,
+                result.content.evidence,
+                source_data
+            )
             if fabrication_check:
                 await self._log_issue(
                     org_id, "fabrication_detected",
@@ -213,11 +217,17 @@ class Layer3IntelligenceService:
     def _check_fabrication(
         self,
         data: Dict,
-        evidence: List[EvidencePointer]
+        evidence: List[EvidencePointer],
+        source_data: Optional[Dict] = None
     ) -> List[str]:
         """
         Check for fabricated data
         
+        Values are checked against the meeting's transcript and attendees
+        with ThreeAgentWorkflow.field_has_evidence (dates in any stated
+        format, emails from attendee data). Without source data, the
+        evidence quotes are checked.
+        
         Returns list of issues if fabrication detected
         """
         issues = []
@@ -229,11 +239,13 @@ class Layer3IntelligenceService:
             value = data.get(field)
             if value is not None:
                 # Must have evidence for this field
-                has_evidence = any(
-                    field.lower() in str(e.quote).lower()
-                    or str(value).lower() in str(e.quote).lower()
-                    for e in evidence
-                )
+                if source_data is not None:
+                    has_evidence = self.workflow.field_has_evidence(field, value, source_data, evidence)
+                else:
+                    has_evidence = any(
+                        str(value).lower() in str(e.quote).lower()
+                        for e in evidence
+                    )
                 
                 if not has_evidence:
                     issues.append(
@@ -246,7 +258,7 @@ class Layer3IntelligenceService:
         self,
         meeting_id: uuid.UUID
     ) -> Optional[Dict]:
-        """Load Layer 2 normalized transcript"""
+        """Load Layer 2 normalized transcript and the meeting's attendees"""
         query = """
         SELECT id, segments, has_pii
         FROM transcripts_normalized
@@ -258,10 +270,17 @@ class Layer3IntelligenceService:
         row = result.fetchone()
         
         if row:
+            attendees = await self.db.execute("""
+            SELECT p.name, p.email
+            FROM meeting_participants mp
+            JOIN people p ON p.id = mp.person_id
+            WHERE mp.meeting_id = :meeting_id
+            """, {"meeting_id": meeting_id})
             return {
                 "id": row[0],
                 "segments": row[1],
-                "has_pii": row[2]
+                "has_pii": row[2],
+                "attendees": [{"name": name, "email": email} for name, email in attendees.fetchall()]
             }
         return None
     
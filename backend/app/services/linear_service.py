@@ -1,5 +1,5 @@
 """Linear API integration for task management."""
-import httpx
+from app.http_clients import get_http_client
 from typing import List, Optional
 from app.config import settings
 
@@ -82,30 +82,30 @@ class LinearService:
         # TODO: Lookup assignee by name
         # Would need to query Linear users first and match by name
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.api_url,
-                json={"query": mutation, "variables": variables},
-                headers=self.headers,
-                timeout=10.0
-            )
-            
-            if response.status_code != 200:
-                raise ValueError(f"Linear API error: {response.text}")
-            
-            data = response.json()
-            
-            if data.get("errors"):
-                raise ValueError(f"Linear GraphQL errors: {data['errors']}")
-            
-            issue_data = data.get("data", {}).get("issueCreate", {}).get("issue", {})
-            
-            return {
-                "id": issue_data.get("id"),
-                "identifier": issue_data.get("identifier"),
-                "title": issue_data.get("title"),
-                "url": issue_data.get("url")
-            }
+        client = get_http_client(self.api_url)
+        response = await client.post(
+            self.api_url,
+            json={"query": mutation, "variables": variables},
+            headers=self.headers,
+            timeout=10.0
+        )
+        
+        if response.status_code != 200:
+            raise ValueError(f"Linear API error: {response.text}")
+        
+        data = response.json()
+        
+        if data.get("errors"):
+            raise ValueError(f"Linear GraphQL errors: {data['errors']}")
+        
+        issue_data = data.get("data", {}).get("issueCreate", {}).get("issue", {})
+        
+        return {
+            "id": issue_data.get("id"),
+            "identifier": issue_data.get("identifier"),
+            "title": issue_data.get("title"),
+            "url": issue_data.get("url")
+        }
     
     async def get_teams(self) -> List[dict]:
         """Get all teams in the workspace."""
@@ -122,21 +122,21 @@ class LinearService:
         }
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.api_url,
-                json={"query": query},
-                headers=self.headers,
-                timeout=10.0
-            )
-            
-            if response.status_code != 200:
-                raise ValueError(f"Linear API error: {response.text}")
-            
-            data = response.json()
-            teams = data.get("data", {}).get("teams", {}).get("nodes", [])
-            
-            return teams
+        client = get_http_client(self.api_url)
+        response = await client.post(
+            self.api_url,
+            json={"query": query},
+            headers=self.headers,
+            timeout=10.0
+        )
+        
+        if response.status_code != 200:
+            raise ValueError(f"Linear API error: {response.text}")
+        
+        data = response.json()
+        teams = data.get("data", {}).get("teams", {}).get("nodes", [])
+        
+        return teams
 
 
 
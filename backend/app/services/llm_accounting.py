@@ -0,0 +1,348 @@
+"""LLM call accounting: tokens, cost and latency per service and org.
+
+The shared OpenAI client (``app.services.llm_client``) reports every chat
+completion here, and the response cache reports its hits. Each call is
+attributed to the calling service (given to ``get_openai_client``) and an
+org ID, taken from ``llm_context`` or else from the pipeline stage that
+is running. Rows are buffered and written to ``llm_calls`` in batches.
+
+Spend per org and UTC day is also kept in Redis. Once an org exceeds its
+daily budget (LLM_ORG_DAILY_BUDGET_USD, overridable per org), calls are
+switched to the cheaper model from LLM_BUDGET_FALLBACK_MODELS.
+"""
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import func, insert, select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import LLMCall
+
+logger = logging.getLogger(__name__)
+
+SPEND_KEY = "llm:spend"
+
+_llm_service: ContextVar[Optional[str]] = ContextVar("llm_service", default=None)
+_llm_org: ContextVar[Optional[uuid.UUID]] = ContextVar("llm_org", default=None)
+
+
+def _parse_map(value: str) -> Dict[str, List[str]]:
+    """Parse "key:a:b,..." into {key: [a, b]} (keys lower-cased)."""
+    parsed = {}
+    for item in value.split(","):
+        parts = [p.strip() for p in item.split(":")]
+        if len(parts) >= 2 and parts[0]:
+            parsed[parts[0].lower()] = parts[1:]
+    return parsed
+
+
+def _longest_prefix(mapping: dict, model: str) -> Optional[str]:
+    model = (model or "").lower()
+    matches = [name for name in mapping if model.startswith(name)]
+    return max(matches, key=len) if matches else None
+
+
+@contextmanager
+def llm_context(service: Optional[str] = None, org_id: Union[str, uuid.UUID, None] = None) -> Iterator[None]:
+    """
+    Attribute LLM calls made inside the block.
+
+    Usage:
+        with llm_context(service="wheel.people", org_id=org_id):
+            await engine.screen_candidate(...)
+
+    service overrides the client's service name; org_id is used for
+    reporting and the org's daily budget.
+    """
+    tokens = []
+    if service is not None:
+        tokens.append((_llm_service, _llm_service.set(service)))
+    if org_id is not None:
+        tokens.append((_llm_org, _llm_org.set(uuid.UUID(str(org_id)))))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def current_service(default: Optional[str] = None) -> Optional[str]:
+    return _llm_service.get() or default
+
+
+def current_org_id() -> Optional[uuid.UUID]:
+    """Org of the current llm_context, else of the running pipeline stage."""
+    org_id = _llm_org.get()
+    if org_id is None:
+        # Imported here: app.worker imports the Celery app and its tasks
+        from app.worker.instrumentation import current_stage
+        run = current_stage()
+        org_id = run.org_id if run is not None else None
+    return org_id
+
+
+class LLMUsageRecorder:
+    """Buffers llm_calls rows, tracks per-org spend and applies budgets."""
+
+    def __init__(
+        self,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        redis_url: Optional[str] = None,
+    ):
+        self.prices = prices if prices is not None else {
+            model: (float(p[0]), float(p[1]))
+            for model, p in _parse_map(settings.llm_model_prices).items()
+            if len(p) == 2
+        }
+        self.fallback_models = {
+            model: p[0] for model, p in _parse_map(settings.llm_budget_fallback_models).items()
+        }
+        self.budgets = {
+            org: float(p[0]) for org, p in _parse_map(settings.llm_org_daily_budgets).items()
+        }
+        self.batch_size = batch_size or settings.llm_accounting_batch_size
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.llm_accounting_flush_seconds
+        self.redis_url = redis_url if redis_url is not None else settings.redis_url
+        self._redis = None
+        self._buffer: List[dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._local_spend: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.totals: Dict[Tuple[str, str], dict] = {}
+        self.dropped = 0
+
+    def _get_redis(self):
+        if self._redis is None and self.redis_url:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """USD cost from LLM_MODEL_PRICES (per 1M tokens); 0 for unknown models."""
+        name = _longest_prefix(self.prices, model)
+        if name is None:
+            return 0.0
+        input_price, output_price = self.prices[name]
+        return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+    def budget_for(self, org_id: Optional[uuid.UUID]) -> float:
+        """Daily budget in USD for org_id (0 = unlimited)."""
+        if org_id is None:
+            return 0.0
+        return self.budgets.get(str(org_id).lower(), settings.llm_org_daily_budget_usd)
+
+    @staticmethod
+    def _day() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    async def spend_today(self, org_id: uuid.UUID) -> float:
+        key = (str(org_id), self._day())
+        try:
+            redis = self._get_redis()
+            if redis is not None:
+                value = await redis.get(f"{SPEND_KEY}:{key[0]}:{key[1]}")
+                return float(value) if value else 0.0
+        except Exception as e:
+            logger.debug(f"LLM spend lookup failed, using process total: {e}")
+        return self._local_spend[key]
+
+    async def _add_spend(self, org_id: uuid.UUID, cost: float) -> None:
+        key = (str(org_id), self._day())
+        self._local_spend[key] += cost
+        try:
+            redis = self._get_redis()
+            if redis is not None:
+                redis_key = f"{SPEND_KEY}:{key[0]}:{key[1]}"
+                pipe = redis.pipeline(transaction=False)
+                pipe.incrbyfloat(redis_key, cost)
+                pipe.expire(redis_key, 2 * 24 * 3600)
+                await pipe.execute()
+        except Exception as e:
+            logger.debug(f"LLM spend update failed: {e}")
+
+    async def choose_model(self, model: str, org_id: Optional[uuid.UUID]) -> str:
+        """model, or its cheaper fallback once org_id is over today's budget."""
+        budget = self.budget_for(org_id)
+        if budget <= 0:
+            return model
+        name = _longest_prefix(self.fallback_models, model)
+        if name is None:
+            return model
+        if await self.spend_today(org_id) < budget:
+            return model
+        return self.fallback_models[name]
+
+    async def record(
+        self,
+        *,
+        model: str,
+        service: Optional[str] = None,
+        org_id: Optional[uuid.UUID] = None,
+        requested_model: Optional[str] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        latency_ms: float = 0.0,
+        queue_ms: float = 0.0,
+        cache_hit: bool = False,
+        status: str = "ok",
+    ) -> None:
+        """Account for one call; cache hits cost nothing."""
+        cost = 0.0 if cache_hit else self.cost(model, prompt_tokens, completion_tokens)
+        self._buffer.append({
+            "id": uuid.uuid4(),
+            "org_id": org_id,
+            "service": service,
+            "model": model,
+            "requested_model": requested_model if requested_model != model else None,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": cost,
+            "latency_ms": round(latency_ms, 1),
+            "queue_ms": round(queue_ms, 1),
+            "cache_hit": cache_hit,
+            "status": status,
+            "created_at": datetime.now(timezone.utc),
+        })
+
+        totals = self.totals.setdefault((service or "", model), {
+            "calls": 0, "errors": 0, "cache_hits": 0, "prompt_tokens": 0,
+            "completion_tokens": 0, "cost_usd": 0.0, "latency_ms": 0.0,
+        })
+        totals["calls"] += 1
+        totals["errors"] += status != "ok"
+        totals["cache_hits"] += cache_hit
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+        totals["cost_usd"] += cost
+        totals["latency_ms"] += latency_ms
+
+        if org_id is not None and cost > 0:
+            await self._add_spend(org_id, cost)
+
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_seconds)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered rows in one INSERT; rows are dropped if that fails."""
+        rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+        try:
+            await self._write(rows)
+        except Exception as e:
+            # Accounting must never fail the call it describes
+            self.dropped += len(rows)
+            logger.warning(f"Failed to record {len(rows)} LLM calls: {e}")
+
+    async def _write(self, rows: List[dict]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(LLMCall), rows)
+            await db.commit()
+
+    def stats(self) -> dict:
+        """Totals for this process since start, per service and model."""
+        return {
+            "buffered": len(self._buffer),
+            "dropped": self.dropped,
+            "calls": [
+                {
+                    "service": service or None,
+                    "model": model,
+                    **{k: round(v, 6) if isinstance(v, float) else v for k, v in totals.items()},
+                    "avg_latency_ms": round(totals["latency_ms"] / totals["calls"], 1),
+                }
+                for (service, model), totals in sorted(self.totals.items())
+            ],
+        }
+
+
+async def summarize_llm_calls(hours: int = 24, org_id: Optional[uuid.UUID] = None) -> dict:
+    """
+    Spend, tokens and latency from llm_calls over the last hours.
+
+    With org_id only that org's calls are included.
+
+    Returns:
+        {"since", "services": [...per service and model], "orgs": [...today's spend per org]}
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    recorder = get_llm_usage()
+    scope = [LLMCall.org_id == org_id] if org_id is not None else []
+    async with AsyncSessionLocal() as db:
+        by_service = await db.execute(
+            select(
+                LLMCall.service,
+                LLMCall.model,
+                func.count().label("calls"),
+                func.count().filter(LLMCall.cache_hit).label("cache_hits"),
+                func.count().filter(LLMCall.status != "ok").label("errors"),
+                func.count().filter(LLMCall.requested_model.isnot(None)).label("downgraded"),
+                func.sum(LLMCall.prompt_tokens).label("prompt_tokens"),
+                func.sum(LLMCall.completion_tokens).label("completion_tokens"),
+                func.sum(LLMCall.cost_usd).label("cost_usd"),
+                func.percentile_cont(0.5).within_group(LLMCall.latency_ms).label("p50_ms"),
+                func.percentile_cont(0.95).within_group(LLMCall.latency_ms).label("p95_ms"),
+                func.avg(LLMCall.queue_ms).label("avg_queue_ms"),
+            )
+            .where(LLMCall.created_at >= since, *scope)
+            .group_by(LLMCall.service, LLMCall.model)
+            .order_by(func.sum(LLMCall.cost_usd).desc())
+        )
+        by_org = await db.execute(
+            select(LLMCall.org_id, func.count(), func.sum(LLMCall.cost_usd))
+            .where(LLMCall.created_at >= today, LLMCall.org_id.isnot(None), *scope)
+            .group_by(LLMCall.org_id)
+            .order_by(func.sum(LLMCall.cost_usd).desc())
+        )
+        services = [
+            {
+                **row._mapping,
+                "cost_usd": round(row.cost_usd or 0.0, 4),
+                "p50_ms": round(row.p50_ms or 0.0, 1),
+                "p95_ms": round(row.p95_ms or 0.0, 1),
+                "avg_queue_ms": round(row.avg_queue_ms or 0.0, 1),
+            }
+            for row in by_service.all()
+        ]
+        orgs = [
+            {
+                "org_id": str(org_id),
+                "calls": calls,
+                "cost_usd_today": round(cost or 0.0, 4),
+                "daily_budget_usd": recorder.budget_for(org_id),
+            }
+            for org_id, calls, cost in by_org.all()
+        ]
+    return {"since": since.isoformat(), "services": services, "orgs": orgs}
+
+
+_llm_usage: Optional[LLMUsageRecorder] = None
+
+
+def get_llm_usage() -> LLMUsageRecorder:
+    """Get or create the process-wide LLM usage recorder."""
+    global _llm_usage
+    if _llm_usage is None:
+        _llm_usage = LLMUsageRecorder()
+    return _llm_usage
+
+
+async def flush_llm_usage() -> None:
+    """Write any buffered rows (call on shutdown)."""
+    if _llm_usage is not None:
+        await _llm_usage.flush()
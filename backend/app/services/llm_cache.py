@@ -0,0 +1,284 @@
+"""Shared response cache for OpenAI chat completions.
+
+Wrap a client with ``with_llm_cache`` and its ``chat.completions.create``
+calls are memoized on the request (model, messages, response_format,
+temperature and any other sampling parameters). Entries live in Redis so
+every API and worker process shares them; if Redis is unreachable a
+per-process LRU is used instead. Pass ``use_cache=False`` to bypass the
+cache for a single call.
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from openai.types.chat import ChatCompletion
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llmcache"
+
+# After a Redis error, serve from memory for this long before retrying
+REDIS_RETRY_SECONDS = 30.0
+
+
+def cache_key(request: dict) -> str:
+    """Stable hash of a chat.completions request."""
+    payload = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU with TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache bounded by entry count.
+
+    Values are stored with a TTL; a sorted set indexes keys by last use so
+    the least recently used entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, url: str, max_entries: int, ttl_seconds: int):
+        import redis.asyncio as aioredis
+
+        self.redis = aioredis.from_url(url)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.index_key = f"{KEY_PREFIX}:index"
+
+    def _key(self, key: str) -> str:
+        return f"{KEY_PREFIX}:entry:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.redis.get(self._key(key))
+        if value is None:
+            return None
+        await self.redis.zadd(self.index_key, {key: time.time()}, xx=True)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str) -> None:
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(self._key(key), value, ex=self.ttl_seconds)
+        pipe.zadd(self.index_key, {key: now})
+        pipe.zremrangebyscore(self.index_key, "-inf", now - self.ttl_seconds)
+        pipe.zcard(self.index_key)
+        size = (await pipe.execute())[-1]
+
+        overflow = size - self.max_entries
+        if overflow > 0:
+            evicted = await self.redis.zpopmin(self.index_key, overflow)
+            if evicted:
+                await self.redis.delete(*[
+                    self._key(k.decode("utf-8") if isinstance(k, bytes) else k)
+                    for k, _ in evicted
+                ])
+
+    async def clear(self) -> None:
+        keys = [k async for k in self.redis.scan_iter(match=f"{KEY_PREFIX}:entry:*")]
+        if keys:
+            await self.redis.delete(*keys)
+        await self.redis.delete(self.index_key)
+
+
+class LLMCache:
+    """Chat completion cache with hit/miss counters."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.enabled = settings.llm_cache_enabled if enabled is None else enabled
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.llm_cache_ttl_seconds
+        self.memory = MemoryCacheBackend(min(self.max_entries, 1000), self.ttl_seconds)
+        self.redis: Optional[RedisCacheBackend] = None
+        url = redis_url if redis_url is not None else (settings.llm_cache_redis_url or settings.redis_url)
+        if url:
+            try:
+                self.redis = RedisCacheBackend(url, self.max_entries, self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"LLM cache: Redis unavailable, using in-process cache: {e}")
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._redis_down_until = 0.0
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception) -> None:
+        self.errors += 1
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.debug(f"LLM cache Redis error, using in-process cache: {e}")
+
+    async def get(self, key: str) -> Optional[str]:
+        value = None
+        if self._use_redis():
+            try:
+                value = await self.redis.get(key)
+            except Exception as e:
+                self._redis_failed(e)
+                value = await self.memory.get(key)
+        else:
+            value = await self.memory.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        if self._use_redis():
+            try:
+                await self.redis.set(key, value)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        await self.memory.set(key, value)
+
+    async def clear(self) -> None:
+        await self.memory.clear()
+        if self.redis is not None:
+            await self.redis.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if self.redis is not None else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachedCompletions:
+    """``chat.completions`` proxy that consults the cache first."""
+
+    def __init__(self, completions: Any, cache: LLMCache):
+        self._completions = completions
+        self._cache = cache
+
+    async def create(self, *, use_cache: bool = True, **kwargs) -> Any:
+        """
+        Same signature as ``chat.completions.create`` plus ``use_cache``.
+
+        Streaming and multi-choice (n > 1) requests are never cached.
+        The key uses the model that will actually answer: an org over its
+        budget gets the fallback model, and that answer must not be served
+        to callers who get the requested one.
+        """
+        if (
+            not use_cache
+            or not self._cache.enabled
+            or kwargs.get("stream")
+            or kwargs.get("n", 1) != 1
+        ):
+            return await self._completions.create(**kwargs)
+
+        resolve = getattr(self._completions, "resolve_model", None)
+        served = await resolve(kwargs) if resolve is not None else None
+        key = cache_key({**kwargs, "model": served} if served else kwargs)
+        started_at = time.perf_counter()
+        cached = await self._cache.get(key)
+        if cached is not None:
+            try:
+                response = ChatCompletion.model_validate_json(cached)
+            except Exception as e:
+                logger.debug(f"Discarding unreadable LLM cache entry: {e}")
+            else:
+                # The shared client accounts for hits too (see llm_accounting)
+                record_hit = getattr(self._completions, "record_cache_hit", None)
+                if record_hit is not None:
+                    await record_hit(
+                        kwargs, response, (time.perf_counter() - started_at) * 1000, served_model=served,
+                    )
+                return response
+
+        if resolve is not None:
+            response = await self._completions.create(served_model=served, **kwargs)
+        else:
+            response = await self._completions.create(**kwargs)
+        try:
+            await self._cache.set(key, response.model_dump_json())
+        except Exception as e:
+            logger.debug(f"LLM cache store failed: {e}")
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._completions, name)
+
+
+class _CachedChat:
+    def __init__(self, chat: Any, cache: LLMCache):
+        self._chat = chat
+        self.completions = CachedCompletions(chat.completions, cache)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._chat, name)
+
+
+class CachedOpenAIClient:
+    """AsyncOpenAI proxy whose chat completions go through the cache."""
+
+    def __init__(self, client: Any, cache: LLMCache):
+        self._client = client
+        self.chat = _CachedChat(client.chat, cache)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+_llm_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Get or create the process-wide LLM cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
+
+
+def with_llm_cache(client: Any, cache: Optional[LLMCache] = None) -> Any:
+    """Wrap an AsyncOpenAI client so chat completions are cached."""
+    if client is None:
+        return None
+    return CachedOpenAIClient(client, cache or get_llm_cache())
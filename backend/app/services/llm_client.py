@@ -0,0 +1,641 @@
+"""Process-wide OpenAI client with a shared rate limiter.
+
+Services get their client from ``get_openai_client`` instead of building
+their own ``AsyncOpenAI``. Every ``chat.completions.create`` call first
+takes a slot from a token bucket per model that tracks both requests per
+minute and tokens per minute (OPENAI_RATE_LIMITS). The buckets live in
+Redis, so the API process and all Celery workers draw from the same
+budget; if Redis is unreachable each process falls back to its own
+buckets.
+
+Request tokens are estimated with tiktoken (prompt plus max_tokens) and
+corrected from the response's usage once it arrives (for streams, from
+the streamed text once the stream ends). If tiktoken cannot load an
+encoding (its files are downloaded on first use), characters / 4 is used
+instead, so an unreachable download never fails a completion. Callers in a process queue in
+FIFO order per model and wait for capacity instead of failing; a 429
+that still gets through pauses the model for every process and the call
+is queued again. Each call is also reported to
+``app.services.llm_accounting`` under the service the client was
+created for.
+"""
+import asyncio
+import functools
+import json
+import logging
+import random
+import time
+import weakref
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import tiktoken
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from app.config import settings
+from app.services.llm_accounting import LLMUsageRecorder, current_org_id, current_service, get_llm_usage
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "openai:ratelimit"
+
+# After a Redis error, use in-process buckets for this long before retrying
+REDIS_RETRY_SECONDS = 30.0
+
+# Rough prompt cost of an image part (low detail)
+IMAGE_TOKENS = 85
+
+# After tiktoken fails to load an encoding, estimate tokens from the text
+# length for this long before trying again
+ENCODING_RETRY_SECONDS = 300.0
+
+# Refill both buckets, then take one request and `cost` tokens if the
+# bucket holds at least min(cost, capacity). A request larger than the
+# bucket runs once it is full and leaves it in debt. Returns the wait in
+# milliseconds (0 = granted).
+TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rpm, tpm = tonumber(ARGV[2]), tonumber(ARGV[3])
+local req_cap, tok_cap = tonumber(ARGV[4]), tonumber(ARGV[5])
+local cost = tonumber(ARGV[6])
+local state = redis.call('HMGET', KEYS[1], 'req', 'tok', 'ts', 'paused_until')
+local req = tonumber(state[1]) or req_cap
+local tok = tonumber(state[2]) or tok_cap
+local ts = tonumber(state[3]) or now
+local paused_until = tonumber(state[4]) or 0
+if paused_until > now then
+    return math.ceil((paused_until - now) * 1000)
+end
+local elapsed = math.max(0, now - ts)
+req = math.min(req_cap, req + elapsed * rpm / 60)
+tok = math.min(tok_cap, tok + elapsed * tpm / 60)
+local wait = 0
+if req < 1 then
+    wait = (1 - req) * 60 / rpm
+end
+local need = math.min(cost, tok_cap)
+if tok < need then
+    wait = math.max(wait, (need - tok) * 60 / tpm)
+end
+if wait == 0 then
+    req = req - 1
+    tok = tok - cost
+end
+redis.call('HSET', KEYS[1], 'req', req, 'tok', tok, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 300)
+return math.ceil(wait * 1000)
+"""
+
+
+def parse_rate_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "model:rpm:tpm,..." into {model: (rpm, tpm)}."""
+    limits = {}
+    for item in value.split(","):
+        parts = [p.strip() for p in item.split(":")]
+        if len(parts) == 3 and parts[0]:
+            limits[parts[0].lower()] = (int(parts[1]), int(parts[2]))
+    return limits
+
+
+class ApproximateEncoding:
+    """Stand-in for a tiktoken encoding: one token per four characters."""
+
+    name = "approximate"
+
+    def encode(self, text: str, **kwargs) -> List[int]:
+        return [0] * -(-len(text) // 4)
+
+
+APPROXIMATE_ENCODING = ApproximateEncoding()
+
+_encoding_down_until = 0.0
+
+
+@functools.lru_cache(maxsize=16)
+def _tiktoken_encoding(model: str) -> "tiktoken.Encoding":
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _encoding(model: str) -> "tiktoken.Encoding":
+    """tiktoken encoding for a model, or APPROXIMATE_ENCODING if it cannot be loaded."""
+    global _encoding_down_until
+    if time.monotonic() < _encoding_down_until:
+        return APPROXIMATE_ENCODING
+    try:
+        return _tiktoken_encoding(model)
+    except Exception as e:
+        _encoding_down_until = time.monotonic() + ENCODING_RETRY_SECONDS
+        logger.warning("tiktoken encoding unavailable, estimating tokens from length: %s", e)
+        return APPROXIMATE_ENCODING
+
+
+def prompt_tokens(request: dict) -> int:
+    """Prompt tokens of a chat.completions request, counted with tiktoken (see _encoding)."""
+    encoding = _encoding(request.get("model") or "")
+    prompt = 3
+    for message in request.get("messages") or []:
+        prompt += 4
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+        if isinstance(content, str):
+            prompt += len(encoding.encode(content, disallowed_special=()))
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    prompt += len(encoding.encode(part.get("text", ""), disallowed_special=()))
+                else:
+                    prompt += IMAGE_TOKENS
+    for key in ("tools", "functions", "response_format"):
+        if isinstance(request.get(key), (dict, list)):
+            prompt += len(encoding.encode(json.dumps(request[key]), disallowed_special=()))
+    return prompt
+
+
+def estimate_tokens(request: dict) -> int:
+    """
+    Tokens a chat.completions request counts against TPM.
+
+    Prompt tokens are counted with tiktoken (message overhead included);
+    the completion is max_tokens, or OPENAI_COMPLETION_TOKEN_ESTIMATE when
+    the request does not set it.
+    """
+    completion = (
+        request.get("max_tokens")
+        or request.get("max_completion_tokens")
+        or settings.openai_completion_token_estimate
+    )
+    return prompt_tokens(request) + completion * request.get("n", 1)
+
+
+class _LocalBuckets:
+    """In-process equivalent of TAKE_SCRIPT."""
+
+    def __init__(self):
+        self._state: Dict[str, dict] = {}
+
+    def take(self, key: str, now: float, rpm: int, tpm: int, req_cap: float, tok_cap: float, cost: int) -> float:
+        state = self._state.setdefault(key, {"req": req_cap, "tok": tok_cap, "ts": now, "paused_until": 0.0})
+        if state["paused_until"] > now:
+            return state["paused_until"] - now
+        elapsed = max(0.0, now - state["ts"])
+        req = min(req_cap, state["req"] + elapsed * rpm / 60)
+        tok = min(tok_cap, state["tok"] + elapsed * tpm / 60)
+        wait = 0.0
+        if req < 1:
+            wait = (1 - req) * 60 / rpm
+        need = min(cost, tok_cap)
+        if tok < need:
+            wait = max(wait, (need - tok) * 60 / tpm)
+        if wait == 0:
+            req -= 1
+            tok -= cost
+        state.update(req=req, tok=tok, ts=now)
+        return wait
+
+    def refund(self, key: str, tokens: int) -> None:
+        if key in self._state:
+            self._state[key]["tok"] += tokens
+
+    def pause(self, key: str, until: float) -> None:
+        state = self._state.setdefault(key, {"req": 0.0, "tok": 0.0, "ts": time.time(), "paused_until": 0.0})
+        state["paused_until"] = max(state["paused_until"], until)
+
+
+class RateLimiter:
+    """
+    Per-model RPM/TPM token buckets shared through Redis.
+
+    A bucket holds burst_seconds worth of its per-minute limit, so a
+    fresh bucket cannot spend a whole minute's budget at once. Models
+    with no configured limit are not limited.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        redis_url: Optional[str] = None,
+        burst_seconds: Optional[float] = None,
+    ):
+        self.limits = limits if limits is not None else parse_rate_limits(settings.openai_rate_limits)
+        self.burst_seconds = burst_seconds if burst_seconds is not None else settings.openai_rate_limit_burst_seconds
+        url = redis_url if redis_url is not None else (settings.openai_rate_limit_redis_url or settings.redis_url)
+        self.redis = None
+        if url:
+            try:
+                import redis.asyncio as aioredis
+                self.redis = aioredis.from_url(url)
+            except Exception as e:
+                logger.warning(f"OpenAI rate limiter: Redis unavailable, limiting per process: {e}")
+        self.local = _LocalBuckets()
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._redis_down_until = 0.0
+        self.granted = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self.rate_limited = 0
+
+    def limit_for(self, model: str) -> Optional[Tuple[int, int]]:
+        """(rpm, tpm) of the longest configured prefix of model, if any."""
+        model = (model or "").lower()
+        matches = [name for name in self.limits if model.startswith(name)]
+        return self.limits[max(matches, key=len)] if matches else None
+
+    def _key(self, model: str) -> str:
+        return f"{KEY_PREFIX}:{model.lower()}"
+
+    def _queue(self, model: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        queues = self._queues.get(loop)
+        if queues is None:
+            queues = self._queues[loop] = {}
+        if model not in queues:
+            queues[model] = asyncio.Lock()
+        return queues[model]
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception) -> None:
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning(f"OpenAI rate limiter Redis error, limiting per process: {e}")
+
+    async def _take(self, model: str, rpm: int, tpm: int, cost: int) -> float:
+        req_cap = max(1.0, rpm * self.burst_seconds / 60)
+        tok_cap = max(1.0, tpm * self.burst_seconds / 60)
+        now = time.time()
+        if self._use_redis():
+            try:
+                wait_ms = await self.redis.eval(
+                    TAKE_SCRIPT, 1, self._key(model), now, rpm, tpm, req_cap, tok_cap, cost
+                )
+                return int(wait_ms) / 1000
+            except Exception as e:
+                self._redis_failed(e)
+        return self.local.take(self._key(model), now, rpm, tpm, req_cap, tok_cap, cost)
+
+    async def acquire(self, model: str, tokens: int) -> None:
+        """Wait, in FIFO order with other callers for model, until the request fits."""
+        limit = self.limit_for(model)
+        if limit is None:
+            return
+        rpm, tpm = limit
+        async with self._queue(model):
+            waited = False
+            while True:
+                wait = await self._take(model, rpm, tpm, tokens)
+                if wait <= 0:
+                    break
+                waited = True
+                self.waited_seconds += wait
+                # Jitter so queue heads in different processes do not poll in lockstep
+                await asyncio.sleep(wait + random.uniform(0, 0.05))
+        self.granted += 1
+        self.waits += waited
+
+    async def settle(self, model: str, reserved: int, used: int) -> None:
+        """Return (or charge) the difference between estimated and actual tokens."""
+        if self.limit_for(model) is None or used == reserved:
+            return
+        delta = reserved - used
+        if self._use_redis():
+            try:
+                if await self.redis.exists(self._key(model)):
+                    await self.redis.hincrbyfloat(self._key(model), "tok", delta)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        self.local.refund(self._key(model), delta)
+
+    async def pause(self, model: str, seconds: float) -> None:
+        """Stop granting model for seconds in every process (after a 429)."""
+        self.rate_limited += 1
+        if self.limit_for(model) is None:
+            # Unlimited models still back off, just without coordination
+            await asyncio.sleep(seconds)
+            return
+        until = time.time() + seconds
+        if self._use_redis():
+            try:
+                key = self._key(model)
+                current = await self.redis.hget(key, "paused_until")
+                if current is None or float(current) < until:
+                    await self.redis.hset(key, "paused_until", until)
+                    await self.redis.expire(key, 300)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        self.local.pause(self._key(model), until)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis" if self.redis is not None else "memory",
+            "granted": self.granted,
+            "waits": self.waits,
+            "waited_seconds": round(self.waited_seconds, 3),
+            "rate_limited": self.rate_limited,
+        }
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class LimitedCompletions:
+    """``chat.completions`` proxy that takes a rate limit slot per call."""
+
+    def __init__(self, owner: "SharedOpenAIClient"):
+        self._owner = owner
+
+    @property
+    def service(self) -> Optional[str]:
+        return self._owner.service
+
+    async def resolve_model(self, kwargs: dict) -> str:
+        """The model create() would call: the requested one, or the org's budget fallback."""
+        requested = kwargs.get("model") or ""
+        usage = self._owner.usage
+        if usage is None:
+            return requested
+        return await usage.choose_model(requested, current_org_id())
+
+    async def create(self, *, served_model: Optional[str] = None, **kwargs) -> Any:
+        """
+        Same signature as ``chat.completions.create`` plus ``served_model``.
+
+        Rate limits (429) and transient errors are retried up to
+        OPENAI_MAX_RETRIES times; a 429 pauses the model for all callers.
+        With accounting on, the call is recorded and the org's daily
+        budget may switch it to a cheaper model. served_model is that
+        choice when the caller already made it with resolve_model (the
+        response cache keys on it). With stream=True the stream is settled
+        and recorded once it ends (see _AccountedStream).
+        """
+        limiter = self._owner.limiter
+        usage = self._owner.usage
+        requested = kwargs.get("model") or ""
+        org_id = None
+        if usage is not None:
+            org_id = current_org_id()
+            if served_model is None:
+                served_model = await usage.choose_model(requested, org_id)
+        if served_model and served_model != requested:
+            kwargs = {**kwargs, "model": served_model}
+        model = kwargs.get("model") or ""
+        reserved = estimate_tokens(kwargs)
+        queue_ms = 0.0
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            await limiter.acquire(model, reserved)
+            started_at = time.perf_counter()
+            queue_ms += (started_at - queued_at) * 1000
+            try:
+                response = await self._owner._chat_client().chat.completions.create(**kwargs)
+            except Exception as e:
+                retry = attempt < settings.openai_max_retries and isinstance(
+                    e, (RateLimitError, APIConnectionError, InternalServerError)
+                )
+                # Quota exhaustion is also a 429 but waiting does not help
+                if isinstance(e, RateLimitError) and getattr(e, "code", None) == "insufficient_quota":
+                    retry = False
+                if not retry:
+                    if usage is not None:
+                        await self._record(usage, model, requested, org_id, None, started_at, queue_ms, status="error")
+                    raise
+                if isinstance(e, RateLimitError):
+                    await limiter.pause(model, _retry_after(e) or min(2 ** attempt, 30))
+                else:
+                    await asyncio.sleep(min(0.5 * 2 ** attempt, 8) + random.uniform(0, 0.25))
+            else:
+                if kwargs.get("stream"):
+                    return _AccountedStream(self, response, kwargs, reserved, requested, org_id, started_at, queue_ms)
+                tokens = getattr(response, "usage", None)
+                if tokens is not None and getattr(tokens, "total_tokens", None):
+                    await limiter.settle(model, reserved, tokens.total_tokens)
+                if usage is not None:
+                    await self._record(usage, model, requested, org_id, tokens, started_at, queue_ms)
+                return response
+            attempt += 1
+
+    async def _record(self, usage, model, requested, org_id, tokens, started_at, queue_ms, status="ok", cache_hit=False):
+        try:
+            await usage.record(
+                model=model,
+                requested_model=requested,
+                service=current_service(self.service),
+                org_id=org_id,
+                prompt_tokens=getattr(tokens, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(tokens, "completion_tokens", 0) or 0,
+                latency_ms=(time.perf_counter() - started_at) * 1000,
+                queue_ms=queue_ms,
+                cache_hit=cache_hit,
+                status=status,
+            )
+        except Exception as e:
+            logger.debug(f"LLM accounting failed: {e}")
+
+    async def record_cache_hit(
+        self, request: dict, response: Any, latency_ms: float, served_model: Optional[str] = None,
+    ) -> None:
+        """Called by the response cache when it answers without the API."""
+        usage = self._owner.usage
+        if usage is None:
+            return
+        requested = request.get("model") or ""
+        await self._record(
+            usage, served_model or requested, requested, current_org_id(), getattr(response, "usage", None),
+            time.perf_counter() - latency_ms / 1000, 0.0, cache_hit=True,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._owner._chat_client().chat.completions, name)
+
+
+class _AccountedStream:
+    """
+    Streamed completion that settles its rate limit reservation and
+    records usage when it ends.
+
+    Stream chunks carry no usage, so completion tokens are counted with
+    tiktoken from the received deltas. A stream closed before its end
+    (e.g. the SSE client went away) is recorded as "cancelled".
+    """
+
+    def __init__(self, completions: LimitedCompletions, stream: Any, request: dict, reserved: int,
+                 requested: str, org_id, started_at: float, queue_ms: float):
+        self._completions = completions
+        self._stream = stream
+        self._request = request
+        self._reserved = reserved
+        self._requested = requested
+        self._org_id = org_id
+        self._started_at = started_at
+        self._queue_ms = queue_ms
+        self._parts: List[str] = []
+        self._finished = False
+
+    def __aiter__(self) -> "_AccountedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            await self._finish("ok")
+            raise
+        except Exception:
+            await self._finish("error")
+            raise
+        for choice in getattr(chunk, "choices", None) or []:
+            content = getattr(choice.delta, "content", None)
+            if content:
+                self._parts.append(content)
+        return chunk
+
+    async def close(self) -> None:
+        await self._finish("cancelled")
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            await close()
+
+    async def _finish(self, status: str) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        owner = self._completions._owner
+        model = self._request.get("model") or ""
+        prompt = prompt_tokens(self._request)
+        completion = len(_encoding(model).encode("".join(self._parts), disallowed_special=()))
+        tokens = SimpleNamespace(prompt_tokens=prompt, completion_tokens=completion, total_tokens=prompt + completion)
+        await owner.limiter.settle(model, self._reserved, tokens.total_tokens)
+        if owner.usage is not None:
+            await self._completions._record(
+                owner.usage, model, self._requested, self._org_id, tokens,
+                self._started_at, self._queue_ms, status=status,
+            )
+
+
+async def stream_text(stream: Any) -> AsyncIterator[str]:
+    """
+    Content deltas of a streamed chat completion (``stream=True``).
+
+    The stream is closed when the generator is, so abandoning it
+    midway stops the generation.
+    """
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            await close()
+
+
+class _LimitedChat:
+    def __init__(self, owner: "SharedOpenAIClient"):
+        self._owner = owner
+        self.completions = LimitedCompletions(owner)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._owner._client().chat, name)
+
+
+class _ClientPool:
+    """One AsyncOpenAI (plus a no-retry copy for chat) per event loop for an API key."""
+
+    def __init__(self, api_key: Optional[str]):
+        self.api_key = api_key
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncOpenAI, AsyncOpenAI]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self) -> Tuple[AsyncOpenAI, AsyncOpenAI]:
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            client = AsyncOpenAI(api_key=self.api_key)
+            # Chat retries are handled by LimitedCompletions, which knows about the limiter
+            clients = self._clients[loop] = (client, client.with_options(max_retries=0))
+        return clients
+
+
+class SharedOpenAIClient:
+    """
+    AsyncOpenAI facade shared by all services in a process.
+
+    The underlying AsyncOpenAI (and its connection pool) is created per
+    event loop on first use and shared by every service using the same
+    API key. Chat completions go through the rate limiter and, when
+    usage is given, are accounted to service; any other attribute is the
+    loop's AsyncOpenAI attribute.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        limiter: RateLimiter,
+        service: Optional[str] = None,
+        usage: Optional[LLMUsageRecorder] = None,
+        pool: Optional[_ClientPool] = None,
+    ):
+        self.api_key = api_key
+        self.limiter = limiter
+        self.service = service
+        self.usage = usage
+        self._pool = pool or _ClientPool(api_key)
+        self.chat = _LimitedChat(self)
+
+    def _client(self) -> AsyncOpenAI:
+        return self._pool.get()[0]
+
+    def _chat_client(self) -> AsyncOpenAI:
+        return self._pool.get()[1]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client(), name)
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_pools: Dict[Optional[str], _ClientPool] = {}
+_openai_clients: Dict[Tuple[Optional[str], Optional[str]], SharedOpenAIClient] = {}
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the process-wide OpenAI rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def get_openai_client(api_key: Optional[str] = None, service: Optional[str] = None) -> SharedOpenAIClient:
+    """
+    Process-wide rate-limited OpenAI client (defaults to OPENAI_API_KEY).
+
+    service names the caller in llm_calls (e.g. "extraction",
+    "translation"); llm_context can override it per block.
+    """
+    key = api_key or settings.openai_api_key
+    client = _openai_clients.get((key, service))
+    if client is None:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _ClientPool(key)
+        usage = get_llm_usage() if settings.llm_accounting_enabled else None
+        client = _openai_clients[(key, service)] = SharedOpenAIClient(
+            key, get_rate_limiter(), service=service, usage=usage, pool=pool
+        )
+    return client
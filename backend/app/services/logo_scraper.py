@@ -3,7 +3,7 @@ Logo Scraper Service
 Automatically fetch company logos and info from websites.
 Similar to HubSpot/Clearbit enrichment.
 """
-import httpx
+from app.http_clients import get_http_client
 from typing import Optional, Dict
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
@@ -41,46 +41,46 @@ class LogoScraper:
         # Method 1: Clearbit Logo API (free, no auth needed)
         try:
             clearbit_url = f"https://logo.clearbit.com/{domain}"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(clearbit_url, timeout=5.0)
-                if response.status_code == 200:
-                    result['logo_url'] = clearbit_url
-                    result['scrape_success'] = True
-                    result['scrape_method'] = 'clearbit'
+            client = get_http_client(clearbit_url)
+            response = await client.get(clearbit_url, timeout=5.0)
+            if response.status_code == 200:
+                result['logo_url'] = clearbit_url
+                result['scrape_success'] = True
+                result['scrape_method'] = 'clearbit'
         except:
             pass
         
         # Method 2: Favicon from website
         try:
             website_url = f"https://{domain}" if not domain.startswith('http') else domain
-            async with httpx.AsyncClient() as client:
-                response = await client.get(website_url, timeout=10.0, follow_redirects=True)
+            client = get_http_client(website_url)
+            response = await client.get(website_url, timeout=10.0, follow_redirects=True)
+            
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'html.parser')
                 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Get favicon
-                    favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
-                    if favicon and favicon.get('href'):
-                        favicon_url = favicon['href']
-                        if not favicon_url.startswith('http'):
-                            # Relative URL
-                            base_url = f"{urlparse(website_url).scheme}://{urlparse(website_url).netloc}"
-                            favicon_url = base_url + favicon_url
-                        result['favicon_url'] = favicon_url
-                    
-                    # Get company name from title or meta
-                    title = soup.find('title')
-                    if title:
-                        result['company_name'] = title.get_text().strip()
-                    
-                    # Get description from meta
-                    description = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
-                    if description and description.get('content'):
-                        result['description'] = description['content'][:500]
-                    
-                    result['scrape_success'] = True
-                    result['scrape_method'] = 'website_parser'
+                # Get favicon
+                favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
+                if favicon and favicon.get('href'):
+                    favicon_url = favicon['href']
+                    if not favicon_url.startswith('http'):
+                        # Relative URL
+                        base_url = f"{urlparse(website_url).scheme}://{urlparse(website_url).netloc}"
+                        favicon_url = base_url + favicon_url
+                    result['favicon_url'] = favicon_url
+                
+                # Get company name from title or meta
+                title = soup.find('title')
+                if title:
+                    result['company_name'] = title.get_text().strip()
+                
+                # Get description from meta
+                description = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
+                if description and description.get('content'):
+                    result['description'] = description['content'][:500]
+                
+                result['scrape_success'] = True
+                result['scrape_method'] = 'website_parser'
         except:
             pass
         
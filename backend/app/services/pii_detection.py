@@ -1,13 +1,31 @@
 """
 PII Detection Service
 GDPR Compliance - Tag all personal identifiable information
+
+All regex classes are compiled into one alternation, so a text is
+scanned once for every kind of structured PII. Names from the org's
+people and organizations tables are matched with an Aho-Corasick
+automaton over words, built per org and rebuilt when those tables
+change. detect_pii_batch scans all segments of a transcript in a single
+pass over the joined text.
 """
+import bisect
+import logging
 import re
+import string
+import time
 import uuid
-from typing import List, Dict, Tuple
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 from pydantic import BaseModel
+from sqlalchemy import text as sql_text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
 class PIIEntity(BaseModel):
     """Detected PII entity"""
     entity_type: str  # "person_name", "email", "phone", "address", "company", "financial"
@@ -18,6 +36,324 @@ class PIIEntity(BaseModel):
     confidence: float
     detection_method: str  # "regex", "ner", "manual"
 
+class PIIKind(NamedTuple):
+    """How matches of one pattern or name list are tagged"""
+    entity_type: str
+    redacted_text: str
+    confidence: float
+    detection_method: str
+
+
+# Regex classes in priority order: where several match at the same
+# position the first one wins, and matches never overlap.
+PII_PATTERNS: List[Tuple[str, PIIKind, str]] = [
+    ("email", PIIKind("email", "[EMAIL]", 1.0, "regex"),
+     r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    # SSN: XXX-XX-XXXX
+    ("ssn", PIIKind("financial_ssn", "[SSN]", 1.0, "regex"),
+     r'\b\d{3}-\d{2}-\d{4}\b'),
+    # Credit card (simplified)
+    ("credit_card", PIIKind("financial_cc", "[CREDIT_CARD]", 0.90, "regex"),
+     r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b'),
+    # US phone patterns: +1 123-456-7890, (123) 456-7890, 123-456-7890
+    ("phone_intl", PIIKind("phone", "[PHONE]", 0.95, "regex"),
+     r'\+1\s?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'),
+    ("phone_paren", PIIKind("phone", "[PHONE]", 0.95, "regex"),
+     r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}'),
+    ("phone", PIIKind("phone", "[PHONE]", 0.95, "regex"),
+     r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'),
+    # Capitalized word pairs that might be names. NOT production-ready:
+    # known names come from the org's dictionary (see NameAutomaton).
+    ("name", PIIKind("person_name", "[NAME]", 0.70, "pattern"),
+     r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'),
+]
+
+# Every match must follow a non-word character (texts are scanned with a
+# leading separator). Starting the pattern with a character class lets
+# re skip ahead in C to the next candidate, which makes one combined pass
+# cheaper than the separate ones; the match is in the named group.
+PII_REGEX = re.compile(
+    r"[^\w](?:" + "|".join(f"(?P<{group}>{pattern})" for group, _, pattern in PII_PATTERNS) + ")"
+)
+PII_KINDS: Dict[str, PIIKind] = {group: kind for group, kind, _ in PII_PATTERNS}
+
+# Dictionary matches, by the table the name came from
+DICTIONARY_KINDS: Dict[str, PIIKind] = {
+    "person": PIIKind("person_name", "[NAME]", 0.95, "dictionary"),
+    "organization": PIIKind("company", "[COMPANY]", 0.90, "dictionary"),
+}
+
+# Joins (and leads) the texts of a batch scan. No pattern can match
+# across it, and its middle character is a word no name contains.
+SEGMENT_SEPARATOR = " \x00 "
+
+# Shorter names (initials, "AB") would match everywhere
+MIN_NAME_CHARS = 3
+
+# Punctuation and whitespace become spaces; the rest of a word (letters,
+# digits) stays. Same length in and out, so offsets carry over.
+_WORD_BREAKS = str.maketrans({
+    char: " " for char in string.punctuation + string.whitespace + "\xa0–—‘’‚“”„«»…•·"
+})
+
+
+def _lowered(text: str) -> str:
+    """text.lower() with the same length (so offsets stay valid)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def _name_words(name: str) -> Tuple[str, ...]:
+    return tuple(_lowered(name).translate(_WORD_BREAKS).split())
+
+
+class NameAutomaton:
+    """
+    Aho-Corasick automaton over words for a list of known names
+    
+    Names match case-insensitively as whole word sequences, so "Acme AB"
+    finds "ACME AB:" but not "Acmeab". Overlapping matches resolve to
+    the leftmost, then the longest name; a name listed under several
+    kinds keeps the first.
+    """
+    
+    def __init__(self, names: Iterable[Tuple[str, str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (length in words, kind) of every name ending in the node
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        self._depth: List[int] = [0]
+        self.size = 0
+        
+        for name, kind in names:
+            words = _name_words(name or "")
+            if not words or len("".join(words)) < MIN_NAME_CHARS:
+                continue
+            node = 0
+            for word in words:
+                nxt = self._goto[node].get(word)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][word] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._depth.append(self._depth[node] + 1)
+                node = nxt
+            if not self._out[node]:
+                self._out[node].append((len(words), kind))
+                self.size += 1
+        
+        # Breadth-first fail links; each node also reports the names
+        # ending in its fail node (shorter suffixes)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for word, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def search(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, kind) name matches in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        # Splitting on single spaces keeps one (possibly empty) part per
+        # gap, so a part's offset is the sum of the lengths before it
+        parts = _lowered(text).translate(_WORD_BREAKS).split(" ")
+        found = []
+        previous = []
+        state = 0
+        for i, word in enumerate(parts):
+            if not word:
+                continue
+            if not state:
+                # Fast path: most words start no name
+                state = root.get(word, 0)
+                if not state:
+                    continue
+                previous = [i]
+            else:
+                while state and word not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(word, 0)
+                previous.append(i)
+                # Words of the current match candidate only
+                del previous[:-self._depth[state] or len(previous)]
+            for length, kind in out[state]:
+                found.append((previous[-length], i, kind))
+        if not found:
+            return []
+        
+        ends = list(accumulate(len(part) + 1 for part in parts))
+        spans = sorted(
+            ((ends[first] - len(parts[first]) - 1, ends[last] - 1, kind) for first, last, kind in found),
+            key=lambda match: (match[0], -match[1])
+        )
+        # Leftmost-longest
+        matches = []
+        last_end = -1
+        for start, end, kind in spans:
+            if start >= last_end:
+                matches.append((start, end, kind))
+                last_end = end
+        return matches
+
+
+class PIIScanner:
+    """
+    Precompiled single-pass PII scanner
+    
+    Structured PII (emails, phones, SSN, cards) wins over dictionary
+    names, which win over the capitalized-pair name pattern.
+    """
+    
+    def __init__(self, automaton: Optional[NameAutomaton] = None):
+        self.automaton = automaton if automaton is not None and len(automaton) else None
+    
+    def scan(self, text: str) -> List[PIIEntity]:
+        """All PII in text, sorted by position"""
+        return self.scan_many([text])[0]
+    
+    def scan_many(self, texts: Sequence[str]) -> List[List[PIIEntity]]:
+        """PII per text, with offsets relative to each text"""
+        joined = SEGMENT_SEPARATOR + SEGMENT_SEPARATOR.join(texts)
+        starts = []
+        offset = len(SEGMENT_SEPARATOR)
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(SEGMENT_SEPARATOR)
+        
+        structured: List[Tuple[int, int, PIIKind]] = []
+        pattern_names: List[Tuple[int, int, PIIKind]] = []
+        for match in PII_REGEX.finditer(joined):
+            group = match.lastgroup
+            span = (match.start(group), match.end(group), PII_KINDS[group])
+            (pattern_names if group == "name" else structured).append(span)
+        
+        names: List[Tuple[int, int, PIIKind]] = []
+        if self.automaton is not None:
+            names = [
+                (start, end, DICTIONARY_KINDS[kind])
+                for start, end, kind in self.automaton.search(joined)
+                if not _overlaps(structured, start, end)
+            ]
+            pattern_names = [span for span in pattern_names if not _overlaps(names, span[0], span[1])]
+        found = sorted(structured + names + pattern_names, key=lambda span: span[0])
+        
+        results: List[List[PIIEntity]] = [[] for _ in texts]
+        for start, end, kind in found:
+            index = bisect.bisect_right(starts, start) - 1
+            base = starts[index]
+            results[index].append(PIIEntity(
+                entity_type=kind.entity_type,
+                text=joined[start:end],
+                redacted_text=kind.redacted_text,
+                start_char=start - base,
+                end_char=end - base,
+                confidence=kind.confidence,
+                detection_method=kind.detection_method
+            ))
+        return results
+
+
+def _overlaps(spans: List[Tuple[int, int, PIIKind]], start: int, end: int) -> bool:
+    """Whether [start, end) overlaps one of spans (sorted, non-overlapping)"""
+    i = bisect.bisect_right(spans, start, key=lambda span: span[1])
+    return i < len(spans) and spans[i][0] < end
+
+
+class _OrgDictionary(NamedTuple):
+    scanner: PIIScanner
+    signature: tuple
+    checked_at: float
+
+
+class PIIDictionaryCache:
+    """
+    Per-org PIIScanner with an automaton of the org's known names
+    
+    A scanner is rebuilt when the row count or latest updated_at of the
+    org's people or organizations changes, checked at most every
+    PII_DICTIONARY_REFRESH_SECONDS. The least recently used of more than
+    PII_DICTIONARY_MAX_ORGS orgs are dropped.
+    
+    The queries run in a savepoint on the caller's session, so if they
+    fail (e.g. the tables are missing) only the savepoint is rolled back
+    and the caller's transaction stays usable; the scanner then falls
+    back to patterns only.
+    """
+    
+    SIGNATURE_QUERY = sql_text("""
+        SELECT
+            (SELECT count(*) FROM people WHERE org_id = :org_id),
+            (SELECT max(updated_at) FROM people WHERE org_id = :org_id),
+            (SELECT count(*) FROM organizations WHERE org_id = :org_id),
+            (SELECT max(updated_at) FROM organizations WHERE org_id = :org_id)
+    """)
+    NAMES_QUERY = sql_text("""
+        SELECT name, 'person' AS kind FROM people WHERE org_id = :org_id
+        UNION ALL
+        SELECT name, 'organization' AS kind FROM organizations WHERE org_id = :org_id
+    """)
+    
+    def __init__(self, refresh_seconds: Optional[float] = None, max_orgs: Optional[int] = None):
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else settings.pii_dictionary_refresh_seconds
+        )
+        self.max_orgs = max_orgs if max_orgs is not None else settings.pii_dictionary_max_orgs
+        self._orgs: "OrderedDict[uuid.UUID, _OrgDictionary]" = OrderedDict()
+        self.builds = 0
+    
+    async def scanner(self, db: AsyncSession, org_id: uuid.UUID) -> PIIScanner:
+        """The org's scanner, rebuilt if its names changed"""
+        entry = self._orgs.get(org_id)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.refresh_seconds:
+            self._orgs.move_to_end(org_id)
+            return entry.scanner
+        
+        try:
+            async with db.begin_nested():
+                signature = tuple((await db.execute(self.SIGNATURE_QUERY, {"org_id": org_id})).one())
+                rows = None
+                if entry is None or signature != entry.signature:
+                    rows = (await db.execute(self.NAMES_QUERY, {"org_id": org_id})).all()
+        except Exception as e:
+            logger.warning(f"PII dictionary unavailable for org {org_id}, using patterns only: {e}")
+            return entry.scanner if entry is not None else DEFAULT_SCANNER
+        
+        if rows is None:
+            scanner = entry.scanner
+        else:
+            scanner = PIIScanner(NameAutomaton((row.name, row.kind) for row in rows))
+            self.builds += 1
+        
+        self._orgs[org_id] = _OrgDictionary(scanner, signature, now)
+        self._orgs.move_to_end(org_id)
+        while len(self._orgs) > self.max_orgs:
+            self._orgs.popitem(last=False)
+        return scanner
+    
+    def invalidate(self, org_id: Optional[uuid.UUID] = None) -> None:
+        """Force a rebuild for one org (or all) on next use"""
+        if org_id is None:
+            self._orgs.clear()
+        else:
+            self._orgs.pop(org_id, None)
+
+
+# Patterns only, for text without an org
+DEFAULT_SCANNER = PIIScanner()
+
+
 class PIIDetectionService:
     """
     Detect and tag ALL PII in text
@@ -34,156 +370,29 @@ class PIIDetectionService:
     
     def detect_pii(self, text: str) -> List[PIIEntity]:
         """
-        Detect all PII in text
+        Detect PII in text with the compiled patterns
         
-        Uses multiple methods:
-        1. Regex for structured data (email, phone)
-        2. NER for named entities (would use spaCy/transformers)
-        3. Pattern matching for addresses
+        Emails, phones, SSN and credit cards in one pass, plus a
+        capitalized-pair name pattern (would use NER). Use
+        detect_pii_batch to also match the org's known names.
         """
-        pii_entities = []
-        
-        # 1. Email detection (regex)
-        pii_entities.extend(self._detect_emails(text))
-        
-        # 2. Phone number detection (regex)
-        pii_entities.extend(self._detect_phones(text))
-        
-        # 3. Named entities (simplified - would use NER model)
-        pii_entities.extend(self._detect_names(text))
-        
-        # 4. Company names (would use NER)
-        pii_entities.extend(self._detect_companies(text))
-        
-        # 5. Addresses (pattern matching)
-        pii_entities.extend(self._detect_addresses(text))
-        
-        # 6. Financial data (credit cards, SSN, etc.)
-        pii_entities.extend(self._detect_financial(text))
-        
-        # Sort by position
-        pii_entities.sort(key=lambda x: x.start_char)
-        
-        return pii_entities
-    
-    def _detect_emails(self, text: str) -> List[PIIEntity]:
-        """Detect email addresses"""
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = []
-        
-        for match in re.finditer(pattern, text):
-            emails.append(PIIEntity(
-                entity_type="email",
-                text=match.group(),
-                redacted_text="[EMAIL]",
-                start_char=match.start(),
-                end_char=match.end(),
-                confidence=1.0,
-                detection_method="regex"
-            ))
-        
-        return emails
+        return DEFAULT_SCANNER.scan(text)
     
-    def _detect_phones(self, text: str) -> List[PIIEntity]:
-        """Detect phone numbers"""
-        # US phone patterns
-        patterns = [
-            r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # 123-456-7890
-            r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-            r'\+1\s?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'  # +1 123-456-7890
-        ]
-        
-        phones = []
-        for pattern in patterns:
-            for match in re.finditer(pattern, text):
-                phones.append(PIIEntity(
-                    entity_type="phone",
-                    text=match.group(),
-                    redacted_text="[PHONE]",
-                    start_char=match.start(),
-                    end_char=match.end(),
-                    confidence=0.95,
-                    detection_method="regex"
-                ))
-        
-        return phones
-    
-    def _detect_names(self, text: str) -> List[PIIEntity]:
+    async def detect_pii_batch(
+        self,
+        texts: Sequence[str],
+        org_id: Optional[uuid.UUID] = None
+    ) -> List[List[PIIEntity]]:
         """
-        Detect person names using NER
+        Detect PII in all segments of a transcript in one pass
         
-        In production, use spaCy or Hugging Face transformers:
-        - spaCy: en_core_web_trf for person names
-        - Confidence scores from model
-        - Context-aware detection
+        With org_id, names of the org's people and organizations are
+        matched too. Offsets are relative to each text.
         """
-        # Simplified pattern matching (would use NER model)
-        # This is a placeholder - MUST use proper NER in production
-        names = []
-        
-        # Pattern: capitalized words that might be names
-        # This is NOT production-ready, just illustrative
-        pattern = r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b'
-        
-        for match in re.finditer(pattern, text):
-            # In production: verify with NER model
-            names.append(PIIEntity(
-                entity_type="person_name",
-                text=match.group(),
-                redacted_text="[NAME]",
-                start_char=match.start(),
-                end_char=match.end(),
-                confidence=0.70,  # Lower confidence - needs NER
-                detection_method="pattern"  # Should be "ner" in production
-            ))
-        
-        return names
-    
-    def _detect_companies(self, text: str) -> List[PIIEntity]:
-        """Detect company names"""
-        # Would use NER model for ORG entities
-        companies = []
-        # Placeholder - needs proper NER
-        return companies
-    
-    def _detect_addresses(self, text: str) -> List[PIIEntity]:
-        """Detect physical addresses"""
-        # Pattern for addresses (simplified)
-        addresses = []
-        # Would need proper address parsing library
-        return addresses
-    
-    def _detect_financial(self, text: str) -> List[PIIEntity]:
-        """Detect financial data (credit cards, SSN, etc.)"""
-        financial = []
-        
-        # SSN pattern: XXX-XX-XXXX
-        ssn_pattern = r'\b\d{3}-\d{2}-\d{4}\b'
-        for match in re.finditer(ssn_pattern, text):
-            financial.append(PIIEntity(
-                entity_type="financial_ssn",
-                text=match.group(),
-                redacted_text="[SSN]",
-                start_char=match.start(),
-                end_char=match.end(),
-                confidence=1.0,
-                detection_method="regex"
-            ))
-        
-        # Credit card pattern (simplified)
-        cc_pattern = r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b'
-        for match in re.finditer(cc_pattern, text):
-            financial.append(PIIEntity(
-                entity_type="financial_cc",
-                text=match.group(),
-                redacted_text="[CREDIT_CARD]",
-                start_char=match.start(),
-                end_char=match.end(),
-                confidence=0.90,
-                detection_method="regex"
-            ))
-        
-        return financial
+        scanner = DEFAULT_SCANNER
+        if org_id is not None and self.db is not None:
+            scanner = await get_pii_dictionaries().scanner(self.db, org_id)
+        return scanner.scan_many(texts)
     
     def redact_pii(
         self,
@@ -256,6 +465,12 @@ class PIIDetectionService:
         await self.db.commit()
 
 
+_pii_dictionaries: Optional[PIIDictionaryCache] = None
 
 
-
+def get_pii_dictionaries() -> PIIDictionaryCache:
+    """Get or create the process-wide per-org PII name dictionaries."""
+    global _pii_dictionaries
+    if _pii_dictionaries is None:
+        _pii_dictionaries = PIIDictionaryCache()
+    return _pii_dictionaries
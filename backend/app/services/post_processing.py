@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Dict, List
 from supabase import create_client
 from app.config import settings
+from app.services.translation_service import TranslationService
 
 
 class PostProcessingService:
@@ -14,6 +15,7 @@ class PostProcessingService:
     
     def __init__(self):
         self.supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+        self.translator = TranslationService()
     
     async def process_meeting(self, meeting_id: str, org_id: str):
         """
@@ -53,6 +55,9 @@ class PostProcessingService:
         
         generated_docs = []
         
+        # Meeting content in each language (one translation batch per meeting)
+        localized = await self._localize_content(meeting, attendees, decisions, actions, org_id)
+        
         # Generate each document in both languages
         for doc_type, doc_title, doc_format in doc_types:
             for lang, lang_name in [('sv', 'Swedish'), ('en', 'English')]:
@@ -60,10 +65,7 @@ class PostProcessingService:
                     # Generate using template (fast, no API needed)
                     content = await self._generate_document_template(
                         doc_type,
-                        meeting,
-                        attendees,
-                        decisions,
-                        actions,
+                        *localized[lang],
                         lang
                     )
                     
@@ -103,6 +105,57 @@ class PostProcessingService:
         
         return generated_docs
     
+    async def _localize_content(self, meeting: Dict, attendees: List, decisions: List, actions: List, org_id: str) -> Dict:
+        """
+        Meeting, attendees, decisions and actions per language ('sv', 'en').
+        
+        The content is stored in the language the meeting was held in; the
+        other language is produced by TranslationService, which serves
+        repeated text from the org's translation memory. If translation is not
+        possible the original content is used for both languages.
+        """
+        
+        content = (meeting, attendees, decisions, actions)
+        metadata = meeting.get('meeting_metadata') if isinstance(meeting.get('meeting_metadata'), dict) else {}
+        sample = ' '.join([meeting.get('title') or '', *[d.get('decision') or '' for d in decisions], *[a.get('title') or '' for a in actions]])
+        source_lang = TranslationService.detect_language(sample)
+        target_lang = 'en' if source_lang == 'sv' else 'sv'
+        
+        try:
+            translated = await self.translator.translate_meeting_data(
+                {
+                    'meeting_info': {
+                        'title': meeting.get('title'),
+                        'key_points': metadata.get('key_points', []),
+                        'main_topics': metadata.get('main_topics', []),
+                    },
+                    'decisions': decisions,
+                    'action_items': actions,
+                    'attendees': attendees,
+                },
+                source_lang,
+                target_lang,
+                org_id=org_id
+            )
+        except Exception as e:
+            print(f"  ⚠ Translation to {target_lang} failed, using original text: {e}")
+            return {source_lang: content, target_lang: content}
+        
+        info = translated['meeting_info']
+        translated_meeting = {
+            **meeting,
+            'title': info.get('title') or meeting.get('title'),
+            'meeting_metadata': {
+                **metadata,
+                'key_points': info.get('key_points', []),
+                'main_topics': info.get('main_topics', []),
+            },
+        }
+        return {
+            source_lang: content,
+            target_lang: (translated_meeting, translated['attendees'], translated['decisions'], translated['action_items']),
+        }
+    
     async def _generate_document_template(
         self,
         doc_type: str,
@@ -0,0 +1,248 @@
+"""
+Per-meeting inverted index over transcript segments.
+
+Built once from a normalized transcript and queried for every claim, so
+evidence lookup costs one posting-list walk per query term instead of a
+scan of every segment. Matches are ranked with BM25; Swedish and English
+stopwords are ignored. Dates stated in the segments are parsed on first
+use, so a normalized date ("2024-03-15") can be matched against the way
+it was said ("15 mars", "March 15th", "15/3").
+"""
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS_EN = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves
+""".split())
+
+STOPWORDS_SV = frozenset("""
+alla allt att av blev bli blir blivit de dem den denna deras dess dessa det detta dig din dina
+ditt du där då efter ej eller en er era ert ett från för ha hade han hans har henne hennes hon
+honom hur här i icke ingen inom inte jag ju kan kunde man med mellan men mig min mina mitt mot
+mycket ni nu när någon något några och om oss på samma sedan sig sin sina sitta själv skulle
+som så sådan sådana sådant till under upp ut utan vad var vara varför varit varje vars vart
+vem vi vid vilka vilkas vilken vilket vår våra vårt än är åt över ska också bara
+""".split())
+
+STOPWORDS = STOPWORDS_EN | STOPWORDS_SV
+
+MONTHS = {
+    "january": 1, "januari": 1, "jan": 1,
+    "february": 2, "februari": 2, "feb": 2,
+    "march": 3, "mars": 3, "mar": 3,
+    "april": 4, "apr": 4,
+    "may": 5, "maj": 5,
+    "june": 6, "juni": 6, "jun": 6,
+    "july": 7, "juli": 7, "jul": 7,
+    "august": 8, "augusti": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9,
+    "october": 10, "oktober": 10, "oct": 10, "okt": 10,
+    "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+_MONTH = "(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+
+# Not followed by more digits (1.2.3, 3/4,5) or a percentage (3/4 %, 3/4 percent)
+_NOT_A_NUMBER = r"(?![/.,]?\d)(?!\s*(?:%|percent\b|procent\b))"
+
+DATE_PATTERNS = [
+    # 2024-03-15
+    ("ymd", re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")),
+    # 15 mars 2024, 15th of March, 15:e mars
+    ("dmy", re.compile(r"\b(\d{1,2})(?:st|nd|rd|th|:e|:a)?\s+(?:of\s+)?" + _MONTH + r"(?:\s+(\d{4}))?\b", re.IGNORECASE)),
+    # March 15, 2024
+    ("mdy", re.compile(r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b", re.IGNORECASE)),
+    # 15/3, 15/3/2024 (3/15 is also accepted when it cannot be day/month)
+    ("numeric", re.compile(r"(?<![\d/.,])(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?" + _NOT_A_NUMBER)),
+    # 15.3.2024; without the year "3.4" is a decimal, not a date
+    ("numeric", re.compile(r"(?<![\d/.,])(\d{1,2})\.(\d{1,2})\.(\d{2}|\d{4})" + _NOT_A_NUMBER)),
+]
+
+# (year or None, month, day)
+StatedDate = Tuple[Optional[int], int, int]
+
+
+def _month(value: str) -> int:
+    return MONTHS[value.lower().rstrip(".")]
+
+
+def find_dates(text: str) -> Set[StatedDate]:
+    """Calendar dates stated in text, with the year when it is given."""
+    found: Set[StatedDate] = set()
+    for kind, pattern in DATE_PATTERNS:
+        for match in pattern.finditer(text or ""):
+            if kind == "ymd":
+                year, month, day = (int(g) for g in match.groups())
+                candidates = [(year, month, day)]
+            elif kind == "dmy":
+                day, month, year = int(match.group(1)), _month(match.group(2)), match.group(3)
+                candidates = [(int(year) if year else None, month, day)]
+            elif kind == "mdy":
+                month, day, year = _month(match.group(1)), int(match.group(2)), match.group(3)
+                candidates = [(int(year) if year else None, month, day)]
+            else:
+                first, second, year = int(match.group(1)), int(match.group(2)), match.group(3)
+                year = (2000 + int(year) if len(year) == 2 else int(year)) if year else None
+                candidates = [(year, second, first), (year, first, second)]
+            for year, month, day in candidates:
+                try:
+                    date(year or 2000, month, day)
+                except ValueError:
+                    continue
+                found.add((year, month, day))
+    return found
+
+
+def parse_date(value: Union[str, date, datetime]) -> Optional[date]:
+    """A normalized date value (date, datetime or ISO string), else None."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace (used for exact phrase checks)."""
+    return " ".join(TOKEN_RE.findall((text or "").lower()))
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms of text: lowercase word tokens without stopwords."""
+    return [
+        token for token in TOKEN_RE.findall((text or "").lower())
+        if token not in STOPWORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+@dataclass
+class SegmentMatch:
+    """A segment ranked against a query."""
+    position: int  # Index into SegmentIndex.segments
+    segment: Dict
+    score: float  # Raw BM25
+    relevance: float  # 0-1, see SegmentIndex.search
+    coverage: float  # Share of the query's terms found in the segment
+    exact: bool  # Whole query appears verbatim (after normalization)
+
+
+class SegmentIndex:
+    """BM25 index over one transcript's segments."""
+
+    def __init__(self, segments: List[Dict], k1: float = 1.5, b: float = 0.75):
+        self.segments = segments
+        self.k1 = k1
+        self.b = b
+        self._texts: List[str] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+        for position, segment in enumerate(segments):
+            text = segment.get("text") or ""
+            self._texts.append(normalize_text(text))
+            terms = tokenize(text)
+            self._lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings[term].append((position, tf))
+
+        self.avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        self._dates: Optional[List[Set[StatedDate]]] = None
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def idf(self, term: str) -> float:
+        """BM25 idf; terms absent from the transcript get the highest weight."""
+        n = len(self.segments)
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, top_k: Optional[int] = 5, min_relevance: float = 0.0) -> List[SegmentMatch]:
+        """
+        Segments matching query, best first.
+
+        relevance is the BM25 score relative to a segment of average
+        length containing every query term once (capped at 1.0), so query
+        terms missing from a segment lower it by their idf weight. A
+        segment containing the whole query verbatim has relevance 1.0.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        phrase = normalize_text(query)
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+
+        for term in terms:
+            idf = self.idf(term)
+            for position, tf in self._postings.get(term, ()):
+                length_norm = 1 - self.b + self.b * (self._lengths[position] / self.avg_length if self.avg_length else 1)
+                scores[position] += idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+                matched[position] += 1
+
+        if not terms and phrase:
+            # Query is all stopwords; only verbatim matches count
+            scores = {i: 0.0 for i, text in enumerate(self._texts) if phrase in text}
+
+        expected = sum(self.idf(term) for term in terms)
+        results = []
+        for position, score in scores.items():
+            exact = bool(phrase) and phrase in self._texts[position]
+            relevance = 1.0 if exact else min(1.0, score / expected) if expected else 0.0
+            if relevance < min_relevance:
+                continue
+            results.append(SegmentMatch(
+                position=position,
+                segment=self.segments[position],
+                score=score,
+                relevance=round(relevance, 4),
+                coverage=matched[position] / len(terms) if terms else 1.0,
+                exact=exact,
+            ))
+
+        results.sort(key=lambda m: (m.relevance, m.score), reverse=True)
+        return results[:top_k] if top_k is not None else results
+
+    def supports(self, value: str) -> Optional[SegmentMatch]:
+        """Best segment stating value: verbatim, or with all of its terms."""
+        for match in self.search(value, top_k=None):
+            if match.exact or match.coverage == 1.0:
+                return match
+        return None
+
+    def supports_date(self, value: Union[str, date, datetime]) -> Optional[SegmentMatch]:
+        """
+        First segment stating the date value in any recognized format.
+
+        A stated date without a year matches any year. Values that are
+        not dates fall back to supports().
+        """
+        wanted = parse_date(value)
+        if wanted is None:
+            return self.supports(str(value))
+        if self._dates is None:
+            self._dates = [find_dates(segment.get("text") or "") for segment in self.segments]
+        for position, dates in enumerate(self._dates):
+            if (wanted.year, wanted.month, wanted.day) in dates or (None, wanted.month, wanted.day) in dates:
+                return SegmentMatch(
+                    position=position,
+                    segment=self.segments[position],
+                    score=0.0,
+                    relevance=1.0,
+                    coverage=1.0,
+                    exact=True,
+                )
+        return None
@@ -3,9 +3,10 @@ Intelligent Task Assistant
 Analyzes action items and generates optimal prompts/solutions for assignees
 Sends via Email or Slack with context and AI-generated guidance
 """
-from typing import Dict, Optional
-from openai import AsyncOpenAI
+import json
+from typing import AsyncIterator, Dict, Optional
 from app.config import settings
+from app.services.llm_client import get_openai_client, stream_text
 
 
 class TaskAssistant:
@@ -19,7 +20,7 @@ class TaskAssistant:
     """
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self.client = get_openai_client(settings.openai_api_key, service="tasks.assistant") if settings.openai_api_key else None
     
     async def analyze_and_assist(
         self,
@@ -45,6 +46,34 @@ class TaskAssistant:
             - ai_assistance: How AI can help
         """
         
+        response = await self.client.chat.completions.create(**self._analysis_request(action_item, meeting_context))
+        
+        analysis = json.loads(response.choices[0].message.content)
+        
+        return analysis
+    
+    async def stream_analysis(
+        self,
+        action_item: Dict,
+        meeting_context: Dict,
+        assignee_info: Dict
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of analyze_and_assist.
+        
+        Yields the analysis JSON text as it is generated; json.loads of
+        the joined text is what analyze_and_assist returns.
+        """
+        
+        stream = await self.client.chat.completions.create(
+            **self._analysis_request(action_item, meeting_context), stream=True
+        )
+        async for delta in stream_text(stream):
+            yield delta
+    
+    def _analysis_request(self, action_item: Dict, meeting_context: Dict) -> Dict:
+        """Completion request for the task analysis."""
+        
         if not self.client:
             raise ValueError("OpenAI API required for task assistance")
         
@@ -82,7 +111,7 @@ Analyze this task and provide:
 Format as JSON with these keys: understanding, best_prompt, approach (array), tools (array), time_estimate, ai_assistance, success_criteria
 """
         
-        response = await self.client.chat.completions.create(
+        return dict(
             model="gpt-4o",
             messages=[
                 {
@@ -97,11 +126,6 @@ Format as JSON with these keys: understanding, best_prompt, approach (array), to
             response_format={"type": "json_object"},
             temperature=0.4
         )
-        
-        import json
-        analysis = json.loads(response.choices[0].message.content)
-        
-        return analysis
     
     async def generate_assistance_email(
         self,
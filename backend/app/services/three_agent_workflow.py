@@ -4,11 +4,32 @@ Ensures all generated content is grounded, traceable, and QA'd
 
 ZERO FABRICATION POLICY ENFORCED HERE
 """
+import re
 import uuid
+from collections import OrderedDict
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.segment_index import SegmentIndex
+
+# Evidence kept per claim, and the least relevance that counts as evidence
+EVIDENCE_TOP_K = 5
+MIN_EVIDENCE_RELEVANCE = 0.3
+
+# Segment indexes kept per workflow (one per meeting transcript)
+MAX_CACHED_INDEXES = 8
+
+# Deadlines said relative to the meeting ("by Friday", "till fredag").
+# The generator resolves them to a date, which the transcript cannot
+# confirm, so such a phrase in the item's evidence is accepted instead.
+RELATIVE_DATE_RE = re.compile(
+    r"\b(today|tomorrow|tonight|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|next (week|month)|end of (the )?(week|month)"
+    r"|idag|i dag|imorgon|i morgon|måndag|tisdag|onsdag|torsdag|fredag|lördag|söndag"
+    r"|nästa (vecka|månad)|veckans slut|månadens slut|månadsskiftet)\b",
+    re.IGNORECASE
+)
 
 class EvidencePointer(BaseModel):
     """Link from generated content to source data"""
@@ -67,6 +88,55 @@ class ThreeAgentWorkflow:
         self.generator_model = generator_model
         self.matcher_model = matcher_model
         self.qa_model = qa_model
+        self._indexes: "OrderedDict[Any, SegmentIndex]" = OrderedDict()
+    
+    def segment_index(self, source_data: Dict) -> SegmentIndex:
+        """
+        Index of source_data's segments, built once per transcript.
+        
+        Keyed on the normalized transcript ID when present, otherwise on
+        the segments list itself.
+        """
+        segments = source_data.get("segments") or []
+        key = source_data.get("id") or id(segments)
+        index = self._indexes.get(key)
+        if index is None or (source_data.get("id") is None and index.segments is not segments):
+            index = SegmentIndex(segments)
+            self._indexes[key] = index
+            while len(self._indexes) > MAX_CACHED_INDEXES:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(key)
+        return index
+    
+    def field_has_evidence(
+        self,
+        field: str,
+        value: Any,
+        source_data: Dict,
+        evidence: Optional[List[EvidencePointer]] = None
+    ) -> bool:
+        """
+        Whether a field value is backed by the source.
+        
+        - owner_email: an email of a meeting attendee (source_data
+          "attendees"), or stated in the transcript
+        - due_date: the date stated in the transcript in any format, or a
+          relative deadline ("by Friday") in the item's evidence quotes
+        - anything else: stated in the transcript, verbatim or with all
+          of its terms
+        """
+        index = self.segment_index(source_data)
+        if field == "owner_email":
+            attendee_emails = {
+                (attendee.get("email") or "").strip().lower()
+                for attendee in source_data.get("attendees") or []
+            }
+            return str(value).strip().lower() in attendee_emails or index.supports(str(value)) is not None
+        if field == "due_date":
+            return index.supports_date(value) is not None or any(
+                RELATIVE_DATE_RE.search(e.quote) for e in evidence or []
+            )
+        return index.supports(str(value)) is not None
     
     async def extract_with_workflow(
         self,
@@ -85,7 +155,7 @@ class ThreeAgentWorkflow:
             org_id: Organization
             content_type: "decisions", "action_items", "summary", etc.
             qa_goal: "zero_hallucinations", "maximize_recall", etc.
-            source_data: Normalized transcript segments
+            source_data: Normalized transcript segments (and optional attendees)
             correlation_id: For tracing
         
         Returns:
@@ -240,7 +310,7 @@ class ThreeAgentWorkflow:
         Rejects if insufficient evidence
         """
         evidence_pointers = []
-        segments = source_data.get("segments", [])
+        index = self.segment_index(source_data)
         
         # For each field in generated content
         for field, value in generated_content.data.items():
@@ -251,7 +321,7 @@ class ThreeAgentWorkflow:
             # Find supporting evidence in source segments
             matching_segments = self._find_evidence_in_segments(
                 claim=str(value),
-                segments=segments,
+                index=index,
                 field=field
             )
             
@@ -315,10 +385,7 @@ class ThreeAgentWorkflow:
             if field in ["owner_email", "due_date", "owner_name"]:
                 if value is not None:
                     # Verify this came from source
-                    has_evidence = any(
-                        field.lower() in e.source_field.lower()
-                        for e in content.evidence
-                    )
+                    has_evidence = self.field_has_evidence(field, value, source_data, content.evidence)
                     if not has_evidence:
                         issues.append(
                             f"Field '{field}' has value but no evidence - possible fabrication"
@@ -389,29 +456,18 @@ Extract {content_type} following the rules above. Return JSON.
     def _find_evidence_in_segments(
         self,
         claim: str,
-        segments: List[Dict],
+        index: SegmentIndex,
         field: str
     ) -> List[Dict]:
-        """Find segments that support a claim"""
-        # Simplified - would use semantic search or fuzzy matching
-        matching = []
-        claim_lower = claim.lower()
-        
-        for segment in segments:
-            text = segment.get("text", "").lower()
-            if claim_lower in text or self._semantic_match(claim_lower, text):
-                matching.append({
-                    **segment,
-                    "relevance": 0.85  # Would be calculated
-                })
-        
-        return matching
-    
-    def _semantic_match(self, claim: str, text: str) -> bool:
-        """Check if claim is semantically present in text"""
-        # Simplified - would use embeddings
-        keywords = claim.split()
-        return any(kw in text for kw in keywords if len(kw) > 3)
+        """Find segments that support a claim, most relevant first"""
+        return [
+            {**match.segment, "relevance": match.relevance}
+            for match in index.search(
+                claim,
+                top_k=EVIDENCE_TOP_K,
+                min_relevance=MIN_EVIDENCE_RELEVANCE
+            )
+        ]
     
     def _contains_email(self, text: str) -> bool:
         """Check if text contains email"""
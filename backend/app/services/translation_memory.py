@@ -0,0 +1,136 @@
+"""
+Translation memory.
+
+Translated strings are stored in the translation_memory table keyed on
+(org_id, source_lang, target_lang, sha256 of the source text), with a
+bounded in-process layer in front. Repeated boilerplate and re-generated
+documents are therefore translated once per org. Entries hold meeting
+content, so they are never shared between orgs and are deleted with the
+org (ON DELETE CASCADE). The memory is an optimization: when the table
+cannot be reached, lookups miss and writes are dropped.
+"""
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TABLE = "translation_memory"
+
+# Hashes per .in_() filter; keeps the PostgREST query string short
+LOOKUP_CHUNK = 200
+
+
+def text_hash(text: str) -> str:
+    """Key for a source text (surrounding whitespace is not significant)."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """Persistent (org_id, source_lang, target_lang, text) -> translation store."""
+
+    def __init__(self, supabase=None, max_entries: Optional[int] = None):
+        self._supabase = supabase
+        self.max_entries = max_entries if max_entries is not None else settings.translation_memory_max_entries
+        self._local: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _client(self):
+        if self._supabase is None:
+            from supabase import create_client
+            self._supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+        return self._supabase
+
+    def _remember(self, key: Tuple[str, str, str, str], translation: str) -> None:
+        self._local[key] = translation
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def lookup(self, org_id, source_lang: str, target_lang: str, texts: List[str]) -> Dict[str, str]:
+        """Known translations for texts in an org, keyed by source text."""
+        org_id = str(org_id)
+        found: Dict[str, str] = {}
+        by_hash: Dict[str, List[str]] = {}
+        for text in texts:
+            key = (org_id, source_lang, target_lang, text_hash(text))
+            if key in self._local:
+                self._local.move_to_end(key)
+                found[text] = self._local[key]
+            else:
+                by_hash.setdefault(key[3], []).append(text)
+
+        hashes = list(by_hash)
+        for start in range(0, len(hashes), LOOKUP_CHUNK):
+            try:
+                rows = await self._fetch_rows(org_id, source_lang, target_lang, hashes[start:start + LOOKUP_CHUNK])
+            except Exception as e:
+                logger.warning("Translation memory lookup failed: %s", e)
+                break
+            for row in rows:
+                self._remember((org_id, source_lang, target_lang, row["text_hash"]), row["translated_text"])
+                for text in by_hash.get(row["text_hash"], []):
+                    found[text] = row["translated_text"]
+
+        self.hits += len(found)
+        self.misses += len(set(texts)) - len(found)
+        return found
+
+    async def store(self, org_id, source_lang: str, target_lang: str, translations: Dict[str, str]) -> None:
+        """Remember an org's translations (source text -> translated text)."""
+        org_id = str(org_id)
+        rows = {}
+        for text, translated in translations.items():
+            digest = text_hash(text)
+            self._remember((org_id, source_lang, target_lang, digest), translated)
+            rows[digest] = {
+                "org_id": org_id,
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                "text_hash": digest,
+                "source_text": text,
+                "translated_text": translated,
+            }
+        if not rows:
+            return
+        try:
+            await self._upsert_rows(list(rows.values()))
+        except Exception as e:
+            logger.warning("Translation memory write failed: %s", e)
+
+    async def _fetch_rows(self, org_id: str, source_lang: str, target_lang: str, hashes: List[str]) -> List[Dict]:
+        def query():
+            return (
+                self._client().table(TABLE)
+                .select("text_hash, translated_text")
+                .eq("org_id", org_id)
+                .eq("source_lang", source_lang)
+                .eq("target_lang", target_lang)
+                .in_("text_hash", hashes)
+                .execute()
+                .data
+            )
+        return await asyncio.to_thread(query)
+
+    async def _upsert_rows(self, rows: List[Dict]) -> None:
+        def upsert():
+            self._client().table(TABLE).upsert(
+                rows,
+                on_conflict="org_id,source_lang,target_lang,text_hash",
+            ).execute()
+        await asyncio.to_thread(upsert)
+
+
+_translation_memory: Optional[TranslationMemory] = None
+
+
+def get_translation_memory() -> TranslationMemory:
+    """Process-wide translation memory."""
+    global _translation_memory
+    if _translation_memory is None:
+        _translation_memory = TranslationMemory()
+    return _translation_memory
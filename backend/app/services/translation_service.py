@@ -2,105 +2,178 @@
 Translation Service - Bilingual Support (Swedish ⟷ English)
 All content exists in both languages
 """
+import json
 from typing import Dict, List, Optional
-from openai import AsyncOpenAI
 from app.config import settings
+from app.services.llm_cache import with_llm_cache
+from app.services.translation_memory import TranslationMemory, get_translation_memory
+from app.services.llm_client import get_openai_client
+
+
+LANG_NAMES = {
+    'sv': 'Swedish',
+    'en': 'English',
+    'de': 'German',
+    'fr': 'French',
+    'es': 'Spanish'
+}
+
+TRANSLATIONS_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "translations": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["translations"],
+            "additionalProperties": False
+        }
+    }
+}
 
 
 class TranslationService:
     """Service for translating meeting content between Swedish and English."""
     
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+    def __init__(self, memory: Optional[TranslationMemory] = None):
+        self.client = with_llm_cache(get_openai_client(settings.openai_api_key, service="translation")) if settings.openai_api_key else None
+        if memory is None and settings.translation_memory_enabled:
+            memory = get_translation_memory()
+        self.memory = memory
     
     async def translate_meeting_data(
         self,
         meeting_data: Dict,
         source_lang: str = "sv",
-        target_lang: str = "en"
+        target_lang: str = "en",
+        org_id: Optional[str] = None
     ) -> Dict:
         """
         Translate all meeting data to target language.
         
+        Every field is translated in one batch (see translate_texts), so a
+        meeting costs at most one API request per language pair.
+        
         Args:
             meeting_data: Dict with attendees, decisions, actions, meeting_info
             source_lang: Source language code (sv=Swedish, en=English)
             target_lang: Target language code
+            org_id: Org the content belongs to; the translation memory is
+                only used when it is given
         
         Returns:
             Translated meeting data in same structure
-        """
-        
-        if not self.client:
-            raise ValueError("OpenAI API key required for translation")
         
-        # Translate meeting title and metadata
-        translated_meeting_info = await self._translate_meeting_info(
-            meeting_data.get('meeting_info', {}),
-            source_lang,
-            target_lang
-        )
+        Raises:
+            ValueError: if some text is not in the translation memory and
+                no OpenAI API key is configured
+        """
         
-        # Translate decisions
-        translated_decisions = await self._translate_decisions(
-            meeting_data.get('decisions', []),
-            source_lang,
-            target_lang
-        )
+        meeting_info = meeting_data.get('meeting_info', {})
+        decisions = meeting_data.get('decisions', [])
+        actions = meeting_data.get('action_items', [])
+        attendees = meeting_data.get('attendees', [])
         
-        # Translate action items
-        translated_actions = await self._translate_actions(
-            meeting_data.get('action_items', []),
-            source_lang,
-            target_lang
-        )
+        texts = self._meeting_info_texts(meeting_info)
+        for decision in decisions:
+            texts += [decision.get('decision'), decision.get('rationale')]
+        for action in actions:
+            texts += [
+                action.get('action') or action.get('title'),
+                action.get('description') or action.get('context')
+            ]
+        # Attendees: Names stay same, only roles translate
+        texts += [attendee.get('role') for attendee in attendees]
         
-        # Attendees: Names stay same, only roles/locations translate
-        translated_attendees = meeting_data.get('attendees', []).copy()
-        for attendee in translated_attendees:
-            if attendee.get('role'):
-                attendee['role'] = await self._translate_text(
-                    attendee['role'],
-                    source_lang,
-                    target_lang
-                )
+        translations = await self.translate_texts(texts, source_lang, target_lang, org_id=org_id)
         
         return {
-            'meeting_info': translated_meeting_info,
-            'decisions': translated_decisions,
-            'action_items': translated_actions,
-            'attendees': translated_attendees,
+            'meeting_info': self._translate_meeting_info(meeting_info, translations),
+            'decisions': self._translate_decisions(decisions, translations),
+            'action_items': self._translate_actions(actions, translations),
+            'attendees': self._translate_attendees(attendees, translations),
             'source_language': source_lang,
             'target_language': target_lang
         }
     
-    async def _translate_meeting_info(self, meeting_info: Dict, source_lang: str, target_lang: str) -> Dict:
+    async def translate_texts(
+        self,
+        texts: List[Optional[str]],
+        source_lang: str,
+        target_lang: str,
+        org_id: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Translate many strings, returning {source text: translation}.
+        
+        Empty values and duplicates are skipped. Strings already in the
+        org's translation memory are not sent; the rest go out as one JSON
+        array per request and are stored in the memory afterwards. Without
+        an org_id the memory is bypassed, so text is never shared between
+        orgs.
+        """
+        
+        unique = list(dict.fromkeys(text for text in texts if text and text.strip()))
+        if not unique or source_lang == target_lang:
+            return {text: text for text in unique}
+        
+        memory = self.memory if org_id else None
+        translations = {}
+        if memory:
+            translations = await memory.lookup(org_id, source_lang, target_lang, unique)
+        
+        missing = [text for text in unique if text not in translations]
+        if missing:
+            if not self.client:
+                raise ValueError("OpenAI API key required for translation")
+            translated = {}
+            for batch in self._batches(missing):
+                translated.update(await self._translate_batch(batch, source_lang, target_lang))
+            if memory:
+                await memory.store(org_id, source_lang, target_lang, translated)
+            translations.update(translated)
+        
+        return translations
+    
+    @staticmethod
+    def _batches(texts: List[str]) -> List[List[str]]:
+        """Split texts so each request stays under translation_batch_max_chars."""
+        
+        batches, batch, size = [], [], 0
+        for text in texts:
+            if batch and size + len(text) > settings.translation_batch_max_chars:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(text)
+            size += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    @staticmethod
+    def _meeting_info_texts(meeting_info: Dict) -> List[str]:
+        return [meeting_info.get('title'), *(meeting_info.get('key_points') or []), *(meeting_info.get('main_topics') or [])]
+    
+    @staticmethod
+    def _translate_meeting_info(meeting_info: Dict, translations: Dict[str, str]) -> Dict:
         """Translate meeting metadata."""
         
         translated = meeting_info.copy()
         
         if meeting_info.get('title'):
-            translated['title'] = await self._translate_text(
-                meeting_info['title'],
-                source_lang,
-                target_lang
-            )
-        
-        if meeting_info.get('key_points'):
-            translated['key_points'] = [
-                await self._translate_text(point, source_lang, target_lang)
-                for point in meeting_info['key_points']
-            ]
+            translated['title'] = translations.get(meeting_info['title'], meeting_info['title'])
         
-        if meeting_info.get('main_topics'):
-            translated['main_topics'] = [
-                await self._translate_text(topic, source_lang, target_lang)
-                for topic in meeting_info['main_topics']
-            ]
+        for key in ('key_points', 'main_topics'):
+            if meeting_info.get(key):
+                translated[key] = [translations.get(item, item) for item in meeting_info[key]]
         
         return translated
     
-    async def _translate_decisions(self, decisions: List[Dict], source_lang: str, target_lang: str) -> List[Dict]:
+    @staticmethod
+    def _translate_decisions(decisions: List[Dict], translations: Dict[str, str]) -> List[Dict]:
         """Translate decisions."""
         
         translated = []
@@ -108,25 +181,16 @@ class TranslationService:
         for decision in decisions:
             trans_decision = decision.copy()
             
-            if decision.get('decision'):
-                trans_decision['decision'] = await self._translate_text(
-                    decision['decision'],
-                    source_lang,
-                    target_lang
-                )
-            
-            if decision.get('rationale'):
-                trans_decision['rationale'] = await self._translate_text(
-                    decision['rationale'],
-                    source_lang,
-                    target_lang
-                )
+            for key in ('decision', 'rationale'):
+                if decision.get(key):
+                    trans_decision[key] = translations.get(decision[key], decision[key])
             
             translated.append(trans_decision)
         
         return translated
     
-    async def _translate_actions(self, actions: List[Dict], source_lang: str, target_lang: str) -> List[Dict]:
+    @staticmethod
+    def _translate_actions(actions: List[Dict], translations: Dict[str, str]) -> List[Dict]:
         """Translate action items."""
         
         translated = []
@@ -135,21 +199,13 @@ class TranslationService:
             trans_action = action.copy()
             
             if action.get('action') or action.get('title'):
-                text_to_translate = action.get('action') or action.get('title')
-                trans_action['action'] = await self._translate_text(
-                    text_to_translate,
-                    source_lang,
-                    target_lang
-                )
+                text = action.get('action') or action.get('title')
+                trans_action['action'] = translations.get(text, text)
                 trans_action['title'] = trans_action['action']
             
             if action.get('description') or action.get('context'):
-                desc_to_translate = action.get('description') or action.get('context')
-                trans_action['description'] = await self._translate_text(
-                    desc_to_translate,
-                    source_lang,
-                    target_lang
-                )
+                desc = action.get('description') or action.get('context')
+                trans_action['description'] = translations.get(desc, desc)
             
             # Owner names stay same (proper nouns)
             
@@ -157,41 +213,60 @@ class TranslationService:
         
         return translated
     
-    async def _translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
+    @staticmethod
+    def _translate_attendees(attendees: List[Dict], translations: Dict[str, str]) -> List[Dict]:
+        translated = []
+        for attendee in attendees:
+            trans_attendee = attendee.copy()
+            if attendee.get('role'):
+                trans_attendee['role'] = translations.get(attendee['role'], attendee['role'])
+            translated.append(trans_attendee)
+        return translated
+    
+    async def _translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> Dict[str, str]:
         """
-        Translate single text using OpenAI.
+        Translate a JSON array of strings in one structured-output request.
         
-        Uses GPT-4 for high-quality translation preserving business context.
+        If the model returns a different number of strings the batch is
+        split in half and retried, so one bad item cannot misalign the rest.
         """
         
-        lang_names = {
-            'sv': 'Swedish',
-            'en': 'English',
-            'de': 'German',
-            'fr': 'French',
-            'es': 'Spanish'
-        }
-        
-        source_name = lang_names.get(source_lang, source_lang)
-        target_name = lang_names.get(target_lang, target_lang)
+        source_name = LANG_NAMES.get(source_lang, source_lang)
+        target_name = LANG_NAMES.get(target_lang, target_lang)
         
         response = await self.client.chat.completions.create(
             model="gpt-4o-mini",  # Fast and cost-effective for translation
             messages=[
                 {
                     "role": "system",
-                    "content": f"You are a professional translator. Translate from {source_name} to {target_name}. Preserve business terminology and proper nouns. Return only the translation, no explanations."
+                    "content": f"You are a professional translator. Translate each string in the JSON array from {source_name} to {target_name}. Preserve business terminology, proper nouns and markdown. Return the translations in the same order, one per input string."
                 },
                 {
                     "role": "user",
-                    "content": text
+                    "content": json.dumps(texts, ensure_ascii=False)
                 }
             ],
-            temperature=0.3,
-            max_tokens=500
+            response_format=TRANSLATIONS_SCHEMA,
+            temperature=0.3
         )
         
-        return response.choices[0].message.content.strip()
+        translations = json.loads(response.choices[0].message.content).get('translations', [])
+        if len(translations) == len(texts):
+            return {text: translated.strip() for text, translated in zip(texts, translations)}
+        
+        if len(texts) == 1:
+            raise ValueError(f"Expected 1 translation, got {len(translations)}")
+        middle = len(texts) // 2
+        return {
+            **await self._translate_batch(texts[:middle], source_lang, target_lang),
+            **await self._translate_batch(texts[middle:], source_lang, target_lang)
+        }
+    
+    async def _translate_text(self, text: str, source_lang: str, target_lang: str, org_id: Optional[str] = None) -> str:
+        """Translate single text (through the memory and batch path)."""
+        
+        translations = await self.translate_texts([text], source_lang, target_lang, org_id=org_id)
+        return translations.get(text, text)
     
     @staticmethod
     def detect_language(text: str) -> str:
@@ -219,8 +294,3 @@ class TranslationService:
             return 'sv'
         
         return 'en'  # Default to English
-
-
-
-
-
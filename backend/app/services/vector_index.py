@@ -0,0 +1,450 @@
+"""Semantic search over transcript chunks.
+
+Each chunk is embedded once, when the pipeline's ``index_chunks`` stage
+runs, and stored quantized in ``chunk_embeddings`` (int8 with a per-vector
+scale, or float16). Workers and the API keep one in-memory matrix per org
+that is loaded from that table and then only topped up with rows added
+since, so nothing is re-embedded or rebuilt. Queries are scored by brute
+force (dot product of unit vectors), over the whole org or one meeting.
+
+The default embedder hashes terms into a fixed number of dimensions and
+needs no network or model files. EMBEDDING_PROVIDER=openai uses the
+OpenAI embeddings API instead; vectors from different embedders are kept
+apart by the ``embedder`` column. Rows stored under another
+EMBEDDING_DTYPE are converted when loaded, so changing it needs no
+re-embedding.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import uuid
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import ChunkEmbedding, TranscriptChunk
+from app.services.segment_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+DTYPES = ("int8", "float16")
+
+# Rows scored per matrix product (bounds the float32 copy of int8 rows)
+SEARCH_BLOCK_ROWS = 65536
+
+# Rows committed by other processes can carry a created_at slightly older
+# than the newest row already loaded; refreshes look back this far
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+OPENAI_BATCH_SIZE = 512
+
+
+def text_hash(text: str) -> str:
+    """Key for a chunk text (surrounding whitespace is not significant)."""
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class HashingEmbedder:
+    """
+    Offline embedder: terms and adjacent term pairs hashed into dim buckets.
+
+    Weights are sublinear term frequencies with a hash-derived sign, so
+    unrelated terms that share a bucket tend to cancel. Stopwords are
+    dropped (see segment_index.tokenize).
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> Counter:
+        terms = tokenize(text)
+        features = Counter(terms)
+        features.update(f"{a} {b}" for a, b in zip(terms, terms[1:]))
+        return features
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        # CPU-bound; keep it off the (shared) event loop
+        return await asyncio.to_thread(self._embed, texts)
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, tf in self._features(text).items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                vectors[row, h % self.dim] += sign * (1.0 + math.log(tf))
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings (text-embedding-3 models can be shortened to dim)."""
+
+    def __init__(self, model: str, dim: int):
+        self.model = model
+        self.dim = dim
+        self.name = f"openai:{model}-{dim}"
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        from app.services.llm_client import get_openai_client
+
+        client = get_openai_client(service="embeddings")
+        rows = []
+        for start in range(0, len(texts), OPENAI_BATCH_SIZE):
+            batch = [text or " " for text in texts[start:start + OPENAI_BATCH_SIZE]]
+            response = await client.embeddings.create(
+                model=self.model,
+                input=batch,
+                dimensions=self.dim,
+            )
+            rows.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return _normalize(np.asarray(rows, dtype=np.float32).reshape(len(texts), self.dim))
+
+
+def get_embedder():
+    """Embedder selected by EMBEDDING_PROVIDER."""
+    if settings.embedding_provider == "openai":
+        return OpenAIEmbedder(settings.embedding_model, settings.embedding_dimensions)
+    return HashingEmbedder(settings.embedding_dimensions)
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compact copies of float32 vectors and their per-row scales.
+
+    int8 rows are scaled so their largest component maps to 127 (vector ≈
+    row * scale); float16 rows have scale 1.
+    """
+    if dtype == "float16":
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    if dtype != "int8":
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    peaks = np.abs(vectors).max(axis=1) if len(vectors) else np.zeros(0, dtype=np.float32)
+    scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales
+
+
+@dataclass
+class ChunkHit:
+    """A transcript chunk matching a query."""
+    chunk_id: uuid.UUID
+    meeting_id: uuid.UUID
+    score: float  # Cosine similarity
+    sequence: int = 0
+    speaker: Optional[str] = None
+    text: str = ""
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+
+class VectorIndex:
+    """Quantized vectors of one org's chunks, searched by brute force."""
+
+    def __init__(self, dim: int, dtype: str = "int8"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.dim = dim
+        self.dtype = dtype
+        self.loaded_until: Optional[datetime] = None  # Newest created_at loaded from the table
+        self._matrix = np.zeros((0, dim), dtype=dtype)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._chunk_ids: List[uuid.UUID] = []
+        self._meeting_ids: List[uuid.UUID] = []
+        self._positions: Dict[uuid.UUID, int] = {}
+        self._by_meeting: Dict[uuid.UUID, List[int]] = {}
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def __contains__(self, chunk_id: uuid.UUID) -> bool:
+        return chunk_id in self._positions
+
+    def add(
+        self,
+        chunk_ids: Sequence[uuid.UUID],
+        meeting_ids: Sequence[uuid.UUID],
+        rows: np.ndarray,
+        scales: np.ndarray,
+    ) -> int:
+        """Append quantized rows; chunks already present are skipped. Returns rows added."""
+        keep = []
+        seen = set()
+        for i, chunk_id in enumerate(chunk_ids):
+            if chunk_id not in self._positions and chunk_id not in seen:
+                seen.add(chunk_id)
+                keep.append(i)
+        if not keep:
+            return 0
+
+        start = len(self._chunk_ids)
+        self._matrix = np.concatenate([self._matrix, np.asarray(rows, dtype=self.dtype)[keep]])
+        self._scales = np.concatenate([self._scales, np.asarray(scales, dtype=np.float32)[keep]])
+        self._alive = np.concatenate([self._alive, np.ones(len(keep), dtype=bool)])
+        for offset, i in enumerate(keep):
+            position = start + offset
+            self._chunk_ids.append(chunk_ids[i])
+            self._meeting_ids.append(meeting_ids[i])
+            self._positions[chunk_ids[i]] = position
+            self._by_meeting.setdefault(meeting_ids[i], []).append(position)
+        return len(keep)
+
+    def discard(self, chunk_ids: Iterable[uuid.UUID]) -> None:
+        """Stop returning chunks that no longer exist."""
+        for chunk_id in chunk_ids:
+            position = self._positions.get(chunk_id)
+            if position is not None:
+                self._alive[position] = False
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        meeting_id: Optional[uuid.UUID] = None,
+    ) -> List[Tuple[uuid.UUID, uuid.UUID, float]]:
+        """(chunk_id, meeting_id, score) of the best matches, best first."""
+        if meeting_id is not None:
+            positions = np.asarray(self._by_meeting.get(meeting_id, []), dtype=np.int64)
+        else:
+            positions = np.arange(len(self._chunk_ids))
+        positions = positions[self._alive[positions]] if len(positions) else positions
+        if not len(positions) or top_k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        scores = np.empty(len(positions), dtype=np.float32)
+        for start in range(0, len(positions), SEARCH_BLOCK_ROWS):
+            block = positions[start:start + SEARCH_BLOCK_ROWS]
+            scores[start:start + len(block)] = (
+                self._matrix[block].astype(np.float32) @ query
+            ) * self._scales[block]
+
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            (self._chunk_ids[positions[i]], self._meeting_ids[positions[i]], float(scores[i]))
+            for i in best
+        ]
+
+
+class ChunkVectorStore:
+    """Embeds transcript chunks into chunk_embeddings and searches them."""
+
+    def __init__(self, embedder=None, dtype: Optional[str] = None, max_orgs: Optional[int] = None):
+        self.embedder = embedder or get_embedder()
+        self.dtype = dtype or settings.embedding_dtype
+        if self.dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {self.dtype}")
+        self.max_orgs = max_orgs if max_orgs is not None else settings.vector_index_max_orgs
+        self._indexes: "OrderedDict[uuid.UUID, VectorIndex]" = OrderedDict()
+        self.embedded = 0
+        self.reused = 0
+
+    async def index_meeting(self, db: AsyncSession, meeting_id: uuid.UUID) -> int:
+        """Embed the meeting's chunks that have no embedding yet. Commits."""
+        result = await db.execute(
+            select(TranscriptChunk.id, TranscriptChunk.org_id, TranscriptChunk.meeting_id, TranscriptChunk.text)
+            .outerjoin(
+                ChunkEmbedding,
+                (ChunkEmbedding.chunk_id == TranscriptChunk.id)
+                & (ChunkEmbedding.embedder == self.embedder.name),
+            )
+            .where(TranscriptChunk.meeting_id == meeting_id)
+            .where(ChunkEmbedding.id.is_(None))
+            .order_by(TranscriptChunk.sequence)
+        )
+        added = await self.index_chunks(db, result.all())
+        await db.commit()
+        return added
+
+    async def index_chunks(self, db: AsyncSession, chunks: Sequence) -> int:
+        """
+        Store embeddings for chunks (rows with id, org_id, meeting_id, text).
+
+        Texts the org has already embedded (cloned transcripts, repeated
+        lines) reuse the stored vector instead of being embedded again.
+        Does not commit.
+
+        Returns:
+            Number of embeddings written
+        """
+        if not chunks:
+            return 0
+
+        hashes = [text_hash(chunk.text) for chunk in chunks]
+        known = await self._vectors_by_hash(db, chunks[0].org_id, sorted(set(hashes)))
+
+        to_embed = sorted({h: chunk.text for h, chunk in zip(hashes, chunks) if h not in known}.items())
+        if to_embed:
+            vectors = await self.embedder.embed([text for _, text in to_embed])
+            quantized, scales = quantize(vectors, self.dtype)
+            for (digest, _), row, scale in zip(to_embed, quantized, scales):
+                known[digest] = (row.tobytes(), float(scale))
+        self.embedded += len(to_embed)
+        self.reused += len(chunks) - len(to_embed)
+
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "chunk_id": chunk.id,
+                "org_id": chunk.org_id,
+                "meeting_id": chunk.meeting_id,
+                "embedder": self.embedder.name,
+                "dtype": self.dtype,
+                "vector": known[digest][0],
+                "scale": known[digest][1],
+                "text_hash": digest,
+            }
+            for chunk, digest in zip(chunks, hashes)
+        ]
+        await db.execute(
+            pg_insert(ChunkEmbedding)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["chunk_id", "embedder"])
+        )
+
+        # Keep an already loaded org index current without a reload
+        index = self._indexes.get(chunks[0].org_id)
+        if index is not None:
+            index.add(
+                [row["chunk_id"] for row in rows],
+                [row["meeting_id"] for row in rows],
+                np.stack([np.frombuffer(row["vector"], dtype=self.dtype) for row in rows]),
+                np.asarray([row["scale"] for row in rows], dtype=np.float32),
+            )
+        return len(rows)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        query: str,
+        meeting_id: Optional[uuid.UUID] = None,
+        top_k: int = 10,
+    ) -> List[ChunkHit]:
+        """Chunks of the org (or one meeting) most similar to query."""
+        index = await self.load(db, org_id)
+        vector = (await self.embedder.embed([query]))[0]
+        matches = index.search(vector, top_k=top_k, meeting_id=meeting_id)
+        if not matches:
+            return []
+
+        result = await db.execute(
+            select(TranscriptChunk).where(TranscriptChunk.id.in_([chunk_id for chunk_id, _, _ in matches]))
+        )
+        chunks = {chunk.id: chunk for chunk in result.scalars().all()}
+        index.discard(chunk_id for chunk_id, _, _ in matches if chunk_id not in chunks)
+
+        return [
+            ChunkHit(
+                chunk_id=chunk_id,
+                meeting_id=chunk_meeting_id,
+                score=round(score, 4),
+                sequence=chunks[chunk_id].sequence,
+                speaker=chunks[chunk_id].speaker,
+                text=chunks[chunk_id].text,
+                start_time=chunks[chunk_id].start_time,
+                end_time=chunks[chunk_id].end_time,
+            )
+            for chunk_id, chunk_meeting_id, score in matches
+            if chunk_id in chunks
+        ]
+
+    async def load(self, db: AsyncSession, org_id: uuid.UUID) -> VectorIndex:
+        """The org's index, topped up with rows stored since it was last loaded."""
+        index = self._indexes.get(org_id)
+        if index is None:
+            index = VectorIndex(self.embedder.dim, self.dtype)
+            self._indexes[org_id] = index
+            while len(self._indexes) > self.max_orgs:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(org_id)
+
+        query = (
+            select(
+                ChunkEmbedding.chunk_id, ChunkEmbedding.meeting_id, ChunkEmbedding.vector,
+                ChunkEmbedding.scale, ChunkEmbedding.dtype, ChunkEmbedding.created_at,
+            )
+            .where(ChunkEmbedding.org_id == org_id)
+            .where(ChunkEmbedding.embedder == self.embedder.name)
+        )
+        if index.loaded_until is not None:
+            query = query.where(ChunkEmbedding.created_at > index.loaded_until - REFRESH_OVERLAP)
+        rows = [row for row in (await db.execute(query)).all() if row.chunk_id not in index]
+        if rows:
+            decoded = [self._decode(row.vector, row.scale, row.dtype) for row in rows]
+            index.add(
+                [row.chunk_id for row in rows],
+                [row.meeting_id for row in rows],
+                np.stack([vector for vector, _ in decoded]),
+                np.asarray([scale for _, scale in decoded], dtype=np.float32),
+            )
+            newest = max(row.created_at for row in rows)
+            if index.loaded_until is None or newest > index.loaded_until:
+                index.loaded_until = newest
+        return index
+
+    async def _vectors_by_hash(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        hashes: List[str],
+    ) -> Dict[str, Tuple[bytes, float]]:
+        result = await db.execute(
+            select(ChunkEmbedding.text_hash, ChunkEmbedding.vector, ChunkEmbedding.scale, ChunkEmbedding.dtype)
+            .where(ChunkEmbedding.org_id == org_id)
+            .where(ChunkEmbedding.embedder == self.embedder.name)
+            .where(ChunkEmbedding.text_hash.in_(hashes))
+            .distinct(ChunkEmbedding.text_hash)
+        )
+        known = {}
+        for row in result.all():
+            vector, scale = self._decode(row.vector, row.scale, row.dtype)
+            known[row.text_hash] = (vector.tobytes(), scale)
+        return known
+
+    def _decode(self, data: bytes, scale: float, dtype: str) -> Tuple[np.ndarray, float]:
+        """A stored row and its scale, requantized to self.dtype if stored as another dtype."""
+        vector = np.frombuffer(data, dtype=dtype)
+        if dtype == self.dtype:
+            return vector, scale
+        rows, scales = quantize(vector.astype(np.float32)[None, :] * np.float32(scale), self.dtype)
+        return rows[0], float(scales[0])
+
+    def stats(self) -> dict:
+        return {
+            "embedder": self.embedder.name,
+            "dtype": self.dtype,
+            "orgs_loaded": len(self._indexes),
+            "vectors_loaded": sum(len(index) for index in self._indexes.values()),
+            "embedded": self.embedded,
+            "reused": self.reused,
+        }
+
+
+_vector_store: Optional[ChunkVectorStore] = None
+
+
+def get_vector_store() -> ChunkVectorStore:
+    """Get or create the process-wide chunk vector store."""
+    global _vector_store
+    if _vector_store is None:
+        _vector_store = ChunkVectorStore()
+    return _vector_store
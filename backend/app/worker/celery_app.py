@@ -1,5 +1,7 @@
 """Celery application configuration."""
+import os
 from celery import Celery
+from kombu import Queue
 from app.config import settings
 
 # Create Celery app
@@ -9,6 +11,77 @@ celery_app = Celery(
     backend=settings.celery_result_backend,
 )
 
+# Workload classes. Concurrency and pool are worker options, so each queue
+# is served by its own worker (see worker_command):
+#   transcribe - provider calls and long job polls (I/O)
+#   extract    - LLM extraction (I/O)
+#   parse      - docx/PDF text extraction (CPU, prefork)
+#   distribute - pipeline orchestration and fan-out branches (I/O)
+#   sync       - Linear and Google Workspace syncs (I/O)
+# Thread-pool workers run all their tasks' coroutines on one event loop
+# per process (see runtime.py), so their concurrency is how many tasks
+# wait on I/O at once; blocking calls inside tasks must use to_thread.
+WORKER_QUEUES: dict[str, dict] = {
+    "transcribe": {"pool": "threads", "concurrency": 16, "rate_limit": settings.celery_transcribe_rate_limit},
+    "extract": {"pool": "threads", "concurrency": 8, "rate_limit": settings.celery_extract_rate_limit},
+    "parse": {"pool": "prefork", "concurrency": os.cpu_count() or 2, "rate_limit": settings.celery_parse_rate_limit},
+    "distribute": {"pool": "threads", "concurrency": 8, "rate_limit": settings.celery_distribute_rate_limit},
+    "sync": {"pool": "threads", "concurrency": 8, "rate_limit": settings.celery_sync_rate_limit},
+}
+
+TASK_QUEUES: dict[str, str] = {
+    "pipeline.process_artifact": "distribute",
+    "pipeline.ingest_artifact": "distribute",
+    "pipeline.transcribe_or_extract": "transcribe",
+    "pipeline.resume_transcription": "transcribe",
+    "pipeline.sweep_transcription_jobs": "transcribe",
+    "pipeline.extract_intelligence": "extract",
+    "pipeline.sync_to_linear": "distribute",
+    "pipeline.sync_to_google_email": "distribute",
+    "pipeline.sync_to_google_calendar": "distribute",
+    "pipeline.index_chunks": "distribute",
+    "pipeline.finalize": "distribute",
+    "sync.linear.sync_action_items": "sync",
+    "sync.google.create_email_draft": "sync",
+    "sync.google.create_calendar_event": "sync",
+    "sync.google.create_meeting_with_agenda": "sync",
+}
+
+# Deferred Whisperflow jobs resume from a webhook; the sweep (run by
+# celery beat) picks up any whose webhook was lost
+BEAT_SCHEDULE: dict[str, dict] = {}
+if settings.whisperflow_webhook_enabled:
+    BEAT_SCHEDULE["sweep-transcription-jobs"] = {
+        "task": "pipeline.sweep_transcription_jobs",
+        "schedule": settings.whisperflow_sweep_seconds,
+    }
+
+# Redis priorities: lower is served first. Uploads use the default;
+# bulk jobs are sent with BULK_PRIORITY so they queue behind them.
+INTERACTIVE_PRIORITY = 0
+BULK_PRIORITY = 9
+
+
+def _rate_limit_annotations() -> dict[str, dict]:
+    """Give every routed task its queue's rate limit (per worker)."""
+    annotations = {}
+    for task_name, queue in TASK_QUEUES.items():
+        rate_limit = WORKER_QUEUES[queue]["rate_limit"]
+        if rate_limit:
+            annotations[task_name] = {"rate_limit": rate_limit}
+    return annotations
+
+
+def worker_command(queue: str) -> str:
+    """Command line for a worker serving a single queue."""
+    options = WORKER_QUEUES[queue]
+    return (
+        f"celery -A app.worker.celery_app worker -Q {queue} "
+        f"-P {options['pool']} -c {options['concurrency']} "
+        f"-n {queue}@%h --loglevel=info"
+    )
+
+
 # Configuration
 celery_app.conf.update(
     task_serializer="json",
@@ -21,12 +94,26 @@ celery_app.conf.update(
     task_soft_time_limit=3300,  # 55 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=100,
+    task_queues=[Queue(name) for name in WORKER_QUEUES],
+    task_default_queue="distribute",
+    task_routes={name: {"queue": queue} for name, queue in TASK_QUEUES.items()},
+    task_annotations=_rate_limit_annotations(),
+    task_default_priority=INTERACTIVE_PRIORITY,
+    beat_schedule=BEAT_SCHEDULE,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "queue_order_strategy": "priority",
+    },
 )
 
 # Auto-discover tasks
 celery_app.autodiscover_tasks(["app.worker.tasks"])
 
+# Per-process event loop, DB pool and HTTP clients (connects worker signals)
+import app.worker.runtime  # noqa: E402,F401
 
 
-
-
+if __name__ == "__main__":
+    # Print one worker command per queue
+    for name in WORKER_QUEUES:
+        print(worker_command(name))
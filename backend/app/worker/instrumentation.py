@@ -0,0 +1,251 @@
+"""Pipeline stage instrumentation.
+
+``stage_run`` wraps a pipeline stage, measures it and writes a single
+``ProcessingRun`` row when the stage exits (one INSERT instead of a
+create + two updates across three sessions). Per-stage latency
+histograms are accumulated in Redis so every worker process contributes
+to the same series, and can be rendered in Prometheus text format.
+
+Wall time is per stage. CPU time and RSS are process-level readings
+taken across the stage (``process_*`` in the run metadata): stages share
+the worker's event loop, so they include whatever else the process ran
+meanwhile. ``concurrent_stages`` records how many stages overlapped.
+"""
+import logging
+import resource
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import ProcessingRun
+
+logger = logging.getLogger(__name__)
+
+# Latency bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+HISTOGRAM_KEY = "metrics:stage_latency"
+
+_current_stage: ContextVar[Optional["StageRun"]] = ContextVar("current_stage", default=None)
+
+# Stages running in this process
+_running: set = set()
+
+
+class StageRun:
+    """Measurements collected while a stage runs."""
+
+    def __init__(
+        self,
+        stage: str,
+        org_id: uuid.UUID,
+        meeting_id: Optional[uuid.UUID] = None,
+        artifact_id: Optional[uuid.UUID] = None,
+    ):
+        self.id = uuid.uuid4()
+        self.stage = stage
+        self.org_id = org_id
+        self.meeting_id = meeting_id
+        self.artifact_id = artifact_id
+        self.rows: Counter = Counter()
+        self.external_calls: Counter = Counter()
+        self.metadata: dict = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._rss_start = _peak_rss_kb()
+        self.concurrent_stages = 1
+
+    def add_rows(self, table: str, count: int = 1) -> None:
+        """Record rows written to a table."""
+        self.rows[table] += count
+
+    def add_external_call(self, service: str, count: int = 1) -> None:
+        """Record calls made to an external service (provider, LLM, API)."""
+        self.external_calls[service] += count
+
+    def start(self) -> None:
+        """Count this stage as running alongside the others in the process."""
+        _running.add(self)
+        for run in _running:
+            run.concurrent_stages = max(run.concurrent_stages, len(_running))
+
+    def finish(self) -> dict:
+        """Snapshot timing and process resource usage."""
+        _running.discard(self)
+        peak = _peak_rss_kb()
+        return {
+            "wall_ms": round((time.perf_counter() - self._wall_start) * 1000, 1),
+            # Process-wide: includes stages that overlapped this one
+            "process_cpu_ms": round((time.process_time() - self._cpu_start) * 1000, 1),
+            "process_peak_rss_kb": peak,
+            "process_rss_growth_kb": max(0, peak - self._rss_start),
+            "concurrent_stages": self.concurrent_stages,
+            "rows": dict(self.rows),
+            "external_calls": dict(self.external_calls),
+        }
+
+
+def _peak_rss_kb() -> int:
+    """Lifetime peak resident set size of this process in KiB (Linux units)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def current_stage() -> Optional[StageRun]:
+    """The stage currently running in this context, if any."""
+    return _current_stage.get()
+
+
+def record_external_call(service: str, count: int = 1) -> None:
+    """Count an external call against the current stage (no-op outside one)."""
+    run = _current_stage.get()
+    if run is not None:
+        run.add_external_call(service, count)
+
+
+@asynccontextmanager
+async def stage_run(
+    stage: str,
+    org_id: uuid.UUID,
+    meeting_id: Optional[uuid.UUID] = None,
+    artifact_id: Optional[uuid.UUID] = None,
+) -> AsyncIterator[StageRun]:
+    """
+    Instrument a pipeline stage.
+
+    Usage:
+        async with stage_run("extract", org_id, artifact_id=artifact_id) as run:
+            ...
+            run.add_rows("decisions", len(decisions))
+
+    The ProcessingRun row is inserted once, on exit, with status
+    succeeded or failed. Exceptions are re-raised.
+    """
+    run = StageRun(stage, org_id, meeting_id=meeting_id, artifact_id=artifact_id)
+    run.start()
+    token = _current_stage.set(run)
+    error: Optional[str] = None
+    try:
+        yield run
+    except BaseException as e:
+        error = str(e) or type(e).__name__
+        raise
+    finally:
+        _current_stage.reset(token)
+        stats = run.finish()
+        await _write_run(run, stats, error)
+        await _observe_latency(stage, stats["wall_ms"] / 1000, failed=error is not None)
+
+
+async def _write_run(run: StageRun, stats: dict, error: Optional[str]) -> None:
+    """Insert the finished ProcessingRun in one statement."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                insert(ProcessingRun).values(
+                    id=run.id,
+                    org_id=run.org_id,
+                    meeting_id=run.meeting_id,
+                    artifact_id=run.artifact_id,
+                    stage=run.stage,
+                    status="failed" if error else "succeeded",
+                    error=error,
+                    run_metadata={**run.metadata, **stats},
+                    started_at=run.started_at,
+                    finished_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+    except Exception as e:
+        # Instrumentation must never mask the stage outcome
+        logger.warning(f"Failed to record processing run for {run.stage}: {e}")
+
+
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None:
+        import redis.asyncio as aioredis
+        _redis = aioredis.from_url(settings.redis_url)
+    return _redis
+
+
+def _bucket_label(seconds: float) -> str:
+    idx = bisect_left(LATENCY_BUCKETS, seconds)
+    return str(LATENCY_BUCKETS[idx]) if idx < len(LATENCY_BUCKETS) else "+Inf"
+
+
+async def _observe_latency(stage: str, seconds: float, failed: bool = False) -> None:
+    """Add one observation to the shared per-stage histogram."""
+    try:
+        key = f"{HISTOGRAM_KEY}:{stage}"
+        pipe = _get_redis().pipeline(transaction=False)
+        pipe.hincrby(key, _bucket_label(seconds), 1)
+        pipe.hincrby(key, "count", 1)
+        pipe.hincrbyfloat(key, "sum", seconds)
+        if failed:
+            pipe.hincrby(key, "failed", 1)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug(f"Failed to record stage latency: {e}")
+
+
+async def get_stage_histograms() -> dict[str, dict]:
+    """
+    Read per-stage latency histograms.
+
+    Returns:
+        {stage: {"buckets": {le: cumulative_count}, "count", "sum", "failed"}}
+    """
+    client = _get_redis()
+    histograms = {}
+    async for raw_key in client.scan_iter(match=f"{HISTOGRAM_KEY}:*"):
+        key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+        stage = key[len(HISTOGRAM_KEY) + 1:]
+        fields = {
+            (k.decode() if isinstance(k, bytes) else k): float(v)
+            for k, v in (await client.hgetall(key)).items()
+        }
+        cumulative = 0
+        buckets = {}
+        for le in [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]:
+            cumulative += int(fields.get(le, 0))
+            buckets[le] = cumulative
+        histograms[stage] = {
+            "buckets": buckets,
+            "count": int(fields.get("count", 0)),
+            "sum": fields.get("sum", 0.0),
+            "failed": int(fields.get("failed", 0)),
+        }
+    return histograms
+
+
+def render_prometheus(histograms: dict[str, dict]) -> str:
+    """Render histograms in Prometheus text exposition format."""
+    name = "pipeline_stage_duration_seconds"
+    lines = [
+        f"# HELP {name} Wall time of pipeline stages.",
+        f"# TYPE {name} histogram",
+    ]
+    for stage in sorted(histograms):
+        hist = histograms[stage]
+        for le, count in hist["buckets"].items():
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {count}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {hist["sum"]}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {hist["count"]}')
+    lines.append("# HELP pipeline_stage_failures_total Failed pipeline stage runs.")
+    lines.append("# TYPE pipeline_stage_failures_total counter")
+    for stage in sorted(histograms):
+        lines.append(f'pipeline_stage_failures_total{{stage="{stage}"}} {histograms[stage]["failed"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,354 @@
+"""Bulk reprocessing of historical meetings.
+
+A reprocess job re-runs chosen pipeline stages (e.g. extraction after a
+prompt change) over every meeting matching a filter, with bounded
+concurrency. The job and each finished meeting are recorded as
+``ProcessingRun`` rows, so a crashed or interrupted job resumes where it
+stopped instead of starting over:
+
+    job_id = await create_job(ReprocessFilter(org_id=org), ["extract"])
+    await run_job(job_id)            # later: run_job(job_id) again resumes
+"""
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import func, insert, select, update
+
+from app.database import AsyncSessionLocal
+from app.models import Artifact, Meeting, ProcessingRun
+
+logger = logging.getLogger(__name__)
+
+# ProcessingRun.stage values for the job header and per-meeting checkpoints
+JOB_STAGE = "reprocess_job"
+ITEM_STAGE = "reprocess"
+
+# Stages a job can re-run, in pipeline order
+REPROCESS_STAGES = ("transcribe", "extract")
+
+
+@dataclass
+class ReprocessFilter:
+    """Which meetings a job covers."""
+    org_id: uuid.UUID
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    statuses: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "org_id": str(self.org_id),
+            "date_from": self.date_from.isoformat() if self.date_from else None,
+            "date_to": self.date_to.isoformat() if self.date_to else None,
+            "statuses": self.statuses,
+        }
+
+
+@dataclass
+class ReprocessProgress:
+    """Counters for one run of a job (resumed items are counted as skipped)."""
+    total: int
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.skipped - self.processed)
+
+    @property
+    def throughput(self) -> float:
+        """Meetings per second in this run."""
+        elapsed = time.monotonic() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.throughput
+        return self.remaining / rate if rate > 0 else None
+
+    def snapshot(self) -> dict:
+        eta = self.eta_seconds
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "remaining": self.remaining,
+            "per_minute": round(self.throughput * 60, 2),
+            "eta_seconds": round(eta) if eta is not None else None,
+        }
+
+
+def validate_stages(stages: list[str]) -> list[str]:
+    """
+    Normalize stage names into pipeline order.
+
+    Raises:
+        ValueError: On unknown stages, or transcribe without extract
+            (new transcript chunks invalidate the old extraction)
+    """
+    unknown = set(stages) - set(REPROCESS_STAGES)
+    if unknown or not stages:
+        raise ValueError(
+            f"Unknown reprocess stage(s): {', '.join(sorted(unknown)) or '(none)'}. "
+            f"Available: {', '.join(REPROCESS_STAGES)}"
+        )
+    if "transcribe" in stages and "extract" not in stages:
+        raise ValueError("Reprocessing transcribe also requires extract")
+    return [stage for stage in REPROCESS_STAGES if stage in stages]
+
+
+async def select_targets(filters: ReprocessFilter) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    """
+    Meetings matching the filter, with the artifact to reprocess.
+
+    Uses each meeting's earliest artifact, as the pipeline does.
+
+    Returns:
+        [(meeting_id, artifact_id)] ordered by meeting date
+    """
+    first_artifact = (
+        select(Artifact.meeting_id, func.min(Artifact.created_at).label("created_at"))
+        .where(Artifact.org_id == filters.org_id)
+        .group_by(Artifact.meeting_id)
+        .subquery()
+    )
+    query = (
+        select(Meeting.id, Artifact.id)
+        .join(first_artifact, first_artifact.c.meeting_id == Meeting.id)
+        .join(
+            Artifact,
+            (Artifact.meeting_id == Meeting.id)
+            & (Artifact.created_at == first_artifact.c.created_at),
+        )
+        .where(Meeting.org_id == filters.org_id)
+        .order_by(Meeting.meeting_date.asc().nulls_last(), Meeting.id)
+    )
+    if filters.date_from:
+        query = query.where(Meeting.meeting_date >= filters.date_from)
+    if filters.date_to:
+        query = query.where(Meeting.meeting_date <= filters.date_to)
+    if filters.statuses:
+        query = query.where(Meeting.processing_status.in_(filters.statuses))
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(query)).all()
+
+    # Ties on created_at could yield two artifacts for one meeting
+    seen: dict[uuid.UUID, uuid.UUID] = {}
+    for meeting_id, artifact_id in rows:
+        seen.setdefault(meeting_id, artifact_id)
+    return list(seen.items())
+
+
+async def create_job(
+    filters: ReprocessFilter,
+    stages: list[str],
+    concurrency: int = 4,
+) -> uuid.UUID:
+    """
+    Snapshot the matching meetings and record a new job.
+
+    Returns:
+        Job ID (the header ProcessingRun's id)
+    """
+    stages = validate_stages(stages)
+    targets = await select_targets(filters)
+    job_id = uuid.uuid4()
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(ProcessingRun).values(
+                id=job_id,
+                org_id=filters.org_id,
+                stage=JOB_STAGE,
+                status="queued",
+                run_metadata={
+                    "filters": filters.to_dict(),
+                    "stages": stages,
+                    "concurrency": concurrency,
+                    "targets": [[str(m), str(a)] for m, a in targets],
+                },
+            )
+        )
+        await db.commit()
+
+    logger.info(f"Created reprocess job {job_id} for {len(targets)} meetings ({', '.join(stages)})")
+    return job_id
+
+
+async def _completed_meetings(job_id: uuid.UUID) -> set[uuid.UUID]:
+    """Meetings already reprocessed successfully by this job."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ProcessingRun.meeting_id)
+            .where(ProcessingRun.stage == ITEM_STAGE)
+            .where(ProcessingRun.status == "succeeded")
+            .where(ProcessingRun.run_metadata["job_id"].astext == str(job_id))
+        )
+        return set(result.scalars().all())
+
+
+async def _set_job_status(job_id: uuid.UUID, status: str, metadata: dict, **values) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ProcessingRun)
+            .where(ProcessingRun.id == job_id)
+            .values(status=status, run_metadata=metadata, **values)
+        )
+        await db.commit()
+
+
+async def _reprocess_meeting(
+    meeting_id: uuid.UUID,
+    artifact_id: uuid.UUID,
+    org_id: uuid.UUID,
+    stages: list[str],
+) -> None:
+    from app.worker.tasks.pipeline import (
+        _extract_intelligence, _index_chunks, _transcribe_or_extract,
+    )
+
+    if "transcribe" in stages:
+        await _transcribe_or_extract(str(artifact_id), str(org_id), force=True, replace=True)
+    if "extract" in stages:
+        await _extract_intelligence(str(artifact_id), str(org_id), replace=True, use_cache=False)
+    if "transcribe" in stages:
+        # Replaced chunks lost their embeddings with them
+        await _index_chunks(str(meeting_id))
+
+
+async def run_job(
+    job_id: uuid.UUID,
+    concurrency: Optional[int] = None,
+    on_progress: Optional[Callable[[ReprocessProgress], None]] = None,
+) -> dict:
+    """
+    Run (or resume) a reprocess job.
+
+    Meetings already checkpointed as succeeded are skipped; failed ones
+    are retried. Each finished meeting is recorded immediately as an
+    ITEM_STAGE ProcessingRun, so progress survives a crash.
+
+    Args:
+        job_id: ID returned by create_job
+        concurrency: Override the job's concurrency for this run
+        on_progress: Called after every finished meeting
+
+    Returns:
+        Final progress snapshot
+    """
+    async with AsyncSessionLocal() as db:
+        job = (await db.execute(
+            select(ProcessingRun)
+            .where(ProcessingRun.id == job_id)
+            .where(ProcessingRun.stage == JOB_STAGE)
+        )).scalar_one()
+
+    metadata = dict(job.run_metadata or {})
+    stages = metadata["stages"]
+    targets = [(uuid.UUID(m), uuid.UUID(a)) for m, a in metadata["targets"]]
+    limit = max(1, concurrency or metadata.get("concurrency", 4))
+
+    done = await _completed_meetings(job_id)
+    progress = ReprocessProgress(total=len(targets), skipped=len(done & {m for m, _ in targets}))
+    await _set_job_status(
+        job_id, "running", metadata,
+        started_at=job.started_at or datetime.now(timezone.utc),
+    )
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def process(meeting_id: uuid.UUID, artifact_id: uuid.UUID):
+        async with semaphore:
+            started = datetime.now(timezone.utc)
+            wall = time.perf_counter()
+            error = None
+            try:
+                await _reprocess_meeting(meeting_id, artifact_id, job.org_id, stages)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                logger.warning(f"Reprocess job {job_id}: meeting {meeting_id} failed: {error}")
+
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    insert(ProcessingRun).values(
+                        org_id=job.org_id,
+                        meeting_id=meeting_id,
+                        artifact_id=artifact_id,
+                        stage=ITEM_STAGE,
+                        status="failed" if error else "succeeded",
+                        error=error,
+                        run_metadata={
+                            "job_id": str(job_id),
+                            "stages": stages,
+                            "wall_ms": round((time.perf_counter() - wall) * 1000, 1),
+                        },
+                        started_at=started,
+                        finished_at=datetime.now(timezone.utc),
+                    )
+                )
+                await db.commit()
+
+            if error:
+                progress.failed += 1
+            else:
+                progress.succeeded += 1
+            if on_progress:
+                on_progress(progress)
+
+    try:
+        await asyncio.gather(*(
+            process(meeting_id, artifact_id)
+            for meeting_id, artifact_id in targets
+            if meeting_id not in done
+        ))
+    except BaseException:
+        metadata["last_run"] = progress.snapshot()
+        await _set_job_status(job_id, "failed", metadata)
+        raise
+
+    metadata["last_run"] = progress.snapshot()
+    await _set_job_status(
+        job_id,
+        "failed" if progress.failed else "succeeded",
+        metadata,
+        error=f"{progress.failed} meeting(s) failed; run again to retry" if progress.failed else None,
+        finished_at=datetime.now(timezone.utc),
+    )
+    return progress.snapshot()
+
+
+async def list_jobs(org_id: uuid.UUID, limit: int = 20) -> list[dict]:
+    """Recent reprocess jobs for an org."""
+    async with AsyncSessionLocal() as db:
+        jobs = (await db.execute(
+            select(ProcessingRun)
+            .where(ProcessingRun.org_id == org_id)
+            .where(ProcessingRun.stage == JOB_STAGE)
+            .order_by(ProcessingRun.created_at.desc())
+            .limit(limit)
+        )).scalars().all()
+
+    return [
+        {
+            "id": str(job.id),
+            "status": job.status,
+            "stages": (job.run_metadata or {}).get("stages"),
+            "total": len((job.run_metadata or {}).get("targets", [])),
+            "last_run": (job.run_metadata or {}).get("last_run"),
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+        }
+        for job in jobs
+    ]
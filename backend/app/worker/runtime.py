@@ -0,0 +1,157 @@
+"""Per-process async runtime for Celery workers.
+
+Each worker process owns one long-lived event loop running in a background
+thread. Tasks submit coroutines to it with ``run_async`` instead of calling
+``asyncio.run``, so the SQLAlchemy/asyncpg pool and shared HTTP clients are
+created once per process and reused across tasks. Thread-pool workers
+share the one loop between their threads.
+
+With the threads pool, -c is the number of tasks in flight on that loop,
+not the number of tasks that can compute at once: a coroutine that
+blocks (synchronous SDK calls, CPU-heavy work) stalls every task in the
+process. Such calls must go through ``asyncio.to_thread`` (see the
+Google client, HashingEmbedder and the Drive/Linear sync).
+"""
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """Owns the event loop, DB pool and shared clients for one process."""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._startup_hooks: list[Callable[[], Awaitable[None]]] = []
+        self._shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def started(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def on_startup(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function to run on the loop at startup."""
+        self._startup_hooks.append(hook)
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function to run on the loop at shutdown."""
+        self._shutdown_hooks.append(hook)
+
+    def start(self) -> None:
+        """Start the loop thread (idempotent)."""
+        with self._lock:
+            if self.started:
+                return
+
+            # Connections inherited from the parent process (or opened on a
+            # previous loop) cannot be used on this loop; start from empty.
+            from app.database import engine
+            engine.sync_engine.dispose(close=False)
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(
+                target=_run, name="worker-async-runtime", daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+            self.loop = loop
+
+        self.submit(self._startup())
+        logger.info("Worker async runtime started")
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Run shutdown hooks, dispose the pool and stop the loop."""
+        with self._lock:
+            if not self.started:
+                return
+            loop = self.loop
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Worker runtime shutdown error: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout)
+        loop.close()
+
+        with self._lock:
+            self.loop = None
+            self._thread = None
+        logger.info("Worker async runtime stopped")
+
+    def submit(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the runtime loop and block for its result."""
+        if not self.started:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+    async def _startup(self) -> None:
+        for hook in self._startup_hooks:
+            await hook()
+
+    async def _shutdown(self) -> None:
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.warning(f"Shutdown hook failed: {e}")
+
+        from app.services.llm_accounting import flush_llm_usage
+        await flush_llm_usage()
+
+        from app.http_clients import close_http_clients
+        await close_http_clients()
+
+        from app.database import engine
+        await engine.dispose()
+
+
+# Process-wide runtime
+runtime = WorkerRuntime()
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine from a Celery task on the worker's persistent loop.
+
+    Starts the runtime lazily, so this also works for eager tasks and
+    scripts that call task functions directly.
+    """
+    return runtime.submit(coro, timeout)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """Start the runtime when a worker child process boots."""
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    """Release pooled connections when a worker child process exits."""
+    runtime.stop()
+
+
+@worker_shutdown.connect
+def _shutdown_worker(**kwargs):
+    """Stop the runtime in thread/solo pool workers, which have no child processes."""
+    runtime.stop()
@@ -1,101 +1,207 @@
 """Pipeline tasks for meeting processing."""
+import asyncio
 import uuid
+import shutil
 import tempfile
 import os
-from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 from celery import chain, group
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
+from app.worker.instrumentation import stage_run
+from app.worker.transcription_jobs import get_pending_jobs
+from app.config import settings
 from app.database import AsyncSessionLocal
-from app.models import (
-    Meeting, Artifact, TranscriptChunk, Summary,
-    ActionItem, Decision, Tag, MeetingTag, Entity,
-    MeetingEntity, ProcessingRun
+from app.http_clients import close_http_clients
+from app.models import Meeting, Artifact, TranscriptChunk, Summary
+from app.providers import (
+    IncompleteTranscription,
+    TranscriptionUpdate,
+    WhisperflowProvider,
+    get_transcription_provider,
+    transcription_provider_chain,
 )
-from app.providers import get_transcription_provider
+from app.integrations.whisperflow_poller import TERMINAL_STATES
+from app.services.audio_preprocessing import prepare_audio, transcribe_pieces
 from app.services.document import DocumentService
 from app.services.extraction import get_extraction_service
+from app.services.artifact_cache import (
+    find_reusable_artifact, clone_transcript, clone_intelligence,
+)
+from app.services.vector_index import get_vector_store
+from app.services.bulk_persistence import (
+    clear_intelligence, persist_intelligence, tag_id_cache, entity_id_cache,
+)
+from app.worker.tasks.sync import (
+    _create_google_email_draft, _create_google_calendar_event,
+)
 
 
-async def create_processing_run(
-    org_id: uuid.UUID,
+# Stage dependency graph: stage -> stages it waits for.
+# Everything after "extract" only needs the extracted rows, so the
+# distribution stages (and the search index update) fan out in parallel
+# and are joined by a chord.
+PIPELINE_DAG: dict[str, tuple[str, ...]] = {
+    "ingest": (),
+    "transcribe": ("ingest",),
+    "extract": ("transcribe",),
+    "sync_linear": ("extract",),
+    "sync_google_email": ("extract",),
+    "sync_google_calendar": ("extract",),
+    "index_chunks": ("extract",),
+}
+
+
+def pipeline_levels(dag: dict[str, tuple[str, ...]] = PIPELINE_DAG) -> list[list[str]]:
+    """
+    Group stages into dependency levels (topological layers).
+    
+    Stages in the same level have no dependencies on each other and
+    can run concurrently.
+    
+    Raises:
+        ValueError: If the graph has a cycle or an unknown dependency
+    """
+    remaining = {stage: set(deps) for stage, deps in dag.items()}
+    for stage, deps in remaining.items():
+        unknown = deps - remaining.keys()
+        if unknown:
+            raise ValueError(f"Stage {stage} depends on unknown stage(s): {', '.join(sorted(unknown))}")
+    
+    levels = []
+    done: set[str] = set()
+    while remaining:
+        ready = [stage for stage, deps in remaining.items() if deps <= done]
+        if not ready:
+            raise ValueError(f"Pipeline has a cycle among: {', '.join(sorted(remaining))}")
+        levels.append(ready)
+        done.update(ready)
+        for stage in ready:
+            del remaining[stage]
+    return levels
+
+
+# Stages that may reuse results of an identical earlier artifact (by sha256)
+CACHEABLE_STAGES = {"transcribe", "extract"}
+
+
+def _stage_signature(
     stage: str,
-    meeting_id: Optional[uuid.UUID] = None,
-    artifact_id: Optional[uuid.UUID] = None,
-) -> uuid.UUID:
-    """Create a processing run record."""
-    async with AsyncSessionLocal() as db:
-        run = ProcessingRun(
-            org_id=org_id,
-            meeting_id=meeting_id,
-            artifact_id=artifact_id,
-            stage=stage,
-            status="queued",
-        )
-        db.add(run)
-        await db.commit()
-        await db.refresh(run)
-        return run.id
+    artifact_id: str,
+    org_id: str,
+    force_reprocess: bool,
+    file_type: Optional[str],
+    priority: Optional[int],
+):
+    if stage == "transcribe":
+        # priority is kept in case the stage defers to a webhook
+        sig = STAGE_TASKS[stage].s(artifact_id, org_id, force=force_reprocess, priority=priority)
+    elif stage in CACHEABLE_STAGES:
+        sig = STAGE_TASKS[stage].s(artifact_id, org_id, force=force_reprocess)
+    else:
+        sig = STAGE_TASKS[stage].s(artifact_id, org_id)
+    
+    # Word documents are parsed locally (CPU), not sent to a provider
+    if stage == "transcribe" and file_type == "docx":
+        sig = sig.set(queue="parse")
+    if priority is not None:
+        sig = sig.set(priority=priority)
+    return sig
+
 
+def _with_ancestors(stage: str, dag: dict[str, tuple[str, ...]] = PIPELINE_DAG) -> set[str]:
+    """A stage and every stage it (transitively) depends on."""
+    done = {stage}
+    pending = list(dag[stage])
+    while pending:
+        dep = pending.pop()
+        if dep not in done:
+            done.add(dep)
+            pending.extend(dag[dep])
+    return done
 
-async def update_processing_run(
-    run_id: uuid.UUID,
-    status: str,
-    error: Optional[str] = None,
-    metadata: Optional[dict] = None,
+
+def build_pipeline(
+    artifact_id: str,
+    org_id: str,
+    force_reprocess: bool = False,
+    file_type: Optional[str] = None,
+    priority: Optional[int] = None,
+    after: Optional[str] = None,
 ):
-    """Update processing run status."""
-    async with AsyncSessionLocal() as db:
-        result = await db.execute(
-            select(ProcessingRun).where(ProcessingRun.id == run_id)
-        )
-        run = result.scalar_one()
-        
-        run.status = status
-        if error:
-            run.error = error
-        if metadata:
-            run.metadata = metadata
-        
-        if status == "running":
-            run.started_at = datetime.utcnow()
-        elif status in ["succeeded", "failed"]:
-            run.finished_at = datetime.utcnow()
-        
-        await db.commit()
+    """
+    Build the Celery canvas for an artifact from PIPELINE_DAG.
+    
+    Stages go to the queues configured in celery_app.TASK_QUEUES; the
+    transcribe stage of a docx artifact goes to the "parse" queue.
+    priority (Redis: lower runs first) applies to every stage.
+    
+    With after, the stage and everything it depends on are left out,
+    e.g. after="transcribe" continues a pipeline whose transcript is
+    already stored; the first task receives that stage's result.
+    """
+    skip = _with_ancestors(after) if after else set()
+    steps = []
+    for level in pipeline_levels():
+        signatures = [
+            _stage_signature(stage, artifact_id, org_id, force_reprocess, file_type, priority)
+            for stage in level
+            if stage not in skip
+        ]
+        if not signatures:
+            continue
+        steps.append(signatures[0] if len(signatures) == 1 else group(signatures))
+    
+    # A group followed by a task becomes a chord: the join only runs
+    # once every branch has finished, and no branch waits on another.
+    if isinstance(steps[-1], group):
+        finalize = finalize_pipeline.s(artifact_id, org_id)
+        if priority is not None:
+            finalize = finalize.set(priority=priority)
+        steps.append(finalize)
+    
+    return chain(*steps)
 
 
 @celery_app.task(name="pipeline.process_artifact")
-def process_artifact(artifact_id: str, org_id: str):
+def process_artifact(
+    artifact_id: str,
+    org_id: str,
+    force_reprocess: bool = False,
+    file_type: Optional[str] = None,
+    priority: Optional[int] = None,
+):
     """
     Process an artifact through the full pipeline.
     
-    This is the main entry point that chains all pipeline stages.
-    """
-    artifact_uuid = uuid.UUID(artifact_id)
-    org_uuid = uuid.UUID(org_id)
+    This is the main entry point. Stages run as a DAG:
+    ingest → transcribe → extract → {linear, email, calendar, index} → finalize.
     
-    # Build processing chain
-    workflow = chain(
-        ingest_artifact.s(artifact_id, org_id),
-        transcribe_or_extract.s(artifact_id, org_id),
-        extract_intelligence.s(artifact_id, org_id),
-        sync_to_linear.s(artifact_id, org_id),
-        sync_to_google_email.s(artifact_id, org_id),
-        sync_to_google_calendar.s(artifact_id, org_id),
-    )
+    If an identical file (same sha256) was already processed in the org,
+    its transcript and intelligence are reused unless force_reprocess is set.
     
+    Pass file_type so document parsing is routed to the "parse" queue,
+    and priority=BULK_PRIORITY for batch jobs so interactive uploads
+    are served first.
+    """
+    workflow = build_pipeline(
+        artifact_id,
+        org_id,
+        force_reprocess=force_reprocess,
+        file_type=file_type,
+        priority=priority,
+    )
     return workflow()
 
 
 @celery_app.task(name="pipeline.ingest_artifact")
 def ingest_artifact(artifact_id: str, org_id: str):
     """Stage 1: Ingest artifact and create/link meeting."""
-    import asyncio
-    return asyncio.run(_ingest_artifact(artifact_id, org_id))
+    return run_async(_ingest_artifact(artifact_id, org_id))
 
 
 async def _ingest_artifact(artifact_id: str, org_id: str):
@@ -103,15 +209,7 @@ async def _ingest_artifact(artifact_id: str, org_id: str):
     artifact_uuid = uuid.UUID(artifact_id)
     org_uuid = uuid.UUID(org_id)
     
-    run_id = await create_processing_run(
-        org_id=org_uuid,
-        stage="ingest",
-        artifact_id=artifact_uuid,
-    )
-    
-    try:
-        await update_processing_run(run_id, "running")
-        
+    async with stage_run("ingest", org_uuid, artifact_id=artifact_uuid) as run:
         async with AsyncSessionLocal() as db:
             # Get artifact
             result = await db.execute(
@@ -138,42 +236,99 @@ async def _ingest_artifact(artifact_id: str, org_id: str):
                 
                 artifact.meeting_id = meeting.id
                 await db.commit()
+                run.add_rows("meetings")
             
-        await update_processing_run(run_id, "succeeded")
-        return {"status": "success", "artifact_id": artifact_id}
+            run.meeting_id = artifact.meeting_id
     
-    except Exception as e:
-        await update_processing_run(run_id, "failed", error=str(e))
-        raise
+    return {"status": "success", "artifact_id": artifact_id}
 
 
-@celery_app.task(name="pipeline.transcribe_or_extract")
-def transcribe_or_extract(prev_result: dict, artifact_id: str, org_id: str):
-    """Stage 2: Transcribe audio or extract text from document."""
-    import asyncio
-    return asyncio.run(_transcribe_or_extract(artifact_id, org_id))
+def _stop_chain(task) -> None:
+    """Don't run the rest of the canvas after this task."""
+    task.request.chain = None
+    task.request.callbacks = None
 
 
-async def _transcribe_or_extract(artifact_id: str, org_id: str):
-    """Async implementation of transcribe_or_extract."""
+@celery_app.task(bind=True, name="pipeline.transcribe_or_extract")
+def transcribe_or_extract(
+    self,
+    prev_result: dict,
+    artifact_id: str,
+    org_id: str,
+    force: bool = False,
+    priority: Optional[int] = None,
+):
+    """
+    Stage 2: Transcribe audio or extract text from document.
+    
+    A deferred Whisperflow job ends the chain here; resume_pipeline
+    starts the remaining stages when the job finishes.
+    """
+    result = run_async(_transcribe_or_extract(
+        artifact_id, org_id, force=force, defer={"force": force, "priority": priority},
+    ))
+    if result.get("status") == "deferred":
+        _stop_chain(self)
+    return result
+
+
+def _can_defer(provider) -> bool:
+    """Whether the provider's job can finish without a worker waiting on it."""
+    return settings.whisperflow_webhook_enabled and isinstance(provider, WhisperflowProvider)
+
+
+async def _transcribe_or_extract(
+    artifact_id: str,
+    org_id: str,
+    force: bool = False,
+    replace: bool = False,
+    defer: Optional[dict] = None,
+):
+    """
+    Async implementation of transcribe_or_extract.
+    
+    With replace, the artifact's existing transcript chunks are deleted
+    first (used when reprocessing; extraction must then be re-run too).
+    
+    With defer (the pipeline options to resume with), a Whisperflow job
+    is only submitted when WHISPERFLOW_WEBHOOK_URL is set, and the stage
+    returns status "deferred" instead of waiting for the transcript.
+    """
     artifact_uuid = uuid.UUID(artifact_id)
     org_uuid = uuid.UUID(org_id)
     
-    run_id = await create_processing_run(
-        org_id=org_uuid,
-        stage="transcribe",
-        artifact_id=artifact_uuid,
-    )
-    
-    try:
-        await update_processing_run(run_id, "running")
-        
+    async with stage_run("transcribe", org_uuid, artifact_id=artifact_uuid) as run:
         async with AsyncSessionLocal() as db:
             # Get artifact
             result = await db.execute(
                 select(Artifact).where(Artifact.id == artifact_uuid)
             )
             artifact = result.scalar_one()
+            run.meeting_id = artifact.meeting_id
+            
+            if replace:
+                await db.execute(
+                    delete(TranscriptChunk).where(TranscriptChunk.artifact_id == artifact.id)
+                )
+                await db.commit()
+            
+            # Reuse an identical, already processed upload
+            if not force:
+                provider_name = None
+                if artifact.file_type != "docx":
+                    provider_name = transcription_provider_chain()[0]
+                source = await find_reusable_artifact(db, artifact, provider_name)
+                if source:
+                    copied = await clone_transcript(db, source, artifact)
+                    await db.commit()
+                    run.add_rows("transcript_chunks", copied)
+                    run.metadata["reused_from"] = str(source.id)
+                    return {
+                        "status": "success",
+                        "artifact_id": artifact_id,
+                        "reused_from": str(source.id),
+                        "source_meeting_id": str(source.meeting_id),
+                    }
             
             if artifact.file_type == "docx":
                 # Extract text from Word document
@@ -196,229 +351,503 @@ async def _transcribe_or_extract(artifact_id: str, org_id: str):
                     text=text,
                 )
                 db.add(chunk)
+                run.add_rows("transcript_chunks")
             
             else:  # audio file
                 # Get signed URL from Supabase Storage (placeholder)
                 signed_url = f"https://storage.supabase.co/{artifact.storage_path}"
                 
-                # Transcribe
+                # Transcribe, persisting segments in batches as they arrive
                 provider = get_transcription_provider()
-                result = await provider.transcribe(signed_url, artifact.language)
-                
-                artifact.language = result.language
-                artifact.duration_seconds = result.duration
                 artifact.transcription_provider = provider.name
-                artifact.transcription_status = "completed"
+                artifact.transcription_status = "processing"
+                await db.commit()
                 
-                # Save segments as chunks
-                for i, segment in enumerate(result.segments):
-                    chunk = TranscriptChunk(
-                        org_id=org_uuid,
-                        meeting_id=artifact.meeting_id,
-                        artifact_id=artifact.id,
-                        sequence=i,
-                        speaker=segment.speaker,
-                        text=segment.text,
-                        start_time=segment.start,
-                        end_time=segment.end,
-                        confidence=segment.confidence,
-                        language=result.language,
+                run.add_external_call(f"transcription:{provider.name}")
+                
+                if defer is not None and _can_defer(provider):
+                    job_id = await provider.submit(
+                        signed_url, artifact.language, webhook_url=settings.whisperflow_webhook_url,
                     )
-                    db.add(chunk)
+                    await get_pending_jobs().add(job_id, {
+                        **defer,
+                        "artifact_id": artifact_id,
+                        "org_id": org_id,
+                        "provider": provider.name,
+                    })
+                    run.metadata["deferred_job"] = job_id
+                    return {"status": "deferred", "artifact_id": artifact_id, "transcription_id": job_id}
+                
+                # Uploaded file (see api/artifacts.py); long recordings are
+                # split and transcribed in parallel pieces. Pieces only
+                # exist on local disk, so this needs a provider that can
+                # read local files; the others get the whole file's URL.
+                local_path = f"/tmp/artifacts/{artifact.id}/{artifact.filename}"
+                if (
+                    settings.audio_chunking_enabled
+                    and provider.accepts_local_files
+                    and os.path.exists(local_path)
+                ):
+                    updates = _chunked_transcription(provider, artifact, local_path, run)
+                else:
+                    run.metadata["streaming"] = provider.supports_streaming
+                    updates = provider.transcribe_stream(signed_url, artifact.language)
+                
+                try:
+                    saved = await _persist_transcript_stream(db, updates, artifact, org_uuid)
+                except Exception:
+                    await _mark_transcription_failed(db, artifact_uuid)
+                    raise
+                
+                artifact.transcription_status = "completed"
+                run.add_rows("transcript_chunks", saved)
             
             await db.commit()
-        
-        await update_processing_run(run_id, "succeeded")
-        return {"status": "success", "artifact_id": artifact_id}
     
-    except Exception as e:
-        await update_processing_run(run_id, "failed", error=str(e))
-        raise
+    return {"status": "success", "artifact_id": artifact_id}
 
 
-@celery_app.task(name="pipeline.extract_intelligence")
-def extract_intelligence(prev_result: dict, artifact_id: str, org_id: str):
-    """Stage 3: Extract structured intelligence using LLM."""
-    import asyncio
-    return asyncio.run(_extract_intelligence(artifact_id, org_id))
+async def _mark_transcription_failed(db: AsyncSession, artifact_id: uuid.UUID) -> None:
+    """Drop partial chunks so a retry starts from a clean slate."""
+    await db.rollback()
+    await db.execute(
+        delete(TranscriptChunk).where(TranscriptChunk.artifact_id == artifact_id)
+    )
+    await db.execute(
+        update(Artifact)
+        .where(Artifact.id == artifact_id)
+        .values(transcription_status="failed")
+    )
+    await db.commit()
 
 
-async def _extract_intelligence(artifact_id: str, org_id: str):
-    """Async implementation of extract_intelligence."""
-    artifact_uuid = uuid.UUID(artifact_id)
-    org_uuid = uuid.UUID(org_id)
+# Deferred jobs whose result could not be loaded are retried by the sweep
+MAX_RESUME_ATTEMPTS = 3
+
+
+def resume_pipeline(transcription_id: str, context: dict, error: Optional[str] = None):
+    """
+    Continue a deferred pipeline once its transcription job has finished.
     
-    run_id = await create_processing_run(
-        org_id=org_uuid,
-        stage="extract",
-        artifact_id=artifact_uuid,
+    Enqueues resume_transcription (which stores the transcript) followed
+    by every stage after transcribe. Safe to call more than once per
+    job: only the first resume_transcription claims it.
+    
+    Args:
+        transcription_id: Provider job ID
+        context: Pipeline context recorded when the job was submitted
+        error: Provider error message if the job failed
+    """
+    priority = context.get("priority")
+    head = resume_transcription.s(transcription_id, error=error)
+    if priority is not None:
+        head = head.set(priority=priority)
+    rest = build_pipeline(
+        context["artifact_id"],
+        context["org_id"],
+        force_reprocess=context.get("force", False),
+        priority=priority,
+        after="transcribe",
     )
+    return chain(head, rest).apply_async()
+
+
+@celery_app.task(bind=True, name="pipeline.resume_transcription")
+def resume_transcription(self, transcription_id: str, error: Optional[str] = None):
+    """Store the transcript of a finished deferred job."""
+    result = run_async(_resume_transcription(transcription_id, error))
+    if result.get("status") == "duplicate":
+        _stop_chain(self)
+    return result
+
+
+async def _resume_transcription(transcription_id: str, error: Optional[str] = None):
+    """Async implementation of resume_transcription."""
+    pending = get_pending_jobs()
+    context = await pending.claim(transcription_id)
+    if context is None:
+        return {"status": "duplicate", "transcription_id": transcription_id}
     
-    try:
-        await update_processing_run(run_id, "running")
-        
+    artifact_id = context["artifact_id"]
+    artifact_uuid = uuid.UUID(artifact_id)
+    org_uuid = uuid.UUID(context["org_id"])
+    
+    async with stage_run("transcribe_resume", org_uuid, artifact_id=artifact_uuid) as run:
+        run.metadata["transcription_id"] = transcription_id
         async with AsyncSessionLocal() as db:
-            # Get artifact and meeting
             result = await db.execute(
                 select(Artifact).where(Artifact.id == artifact_uuid)
             )
             artifact = result.scalar_one()
+            run.meeting_id = artifact.meeting_id
             
-            result = await db.execute(
-                select(Meeting).where(Meeting.id == artifact.meeting_id)
-            )
-            meeting = result.scalar_one()
-            
-            # Get transcript chunks
-            result = await db.execute(
-                select(TranscriptChunk)
-                .where(TranscriptChunk.meeting_id == meeting.id)
-                .order_by(TranscriptChunk.sequence)
-            )
-            chunks = result.scalars().all()
-            
-            # Prepare data for extraction
-            chunk_dicts = [
-                {
-                    "id": str(chunk.id),
-                    "speaker": chunk.speaker,
-                    "text": chunk.text,
-                    "start_time": chunk.start_time,
-                    "end_time": chunk.end_time,
-                }
-                for chunk in chunks
-            ]
-            
-            meeting_metadata = {
-                "title": meeting.title,
-                "date": str(meeting.meeting_date) if meeting.meeting_date else None,
-                "type": meeting.meeting_type,
-            }
-            
-            # Extract intelligence
-            extraction_service = get_extraction_service()
-            intelligence = await extraction_service.extract_intelligence(
-                transcript_chunks=chunk_dicts,
-                meeting_metadata=meeting_metadata,
-            )
-            
-            # Save summary
-            summary = Summary(
-                org_id=org_uuid,
-                meeting_id=meeting.id,
-                summary_type="full",
-                content_md=intelligence.summary_md,
-                model="gpt-4o",
-            )
-            db.add(summary)
-            
-            # Save decisions
-            for dec in intelligence.decisions:
-                # Find source chunk
-                source_chunk_id = None
-                source_quote = None
-                if dec.source_chunk_indices:
-                    idx = dec.source_chunk_indices[0]
-                    if idx < len(chunks):
-                        source_chunk_id = chunks[idx].id
-                        source_quote = chunks[idx].text[:500]
+            try:
+                if error is not None:
+                    raise ValueError(f"Transcription failed: {error}")
+                provider = get_transcription_provider(context.get("provider", "whisperflow"))
+                run.add_external_call(f"transcription:{provider.name}")
+                transcript = await provider.fetch_result(transcription_id, artifact.language)
                 
-                decision = Decision(
-                    org_id=org_uuid,
-                    meeting_id=meeting.id,
-                    decision=dec.decision,
-                    rationale=dec.rationale,
-                    source_chunk_id=source_chunk_id,
-                    source_quote=source_quote,
-                    confidence=0.9 if dec.confidence == "high" else 0.7 if dec.confidence == "medium" else 0.5,
-                )
-                db.add(decision)
-            
-            # Save action items
-            for item in intelligence.action_items:
-                # Find source chunk
-                source_chunk_id = None
-                source_quote = None
-                if item.source_chunk_indices:
-                    idx = item.source_chunk_indices[0]
-                    if idx < len(chunks):
-                        source_chunk_id = chunks[idx].id
-                        source_quote = chunks[idx].text[:500]
+                async def updates():
+                    yield TranscriptionUpdate(
+                        segments=transcript.segments,
+                        language=transcript.language,
+                        duration=transcript.duration,
+                        model=transcript.model,
+                        provider=provider.name,
+                        final=True,
+                    )
                 
-                action_item = ActionItem(
-                    org_id=org_uuid,
-                    meeting_id=meeting.id,
-                    title=item.title,
-                    description=item.description,
-                    owner_name=item.owner_name,
-                    owner_email=item.owner_email,
-                    status=item.status,
-                    due_date=item.due_date,
-                    priority=item.priority,
-                    source_chunk_id=source_chunk_id,
-                    source_quote=source_quote,
-                    confidence=0.9 if item.confidence == "high" else 0.7 if item.confidence == "medium" else 0.5,
-                )
-                db.add(action_item)
+                saved = await _persist_transcript_stream(db, updates(), artifact, org_uuid)
+            except Exception:
+                await _mark_transcription_failed(db, artifact_uuid)
+                attempts = context.get("attempts", 0) + 1
+                if error is None and attempts < MAX_RESUME_ATTEMPTS:
+                    await pending.add(transcription_id, {**context, "attempts": attempts})
+                raise
             
-            # Save tags
-            for tag_name in intelligence.tags:
-                # Find or create tag
+            artifact.transcription_status = "completed"
+            run.add_rows("transcript_chunks", saved)
+            await db.commit()
+    
+    return {"status": "success", "artifact_id": artifact_id, "transcription_id": transcription_id}
+
+
+@celery_app.task(name="pipeline.sweep_transcription_jobs")
+def sweep_transcription_jobs():
+    """Resume deferred jobs that finished without a webhook reaching us."""
+    return run_async(_sweep_transcription_jobs())
+
+
+async def _sweep_transcription_jobs():
+    """Async implementation of sweep_transcription_jobs (one batched status check)."""
+    pending = await get_pending_jobs().all()
+    if not pending:
+        return {"pending": 0, "resumed": 0}
+    
+    provider = get_transcription_provider("whisperflow")
+    statuses = await provider.client.get_transcription_statuses(pending.keys())
+    
+    resumed = 0
+    for job_id, status in statuses.items():
+        state = status.get("state")
+        if state in TERMINAL_STATES:
+            error = status.get("error", "Unknown error") if state == "failed" else None
+            resume_pipeline(job_id, pending[job_id], error=error)
+            resumed += 1
+    
+    return {"pending": len(pending), "resumed": resumed}
+
+
+async def _chunked_transcription(
+    provider,
+    artifact: Artifact,
+    local_path: str,
+    run,
+) -> AsyncIterator[TranscriptionUpdate]:
+    """
+    Preprocess a local recording and transcribe its pieces concurrently.
+    
+    The provider must accept local file paths (pieces are not uploaded).
+    """
+    piece_dir = tempfile.mkdtemp(prefix=f"pieces-{artifact.id}-")
+    try:
+        prepared = await asyncio.to_thread(prepare_audio, local_path, piece_dir)
+        run.metadata["audio_pieces"] = len(prepared.pieces)
+        run.metadata["trimmed_seconds"] = prepared.trimmed_seconds
+        # One provider call per piece
+        run.add_external_call(f"transcription:{provider.name}", len(prepared.pieces) - 1)
+        
+        async def locate(piece):
+            return piece.path
+        
+        result = await transcribe_pieces(provider, prepared, locate, artifact.language)
+        yield TranscriptionUpdate(
+            segments=result.segments,
+            language=result.language,
+            duration=result.duration,
+            model=result.model,
+            provider=result.provider,
+            final=True,
+        )
+    finally:
+        shutil.rmtree(piece_dir, ignore_errors=True)
+
+
+async def _persist_transcript_stream(
+    db: AsyncSession,
+    updates: AsyncIterator[TranscriptionUpdate],
+    artifact: Artifact,
+    org_id: uuid.UUID,
+) -> int:
+    """
+    Write streamed segments as TranscriptChunk rows.
+    
+    Segments are inserted and committed every
+    settings.transcript_flush_segments rows, so the transcript becomes
+    visible while the provider is still working. Chunks written before
+    the language was known are backfilled at the end. Sets the
+    artifact's language and duration; does not commit the artifact.
+    
+    Returns:
+        Number of chunks written
+    
+    Raises:
+        IncompleteTranscription: The stream ended without a final update
+            (the caller discards the partial chunks)
+    """
+    batch_size = max(1, settings.transcript_flush_segments)
+    pending: list[dict] = []
+    sequence = 0
+    language = artifact.language
+    final = False
+    
+    async def flush():
+        if pending:
+            await db.execute(pg_insert(TranscriptChunk).values(pending))
+            await db.commit()
+            pending.clear()
+    
+    async for progress in updates:
+        if progress.language:
+            language = progress.language
+        if progress.duration is not None:
+            artifact.duration_seconds = progress.duration
+        if progress.provider:
+            artifact.transcription_provider = progress.provider
+        final = final or progress.final
+        
+        for segment in progress.segments:
+            pending.append({
+                "id": uuid.uuid4(),
+                "org_id": org_id,
+                "meeting_id": artifact.meeting_id,
+                "artifact_id": artifact.id,
+                "sequence": sequence,
+                "speaker": segment.speaker,
+                "text": segment.text,
+                "start_time": segment.start,
+                "end_time": segment.end,
+                "confidence": segment.confidence,
+                "language": language,
+            })
+            sequence += 1
+        
+        if len(pending) >= batch_size:
+            await flush()
+    
+    if not final:
+        raise IncompleteTranscription(
+            f"Transcription stream ended after {sequence} segments without a final update"
+        )
+    await flush()
+    
+    artifact.language = language
+    if language and sequence:
+        await db.execute(
+            update(TranscriptChunk)
+            .where(TranscriptChunk.artifact_id == artifact.id)
+            .where(TranscriptChunk.language.is_(None))
+            .values(language=language)
+        )
+    
+    return sequence
+
+
+@celery_app.task(name="pipeline.extract_intelligence")
+def extract_intelligence(prev_result: dict, artifact_id: str, org_id: str, force: bool = False):
+    """Stage 3: Extract structured intelligence using LLM."""
+    source_meeting_id = source_artifact_id = None
+    if not force and prev_result:
+        source_meeting_id = prev_result.get("source_meeting_id")
+        source_artifact_id = prev_result.get("reused_from")
+    return run_async(_extract_intelligence(
+        artifact_id, org_id, source_meeting_id, source_artifact_id, use_cache=not force,
+    ))
+
+
+async def _extract_intelligence(
+    artifact_id: str,
+    org_id: str,
+    source_meeting_id: Optional[str] = None,
+    source_artifact_id: Optional[str] = None,
+    replace: bool = False,
+    use_cache: bool = True,
+):
+    """
+    Async implementation of extract_intelligence.
+    
+    With replace, the meeting's previous summaries, decisions, action
+    items and tag/entity links are deleted in the same transaction.
+    use_cache=False skips the LLM response cache so a forced run
+    really calls the model again.
+    """
+    artifact_uuid = uuid.UUID(artifact_id)
+    org_uuid = uuid.UUID(org_id)
+    
+    try:
+        async with stage_run("extract", org_uuid, artifact_id=artifact_uuid) as run:
+            async with AsyncSessionLocal() as db:
+                # Get artifact and meeting
                 result = await db.execute(
-                    select(Tag)
-                    .where(Tag.org_id == org_uuid)
-                    .where(Tag.name == tag_name)
+                    select(Artifact).where(Artifact.id == artifact_uuid)
                 )
-                tag = result.scalar_one_or_none()
-                
-                if not tag:
-                    tag = Tag(org_id=org_uuid, name=tag_name)
-                    db.add(tag)
-                    await db.flush()
+                artifact = result.scalar_one()
                 
-                # Link to meeting
-                meeting_tag = MeetingTag(meeting_id=meeting.id, tag_id=tag.id)
-                db.add(meeting_tag)
-            
-            # Save entities
-            for ent in intelligence.entities:
-                # Find or create entity
                 result = await db.execute(
-                    select(Entity)
-                    .where(Entity.org_id == org_uuid)
-                    .where(Entity.kind == ent.kind)
-                    .where(Entity.name == ent.name)
+                    select(Meeting).where(Meeting.id == artifact.meeting_id)
                 )
-                entity = result.scalar_one_or_none()
+                meeting = result.scalar_one()
+                run.meeting_id = meeting.id
+                
+                if replace:
+                    cleared = await clear_intelligence(db, meeting.id)
+                    run.metadata["replaced"] = cleared
                 
-                if not entity:
-                    entity = Entity(
+                # Copy intelligence from the identical artifact's meeting
+                if source_meeting_id and source_artifact_id:
+                    counts = await clone_intelligence(
+                        db,
+                        source_meeting_id=uuid.UUID(source_meeting_id),
+                        target_meeting_id=meeting.id,
                         org_id=org_uuid,
-                        kind=ent.kind,
-                        name=ent.name,
+                        source_artifact_id=uuid.UUID(source_artifact_id),
+                        target_artifact_id=artifact.id,
                     )
-                    db.add(entity)
-                    await db.flush()
+                    if counts is not None:
+                        for table, count in counts.items():
+                            run.add_rows(table, count)
+                        run.metadata["reused_from_meeting"] = source_meeting_id
+                        meeting.processing_status = "completed"
+                        await db.commit()
+                        return {
+                            "status": "success",
+                            "artifact_id": artifact_id,
+                            "meeting_id": str(meeting.id),
+                            "reused_from_meeting": source_meeting_id,
+                        }
+                
+                # Get transcript chunks
+                result = await db.execute(
+                    select(TranscriptChunk)
+                    .where(TranscriptChunk.meeting_id == meeting.id)
+                    .order_by(TranscriptChunk.sequence)
+                )
+                chunks = result.scalars().all()
+                
+                # Prepare data for extraction
+                chunk_dicts = [
+                    {
+                        "id": str(chunk.id),
+                        "speaker": chunk.speaker,
+                        "text": chunk.text,
+                        "start_time": chunk.start_time,
+                        "end_time": chunk.end_time,
+                    }
+                    for chunk in chunks
+                ]
+                
+                meeting_metadata = {
+                    "title": meeting.title,
+                    "date": str(meeting.meeting_date) if meeting.meeting_date else None,
+                    "type": meeting.meeting_type,
+                }
                 
-                # Link to meeting
-                meeting_entity = MeetingEntity(
+                # Extract intelligence
+                extraction_service = get_extraction_service()
+                intelligence = await extraction_service.extract_intelligence(
+                    transcript_chunks=chunk_dicts,
+                    meeting_metadata=meeting_metadata,
+                    use_cache=use_cache,
+                )
+                run.add_external_call("openai")
+                
+                # Save summary
+                summary = Summary(
+                    org_id=org_uuid,
                     meeting_id=meeting.id,
-                    entity_id=entity.id,
-                    mention_count=1,
+                    summary_type="full",
+                    content_md=intelligence.summary_md,
+                    model="gpt-4o",
                 )
-                db.add(meeting_entity)
-            
-            # Update meeting status
-            meeting.processing_status = "completed"
-            
-            await db.commit()
-        
-        await update_processing_run(run_id, "succeeded")
-        return {"status": "success", "artifact_id": artifact_id}
+                db.add(summary)
+                run.add_rows("summaries")
+                
+                # Save decisions, action items, tags and entities in bulk
+                counts = await persist_intelligence(
+                    db,
+                    org_id=org_uuid,
+                    meeting_id=meeting.id,
+                    intelligence=intelligence,
+                    chunks=chunks,
+                )
+                for table, count in counts.items():
+                    run.add_rows(table, count)
+                
+                # Update meeting status
+                meeting.processing_status = "completed"
+                
+                await db.commit()
     
-    except Exception as e:
-        await update_processing_run(run_id, "failed", error=str(e))
+    except Exception:
+        # Cached IDs may point at rows that no longer exist
+        tag_id_cache.invalidate(org_uuid)
+        entity_id_cache.invalidate(org_uuid)
         raise
+    
+    return {
+        "status": "success",
+        "artifact_id": artifact_id,
+        "meeting_id": str(meeting.id),
+    }
+
+
+async def _get_meeting_id(prev_result: Optional[dict], artifact_id: str) -> str:
+    """Meeting ID from the extract result, falling back to the artifact row."""
+    if prev_result and prev_result.get("meeting_id"):
+        return prev_result["meeting_id"]
+    
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Artifact.meeting_id).where(Artifact.id == uuid.UUID(artifact_id))
+        )
+        return str(result.scalar_one())
+
+
+class StageFailed(Exception):
+    """A branch reported failure in its result rather than raising."""
+
+
+async def _run_distribution_stage(stage: str, coro_factory, prev_result, artifact_id, org_id):
+    """
+    Run one fan-out branch with its own processing run.
+    
+    Branches never raise: a failing integration is recorded and returned
+    as a status so it cannot fail the chord for the other branches.
+    """
+    org_uuid = uuid.UUID(org_id)
+    try:
+        meeting_id = await _get_meeting_id(prev_result, artifact_id)
+    except Exception as e:
+        return {"stage": stage, "status": "failed", "error": str(e)}
+    
+    try:
+        async with stage_run(
+            stage,
+            org_uuid,
+            meeting_id=uuid.UUID(meeting_id),
+            artifact_id=uuid.UUID(artifact_id),
+        ) as run:
+            outcome = await coro_factory(meeting_id) or {}
+            run.metadata["outcome"] = outcome
+            if outcome.get("status") in ("error", "failed"):
+                raise StageFailed(outcome.get("message") or outcome.get("error") or "failed")
+        return {"stage": stage, "status": "success", **outcome}
+    
+    except StageFailed:
+        return {"stage": stage, **outcome}
+    except Exception as e:
+        return {"stage": stage, "status": "failed", "error": str(e)}
 
 
 @celery_app.task(name="pipeline.sync_to_linear")
@@ -426,77 +855,119 @@ def sync_to_linear(prev_result: dict, artifact_id: str, org_id: str):
     """
     Stage 4: Create Linear project and tasks with Drive doc links.
     
-    Runs the enhanced distribution:
+    Runs the enhanced distribution in-process:
     - Creates Google Drive folder
     - Uploads all documents
     - Creates Linear project
     - Creates tasks with Drive links
     - Sets proper assignees and deadlines
     """
-    import asyncio
-    return asyncio.run(_sync_to_linear(artifact_id, org_id))
+    return run_async(_run_distribution_stage(
+        "sync_linear", _sync_to_linear, prev_result, artifact_id, org_id,
+    ))
 
 
-async def _sync_to_linear(artifact_id: str, org_id: str):
+async def _sync_to_linear(meeting_id: str):
     """Async implementation of Linear sync."""
-    try:
-        # Run the enhanced sync for this meeting
-        import subprocess
-        import json
-        
-        # Get meeting ID from artifact
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(Artifact).where(Artifact.id == uuid.UUID(artifact_id))
-            )
-            artifact = result.scalar_one()
-            meeting_id = str(artifact.meeting_id)
-        
-        print(f"\n🚀 Running enhanced distribution for meeting {meeting_id[:8]}...")
-        
-        # Run sync_with_drive_links.py as subprocess
-        result = subprocess.run(
-            ['python3', 'sync_with_drive_links.py'],
-            cwd='/Users/marcus/Library/Mobile Documents/com~apple~CloudDocs/Documents/Cursor-projects/Disruptive Ventures/DV Legacy/dv/backend',
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if result.returncode == 0:
-            print("✅ Enhanced distribution completed successfully!")
-            return {"status": "success", "message": "Drive folders, Linear project, and tasks created"}
-        else:
-            print(f"⚠ Enhanced distribution had errors: {result.stderr}")
-            return {"status": "partial", "errors": result.stderr}
+    # The sync makes blocking Supabase and Drive calls; keep them off the
+    # worker's shared loop so the other branches keep running
+    results = await asyncio.to_thread(_sync_meeting_with_drive_links, meeting_id)
     
-    except Exception as e:
-        print(f"✗ Enhanced distribution failed: {str(e)}")
-        return {"status": "failed", "error": str(e)}
+    errors = results.get("errors") or []
+    return {
+        "status": "partial" if errors else "success",
+        "linear_tasks": len(results.get("linear_tasks") or []),
+        "drive_docs": len(results.get("drive_docs") or []),
+        "errors": errors,
+    }
+
+
+def _sync_meeting_with_drive_links(meeting_id: str) -> dict:
+    """Run the Drive/Linear sync on a private event loop in this thread."""
+    sync_module = _load_drive_sync_module()
+    
+    async def run():
+        try:
+            return await sync_module.sync_meeting_with_drive_links(meeting_id)
+        finally:
+            await close_http_clients()
+    
+    return asyncio.run(run())
+
+
+_drive_sync_module = None
+
+
+def _load_drive_sync_module():
+    """Import backend/sync_with_drive_links.py once per process."""
+    global _drive_sync_module
+    if _drive_sync_module is None:
+        import importlib.util
+        from pathlib import Path
+        
+        path = Path(__file__).resolve().parents[3] / "sync_with_drive_links.py"
+        spec = importlib.util.spec_from_file_location("sync_with_drive_links", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _drive_sync_module = module
+    return _drive_sync_module
 
 
 @celery_app.task(name="pipeline.sync_to_google_email")
 def sync_to_google_email(prev_result: dict, artifact_id: str, org_id: str):
-    """
-    Stage 5: Create Gmail draft with all tasks for all assignees.
-    
-    This is already done in sync_to_linear (enhanced distribution),
-    so we just log completion here.
-    """
-    print("✅ Gmail drafts created in enhanced distribution (Step 4)")
-    return {"status": "completed_in_step_4"}
+    """Stage 5: Create Gmail draft (or send) with the meeting follow-up."""
+    return run_async(_run_distribution_stage(
+        "sync_google_email",
+        lambda meeting_id: _create_google_email_draft(meeting_id, org_id),
+        prev_result, artifact_id, org_id,
+    ))
 
 
 @celery_app.task(name="pipeline.sync_to_google_calendar")
 def sync_to_google_calendar(prev_result: dict, artifact_id: str, org_id: str):
-    """
-    Stage 6: Create calendar events for deadlines.
-    
-    This will be implemented in future enhancement.
-    For now, deadlines are in Linear tasks.
-    """
-    print("ℹ️  Calendar integration - future enhancement")
-    return {"status": "future_feature"}
+    """Stage 6: Create follow-up calendar event (or proposal)."""
+    return run_async(_run_distribution_stage(
+        "sync_google_calendar",
+        lambda meeting_id: _create_google_calendar_event(meeting_id, org_id),
+        prev_result, artifact_id, org_id,
+    ))
+
+
+@celery_app.task(name="pipeline.index_chunks")
+def index_chunks(prev_result: dict, artifact_id: str, org_id: str):
+    """Stage 7: Embed the meeting's new transcript chunks for search."""
+    return run_async(_run_distribution_stage(
+        "index_chunks", _index_chunks, prev_result, artifact_id, org_id,
+    ))
+
+
+async def _index_chunks(meeting_id: str):
+    """Async implementation of index_chunks (only chunks without an embedding)."""
+    store = get_vector_store()
+    async with AsyncSessionLocal() as db:
+        indexed = await store.index_meeting(db, uuid.UUID(meeting_id))
+    return {"status": "success", "indexed": indexed, "embedder": store.embedder.name}
+
 
+@celery_app.task(name="pipeline.finalize")
+def finalize_pipeline(branch_results: list, artifact_id: str, org_id: str):
+    """Chord join: summarize the distribution branches."""
+    failed = [r.get("stage") for r in branch_results if r.get("status") in ("error", "failed")]
+    return {
+        "status": "partial" if failed else "success",
+        "artifact_id": artifact_id,
+        "failed_stages": failed,
+        "stages": branch_results,
+    }
 
 
+# Stage name -> task, used by build_pipeline
+STAGE_TASKS = {
+    "ingest": ingest_artifact,
+    "transcribe": transcribe_or_extract,
+    "extract": extract_intelligence,
+    "sync_linear": sync_to_linear,
+    "sync_google_email": sync_to_google_email,
+    "sync_google_calendar": sync_to_google_calendar,
+    "index_chunks": index_chunks,
+}
@@ -5,6 +5,7 @@ from typing import Optional
 from sqlalchemy import select, text
 
 from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
 from app.database import AsyncSessionLocal
 from app.models import (
     Meeting, ActionItem, Decision, Summary, 
@@ -41,8 +42,7 @@ async def get_integration_secrets(org_id: uuid.UUID, provider: str) -> Optional[
 @celery_app.task(name="sync.linear.sync_action_items")
 def sync_action_items_to_linear(meeting_id: str, org_id: str):
     """Sync action items from a meeting to Linear."""
-    import asyncio
-    return asyncio.run(_sync_action_items_to_linear(meeting_id, org_id))
+    return run_async(_sync_action_items_to_linear(meeting_id, org_id))
 
 
 async def _sync_action_items_to_linear(meeting_id: str, org_id: str):
@@ -164,8 +164,7 @@ async def _sync_action_items_to_linear(meeting_id: str, org_id: str):
 @celery_app.task(name="sync.google.create_email_draft")
 def create_google_email_draft(meeting_id: str, org_id: str):
     """Create Gmail draft with meeting follow-up."""
-    import asyncio
-    return asyncio.run(_create_google_email_draft(meeting_id, org_id))
+    return run_async(_create_google_email_draft(meeting_id, org_id))
 
 
 async def _create_google_email_draft(meeting_id: str, org_id: str):
@@ -290,8 +289,7 @@ async def _create_google_email_draft(meeting_id: str, org_id: str):
 @celery_app.task(name="sync.google.create_calendar_event")
 def create_google_calendar_event(meeting_id: str, org_id: str):
     """Create Google Calendar event."""
-    import asyncio
-    return asyncio.run(_create_google_calendar_event(meeting_id, org_id))
+    return run_async(_create_google_calendar_event(meeting_id, org_id))
 
 
 async def _create_google_calendar_event(meeting_id: str, org_id: str):
@@ -391,8 +389,7 @@ async def _create_google_calendar_event(meeting_id: str, org_id: str):
 @celery_app.task(name="sync.google.create_meeting_with_agenda")
 def create_meeting_calendar_event_with_agenda(meeting_id: str, org_id: str, send_invites: bool = False):
     """Create Google Calendar event with AI-generated agenda in description."""
-    import asyncio
-    return asyncio.run(_create_meeting_calendar_event_with_agenda(meeting_id, org_id, send_invites))
+    return run_async(_create_meeting_calendar_event_with_agenda(meeting_id, org_id, send_invites))
 
 
 async def _create_meeting_calendar_event_with_agenda(meeting_id: str, org_id: str, send_invites: bool):
@@ -0,0 +1,74 @@
+"""Transcription jobs the pipeline is waiting on outside a worker slot.
+
+When WHISPERFLOW_WEBHOOK_URL is set, the transcribe stage submits the
+Whisperflow job, records it here and ends; the rest of the pipeline is
+started again by the webhook (or by the periodic sweep if the webhook
+never arrives). Entries live in one Redis hash, job ID -> pipeline
+context, so the API process and every worker see the same set.
+
+Whoever resumes a job first removes its entry with ``claim``; a late
+duplicate (webhook retried, or webhook and sweep racing) finds nothing
+to claim and stops.
+"""
+import json
+import time
+from typing import Optional
+
+from app.config import settings
+
+PENDING_KEY = "transcription:pending_jobs"
+
+
+class PendingTranscriptionJobs:
+    """Redis-backed map of outstanding job IDs to pipeline context."""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url if redis_url is not None else settings.redis_url
+        self._redis = None
+
+    def _get_redis(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    async def add(self, job_id: str, context: dict) -> None:
+        """Record a submitted job and what is needed to resume its pipeline."""
+        entry = {**context, "submitted_at": time.time()}
+        await self._get_redis().hset(PENDING_KEY, job_id, json.dumps(entry))
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self._get_redis().hget(PENDING_KEY, job_id)
+        return json.loads(raw) if raw else None
+
+    async def claim(self, job_id: str) -> Optional[dict]:
+        """
+        Take ownership of a job's resumption.
+
+        Returns:
+            The job's context, or None if it was already claimed
+        """
+        client = self._get_redis()
+        raw = await client.hget(PENDING_KEY, job_id)
+        if not raw or not await client.hdel(PENDING_KEY, job_id):
+            return None
+        return json.loads(raw)
+
+    async def all(self) -> dict[str, dict]:
+        """Every outstanding job ID with its context."""
+        raw = await self._get_redis().hgetall(PENDING_KEY)
+        return {
+            (k.decode() if isinstance(k, bytes) else k): json.loads(v)
+            for k, v in raw.items()
+        }
+
+
+_pending_jobs: Optional[PendingTranscriptionJobs] = None
+
+
+def get_pending_jobs() -> PendingTranscriptionJobs:
+    """Get or create the process-wide pending job registry."""
+    global _pending_jobs
+    if _pending_jobs is None:
+        _pending_jobs = PendingTranscriptionJobs()
+    return _pending_jobs
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark single-request vs windowed (map-reduce) extraction.
+
+Runs ExtractionService against a local OpenAI stub on a synthetic
+transcript, so it needs no network or API key. The stub's latency grows
+with prompt size, like a real single-stream completion.
+
+Usage:
+    python benchmarks/extraction_windows.py --hours 3
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from _common import bootstrap_env
+
+bootstrap_env()
+
+from app.config import settings  # noqa: E402
+from app.services.extraction import ExtractionService  # noqa: E402
+from stubs import StubOpenAI  # noqa: E402
+
+SPEAKERS = ["Anna", "Erik", "Sofia", "Johan", "Maria"]
+VOCABULARY = (
+    "revenue pipeline runway hiring portfolio board budget quarter forecast customer "
+    "churn pricing roadmap launch partner investor valuation burn marketing product "
+    "team deadline review contract legal compliance sales growth metrics target"
+).split()
+
+
+def synthetic_transcript(hours: float, seed: int = 7) -> list[dict]:
+    """~150 spoken words per minute in 20-second segments."""
+    rng = random.Random(seed)
+    segments = int(hours * 3600 / 20)
+    chunks = []
+    for i in range(segments):
+        words = [rng.choice(VOCABULARY) for _ in range(50)]
+        chunks.append({
+            "speaker": SPEAKERS[i % len(SPEAKERS)],
+            "text": " ".join(words),
+            "start_time": i * 20.0,
+            "end_time": (i + 1) * 20.0,
+        })
+    return chunks
+
+
+async def run(service: ExtractionService, chunks: list[dict], windowed: bool, **latency) -> dict:
+    service.client = StubOpenAI(**latency)
+    start = time.perf_counter()
+    result = await service.extract_intelligence(chunks, {"title": "Benchmark"}, windowed=windowed)
+    elapsed = time.perf_counter() - start
+    stub = service.client.chat.completions
+    return {
+        "seconds": elapsed,
+        "calls": stub.calls,
+        "decisions": len(result.decisions),
+        "actions": len(result.action_items),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Windowed extraction benchmark")
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--base-ms", type=float, default=400.0, help="Stub fixed latency per request")
+    parser.add_argument("--ms-per-1k", type=float, default=150.0, help="Stub latency per 1k prompt tokens")
+    args = parser.parse_args()
+    latency = {"base_ms": args.base_ms, "ms_per_1k_input": args.ms_per_1k}
+
+    chunks = synthetic_transcript(args.hours)
+    service = ExtractionService(api_key="bench")
+    total_tokens = sum(
+        len(service.encoding.encode(line)) + 1
+        for line in service._build_transcript_lines(chunks)
+    )
+
+    single = await run(service, chunks, windowed=False, **latency)
+    windowed = await run(service, chunks, windowed=True, **latency)
+
+    print(f"Synthetic transcript: {args.hours:g} h, {len(chunks)} chunks, {total_tokens} tokens")
+    print(f"Window budget: {settings.extraction_window_tokens} tokens, "
+          f"overlap {settings.extraction_window_overlap_tokens}, "
+          f"concurrency {settings.extraction_max_concurrency}")
+    for label, r in (("single request", single), ("windowed", windowed)):
+        print(f"  {label:15s}: {r['seconds']:6.2f}s  calls={r['calls']:3d}  "
+              f"decisions={r['decisions']:3d}  actions={r['actions']:3d}")
+    print(f"  speedup        : {single['seconds'] / windowed['seconds']:6.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Benchmark PII scanning throughput in segments per second.
+
+Compares, on a synthetic transcript:
+- legacy: one uncompiled re.finditer pass per PII class, per segment
+- compiled: PIIDetectionService.detect_pii per segment (one pass)
+- batch: one scan_many call over all segments, patterns only
+- dictionary: the same batch call also matching an org dictionary of
+  known people and organization names
+
+Usage:
+    python benchmarks/pii_scan.py --segments 5000 --names 2000
+"""
+import argparse
+import random
+import re
+import time
+
+from _common import bootstrap_env
+
+bootstrap_env()
+
+from app.services.pii_detection import NameAutomaton, PIIDetectionService, PIIScanner  # noqa: E402
+
+FIRST = ["Anna", "Erik", "Sofia", "Johan", "Maria", "Lars", "Karin", "Nils", "Elin", "Oskar"]
+LAST = ["Svensson", "Berg", "Lindqvist", "Holm", "Ek", "Nyberg", "Sandberg", "Lund", "Wall", "Dahl"]
+VOCABULARY = (
+    "revenue pipeline runway hiring portfolio board budget quarter forecast customer "
+    "churn pricing roadmap launch partner investor valuation burn marketing product "
+    "team deadline review contract legal compliance sales growth metrics target"
+).split()
+
+# The detect_pii implementation before the compiled scanner
+LEGACY_PATTERNS = [
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
+    r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',
+    r'\+1\s?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
+    r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b',
+    r'\b\d{3}-\d{2}-\d{4}\b',
+    r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
+]
+
+
+def legacy_detect(text: str) -> int:
+    return sum(1 for pattern in LEGACY_PATTERNS for _ in re.finditer(pattern, text))
+
+
+def synthetic_names(count: int, seed: int = 3) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        if i % 4 == 3:
+            names.append((f"{rng.choice(VOCABULARY).title()}{i} AB", "organization"))
+        else:
+            names.append((f"{rng.choice(FIRST)} {rng.choice(LAST)}{i}", "person"))
+    return names
+
+
+def synthetic_segments(count: int, names: list[tuple[str, str]], seed: int = 7) -> list[str]:
+    """20-second segments (~50 words), some mentioning people, emails or phones."""
+    rng = random.Random(seed)
+    segments = []
+    for _ in range(count):
+        words = [rng.choice(VOCABULARY) for _ in range(50)]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(50), rng.choice(names)[0])
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(50), f"{rng.choice(FIRST).lower()}@example.com")
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(50), f"555-{rng.randrange(100, 999)}-{rng.randrange(1000, 9999)}")
+        segments.append(" ".join(words))
+    return segments
+
+
+def rate(label: str, segments: int, seconds: float, found: int) -> None:
+    print(f"  {label:10s}: {segments / seconds:10,.0f} segments/s  ({seconds * 1000:7.1f} ms, {found} entities)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PII scanner benchmark")
+    parser.add_argument("--segments", type=int, default=5000)
+    parser.add_argument("--names", type=int, default=2000, help="Known people/organization names")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs")
+    args = parser.parse_args()
+
+    names = synthetic_names(args.names)
+    segments = synthetic_segments(args.segments, names)
+    service = PIIDetectionService(db=None)
+
+    start = time.perf_counter()
+    automaton = NameAutomaton(names)
+    build_ms = (time.perf_counter() - start) * 1000
+    scanner = PIIScanner(automaton)
+
+    runs = {
+        "legacy": lambda: sum(legacy_detect(text) for text in segments),
+        "compiled": lambda: sum(len(service.detect_pii(text)) for text in segments),
+        "batch": lambda: sum(len(found) for found in PIIScanner().scan_many(segments)),
+        "dictionary": lambda: sum(len(found) for found in scanner.scan_many(segments)),
+    }
+    print(f"Synthetic transcript: {len(segments)} segments, {sum(map(len, segments)):,} chars")
+    print(f"Dictionary: {len(automaton)} names, automaton built in {build_ms:.1f} ms")
+    timings = {}
+    for label, run in runs.items():
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            found = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[label] = best
+        rate(label, len(segments), best, found)
+    print(f"  speedup   : {timings['legacy'] / timings['compiled']:6.2f}x compiled, "
+          f"{timings['legacy'] / timings['batch']:6.2f}x batch, "
+          f"{timings['legacy'] / timings['dictionary']:6.2f}x with dictionary")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Deterministic offline stand-ins for external services used in benchmarks."""
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+LINE_PATTERN = re.compile(r"^\[(\d+)\]\s*([^:]*):\s*(.*)$")
+
+
+class StubEncoding:
+    """
+    tiktoken stand-in: about 1.3 tokens per word, like the LLM stub.
+
+    tiktoken downloads its BPE files on first use, which an offline run
+    cannot do.
+    """
+
+    name = "stub-words"
+
+    def encode(self, text: str, disallowed_special=()) -> list[int]:
+        return [0] * round(len(text.split()) * 1.3)
+
+
+class StubChatCompletions:
+    """
+    OpenAI-compatible ``chat.completions`` that answers locally.
+
+    Latency is modelled as ``base_ms + input_tokens * ms_per_1k_input / 1000``
+    (tokens approximated as words * 1.3), so longer prompts are slower the way
+    real single-stream requests are. Structured-output requests for
+    ``meeting_intelligence`` get a schema-valid MeetingIntelligence derived
+    from the transcript lines; anything else gets a short text reply.
+    """
+
+    def __init__(self, base_ms: float = 400.0, ms_per_1k_input: float = 150.0):
+        self.base_ms = base_ms
+        self.ms_per_1k_input = ms_per_1k_input
+        self.calls = 0
+        self.input_tokens = 0
+
+    async def create(self, model: str, messages: list[dict], response_format: Optional[dict] = None, **kwargs):
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        tokens = int(len(prompt.split()) * 1.3)
+        self.calls += 1
+        self.input_tokens += tokens
+        await asyncio.sleep((self.base_ms + tokens * self.ms_per_1k_input / 1000) / 1000)
+
+        schema_name = ((response_format or {}).get("json_schema") or {}).get("name")
+        if schema_name == "meeting_intelligence":
+            content = json.dumps(fake_meeting_intelligence(messages[-1]["content"]))
+        else:
+            content = "Condensed summary of the meeting."
+
+        return SimpleNamespace(
+            id=f"stub-{self.calls}",
+            model=model,
+            created=int(time.time()),
+            choices=[SimpleNamespace(
+                index=0,
+                finish_reason="stop",
+                message=SimpleNamespace(role="assistant", content=content),
+            )],
+            usage=SimpleNamespace(
+                prompt_tokens=tokens,
+                completion_tokens=len(content.split()),
+                total_tokens=tokens + len(content.split()),
+            ),
+        )
+
+
+class StubOpenAI:
+    """Drop-in for ``AsyncOpenAI`` exposing only ``chat.completions``."""
+
+    def __init__(self, **latency):
+        self.chat = SimpleNamespace(completions=StubChatCompletions(**latency))
+
+
+def fake_meeting_intelligence(transcript: str, every: int = 40) -> dict:
+    """
+    Build a MeetingIntelligence payload from "[i] speaker: text" lines.
+
+    Every ``every``-th line becomes an action item and every
+    ``2 * every``-th a decision, citing the line's own index.
+    """
+    decisions, actions, speakers = [], [], set()
+    for line in transcript.splitlines():
+        match = LINE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        idx, speaker, text = int(match.group(1)), match.group(2).strip(), match.group(3)
+        speakers.add(speaker)
+        words = " ".join(text.split()[:8])
+        if idx % every == every - 1:
+            actions.append({
+                "title": f"Follow up: {words}",
+                "description": None,
+                "owner_name": speaker or None,
+                "owner_email": None,
+                "due_date": None,
+                "status": "open",
+                "priority": "medium",
+                "confidence": "medium",
+                "source_chunk_indices": [idx],
+            })
+        if idx % (2 * every) == 2 * every - 1:
+            decisions.append({
+                "decision": f"Agreed: {words}",
+                "rationale": None,
+                "confidence": "high",
+                "source_chunk_indices": [idx],
+            })
+
+    return {
+        "summary_md": f"Meeting with {len(speakers)} speakers.",
+        "decisions": decisions,
+        "action_items": actions,
+        "tags": ["benchmark"],
+        "entities": [{"kind": "person", "name": s} for s in sorted(speakers) if s],
+    }
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Compare Celery task throughput with asyncio.run vs the worker runtime.
+
+"before" runs each task body in a fresh event loop (asyncio.run), which
+cannot reuse pooled connections opened on an earlier loop. "after" submits
+every task to the persistent per-process loop in app.worker.runtime.
+
+Usage:
+    python benchmarks/worker_loop.py --tasks 200
+    python benchmarks/worker_loop.py --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import time
+import weakref
+
+from _common import bootstrap_env
+
+bootstrap_env()
+
+from sqlalchemy import text  # noqa: E402
+
+
+class SimulatedPool:
+    """Connection pool stand-in: connecting costs time, reuse is free."""
+
+    def __init__(self, connect_ms: float, query_ms: float):
+        self.connect_s = connect_ms / 1000
+        self.query_s = query_ms / 1000
+        # Keyed on the loop itself: a closed loop's id can be reused by the
+        # next asyncio.run, which would count as reusing its connections
+        self._idle: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = weakref.WeakKeyDictionary()
+        self.connects = 0
+
+    async def query(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._idle.get(loop, 0) == 0:
+            # Connections are bound to the loop that opened them
+            await asyncio.sleep(self.connect_s)
+            self.connects += 1
+        else:
+            self._idle[loop] -= 1
+        await asyncio.sleep(self.query_s)
+        self._idle[loop] = self._idle.get(loop, 0) + 1
+
+
+def make_task(args, pool: SimulatedPool):
+    """Build the task body coroutine factory."""
+    if args.database_url:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        import app.database as database
+
+        database.engine = create_async_engine(args.database_url, pool_pre_ping=True)
+
+        async def task_body():
+            async with database.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        return task_body
+
+    async def task_body():
+        for _ in range(args.queries):
+            await pool.query()
+
+    return task_body
+
+
+def run_before(task_body, n: int) -> float:
+    """Each task gets its own event loop."""
+    start = time.perf_counter()
+    for _ in range(n):
+        asyncio.run(task_body())
+    return n / (time.perf_counter() - start)
+
+
+def run_after(task_body, n: int) -> float:
+    """All tasks share the worker runtime loop."""
+    from app.worker.runtime import runtime
+
+    runtime.start()
+    try:
+        start = time.perf_counter()
+        for _ in range(n):
+            runtime.submit(task_body())
+        return n / (time.perf_counter() - start)
+    finally:
+        runtime.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks per mode")
+    parser.add_argument("--queries", type=int, default=3, help="DB queries per task (simulated mode)")
+    parser.add_argument("--connect-ms", type=float, default=25.0, help="Simulated connect + TLS + auth cost")
+    parser.add_argument("--query-ms", type=float, default=1.0, help="Simulated query latency")
+    parser.add_argument("--database-url", default=None, help="Benchmark against a real database instead")
+    args = parser.parse_args()
+
+    before_pool = SimulatedPool(args.connect_ms, args.query_ms)
+    before = run_before(make_task(args, before_pool), args.tasks)
+
+    after_pool = SimulatedPool(args.connect_ms, args.query_ms)
+    after = run_after(make_task(args, after_pool), args.tasks)
+
+    mode = "database" if args.database_url else "simulated"
+    print(f"Worker loop benchmark ({mode}, {args.tasks} tasks)")
+    print(f"  asyncio.run per task : {before:8.1f} tasks/sec")
+    print(f"  persistent runtime   : {after:8.1f} tasks/sec")
+    print(f"  speedup              : {after / before:8.2f}x")
+    if not args.database_url:
+        print(f"  connects             : {before_pool.connects} -> {after_pool.connects}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+-- ============================================================================
+-- MIGRATION 022: UNIQUE ENTITIES PER ORG
+-- Bulk extraction upserts entities with ON CONFLICT (org_id, kind, name),
+-- which needs a unique index. Merge existing duplicates first.
+-- ============================================================================
+
+-- Re-point meeting links from duplicate entities to the oldest row
+WITH ranked AS (
+    SELECT
+        id,
+        FIRST_VALUE(id) OVER (
+            PARTITION BY org_id, kind, name
+            ORDER BY created_at, id
+        ) AS keep_id
+    FROM entities
+),
+dupes AS (
+    SELECT id, keep_id FROM ranked WHERE id <> keep_id
+),
+merged AS (
+    SELECT me.org_id, me.meeting_id, d.keep_id AS entity_id, SUM(me.mention_count) AS mention_count
+    FROM meeting_entities me
+    JOIN dupes d ON d.id = me.entity_id
+    GROUP BY me.org_id, me.meeting_id, d.keep_id
+)
+INSERT INTO meeting_entities (id, org_id, meeting_id, entity_id, mention_count)
+SELECT gen_random_uuid(), org_id, meeting_id, entity_id, mention_count
+FROM merged
+ON CONFLICT (meeting_id, entity_id)
+DO UPDATE SET mention_count = meeting_entities.mention_count + EXCLUDED.mention_count;
+
+-- Drop duplicates (their meeting_entities rows cascade)
+DELETE FROM entities e
+USING entities keep
+WHERE e.org_id = keep.org_id
+  AND e.kind = keep.kind
+  AND e.name = keep.name
+  AND (keep.created_at, keep.id) < (e.created_at, e.id);
+
+DROP INDEX IF EXISTS ix_entities_org_kind_name;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_entities_org_kind_name ON entities(org_id, kind, name);
@@ -0,0 +1,24 @@
+-- ============================================================================
+-- MIGRATION 023: TRANSLATION MEMORY
+-- Translated strings keyed on (org_id, source_lang, target_lang, sha256 of
+-- the source text), so repeated text is only sent for translation once.
+-- Rows hold meeting content and are scoped to, and deleted with, their org
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS translation_memory (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id UUID NOT NULL REFERENCES orgs(id) ON DELETE CASCADE,
+    source_lang VARCHAR(10) NOT NULL,
+    target_lang VARCHAR(10) NOT NULL,
+    text_hash CHAR(64) NOT NULL,  -- sha256 hex of the stripped source text
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_translation_memory_key
+    ON translation_memory(org_id, source_lang, target_lang, text_hash);
+
+COMMENT ON TABLE translation_memory IS 'Cached translations used by TranslationService, per org';
+COMMENT ON COLUMN translation_memory.text_hash IS 'sha256 hex digest of the source text with surrounding whitespace removed';
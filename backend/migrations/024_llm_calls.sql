@@ -0,0 +1,27 @@
+-- ============================================================================
+-- MIGRATION 024: LLM CALL ACCOUNTING
+-- One row per chat completion (or cache hit): calling service, org, model,
+-- tokens, cost and latency. Written in batches by app.services.llm_accounting
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id UUID,  -- no FK: kept for spend reporting after an org is deleted
+    service VARCHAR(100),
+    model VARCHAR(100) NOT NULL,
+    requested_model VARCHAR(100),  -- set when the daily budget picked a cheaper model
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd DOUBLE PRECISION NOT NULL DEFAULT 0,
+    latency_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+    queue_ms DOUBLE PRECISION NOT NULL DEFAULT 0,  -- time waiting for the rate limiter
+    cache_hit BOOLEAN NOT NULL DEFAULT false,
+    status VARCHAR(20) NOT NULL DEFAULT 'ok',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_calls_created_at ON llm_calls(created_at);
+CREATE INDEX IF NOT EXISTS ix_llm_calls_org_created ON llm_calls(org_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_llm_calls_service_created ON llm_calls(service, created_at);
+
+COMMENT ON TABLE llm_calls IS 'OpenAI chat completion calls with tokens, cost and latency per service and org';
@@ -0,0 +1,24 @@
+-- ============================================================================
+-- MIGRATION 025: TRANSCRIPT CHUNK EMBEDDINGS
+-- Quantized embedding per transcript chunk and embedder, loaded by workers
+-- into an in-memory index for semantic search (app.services.vector_index)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    chunk_id UUID NOT NULL REFERENCES transcript_chunks(id) ON DELETE CASCADE,
+    org_id UUID NOT NULL,
+    meeting_id UUID NOT NULL,
+    embedder VARCHAR(100) NOT NULL,  -- e.g. hashing-512, openai:text-embedding-3-small-256
+    dtype VARCHAR(10) NOT NULL,  -- int8 or float16
+    vector BYTEA NOT NULL,
+    scale DOUBLE PRECISION NOT NULL DEFAULT 1,  -- int8 vectors are vector * scale
+    text_hash CHAR(64) NOT NULL,  -- sha256 hex of the chunk text
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_chunk_embeddings_chunk_embedder UNIQUE (chunk_id, embedder)
+);
+
+CREATE INDEX IF NOT EXISTS ix_chunk_embeddings_org_created ON chunk_embeddings(org_id, embedder, created_at);
+CREATE INDEX IF NOT EXISTS ix_chunk_embeddings_text_hash ON chunk_embeddings(org_id, embedder, text_hash);
+
+COMMENT ON TABLE chunk_embeddings IS 'Transcript chunk embeddings for semantic search, one row per chunk and embedder';
@@ -48,6 +48,7 @@ class BulkUploader:
                     response = await client.post(
                         f"{self.api_url}/artifacts/upload",
                         headers=self.headers,
+                        params={"bulk": "true"},
                         files=files,
                     )
                     response.raise_for_status()
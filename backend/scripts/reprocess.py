@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Re-run pipeline stages over historical meetings.
+
+Usage:
+    # Re-extract every completed meeting of an org in 2024
+    python scripts/reprocess.py --org ORG_ID --stages extract \\
+        --from 2024-01-01 --to 2024-12-31 --status completed --concurrency 8
+
+    # Resume an interrupted job (skips meetings already done)
+    python scripts/reprocess.py --resume JOB_ID
+
+    # List recent jobs
+    python scripts/reprocess.py --org ORG_ID --list
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import date
+from pathlib import Path
+
+from rich.console import Console
+from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn, TimeElapsedColumn
+from rich.table import Table
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.worker.reprocess import (  # noqa: E402
+    REPROCESS_STAGES, ReprocessFilter, ReprocessProgress,
+    create_job, list_jobs, run_job,
+)
+
+console = Console()
+
+
+def format_eta(seconds) -> str:
+    if seconds is None:
+        return "--"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+async def run_with_progress(job_id: uuid.UUID, concurrency) -> dict:
+    with Progress(
+        TextColumn("[bold blue]Reprocessing"),
+        BarColumn(),
+        TaskProgressColumn(),
+        TextColumn("{task.fields[rate]}/min  ETA {task.fields[eta]}  failed {task.fields[failed]}"),
+        TimeElapsedColumn(),
+        console=console,
+    ) as bar:
+        task = bar.add_task("reprocess", total=None, rate="0", eta="--", failed=0)
+
+        def on_progress(progress: ReprocessProgress):
+            snapshot = progress.snapshot()
+            bar.update(
+                task,
+                total=progress.total,
+                completed=progress.skipped + progress.processed,
+                rate=snapshot["per_minute"],
+                eta=format_eta(snapshot["eta_seconds"]),
+                failed=progress.failed,
+            )
+
+        return await run_job(job_id, concurrency=concurrency, on_progress=on_progress)
+
+
+def print_jobs(jobs: list[dict]):
+    table = Table(title="Reprocess jobs")
+    table.add_column("Job")
+    table.add_column("Status")
+    table.add_column("Stages")
+    table.add_column("Meetings", justify="right")
+    table.add_column("Last run")
+    table.add_column("Created")
+    for job in jobs:
+        last = job["last_run"] or {}
+        table.add_row(
+            job["id"],
+            job["status"],
+            ",".join(job["stages"] or []),
+            str(job["total"]),
+            f"{last.get('succeeded', 0)} ok / {last.get('failed', 0)} failed" if last else "-",
+            job["created_at"] or "-",
+        )
+    console.print(table)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk reprocess meetings")
+    parser.add_argument("--org", type=uuid.UUID, help="Organization ID")
+    parser.add_argument("--stages", default="extract", help=f"Comma-separated: {','.join(REPROCESS_STAGES)}")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="Meeting date from (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Meeting date to (YYYY-MM-DD)")
+    parser.add_argument("--status", action="append", default=[], help="Meeting processing status (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Meetings processed at once (default 4)")
+    parser.add_argument("--resume", type=uuid.UUID, help="Resume an existing job")
+    parser.add_argument("--list", action="store_true", help="List recent jobs for --org")
+    parser.add_argument("--yes", action="store_true", help="Do not ask for confirmation")
+    args = parser.parse_args()
+
+    if args.list:
+        if not args.org:
+            parser.error("--list requires --org")
+        print_jobs(await list_jobs(args.org))
+        return
+
+    if args.resume:
+        job_id = args.resume
+    else:
+        if not args.org:
+            parser.error("--org is required to start a job")
+        filters = ReprocessFilter(
+            org_id=args.org,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            statuses=args.status,
+        )
+        stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+        try:
+            job_id = await create_job(filters, stages, concurrency=args.concurrency or 4)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            sys.exit(1)
+
+        console.print(f"[bold]Job:[/bold] {job_id}")
+        if not args.yes:
+            proceed = console.input("[cyan]Start reprocessing? (y/n):[/cyan] ").strip().lower()
+            if proceed != "y":
+                console.print(f"[yellow]Not started. Run later with --resume {job_id}[/yellow]")
+                return
+
+    try:
+        result = await run_with_progress(job_id, args.concurrency)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        console.print(f"\n[yellow]Interrupted. Resume with --resume {job_id}[/yellow]")
+        raise
+
+    console.print()
+    console.print(f"[bold green]Done:[/bold green] {result['succeeded']} succeeded, "
+                  f"{result['failed']} failed, {result['skipped']} already done "
+                  f"({result['per_minute']}/min)")
+    if result["failed"]:
+        console.print(f"[yellow]Retry failures with --resume {job_id}[/yellow]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,183 @@
+"""Tests for reusing the transcript and intelligence of identical uploads."""
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import ActionItem, Artifact, Decision, Summary
+from app.services.artifact_cache import clone_intelligence, clone_transcript, find_reusable_artifact
+
+ORG = uuid.uuid4()
+
+
+class FakeDB:
+    """Compiles each statement and answers with the next scripted result."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.added = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        return self.results.pop(0) if self.results else SimpleNamespace(rowcount=0)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        pass
+
+
+def result(rows=(), scalar=None, rowcount=0):
+    return SimpleNamespace(
+        scalar_one_or_none=lambda: scalar,
+        scalar_one=lambda: scalar,
+        all=lambda: list(rows),
+        scalars=lambda: SimpleNamespace(all=lambda: list(rows)),
+        rowcount=rowcount,
+    )
+
+
+def upload(**fields):
+    return Artifact(**{
+        "id": uuid.uuid4(),
+        "org_id": ORG,
+        "meeting_id": uuid.uuid4(),
+        "filename": "board.m4a",
+        "file_type": "audio",
+        "storage_path": "org/board.m4a",
+        "sha256": "a" * 64,
+        "language": None,
+        **fields,
+    })
+
+
+async def test_identical_upload_in_another_meeting_is_reused():
+    earlier = upload()
+    artifact = upload()
+    db = FakeDB(result(scalar=earlier))
+
+    assert await find_reusable_artifact(db, artifact, "klang") is earlier
+
+    (sql, params), = db.statements
+    assert "artifacts.sha256 = %(sha256_1)s" in sql and params["sha256_1"] == artifact.sha256
+    assert params["org_id_1"] == ORG
+    assert "artifacts.transcription_status = %(transcription_status_1)s" in sql
+    assert "EXISTS (SELECT transcript_chunks.id" in sql
+    # Never the same meeting: its chunks and intelligence are already there
+    assert "artifacts.meeting_id != %(meeting_id_1)s" in sql and params["meeting_id_1"] == artifact.meeting_id
+
+
+async def test_audio_must_match_provider_and_language():
+    db = FakeDB(result())
+    assert await find_reusable_artifact(db, upload(language="sv"), "klang") is None
+    (sql, params), = db.statements
+    assert params["transcription_provider_1"] == "klang"
+    assert params["language_1"] == "sv"
+
+    db = FakeDB(result())
+    await find_reusable_artifact(db, upload(file_type="docx", language="sv"), None)
+    (sql, params), = db.statements
+    assert "transcription_provider_1" not in params and "language_1" not in params
+
+
+async def test_upload_without_hash_is_never_matched():
+    db = FakeDB()
+    assert await find_reusable_artifact(db, upload(sha256=None), "klang") is None
+    assert db.statements == []
+
+
+async def test_clone_transcript_copies_chunks_onto_the_target():
+    source = upload(content_text="Hej", language="sv", duration_seconds=61.0, transcription_provider="klang")
+    target = upload()
+    db = FakeDB(result(rowcount=12))
+
+    assert await clone_transcript(db, source, target) == 12
+    (sql, params), = db.statements
+    assert sql.startswith("INSERT INTO transcript_chunks (id, org_id, meeting_id, artifact_id, sequence")
+    assert "FROM transcript_chunks" in sql
+    assert target.meeting_id in params.values() and target.id in params.values()
+    assert source.id in params.values()
+    assert (target.content_text, target.language, target.transcription_status) == ("Hej", "sv", "completed")
+
+
+async def test_clone_intelligence_remaps_chunks_and_reopens_actions():
+    source_meeting, target_meeting = uuid.uuid4(), uuid.uuid4()
+    source_chunk, target_chunk = uuid.uuid4(), uuid.uuid4()
+    summary = Summary(summary_type="executive", content_md="# Summary", model="gpt-4o")
+    decision = Decision(decision="Hire", source_chunk_id=source_chunk, confidence="high")
+    action = ActionItem(title="Post the ad", status="done", source_chunk_id=source_chunk, confidence="high")
+    db = FakeDB(
+        result(scalar=uuid.uuid4()),                 # has a summary
+        result(rows=[(source_chunk, target_chunk)]),  # chunk map
+        result(rows=[summary]),
+        result(rows=[decision]),
+        result(),                                     # decision insert
+        result(rows=[action]),
+        result(),                                     # action insert
+        result(rowcount=2),                           # tags
+        result(rowcount=3),                           # entities
+    )
+
+    counts = await clone_intelligence(
+        db, source_meeting, target_meeting, ORG,
+        source_artifact_id=uuid.uuid4(), target_artifact_id=uuid.uuid4(),
+    )
+
+    assert counts == {"summaries": 1, "decisions": 1, "action_items": 1, "tags": 2, "entities": 3}
+    assert [s.meeting_id for s in db.added] == [target_meeting]
+    decision_params = db.statements[4][1]
+    assert decision_params["source_chunk_id_m0"] == target_chunk
+    assert decision_params["meeting_id_m0"] == target_meeting
+    action_params = db.statements[6][1]
+    assert action_params["status_m0"] == "open"
+
+
+async def test_clone_intelligence_needs_a_completed_extraction():
+    db = FakeDB(result(scalar=None))
+    assert await clone_intelligence(db, uuid.uuid4(), uuid.uuid4(), ORG, uuid.uuid4(), uuid.uuid4()) is None
+    assert len(db.statements) == 1
+
+
+async def test_force_skips_reuse(monkeypatch):
+    from app.worker.tasks import pipeline
+
+    artifact = upload(file_type="docx")
+    lookups = []
+
+    async def find(db, artifact, provider_name):
+        lookups.append(artifact.id)
+        return upload()
+
+    async def clone(db, source, target):
+        return 1
+
+    @asynccontextmanager
+    async def stage_run(*args, **kwargs):
+        yield SimpleNamespace(meeting_id=None, metadata={}, add_rows=lambda *a: None)
+
+    class Documents:
+        def extract_text_from_docx(self, path):
+            return "Protokoll"
+
+    monkeypatch.setattr(pipeline, "find_reusable_artifact", find)
+    monkeypatch.setattr(pipeline, "clone_transcript", clone)
+    monkeypatch.setattr(pipeline, "stage_run", stage_run)
+    monkeypatch.setattr(pipeline, "DocumentService", Documents)
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", lambda: session(FakeDB(result(scalar=artifact))))
+
+    reused = await pipeline._transcribe_or_extract(str(artifact.id), str(ORG))
+    assert "reused_from" in reused and len(lookups) == 1
+
+    forced = await pipeline._transcribe_or_extract(str(artifact.id), str(ORG), force=True)
+    assert forced == {"status": "success", "artifact_id": str(artifact.id)}
+    assert len(lookups) == 1
+    assert artifact.content_text == "Protokoll"
+
+
+@asynccontextmanager
+async def session(db):
+    yield db
@@ -0,0 +1,73 @@
+"""Tests for chunked transcription cut points and stitching."""
+import pytest
+
+from app.providers.base import TranscriptionSegment
+from app.services.audio_preprocessing import (
+    AudioPiece,
+    TimeMap,
+    choose_cut_points,
+    stitch_segments,
+)
+
+
+def seg(start, end, text, speaker=None):
+    return TranscriptionSegment(start=start, end=end, text=text, speaker=speaker)
+
+
+def test_cut_points_prefer_nearby_silence():
+    # Target 600 s; silences at 580 and 1190 are within tolerance
+    cuts = choose_cut_points(1800, [100, 580, 900, 1190], target=600)
+    assert cuts == [580, 1190]
+
+
+def test_cut_points_fall_back_to_hard_cut():
+    assert choose_cut_points(1500, [], target=600) == [600, 1200]
+    assert choose_cut_points(700, [], target=600) == []
+
+
+def test_time_map_restores_trimmed_silence():
+    # 0-10 s kept, 10-40 s silence shortened away, 40-50 s kept
+    time_map = TimeMap([(0.0, 10.0), (40.0, 50.0)])
+    assert time_map.duration == 20.0
+    assert time_map.to_original(5.0) == 5.0
+    assert time_map.to_original(12.0) == 42.0
+    assert time_map.to_processed(45.0) == 15.0
+    assert time_map.to_processed(25.0) == 10.0
+
+
+def test_stitch_offsets_dedupes_overlap_and_keeps_speakers():
+    pieces = [
+        AudioPiece(0, "a.wav", audio_start=0, audio_end=70, core_start=0, core_end=60),
+        AudioPiece(1, "b.wav", audio_start=50, audio_end=120, core_start=60, core_end=120),
+    ]
+    first = [
+        seg(0, 30, "intro", "A"),
+        seg(30, 55, "question", "B"),
+        seg(55, 68, "answer starts", "A"),
+    ]
+    # Second piece labels the same people the other way round
+    second = [
+        seg(0, 5, "question", "X"),
+        seg(5, 18, "answer starts", "Y"),
+        seg(18, 70, "answer continues", "Y"),
+    ]
+    
+    stitched = stitch_segments(pieces, [first, second])
+    
+    assert [s.text for s in stitched] == ["intro", "question", "answer starts", "answer continues"]
+    assert stitched[-1].start == 68 and stitched[-1].end == 120
+    assert stitched[-1].speaker == "A"
+    assert {s.speaker for s in stitched} == {"A", "B"}
+
+
+def test_stitch_new_speaker_gets_new_label():
+    pieces = [
+        AudioPiece(0, "a.wav", 0, 70, 0, 60),
+        AudioPiece(1, "b.wav", 50, 120, 60, 120),
+    ]
+    stitched = stitch_segments(pieces, [
+        [seg(0, 68, "hello", "Speaker 1")],
+        [seg(0, 18, "hello", "Speaker 1"), seg(30, 60, "new voice", "Speaker 2")],
+    ])
+    assert stitched[-1].speaker not in (None, "Speaker 1")
+    assert stitched[-1].start == pytest.approx(80)
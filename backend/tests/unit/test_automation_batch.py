@@ -0,0 +1,109 @@
+"""Tests for the AIAutomationEngine batch APIs."""
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+from app.services.ai_automation_engine import AIAutomationEngine
+
+
+class FakeCompletions:
+    """Scores every "=== Candidate n ===" / "=== Lead n ===" block in the prompt."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        blocks = re.findall(r"=== (?:Candidate|Lead) (\d+) ===\n(.*?)(?=\n\n===|\s*$)", prompt, re.S)
+        self.calls.append([int(index) for index, _ in blocks])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if any("raise" in text for _, text in blocks):
+            raise RuntimeError("model error")
+        results = [
+            {"index": int(index), "score": 10 * int(index), "reasoning": text.strip()}
+            for index, text in blocks
+            if "drop" not in text  # the model "forgets" this record
+        ]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+            content=json.dumps({"results": results})
+        ))])
+
+
+def make_engine(completions):
+    engine = AIAutomationEngine(db=None, openai_api_key="test")
+    engine.openai = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return engine
+
+
+async def test_candidates_are_packed_and_streamed(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "automation_batch_size", 4)
+    completions = FakeCompletions()
+    engine = make_engine(completions)
+    candidates = [{"id": f"c{i}", "resume_text": f"resume {i}"} for i in range(10)]
+    progress = []
+
+    results = [
+        item async for item in engine.batch_screen_candidates(
+            candidates, ["python"], on_progress=lambda done, total, item: progress.append((done, total)),
+        )
+    ]
+
+    assert sorted(completions.calls) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert sorted(item.index for item in results) == list(range(10))
+    assert all(item.error is None and item.result["score"] == 10 * item.index for item in results)
+    assert {item.id for item in results} == {f"c{i}" for i in range(10)}
+    assert progress == [(done, 10) for done in range(1, 11)]
+
+
+async def test_failing_record_only_fails_itself(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "automation_batch_size", 4)
+    completions = FakeCompletions()
+    engine = make_engine(completions)
+    leads = [{"company_name": f"Co {i}"} for i in range(4)]
+    leads[1]["company_name"] = "drop"
+    leads[2]["company_name"] = "raise"
+
+    results = {item.index: item async for item in engine.batch_qualify_leads(leads, {"stage": "seed"})}
+
+    assert results[0].result["score"] == 0 and results[3].result["score"] == 30
+    assert "No result" in results[1].error
+    assert results[2].error == "model error"
+    # The pack was split in halves, then the failing halves again
+    assert sorted(completions.calls) == [[0], [0, 1], [0, 1, 2, 3], [1], [2], [2, 3], [3]]
+
+
+async def test_concurrency_is_bounded_and_progress_can_be_async():
+    completions = FakeCompletions()
+    engine = make_engine(completions)
+
+    async def score(portfolio_company_id, criteria, current_metrics):
+        await completions.create(messages=[{}, {"content": ""}])
+        return {"overall_score": int(portfolio_company_id)}
+
+    engine.calculate_qualification_score = score
+    seen = []
+
+    async def on_progress(done, total, item):
+        seen.append(done)
+
+    companies = [{"portfolio_company_id": str(i)} for i in range(6)]
+    results = [
+        item async for item in engine.batch_calculate_qualification_scores(
+            companies, max_concurrency=2, on_progress=on_progress,
+        )
+    ]
+
+    assert completions.max_in_flight == 2
+    assert sorted(item.result["overall_score"] for item in results) == list(range(6))
+    assert seen == list(range(1, 7))
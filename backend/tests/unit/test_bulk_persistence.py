@@ -0,0 +1,124 @@
+"""Tests for the bulk upserts of extracted meeting intelligence."""
+import re
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.services import bulk_persistence
+from app.services.bulk_persistence import OrgIdCache, persist_intelligence, upsert_tags
+from app.services.extraction import (
+    ExtractedActionItem, ExtractedDecision, ExtractedEntity, MeetingIntelligence,
+)
+
+
+class FakeDB:
+    """Records compiled statements; RETURNING yields the inserted rows."""
+
+    def __init__(self):
+        self.sync_session = Session()
+        self.statements = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        self.statements.append((sql, compiled.params))
+        if "RETURNING" not in sql:
+            return SimpleNamespace(rowcount=0)
+        rows = {}
+        for key, value in compiled.params.items():
+            column, index = re.fullmatch(r"(\w+)_m(\d+)", key).groups()
+            rows.setdefault(index, {})[column] = value
+        return [SimpleNamespace(**row) for row in rows.values()]
+
+    def inserts(self, table):
+        return [(sql, params) for sql, params in self.statements if sql.startswith(f"INSERT INTO {table} ")]
+
+    def commit(self):
+        self.sync_session.commit()
+
+    def rollback(self):
+        self.sync_session.begin()
+        self.sync_session.rollback()
+
+
+def fresh_caches(monkeypatch):
+    tags, entities = OrgIdCache(), OrgIdCache()
+    monkeypatch.setattr(bulk_persistence, "tag_id_cache", tags)
+    monkeypatch.setattr(bulk_persistence, "entity_id_cache", entities)
+    return tags, entities
+
+
+async def test_intelligence_is_deduplicated_into_one_upsert_per_table(monkeypatch):
+    fresh_caches(monkeypatch)
+    db = FakeDB()
+    chunks = [SimpleNamespace(id=uuid.uuid4(), text="Acme AB signs. Acme AB pays.")]
+    intelligence = MeetingIntelligence(
+        summary_md="",
+        decisions=[ExtractedDecision(decision="Sign", confidence="high", source_chunk_indices=[0])],
+        action_items=[ExtractedActionItem(title="Pay", confidence="low", due_date="2024-03-15 maybe")],
+        tags=["Budget", " Budget ", "budget", ""],
+        entities=[
+            ExtractedEntity(kind="company", name="Acme AB"),
+            ExtractedEntity(kind="company", name=" Acme AB "),
+        ],
+    )
+
+    counts = await persist_intelligence(db, uuid.uuid4(), uuid.uuid4(), intelligence, chunks)
+
+    assert counts == {"decisions": 1, "action_items": 1, "tags": 2, "entities": 1}
+    (tag_sql, tag_params), = db.inserts("tags")
+    assert "ON CONFLICT (org_id, name) DO UPDATE" in tag_sql
+    assert sorted(v for k, v in tag_params.items() if k.startswith("name_")) == ["Budget", "budget"]
+    (entity_sql, _), = db.inserts("entities")
+    assert "ON CONFLICT (org_id, kind, name) DO UPDATE" in entity_sql
+    (link_sql, link_params), = db.inserts("meeting_entities")
+    assert "ON CONFLICT (meeting_id, entity_id) DO UPDATE" in link_sql
+    assert link_params["mention_count_m0"] == 2
+    (_, action_params), = db.inserts("action_items")
+    assert action_params["due_date_m0"].isoformat() == "2024-03-15"
+    assert "ON CONFLICT (meeting_id, tag_id) DO NOTHING" in db.inserts("meeting_tags")[0][0]
+
+
+async def test_ids_are_cached_only_after_commit(monkeypatch):
+    tags, _ = fresh_caches(monkeypatch)
+    org_id = uuid.uuid4()
+
+    db = FakeDB()
+    ids = await upsert_tags(db, org_id, ["Budget"])
+    assert tags.get_many(org_id, ["Budget"]) == {}
+    db.commit()
+    assert tags.get_many(org_id, ["Budget"]) == ids
+
+    # Cached names skip the upsert
+    db = FakeDB()
+    assert await upsert_tags(db, org_id, ["Budget"]) == ids
+    assert db.statements == []
+
+
+async def test_rolled_back_ids_never_reach_the_cache(monkeypatch):
+    tags, _ = fresh_caches(monkeypatch)
+    org_id = uuid.uuid4()
+    db = FakeDB()
+
+    await upsert_tags(db, org_id, ["Hiring"])
+    db.rollback()
+    db.commit()
+    assert tags.get_many(org_id, ["Hiring"]) == {}
+
+
+def test_org_id_cache_invalidation_and_eviction():
+    cache = OrgIdCache(max_orgs=2, max_keys_per_org=2)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.put_many(a, {"x": 1, "y": 2, "z": 3})
+    assert cache.get_many(a, ["x", "y", "z"]) == {"y": 2, "z": 3}
+
+    cache.put_many(b, {"x": 1})
+    cache.put_many(c, {"x": 1})
+    assert cache.get_many(a, ["y"]) == {}  # least recently used org
+
+    cache.invalidate(b)
+    assert cache.get_many(b, ["x"]) == {} and cache.get_many(c, ["x"]) == {"x": 1}
+    cache.invalidate()
+    assert cache.get_many(c, ["x"]) == {}
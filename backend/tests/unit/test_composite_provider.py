@@ -0,0 +1,169 @@
+"""Tests for the composite (failover / hedged) transcription provider."""
+import asyncio
+
+import pytest
+
+from app.providers.base import (
+    TranscriptionProvider, TranscriptionResult, TranscriptionSegment, TranscriptionUpdate,
+)
+from app.providers.composite import AllProvidersFailed, CompositeProvider, ProviderLatencyStats
+
+
+class FakeProvider(TranscriptionProvider):
+    def __init__(self, name, delay=0.0, fail=False):
+        self._name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def supports_speaker_diarization(self):
+        return True
+
+    async def transcribe(self, file_url, language_hint=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self._name} down")
+        return TranscriptionResult(
+            language="en",
+            segments=[TranscriptionSegment(start=0, end=1, text=self._name)],
+        )
+
+
+def composite(providers, **kwargs):
+    kwargs.setdefault("hedge", False)
+    return CompositeProvider(providers, stats=ProviderLatencyStats(redis_url=""), **kwargs)
+
+
+async def test_fails_over_to_next_provider():
+    primary, backup = FakeProvider("klang", fail=True), FakeProvider("mistral")
+    result = await composite([primary, backup]).transcribe("file://x")
+    assert result.provider == "mistral"
+    assert primary.calls == backup.calls == 1
+
+
+async def test_timeout_counts_as_failure():
+    slow, backup = FakeProvider("klang", delay=1.0), FakeProvider("openai")
+    provider = composite([slow, backup], timeouts={"klang": 0.05})
+    result = await provider.transcribe("file://x")
+    assert result.provider == "openai"
+
+
+async def test_all_failed_raises():
+    provider = composite([FakeProvider("klang", fail=True), FakeProvider("mistral", fail=True)])
+    with pytest.raises(AllProvidersFailed) as exc:
+        await provider.transcribe("file://x")
+    assert [name for name, _ in exc.value.errors] == ["klang", "mistral"]
+
+
+async def test_hedge_takes_first_result_and_cancels_other():
+    slow, fast = FakeProvider("klang", delay=1.0), FakeProvider("mistral", delay=0.01)
+    provider = composite([slow, fast], hedge=True, hedge_default_seconds=0.05)
+    result = await provider.transcribe("file://x")
+    await asyncio.sleep(0.01)
+    assert result.provider == "mistral"
+    assert slow.cancelled
+
+
+async def test_no_hedge_when_primary_is_fast():
+    fast, backup = FakeProvider("klang"), FakeProvider("mistral")
+    provider = composite([fast, backup], hedge=True, hedge_default_seconds=0.5)
+    result = await provider.transcribe("file://x")
+    assert result.provider == "klang"
+    assert backup.calls == 0
+
+
+async def test_hedge_delay_adapts_to_observed_latency():
+    stats = ProviderLatencyStats(redis_url="")
+    for i in range(100):
+        await stats.record("klang", 10.0 + i / 10)
+    provider = CompositeProvider([FakeProvider("klang")], stats=stats, hedge=True, hedge_default_seconds=120)
+    assert 19.0 <= await provider.hedge_delay(provider.providers[0]) <= 20.0
+
+
+async def test_hedge_loser_is_recorded_as_censored_sample():
+    slow, fast = FakeProvider("klang", delay=1.0), FakeProvider("mistral", delay=0.01)
+    provider = composite([slow, fast], hedge=True, hedge_default_seconds=0.05)
+    await provider.transcribe("file://x")
+    await asyncio.sleep(0.01)
+
+    # The cancelled primary ran for at least the hedge delay (samples()
+    # would return the window cached when the hedge delay was read)
+    samples = list(provider.stats._local["klang"])
+    assert len(samples) == 1 and samples[0] >= 0.05
+    assert len(provider.stats._local["mistral"]) == 1
+
+
+class FakeStreamProvider(FakeProvider):
+    """Yields one update per delay in delays; the last one is final."""
+
+    def __init__(self, name, delays, fail=False):
+        super().__init__(name, fail=fail)
+        self.delays = delays
+        self.closed = False
+
+    @property
+    def supports_streaming(self):
+        return True
+
+    async def transcribe_stream(self, file_url, language_hint=None):
+        self.calls += 1
+        try:
+            for i, delay in enumerate(self.delays):
+                await asyncio.sleep(delay)
+                if self.fail:
+                    raise RuntimeError(f"{self._name} down")
+                yield TranscriptionUpdate(
+                    segments=[TranscriptionSegment(start=i, end=i + 1, text=self._name)],
+                    final=i == len(self.delays) - 1,
+                )
+        finally:
+            self.closed = True
+
+
+async def collect(stream):
+    return [update async for update in stream]
+
+
+async def test_stream_fails_over_when_first_update_is_late():
+    slow, backup = FakeStreamProvider("klang", [1.0]), FakeStreamProvider("mistral", [0, 0])
+    provider = composite([slow, backup], timeouts={"klang": 0.05})
+    updates = await collect(provider.transcribe_stream("file://x"))
+    assert [u.provider for u in updates] == ["mistral", "mistral"]
+    assert updates[-1].final and slow.closed
+
+
+async def test_stream_fails_over_on_error_before_first_update():
+    broken, backup = FakeStreamProvider("klang", [0], fail=True), FakeStreamProvider("mistral", [0])
+    updates = await collect(composite([broken, backup]).transcribe_stream("file://x"))
+    assert [u.provider for u in updates] == ["mistral"]
+
+
+async def test_stream_is_hedged_until_the_first_update():
+    slow, fast = FakeStreamProvider("klang", [1.0, 0]), FakeStreamProvider("mistral", [0.01, 0])
+    provider = composite([slow, fast], hedge=True, hedge_default_seconds=0.05)
+    updates = await collect(provider.transcribe_stream("file://x"))
+    assert [u.provider for u in updates] == ["mistral", "mistral"]
+    assert slow.closed
+    assert [s >= 0.05 for s in provider.stats._local["klang"]] == [True]
+
+
+async def test_stream_gap_after_first_update_is_bounded():
+    stalled, backup = FakeStreamProvider("klang", [0, 1.0]), FakeStreamProvider("mistral", [0])
+    provider = composite([stalled, backup], timeouts={"klang": 0.05})
+    seen = []
+    with pytest.raises(asyncio.TimeoutError):
+        async for update in provider.transcribe_stream("file://x"):
+            seen.append(update.provider)
+    assert seen == ["klang"] and stalled.closed
+    assert backup.calls == 0
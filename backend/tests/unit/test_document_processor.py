@@ -0,0 +1,110 @@
+"""Tests for concurrent content generation and verification in DocumentProcessor."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.document_processor import (
+    ContentType,
+    DocumentProcessingResult,
+    DocumentProcessor,
+    ProcessingStage,
+    ProcessingStatus,
+)
+
+CONTENT_TYPES = [
+    ContentType.DUE_DILIGENCE,
+    ContentType.SWOT_ANALYSIS,
+    ContentType.EXECUTIVE_SUMMARY,
+]
+
+
+def make_processor(max_concurrent_generations=4, delays=None, fail=None, reject=()):
+    """DocumentProcessor with fake agents 5 and 6 (no API keys needed)."""
+    processor = DocumentProcessor.__new__(DocumentProcessor)
+    processor._generation_slots = asyncio.Semaphore(max_concurrent_generations)
+    processor.in_flight = 0
+    processor.peak = 0
+    processor.verified_at = {}
+    delays = delays or {}
+
+    async def generate(content_type, *args, **kwargs):
+        processor.in_flight += 1
+        processor.peak = max(processor.peak, processor.in_flight)
+        try:
+            await asyncio.sleep(delays.get(content_type, 0.05))
+        finally:
+            processor.in_flight -= 1
+        if content_type == fail:
+            raise RuntimeError(f"{content_type.value} failed")
+        return SimpleNamespace(content_type=content_type)
+
+    async def verify(content, output_mode):
+        processor.verified_at[content.content_type] = asyncio.get_running_loop().time()
+        return SimpleNamespace(approved=content.content_type not in reject, final_confidence=0.9)
+
+    processor._run_content_generation = generate
+    processor._run_verification = verify
+    return processor
+
+
+def new_result():
+    return DocumentProcessingResult(
+        document_id="doc",
+        filename="deck.pdf",
+        document_type="pitch_deck",
+        current_stage=ProcessingStage.CONTENT_GENERATION,
+        status=ProcessingStatus.PROCESSING,
+    )
+
+
+async def test_content_types_generate_concurrently_in_order():
+    processor = make_processor()
+    result = new_result()
+    await processor._generate_and_verify_all(result, CONTENT_TYPES, None, None)
+    assert processor.peak == len(CONTENT_TYPES)
+    assert list(result.generated_content) == CONTENT_TYPES
+    assert list(result.verification) == CONTENT_TYPES
+    assert not result.requires_human_review
+
+
+async def test_verification_starts_when_its_content_is_ready():
+    delays = {
+        ContentType.DUE_DILIGENCE: 0.3,
+        ContentType.SWOT_ANALYSIS: 0.01,
+        ContentType.EXECUTIVE_SUMMARY: 0.01,
+    }
+    processor = make_processor(delays=delays)
+    await processor._generate_and_verify_all(new_result(), CONTENT_TYPES, None, None)
+    verified = processor.verified_at
+    assert verified[ContentType.SWOT_ANALYSIS] + 0.2 < verified[ContentType.DUE_DILIGENCE]
+
+
+async def test_generation_budget_is_shared_across_documents():
+    processor = make_processor(max_concurrent_generations=2)
+    await asyncio.gather(*(
+        processor._generate_and_verify_all(new_result(), CONTENT_TYPES, None, None)
+        for _ in range(3)
+    ))
+    assert processor.peak == 2
+
+
+async def test_rejected_content_requires_review():
+    processor = make_processor(reject={ContentType.SWOT_ANALYSIS})
+    result = new_result()
+    await processor._generate_and_verify_all(result, CONTENT_TYPES, None, None)
+    assert result.requires_human_review
+    assert result.review_reason == "Content failed QA verification"
+
+
+async def test_generation_failure_cancels_others_and_keeps_stage():
+    processor = make_processor(
+        delays={ContentType.DUE_DILIGENCE: 1.0},
+        fail=ContentType.SWOT_ANALYSIS,
+    )
+    result = new_result()
+    with pytest.raises(Exception, match="swot_analysis failed") as exc:
+        await processor._generate_and_verify_all(result, CONTENT_TYPES, None, None)
+    assert exc.value.stage == ProcessingStage.CONTENT_GENERATION
+    assert ContentType.DUE_DILIGENCE not in result.generated_content
+    assert processor.in_flight == 0
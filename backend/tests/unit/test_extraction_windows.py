@@ -0,0 +1,58 @@
+"""Tests for windowed (map-reduce) extraction helpers."""
+from app.services.extraction import (
+    ExtractedActionItem,
+    ExtractedDecision,
+    ExtractedEntity,
+    MeetingIntelligence,
+    build_token_windows,
+    merge_window_results,
+)
+
+
+def test_windows_cover_all_chunks_with_overlap():
+    """Windows respect the budget and overlap by whole chunks."""
+    windows = build_token_windows([10] * 10, max_tokens=35, overlap_tokens=10)
+    
+    assert windows[0] == (0, 3)
+    assert windows[-1][1] == 10
+    for (prev_start, prev_end), (start, end) in zip(windows, windows[1:]):
+        assert start == prev_end - 1  # one 10-token chunk of overlap
+        assert start > prev_start  # always makes progress
+
+
+def test_oversized_chunk_gets_own_window():
+    """A chunk larger than the budget is not dropped."""
+    assert build_token_windows([50, 10, 10], max_tokens=35, overlap_tokens=10) == [(0, 1), (1, 3)]
+    assert build_token_windows([], max_tokens=35) == []
+
+
+def test_merge_remaps_indices_and_deduplicates():
+    """Local indices become global; overlapping duplicates are merged."""
+    first = MeetingIntelligence(
+        summary_md="Part one.",
+        decisions=[ExtractedDecision(decision="We will hire two engineers.", confidence="medium", source_chunk_indices=[2])],
+        action_items=[ExtractedActionItem(title="Send term sheet to Acme", confidence="low", source_chunk_indices=[1])],
+        tags=["Hiring"],
+        entities=[ExtractedEntity(kind="company", name="Acme")],
+    )
+    second = MeetingIntelligence(
+        summary_md="Part two.",
+        decisions=[ExtractedDecision(decision="We will hire two engineers", confidence="high", source_chunk_indices=[0, 99])],
+        action_items=[ExtractedActionItem(title="Send the term sheet to Acme", owner_name="Anna", confidence="high", source_chunk_indices=[3])],
+        tags=["hiring", "Fundraising"],
+        entities=[ExtractedEntity(kind="company", name="ACME")],
+    )
+    
+    merged = merge_window_results([(0, first), (2, second)], total_chunks=10)
+    
+    assert len(merged.decisions) == 1
+    assert merged.decisions[0].source_chunk_indices == [2]  # 99 + 2 is out of range
+    assert merged.decisions[0].confidence == "high"
+    
+    assert len(merged.action_items) == 1
+    assert merged.action_items[0].source_chunk_indices == [1, 5]
+    assert merged.action_items[0].owner_name == "Anna"
+    
+    assert merged.tags == ["Hiring", "Fundraising"]
+    assert len(merged.entities) == 1
+    assert merged.summary_md == "Part one.\n\nPart two."
@@ -0,0 +1,27 @@
+"""Tests for the shared HTTP client registry."""
+from app.http_clients import HTTPClientRegistry
+
+
+async def test_clients_are_shared_per_origin():
+    registry = HTTPClientRegistry(http2=False)
+    
+    klang = registry.get("https://api.klang.ai/v1/transcribe")
+    assert registry.get("https://api.klang.ai/v1/status") is klang
+    assert registry.get("https://api.klang.ai:443") is klang
+    assert registry.get("https://api.mistral.ai/v1") is not klang
+    
+    await registry.aclose()
+    assert klang.is_closed
+
+
+async def test_least_recently_used_origin_is_evicted():
+    registry = HTTPClientRegistry(http2=False, max_origins=2)
+    
+    first = registry.get("https://a.example.com")
+    registry.get("https://b.example.com")
+    registry.get("https://a.example.com")
+    registry.get("https://c.example.com")
+    
+    assert set(registry.stats()) == {"https://a.example.com:443", "https://c.example.com:443"}
+    assert registry.get("https://a.example.com") is first
+    await registry.aclose()
@@ -0,0 +1,173 @@
+"""Tests for LLM call accounting and per-org budgets."""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_client
+from app.services.llm_accounting import LLMUsageRecorder, llm_context
+from app.services.llm_cache import LLMCache, with_llm_cache
+from app.services.llm_client import RateLimiter, SharedOpenAIClient
+
+ORG = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture(autouse=True)
+def word_encoding(monkeypatch):
+    """Count one token per word so the tests never download tiktoken files."""
+    words = SimpleNamespace(encode=lambda text, disallowed_special=(): text.split())
+    monkeypatch.setattr(llm_client, "_encoding", lambda model: words)
+
+
+class MemoryRecorder(LLMUsageRecorder):
+    """Recorder that writes batches to a list instead of llm_calls."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("prices", {"gpt-4o-mini": (0.15, 0.60), "gpt-4o": (2.50, 10.00)})
+        kwargs.setdefault("redis_url", "")
+        kwargs.setdefault("flush_seconds", 0.01)
+        super().__init__(**kwargs)
+        self.batches = []
+
+    async def _write(self, rows):
+        self.batches.append(rows)
+
+
+class FakeCompletions:
+    def __init__(self, prompt_tokens=1000, completion_tokens=500):
+        self.models = []
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        return SimpleNamespace(usage=SimpleNamespace(
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            total_tokens=self.prompt_tokens + self.completion_tokens,
+        ))
+
+
+def make_client(recorder, completions, service="translation"):
+    client = SharedOpenAIClient("test", RateLimiter(limits={}, redis_url=""), service=service, usage=recorder)
+    client._chat_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+def request(model="gpt-4o"):
+    return {"model": model, "messages": [{"role": "user", "content": "hi"}]}
+
+
+def test_cost_uses_longest_price_prefix():
+    recorder = MemoryRecorder()
+    assert recorder.cost("gpt-4o-mini-2024-07-18", 1_000_000, 0) == 0.15
+    assert recorder.cost("gpt-4o-2024-08-06", 1000, 1000) == 0.0125
+    assert recorder.cost("unknown", 1000, 1000) == 0.0
+
+
+async def test_calls_are_attributed_and_written_in_batches():
+    recorder = MemoryRecorder(batch_size=3)
+    client = make_client(recorder, FakeCompletions())
+
+    with llm_context(org_id=ORG):
+        for _ in range(3):
+            await client.chat.completions.create(**request())
+    with llm_context(service="wheel.people"):
+        await client.chat.completions.create(**request("gpt-4o-mini"))
+
+    # Full batch written immediately, the rest after flush_seconds
+    assert [len(batch) for batch in recorder.batches] == [3]
+    await asyncio.sleep(0.05)
+    assert [len(batch) for batch in recorder.batches] == [3, 1]
+
+    first = recorder.batches[0][0]
+    assert first["service"] == "translation"
+    assert first["org_id"] == ORG
+    assert (first["prompt_tokens"], first["completion_tokens"]) == (1000, 500)
+    assert first["cost_usd"] == 0.0075
+    assert recorder.batches[1][0]["service"] == "wheel.people"
+    assert recorder.batches[1][0]["org_id"] is None
+
+
+async def test_org_over_budget_switches_to_cheaper_model(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "llm_org_daily_budget_usd", 0.01)
+    recorder = MemoryRecorder()
+    completions = FakeCompletions()
+    client = make_client(recorder, completions)
+
+    with llm_context(org_id=ORG):
+        # 0.0075 each: the second call still fits, the third does not
+        for _ in range(3):
+            await client.chat.completions.create(**request("gpt-4o-2024-08-06"))
+    assert completions.models == ["gpt-4o-2024-08-06", "gpt-4o-2024-08-06", "gpt-4o-mini"]
+    assert recorder._buffer[-1]["requested_model"] == "gpt-4o-2024-08-06"
+
+    # Other orgs are unaffected
+    await client.chat.completions.create(**request())
+    assert completions.models[-1] == "gpt-4o"
+
+
+async def test_cache_hits_are_recorded_without_cost():
+    recorder = MemoryRecorder()
+    completions = FakeCompletions()
+    completions.create = _completion_create(completions)
+    cache = LLMCache(redis_url="", max_entries=10, ttl_seconds=60, enabled=True)
+    client = with_llm_cache(make_client(recorder, completions), cache)
+
+    await client.chat.completions.create(**request())
+    await client.chat.completions.create(**request())
+    assert len(completions.models) == 1
+    miss, hit = recorder._buffer
+    assert (miss["cache_hit"], hit["cache_hit"]) == (False, True)
+    assert hit["cost_usd"] == 0.0
+    assert hit["prompt_tokens"] == 1000
+    assert recorder.stats()["calls"][0]["cache_hits"] == 1
+
+
+async def test_budget_fallback_answers_are_cached_under_the_fallback_model(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "llm_org_daily_budget_usd", 0.01)
+    recorder = MemoryRecorder()
+    completions = FakeCompletions()
+    completions.create = _completion_create(completions)
+    cache = LLMCache(redis_url="", max_entries=10, ttl_seconds=60, enabled=True)
+    client = with_llm_cache(make_client(recorder, completions), cache)
+
+    with llm_context(org_id=ORG):
+        await client.chat.completions.create(**request(), use_cache=False)
+        await client.chat.completions.create(**request(), use_cache=False)
+        # Over budget: answered by the fallback
+        over_budget = await client.chat.completions.create(**request())
+        again = await client.chat.completions.create(**request())
+    assert completions.models == ["gpt-4o", "gpt-4o", "gpt-4o-mini"]
+    assert over_budget.model == again.model == "gpt-4o-mini"
+    hit = recorder._buffer[-1]
+    assert hit["cache_hit"] and (hit["model"], hit["requested_model"]) == ("gpt-4o-mini", "gpt-4o")
+
+    # An org within budget gets gpt-4o, not the cached fallback answer
+    response = await client.chat.completions.create(**request())
+    assert response.model == "gpt-4o"
+    assert completions.models[-1] == "gpt-4o"
+
+
+def _completion_create(completions):
+    """A create() returning a real ChatCompletion, which the cache can store."""
+    from openai.types.chat import ChatCompletion
+
+    async def create(**kwargs):
+        completions.models.append(kwargs["model"])
+        return ChatCompletion.model_validate({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": kwargs["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "ok"},
+            }],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 500, "total_tokens": 1500},
+        })
+    return create
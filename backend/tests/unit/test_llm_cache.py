@@ -0,0 +1,78 @@
+"""Tests for the shared LLM response cache."""
+import pytest
+from openai.types.chat import ChatCompletion
+
+from app.services.llm_cache import LLMCache, cache_key, with_llm_cache
+
+
+def make_completion(content: str) -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+    })
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        return make_completion(f"answer {self.calls}")
+
+
+class FakeClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = FakeCompletions()
+
+
+@pytest.fixture
+def memory_cache():
+    return LLMCache(redis_url="", max_entries=2, ttl_seconds=60, enabled=True)
+
+
+def test_cache_key_depends_on_request():
+    """Temperature, model and messages all change the key."""
+    base = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.1}
+    assert cache_key(base) == cache_key(dict(base))
+    assert cache_key(base) != cache_key({**base, "temperature": 0.7})
+    assert cache_key(base) != cache_key({**base, "model": "gpt-4o-mini"})
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_is_served_from_cache(memory_cache):
+    """Second identical call does not reach the API."""
+    client = FakeClient()
+    cached = with_llm_cache(client, memory_cache)
+    request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.1}
+    
+    first = await cached.chat.completions.create(**request)
+    second = await cached.chat.completions.create(**request)
+    
+    assert client.chat.completions.calls == 1
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert memory_cache.stats()["hits"] == 1
+    assert memory_cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_opt_out_and_eviction(memory_cache):
+    """use_cache=False bypasses the cache; oldest entries are evicted."""
+    client = FakeClient()
+    cached = with_llm_cache(client, memory_cache)
+    
+    for prompt in ("a", "b", "c"):
+        await cached.chat.completions.create(model="m", messages=[{"role": "user", "content": prompt}])
+    await cached.chat.completions.create(model="m", messages=[{"role": "user", "content": "a"}])
+    assert client.chat.completions.calls == 4  # "a" was evicted
+    
+    await cached.chat.completions.create(model="m", messages=[{"role": "user", "content": "c"}], use_cache=False)
+    assert client.chat.completions.calls == 5
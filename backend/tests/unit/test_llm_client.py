@@ -0,0 +1,152 @@
+"""Tests for the shared OpenAI client and its rate limiter."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.services import llm_client
+from app.services.llm_client import (
+    APPROXIMATE_ENCODING,
+    RateLimiter,
+    SharedOpenAIClient,
+    estimate_tokens,
+    parse_rate_limits,
+)
+
+
+_real_encoding = llm_client._encoding
+
+
+@pytest.fixture(autouse=True)
+def word_encoding(monkeypatch):
+    """Count one token per word so the tests never download tiktoken files."""
+    words = SimpleNamespace(encode=lambda text, disallowed_special=(): text.split())
+    monkeypatch.setattr(llm_client, "_encoding", lambda model: words)
+
+
+def rate_limit_error(retry_after_ms="50"):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, request=request, headers={"retry-after-ms": retry_after_ms})
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class FakeCompletions:
+    def __init__(self, errors=(), total_tokens=None):
+        self.errors = list(errors)
+        self.total_tokens = total_tokens
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append((kwargs["messages"][0]["content"], time.monotonic()))
+        if self.errors:
+            raise self.errors.pop(0)
+        usage = SimpleNamespace(total_tokens=self.total_tokens) if self.total_tokens else None
+        return SimpleNamespace(usage=usage)
+
+
+def make_client(limiter, completions):
+    client = SharedOpenAIClient("test", limiter)
+    client._chat_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+def request(content="hi", model="test-model", **kwargs):
+    return {"model": model, "messages": [{"role": "user", "content": content}], **kwargs}
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("gpt-4o:500:30000, gpt-4o-mini:500:200000,bad") == {
+        "gpt-4o": (500, 30000),
+        "gpt-4o-mini": (500, 200000),
+    }
+
+
+def test_longest_prefix_limit_applies():
+    limiter = RateLimiter(limits=parse_rate_limits("gpt-4o:1:1,gpt-4o-mini:2:2"), redis_url="")
+    assert limiter.limit_for("gpt-4o-mini-2024-07-18") == (2, 2)
+    assert limiter.limit_for("gpt-4o-2024-08-06") == (1, 1)
+    assert limiter.limit_for("whisper-1") is None
+
+
+def test_estimate_tokens_counts_prompt_and_completion():
+    short = estimate_tokens(request("hello", max_tokens=100))
+    long = estimate_tokens(request("hello " * 500, max_tokens=100))
+    assert 100 < short < 120
+    assert long - short >= 499
+
+
+def test_unloadable_encoding_falls_back_to_length_estimate(monkeypatch):
+    loads = []
+
+    def unreachable(model):
+        loads.append(model)
+        raise ConnectionError("openaipublic.blob.core.windows.net unreachable")
+
+    monkeypatch.setattr(llm_client, "_encoding", _real_encoding)
+    monkeypatch.setattr(llm_client, "_tiktoken_encoding", unreachable)
+    monkeypatch.setattr(llm_client, "_encoding_down_until", 0.0)
+
+    assert estimate_tokens(request("x" * 400, max_tokens=100)) == 3 + 4 + 100 + 100
+    assert estimate_tokens(request("x" * 4, max_tokens=100)) == 3 + 4 + 1 + 100
+    # Not retried until ENCODING_RETRY_SECONDS have passed
+    assert loads == ["test-model"]
+    assert llm_client._encoding("test-model") is APPROXIMATE_ENCODING
+
+
+async def test_requests_per_minute_are_queued_in_order():
+    # 600 RPM with a 0.5 s burst: 5 immediately, then one every 0.1 s
+    limiter = RateLimiter(limits={"test-model": (600, 10**9)}, redis_url="", burst_seconds=0.5)
+    completions = FakeCompletions()
+    client = make_client(limiter, completions)
+
+    start = time.monotonic()
+    await asyncio.gather(*(client.chat.completions.create(**request(str(i))) for i in range(8)))
+    assert [content for content, _ in completions.calls] == [str(i) for i in range(8)]
+    assert completions.calls[4][1] - start < 0.05
+    assert completions.calls[7][1] - start >= 0.25
+    assert limiter.stats()["granted"] == 8
+
+
+async def test_tokens_per_minute_limit_waits_and_usage_is_settled():
+    # 60k TPM with a 1 s burst holds 1000 tokens
+    limiter = RateLimiter(limits={"test-model": (10**6, 60000)}, redis_url="", burst_seconds=1.0)
+    completions = FakeCompletions(total_tokens=100)
+    client = make_client(limiter, completions)
+
+    start = time.monotonic()
+    # Each reserves ~608 tokens but uses 100, so the second is not held back
+    await client.chat.completions.create(**request(max_tokens=600))
+    await client.chat.completions.create(**request(max_tokens=600))
+    assert time.monotonic() - start < 0.1
+
+    # Without the refund the third would wait for the bucket to refill
+    completions.total_tokens = None
+    await client.chat.completions.create(**request(max_tokens=600))
+    await client.chat.completions.create(**request(max_tokens=600))
+    assert time.monotonic() - start >= 0.3
+
+
+async def test_rate_limit_error_pauses_and_retries():
+    limiter = RateLimiter(limits={"test-model": (10**6, 10**9)}, redis_url="", burst_seconds=1.0)
+    completions = FakeCompletions(errors=[rate_limit_error("100")])
+    client = make_client(limiter, completions)
+
+    await client.chat.completions.create(**request())
+    first, second = completions.calls
+    assert second[1] - first[1] >= 0.1
+    assert limiter.stats()["rate_limited"] == 1
+
+
+async def test_rate_limit_error_is_raised_after_max_retries(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "openai_max_retries", 1)
+    limiter = RateLimiter(limits={}, redis_url="")
+    completions = FakeCompletions(errors=[rate_limit_error("10"), rate_limit_error("10")])
+    client = make_client(limiter, completions)
+
+    with pytest.raises(openai.RateLimitError):
+        await client.chat.completions.create(**request())
+    assert len(completions.calls) == 2
@@ -0,0 +1,136 @@
+"""Tests for the compiled PII scanner and per-org name dictionaries."""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.pii_detection import (
+    NameAutomaton,
+    PIIDetectionService,
+    PIIDictionaryCache,
+    PIIScanner,
+)
+
+NAMES = [
+    ("Anna Svensson", "person"),
+    ("Svensson", "person"),
+    ("Acme AB", "organization"),
+    ("AB", "organization"),  # too short to match on its own
+]
+
+
+def spans(entities):
+    return [(e.entity_type, e.text, e.start_char, e.detection_method) for e in entities]
+
+
+def test_structured_pii_in_one_pass():
+    text = "Ring (555) 123-4567 eller mejla john@example.com, kort 1234 5678 9012 3456, ssn 123-45-6789."
+    entities = PIIDetectionService(db=None).detect_pii(text)
+    assert [(e.entity_type, e.text) for e in entities] == [
+        ("phone", "(555) 123-4567"),
+        ("email", "john@example.com"),
+        ("financial_cc", "1234 5678 9012 3456"),
+        ("financial_ssn", "123-45-6789"),
+    ]
+    assert all(text[e.start_char:e.end_char] == e.text for e in entities)
+
+
+def test_dictionary_names_beat_the_name_pattern_and_lose_to_emails():
+    scanner = PIIScanner(NameAutomaton(NAMES))
+    text = "Anna Svensson (anna@acme.se) från ACME AB: Erik Berg tar det."
+    assert spans(scanner.scan(text)) == [
+        ("person_name", "Anna Svensson", 0, "dictionary"),
+        ("email", "anna@acme.se", 15, "regex"),
+        ("company", "ACME AB", 34, "dictionary"),
+        ("person_name", "Erik Berg", 43, "pattern"),
+    ]
+
+
+def test_automaton_follows_fail_links_to_shorter_names():
+    automaton = NameAutomaton([("bo cid", "person"), ("al bo cid dan", "person"), ("ce", "organization")])
+    assert automaton.search("al bo cid x") == [(3, 9, "person")]
+    assert automaton.search("x ce") == []  # too short
+    assert automaton.search("al bo cid dan") == [(0, 13, "person")]
+
+
+def test_batch_offsets_are_per_segment_and_names_do_not_span_segments():
+    scanner = PIIScanner(NameAutomaton(NAMES))
+    texts = ["hej anna", "Svensson här, 555-123-4567", "", "Acme AB"]
+    results = scanner.scan_many(texts)
+    assert [spans(r) for r in results] == [
+        [],
+        [("person_name", "Svensson", 0, "dictionary"), ("phone", "555-123-4567", 14, "regex")],
+        [],
+        [("company", "Acme AB", 0, "dictionary")],
+    ]
+    assert [spans(scanner.scan(text)) for text in texts] == [spans(r) for r in results]
+
+
+class Savepoint:
+    """begin_nested() stand-in that records how each savepoint ended."""
+
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.log.append("rollback" if exc_type else "release")
+        return False
+
+
+class FakeDB:
+    """Answers the signature and names queries from in-memory tables."""
+
+    def __init__(self):
+        self.people = [("Anna Svensson", datetime(2024, 1, 1))]
+        self.organizations = [("Acme AB", datetime(2024, 1, 1))]
+        self.name_queries = 0
+        self.savepoints = []
+
+    def begin_nested(self):
+        return Savepoint(self.savepoints)
+
+    async def execute(self, query, params):
+        if "UNION ALL" in str(query):
+            self.name_queries += 1
+            rows = [SimpleNamespace(name=n, kind="person") for n, _ in self.people]
+            rows += [SimpleNamespace(name=n, kind="organization") for n, _ in self.organizations]
+            return SimpleNamespace(all=lambda: rows)
+        signature = (
+            len(self.people), max(t for _, t in self.people),
+            len(self.organizations), max(t for _, t in self.organizations),
+        )
+        return SimpleNamespace(one=lambda: signature)
+
+
+async def test_dictionary_is_rebuilt_when_names_change():
+    db = FakeDB()
+    org_id = uuid.uuid4()
+    cache = PIIDictionaryCache(refresh_seconds=0, max_orgs=4)
+
+    first = await cache.scanner(db, org_id)
+    assert await cache.scanner(db, org_id) is first
+    assert db.name_queries == 1
+
+    db.people.append(("Erik Berg", datetime(2024, 2, 1)))
+    scanner = await cache.scanner(db, org_id)
+    assert scanner is not first and db.name_queries == 2
+    assert spans(scanner.scan("erik berg")) == [("person_name", "erik berg", 0, "dictionary")]
+    assert db.savepoints == ["release"] * 3
+
+
+async def test_batch_detection_falls_back_to_patterns_without_tables():
+    class BrokenDB(FakeDB):
+        async def execute(self, query, params):
+            raise RuntimeError('relation "organizations" does not exist')
+
+    db = BrokenDB()
+    service = PIIDetectionService(db)
+    results = await service.detect_pii_batch(["Anna Svensson: 555-123-4567"], org_id=uuid.uuid4())
+    assert spans(results[0]) == [
+        ("person_name", "Anna Svensson", 0, "pattern"),
+        ("phone", "555-123-4567", 15, "regex"),
+    ]
+    # Only the savepoint is rolled back; the caller's transaction continues
+    assert db.savepoints == ["rollback"]
@@ -0,0 +1,71 @@
+"""Tests for the pipeline stage DAG and the Celery canvas built from it."""
+import pytest
+from celery import chord
+
+from app.worker.tasks.pipeline import PIPELINE_DAG, build_pipeline, pipeline_levels
+
+DISTRIBUTION = {"sync_linear", "sync_google_email", "sync_google_calendar", "index_chunks"}
+
+
+def task_names(signatures):
+    return [sig.task for sig in signatures]
+
+
+def test_levels_follow_dependencies():
+    levels = pipeline_levels()
+    assert levels[:3] == [["ingest"], ["transcribe"], ["extract"]]
+    assert set(levels[3]) == DISTRIBUTION and len(levels) == 4
+
+    position = {stage: i for i, level in enumerate(levels) for stage in level}
+    for stage, deps in PIPELINE_DAG.items():
+        assert all(position[dep] < position[stage] for dep in deps)
+
+
+def test_levels_reject_cycles_and_unknown_stages():
+    with pytest.raises(ValueError, match="cycle"):
+        pipeline_levels({"a": ("b",), "b": ("a",)})
+    with pytest.raises(ValueError, match="unknown"):
+        pipeline_levels({"a": ("missing",)})
+
+
+def test_distribution_stages_are_joined_by_a_chord():
+    canvas = build_pipeline("artifact-1", "org-1", priority=5)
+    *head, join = canvas.tasks
+
+    assert task_names(head) == [
+        "pipeline.ingest_artifact",
+        "pipeline.transcribe_or_extract",
+        "pipeline.extract_intelligence",
+    ]
+    assert isinstance(join, chord)
+    assert sorted(task_names(join.tasks)) == sorted([
+        "pipeline.sync_to_linear",
+        "pipeline.sync_to_google_email",
+        "pipeline.sync_to_google_calendar",
+        "pipeline.index_chunks",
+    ])
+    assert join.body.task == "pipeline.finalize"
+    assert join.body.args == ("artifact-1", "org-1")
+    assert all(sig.options.get("priority") == 5 for sig in [*head, *join.tasks, join.body])
+
+
+def test_docx_transcription_goes_to_the_parse_queue():
+    canvas = build_pipeline("artifact-1", "org-1", file_type="docx")
+    transcribe = canvas.tasks[1]
+    assert transcribe.options.get("queue") == "parse"
+
+
+def test_after_transcribe_keeps_only_later_stages():
+    canvas = build_pipeline("artifact-1", "org-1", force_reprocess=True, after="transcribe")
+    extract, join = canvas.tasks
+
+    # The first task receives the resumed transcription's result
+    assert extract.task == "pipeline.extract_intelligence"
+    assert extract.kwargs == {"force": True}
+    assert isinstance(join, chord)
+    assert len(join.tasks) == len(DISTRIBUTION)
+    assert join.body.task == "pipeline.finalize"
+
+    stages = task_names([extract, *join.tasks, join.body])
+    assert "pipeline.ingest_artifact" not in stages
+    assert "pipeline.transcribe_or_extract" not in stages
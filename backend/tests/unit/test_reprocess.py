@@ -0,0 +1,113 @@
+"""Tests for bulk reprocess jobs."""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.worker.reprocess import ReprocessProgress, validate_stages
+
+
+def test_validate_stages_orders_and_checks():
+    assert validate_stages(["extract", "transcribe"]) == ["transcribe", "extract"]
+    assert validate_stages(["extract"]) == ["extract"]
+    
+    with pytest.raises(ValueError, match="requires extract"):
+        validate_stages(["transcribe"])
+    with pytest.raises(ValueError, match="Unknown"):
+        validate_stages(["sync_linear"])
+
+
+def test_progress_throughput_and_eta():
+    progress = ReprocessProgress(total=100, skipped=20)
+    progress.started -= 60  # one minute in
+    progress.succeeded = 28
+    progress.failed = 2
+    
+    snapshot = progress.snapshot()
+    assert snapshot["remaining"] == 50
+    assert snapshot["per_minute"] == pytest.approx(30, rel=0.01)
+    assert snapshot["eta_seconds"] == pytest.approx(100, abs=1)
+
+
+def test_progress_without_work_has_no_eta():
+    assert ReprocessProgress(total=10).eta_seconds is None
+
+
+class FakeRuns:
+    """In-memory processing_runs table behind a fake AsyncSessionLocal."""
+    
+    def __init__(self, job):
+        self.job = job
+        self.items = []  # inserted per-meeting checkpoints
+    
+    def __call__(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, runs):
+        self.runs = runs
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def commit(self):
+        pass
+    
+    async def execute(self, stmt):
+        params = stmt.compile().params
+        if stmt.is_insert:
+            self.runs.items.append(params)
+        elif stmt.is_update:
+            self.runs.job.status = params["status"]
+            self.runs.job.run_metadata = params["run_metadata"]
+        elif stmt.column_descriptions[0]["name"] == "meeting_id":
+            done = [
+                item["meeting_id"] for item in self.runs.items
+                if item["status"] == "succeeded" and item["run_metadata"]["job_id"] == str(self.runs.job.id)
+            ]
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: done))
+        else:
+            return SimpleNamespace(scalar_one=lambda: self.runs.job)
+
+
+async def test_resumed_job_only_processes_meetings_not_done(monkeypatch):
+    from app.worker import reprocess
+    
+    targets = [(uuid.uuid4(), uuid.uuid4()) for _ in range(4)]
+    job = SimpleNamespace(
+        id=uuid.uuid4(), org_id=uuid.uuid4(), status="queued", started_at=None,
+        run_metadata={"stages": ["extract"], "concurrency": 2, "targets": [[str(m), str(a)] for m, a in targets]},
+    )
+    runs = FakeRuns(job)
+    monkeypatch.setattr(reprocess, "AsyncSessionLocal", runs)
+    
+    calls = []
+    failing = {targets[1][0]}
+    
+    async def reprocess_meeting(meeting_id, artifact_id, org_id, stages):
+        calls.append(meeting_id)
+        if meeting_id in failing:
+            raise RuntimeError("model error")
+    
+    monkeypatch.setattr(reprocess, "_reprocess_meeting", reprocess_meeting)
+    
+    first = await reprocess.run_job(job.id)
+    assert sorted(calls) == sorted(m for m, _ in targets)
+    assert (first["succeeded"], first["failed"], first["skipped"]) == (3, 1, 0)
+    assert job.status == "failed"
+    
+    # The second run retries the failed meeting and skips the rest
+    calls.clear()
+    failing.clear()
+    second = await reprocess.run_job(job.id)
+    assert calls == [targets[1][0]]
+    assert (second["succeeded"], second["failed"], second["skipped"]) == (1, 0, 3)
+    assert job.status == "succeeded"
+    
+    calls.clear()
+    third = await reprocess.run_job(job.id)
+    assert calls == [] and third["skipped"] == 4
@@ -0,0 +1,137 @@
+"""Tests for concurrent claim research and the search result cache."""
+import asyncio
+import time
+
+import httpx
+
+from app.services import agent_3_researcher
+from app.services.agent_3_researcher import (
+    DomainLimiter,
+    PublicSource,
+    ResearcherAgent,
+    SourceReliability,
+    VerificationStatus,
+    normalize_query,
+)
+
+
+def make_agent(claims, search_delay=0.05, fail_claim=None):
+    agent = ResearcherAgent(api_key="test")
+    agent.domain_limits = DomainLimiter(max_concurrent=100, min_interval_seconds=0)
+    agent.fetches = []
+
+    agent._prioritize_claims = lambda analysis, max_claims: [
+        {"claim": c, "source": "p1"} for c in claims[:max_claims]
+    ]
+
+    async def generate_queries(claim, company_name):
+        if claim == fail_claim:
+            raise RuntimeError("LLM down")
+        # Funding and headcount claims share the company query
+        return [f"{company_name} crunchbase", f"{claim} {company_name}"]
+
+    async def fetch(query):
+        agent.fetches.append(query)
+        await asyncio.sleep(search_delay)
+        return [PublicSource(
+            url="https://crunchbase.com/acme",
+            title=query,
+            reliability=SourceReliability.HIGH,
+            relevance_score=0.9,
+        )]
+
+    async def verify(claim, sources):
+        await asyncio.sleep(search_delay)
+        return {"status": VerificationStatus.CONFIRMED}
+
+    agent._generate_search_queries = generate_queries
+    agent._fetch_search_results = fetch
+    agent._verify_claim_with_sources = verify
+    agent._check_link = lambda url: asyncio.sleep(0, result=True)
+    return agent
+
+
+def test_normalize_query():
+    assert normalize_query("Acme  Funding, Crunchbase") == normalize_query("crunchbase acme funding")
+
+
+async def test_claims_are_researched_concurrently_in_order():
+    claims = [f"claim {i}" for i in range(8)]
+    agent = make_agent(claims, search_delay=0.1)
+    start = time.perf_counter()
+    results = await agent.research_claims(None, company_name="Acme")
+    elapsed = time.perf_counter() - start
+    assert [r.claim for r in results] == claims
+    assert all(r.verification_status == VerificationStatus.CONFIRMED for r in results)
+    # Sequential would take ~8 * 0.2s
+    assert elapsed < 0.6
+
+
+async def test_shared_queries_are_fetched_once():
+    agent = make_agent(["funding: 10M", "headcount: 40"])
+    await agent.research_claims(None, company_name="Acme")
+    assert agent.fetches.count("Acme crunchbase") == 1
+    assert len(agent.fetches) == 3
+
+    # Cached across calls too
+    await agent.research_claims(None, company_name="Acme")
+    assert len(agent.fetches) == 3
+
+
+async def test_failed_claim_does_not_stop_others():
+    agent = make_agent(["a", "b", "c"], fail_claim="b")
+    results = await agent.research_claims(None, company_name="Acme")
+    assert [r.verification_status for r in results] == [
+        VerificationStatus.CONFIRMED,
+        VerificationStatus.UNCERTAIN,
+        VerificationStatus.CONFIRMED,
+    ]
+    assert results[1].additional_context["error"] == "LLM down"
+
+
+async def test_domain_limiter_spaces_requests_per_domain():
+    limiter = DomainLimiter(max_concurrent=2, min_interval_seconds=0.05)
+    started = {}
+
+    async def request(url, key):
+        async with limiter.slot(url):
+            started[key] = time.monotonic()
+
+    await asyncio.gather(
+        *(request("https://api.example.com/search", i) for i in range(3)),
+        request("https://other.example.com/", "other"),
+    )
+    same_domain = sorted(started[i] for i in range(3))
+    assert same_domain[2] - same_domain[0] >= 0.09
+    assert started["other"] - same_domain[0] < 0.04
+
+
+async def test_dead_source_links_are_dropped_under_the_domain_limit(monkeypatch):
+    agent = make_agent(["funding: 10M"])
+    del agent._check_link
+    agent.domain_limits = DomainLimiter(max_concurrent=1, min_interval_seconds=0)
+    requested, active = [], []
+
+    async def handler(request):
+        active.append(request.url.host)
+        # One request per domain at a time
+        assert active.count(request.url.host) == 1
+        await asyncio.sleep(0.01)
+        active.remove(request.url.host)
+        requested.append(str(request.url))
+        return httpx.Response(404 if request.url.path == "/gone" else 200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(agent_3_researcher, "get_http_client", lambda url: client)
+
+    async def fetch(query):
+        return [
+            PublicSource(url=f"https://crunchbase.com/{path}", title=path,
+                         reliability=SourceReliability.HIGH, relevance_score=0.9)
+            for path in ("acme", "gone")
+        ]
+
+    agent._fetch_search_results = fetch
+    result, = await agent.research_claims(None, company_name="Acme")
+    assert [src.url for src in result.public_sources] == ["https://crunchbase.com/acme"] * 2
+    assert len(requested) == 4
@@ -0,0 +1,143 @@
+"""Tests for the BM25 segment index and evidence matching."""
+import uuid
+from datetime import date
+
+from app.services.segment_index import SegmentIndex, find_dates, tokenize
+from app.services.layer3_intelligence import Layer3IntelligenceService
+from app.services.three_agent_workflow import GeneratedContent, ThreeAgentWorkflow
+
+SEGMENTS = [
+    {"id": uuid.uuid4(), "speaker": "Anna", "text": "Vi beslutade att öka marknadsbudgeten för Q3."},
+    {"id": uuid.uuid4(), "speaker": "Erik", "text": "Erik tar fram en rapport om churn till fredag."},
+    {"id": uuid.uuid4(), "speaker": "Sofia", "text": "The board approved the hiring plan for the sales team."},
+    {"id": uuid.uuid4(), "speaker": "Anna", "text": "Hiring is slow and the team is small."},
+    {"id": uuid.uuid4(), "speaker": "Johan", "text": "Send the contract to anna@example.com by Friday."},
+]
+
+
+def test_tokenize_drops_swedish_and_english_stopwords():
+    assert tokenize("Vi beslutade att öka budgeten för Q3") == ["beslutade", "öka", "budgeten", "q3"]
+    assert tokenize("The board approved the plan") == ["board", "approved", "plan"]
+
+
+def test_search_ranks_by_bm25():
+    index = SegmentIndex(SEGMENTS)
+    matches = index.search("approved hiring plan")
+    assert [m.position for m in matches] == [2, 3]
+    assert matches[0].relevance > matches[1].relevance
+    assert matches[0].coverage == 1.0
+    assert 0 < matches[1].relevance < 0.5
+
+
+def test_verbatim_match_is_fully_relevant():
+    index = SegmentIndex(SEGMENTS)
+    best = index.search("öka marknadsbudgeten för Q3")[0]
+    assert best.position == 0
+    assert best.exact and best.relevance == 1.0
+
+
+def test_supports_requires_all_terms():
+    index = SegmentIndex(SEGMENTS)
+    assert index.supports("anna@example.com").position == 4
+    assert index.supports("Erik") is not None
+    assert index.supports("Maria") is None
+    assert index.supports("report churn Monday") is None
+
+
+async def test_matcher_returns_ranked_evidence_with_scores():
+    workflow = ThreeAgentWorkflow(db=None)
+    source_data = {"id": "transcript-1", "segments": SEGMENTS}
+    generated = GeneratedContent(
+        content_type="decision",
+        data={"decision": "approved the hiring plan", "rationale": None},
+        confidence=0.8,
+    )
+    matched = await workflow._matcher_agent(generated, source_data)
+    # "Hiring is slow..." shares one term and falls below MIN_EVIDENCE_RELEVANCE
+    assert [e.source_id for e in matched.evidence] == [SEGMENTS[2]["id"]]
+    assert matched.evidence[0].relevance_score == 1.0
+
+    generated.data = {"decision": "hiring team"}
+    matched = await workflow._matcher_agent(generated, source_data)
+    scores = [e.relevance_score for e in matched.evidence]
+    assert [e.source_id for e in matched.evidence] == [SEGMENTS[3]["id"], SEGMENTS[2]["id"]]
+    assert scores == sorted(scores, reverse=True) and 0.85 not in scores
+
+    # The index is built once per transcript
+    assert workflow.segment_index(source_data) is workflow.segment_index(source_data)
+
+
+def test_fabrication_check_uses_the_index():
+    service = Layer3IntelligenceService(db=None)
+    source_data = {"id": "transcript-1", "segments": SEGMENTS}
+    data = {"owner_name": "Erik", "owner_email": "anna@example.com", "due_date": "2024-06-30"}
+    issues = service._check_fabrication(data, [], source_data)
+    assert issues == ["Field 'due_date' = '2024-06-30' has no evidence - likely fabricated"]
+
+
+def test_find_dates_normalizes_stated_formats():
+    assert find_dates("klart senast 15 mars") == {(None, 3, 15)}
+    assert find_dates("by March 15th, 2024") == {(2024, 3, 15)}
+    assert find_dates("due 15/3 or 2024-03-15") == {(None, 3, 15), (2024, 3, 15)}
+    assert find_dates("no date here, just 42 items") == set()
+    assert find_dates("möte 15.3.2024, sedan 16/4/24.") == {(2024, 3, 15), (2024, 4, 16)}
+
+
+def test_find_dates_ignores_decimals_and_ratios():
+    assert find_dates("Revenue grew 3.4 percent") == set()
+    assert find_dates("marginal 12.5 procent, 3/4 % av kunderna") == set()
+    assert find_dates("version 1.2.3.4 and 3/4/2024/1") == set()
+
+
+def test_supports_date_matches_any_stated_format():
+    index = SegmentIndex([
+        {"id": uuid.uuid4(), "text": "Rapporten ska vara klar den 15:e mars."},
+        {"id": uuid.uuid4(), "text": "Budget review on 2024-04-02."},
+    ])
+    assert index.supports_date("2024-03-15").position == 0
+    assert index.supports_date(date(2025, 3, 15)).position == 0  # no year stated
+    assert index.supports_date("2024-04-02").position == 1
+    assert index.supports_date("2025-04-02") is None
+    assert index.supports_date("2024-03-16") is None
+
+
+def action_item(**fields):
+    data = {"title": "Send the contract", "owner_name": None, "owner_email": None, "due_date": None, **fields}
+    return GeneratedContent(content_type="action_item", data=data, confidence=0.8)
+
+
+async def qa(workflow, source_data, generated):
+    matched = await workflow._matcher_agent(generated, source_data)
+    return await workflow._qa_agent(matched, "maximize_recall", source_data)
+
+
+async def test_qa_accepts_normalized_dates_and_attendee_emails():
+    workflow = ThreeAgentWorkflow(db=None)
+    source_data = {
+        "id": "transcript-2",
+        "segments": [
+            {"id": uuid.uuid4(), "speaker": "Johan", "text": "Erik will send the contract to the lawyers by 15 March 2024."},
+        ],
+        "attendees": [{"name": "Erik Svensson", "email": "Erik.Svensson@example.com"}],
+    }
+    result = await qa(workflow, source_data, action_item(
+        owner_name="Erik", owner_email="erik.svensson@example.com", due_date="2024-03-15"
+    ))
+    assert result.issues == []
+
+    result = await qa(workflow, source_data, action_item(
+        owner_name="Maria", owner_email="maria@example.com", due_date="2024-03-22"
+    ))
+    assert sorted(result.issues) == [
+        "Field 'due_date' has value but no evidence - possible fabrication",
+        "Field 'owner_email' has value but no evidence - possible fabrication",
+        "Field 'owner_name' has value but no evidence - possible fabrication",
+    ]
+
+
+async def test_qa_accepts_relative_deadlines_in_the_evidence():
+    workflow = ThreeAgentWorkflow(db=None)
+    source_data = {"id": "transcript-1", "segments": SEGMENTS}
+    # "Send the contract to anna@example.com by Friday." resolved to a date
+    result = await qa(workflow, source_data, action_item(due_date="2024-06-28"))
+    assert result.issues == []
@@ -0,0 +1,134 @@
+"""Tests for streamed completions and the SSE helpers."""
+import json
+from types import SimpleNamespace
+
+from app.api.sse import sse_stream
+from app.services import llm_client
+from app.services.document_generator import DocumentGenerator
+from app.services.llm_client import LimitedCompletions, stream_text
+from app.services.task_assistant import TaskAssistant
+
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeStream:
+    def __init__(self, texts, fail_after=None):
+        self._chunks = iter([chunk(text) for text in texts])
+        self._sent = 0
+        self.fail_after = fail_after
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.fail_after is not None and self._sent == self.fail_after:
+            raise RuntimeError("connection reset")
+        self._sent += 1
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    def __init__(self, texts):
+        self.texts = texts
+        self.requests = []
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return FakeStream(self.texts)
+
+
+def parse_events(messages):
+    events = []
+    for message in messages:
+        event, data = message.strip().split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+async def test_document_is_streamed_with_the_same_request():
+    generator = DocumentGenerator()
+    completions = FakeCompletions(["# Notes", "\n- Budget approved"])
+    generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    meeting_data = {"meeting_info": {"title": "Board"}, "decisions": [{}]}
+
+    deltas, document = generator.stream_document("meeting_notes", meeting_data, "en")
+    assert document == {"title": "Meeting Notes - Board", "format": "markdown"}
+    assert [delta async for delta in deltas] == ["# Notes", "\n- Budget approved"]
+
+    request, _ = generator._prepare("meeting_notes", meeting_data, "en", None)
+    assert completions.requests == [{**request, "stream": True}]
+
+
+async def test_task_analysis_stream_joins_to_json():
+    assistant = TaskAssistant()
+    assistant.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(['{"best_prompt": ', '"Draft it"}'])))
+    text = "".join([
+        delta async for delta in assistant.stream_analysis({"title": "Report"}, {}, {})
+    ])
+    assert json.loads(text) == {"best_prompt": "Draft it"}
+
+
+async def test_sse_stream_emits_deltas_then_done():
+    saved = []
+
+    async def finish(text):
+        saved.append(text)
+        return {"id": "doc-1"}
+
+    stream = FakeStream(["Hej", " världen"])
+    events = parse_events([message async for message in sse_stream(stream_text(stream), finish)])
+
+    assert events == [("delta", {"text": "Hej"}), ("delta", {"text": " världen"}), ("done", {"id": "doc-1"})]
+    assert saved == ["Hej världen"]
+    assert stream.closed
+
+
+async def test_sse_stream_reports_errors_without_saving():
+    saved = []
+
+    async def finish(text):
+        saved.append(text)
+
+    stream = FakeStream(["partial", "more"], fail_after=1)
+    events = parse_events([message async for message in sse_stream(stream_text(stream), finish)])
+
+    assert events == [("delta", {"text": "partial"}), ("error", {"detail": "connection reset"})]
+    assert saved == []
+    assert stream.closed
+
+
+async def test_accounted_stream_settles_once_at_the_end(monkeypatch):
+    words = SimpleNamespace(encode=lambda text, disallowed_special=(): text.split())
+    monkeypatch.setattr(llm_client, "_encoding", lambda model: words)
+    settled, recorded = [], []
+
+    async def settle(model, reserved, used):
+        settled.append((model, reserved, used))
+
+    async def record(**kwargs):
+        recorded.append(kwargs)
+
+    owner = SimpleNamespace(
+        service="documents.generator",
+        limiter=SimpleNamespace(settle=settle),
+        usage=SimpleNamespace(record=record),
+    )
+    request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "write notes"}], "stream": True}
+    stream = llm_client._AccountedStream(
+        LimitedCompletions(owner), FakeStream(["one two", " three"]), request, 500, "gpt-4o", None, 0.0, 0.0
+    )
+
+    assert "".join([delta async for delta in stream_text(stream)]) == "one two three"
+    prompt = llm_client.prompt_tokens(request)
+    assert settled == [("gpt-4o", 500, prompt + 3)]
+    assert len(recorded) == 1
+    assert recorded[0]["completion_tokens"] == 3 and recorded[0]["status"] == "ok"
@@ -1,6 +1,10 @@
 """Tests for transcription provider adapters."""
 import pytest
-from app.providers.base import TranscriptionProvider, TranscriptionResult
+from app.providers.base import (
+    TranscriptionProvider,
+    TranscriptionResult,
+    TranscriptionSegment,
+)
 from app.providers.factory import get_transcription_provider
 
 
@@ -9,11 +13,13 @@ def test_transcription_provider_interface():
     from app.providers.klang import KlangProvider
     from app.providers.mistral import MistralProvider
     from app.providers.openai_provider import OpenAIProvider
+    from app.providers.whisperflow import WhisperflowProvider
     
     # All providers should inherit from TranscriptionProvider
     assert issubclass(KlangProvider, TranscriptionProvider)
     assert issubclass(MistralProvider, TranscriptionProvider)
     assert issubclass(OpenAIProvider, TranscriptionProvider)
+    assert issubclass(WhisperflowProvider, TranscriptionProvider)
 
 
 def test_provider_names():
@@ -58,6 +64,123 @@ async def test_transcription_contract():
     pass
 
 
+@pytest.mark.asyncio
+async def test_transcribe_stream_buffered_fallback():
+    """Providers without streaming yield one final update with all segments."""
+    class BufferedProvider(TranscriptionProvider):
+        @property
+        def name(self) -> str:
+            return "buffered"
+        
+        async def transcribe(self, file_url, language_hint=None):
+            return TranscriptionResult(
+                language="sv",
+                segments=[
+                    TranscriptionSegment(start=0.0, end=1.0, text="Hej"),
+                    TranscriptionSegment(start=1.0, end=2.0, text="allihop"),
+                ],
+                duration=2.0,
+                model="test",
+            )
+    
+    provider = BufferedProvider()
+    updates = [u async for u in provider.transcribe_stream("https://example.com/a.mp3")]
+    
+    assert not provider.supports_streaming
+    assert len(updates) == 1
+    assert updates[0].final
+    assert updates[0].language == "sv"
+    assert [s.text for s in updates[0].segments] == ["Hej", "allihop"]
+
+
+@pytest.mark.asyncio
+async def test_local_provider_is_deterministic():
+    """The local provider returns the same transcript for the same file."""
+    from app.providers.local import LocalProvider
+    
+    provider = get_transcription_provider("local")
+    assert isinstance(provider, LocalProvider)
+    
+    local = LocalProvider(segments=5, latency_ms=0, ms_per_segment=0)
+    first = await local.transcribe("https://example.com/a.mp3")
+    again = await local.transcribe("https://example.com/a.mp3")
+    other = await local.transcribe("https://example.com/b.mp3")
+    
+    assert [s.text for s in first.segments] == [s.text for s in again.segments]
+    assert [s.text for s in first.segments] != [s.text for s in other.segments]
+    assert len(first.segments) == 5
+    assert first.duration == 100.0
+
+
+STREAM_TYPES = {"klang": "application/x-ndjson", "mistral": "text/event-stream"}
+
+
+def _streaming_client(body: str, content_type: str = "application/x-ndjson"):
+    import httpx
+    return httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text=body, headers={"Content-Type": content_type})
+    ))
+
+
+def _provider(monkeypatch, module: str, body: str, content_type: str):
+    import importlib
+    
+    provider_module = importlib.import_module(f"app.providers.{module}")
+    monkeypatch.setattr(provider_module, "get_http_client", lambda url: _streaming_client(body, content_type))
+    provider_class = {"klang": "KlangProvider", "mistral": "MistralProvider"}[module]
+    return getattr(provider_module, provider_class)(api_key="test", api_url="https://stt.example.com")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("module, body", [
+    ("klang", '{"segment": {"start": 0, "end": 1, "text": "Hej"}}\n'),
+    ("mistral", 'data: {"type": "transcription.segment", "start": 0, "end": 1, "text": "Hej"}\n\n'),
+])
+async def test_stream_without_final_record_raises(monkeypatch, module, body):
+    """A dropped stream must not look like a finished transcript."""
+    from app.providers import IncompleteTranscription
+    
+    provider = _provider(monkeypatch, module, body, STREAM_TYPES[module])
+    
+    updates = []
+    with pytest.raises(IncompleteTranscription):
+        async for update in provider.transcribe_stream("https://example.com/a.mp3"):
+            updates.append(update)
+    assert not any(update.final for update in updates)
 
 
+@pytest.mark.asyncio
+async def test_klang_stream_ends_with_final_update(monkeypatch):
+    from app.providers import klang
+    
+    body = (
+        '{"segment": {"start": 0, "end": 1, "text": "Hej", "speaker": "A"}}\n'
+        '{"done": true, "language": "sv", "duration": 1.0}\n'
+    )
+    monkeypatch.setattr(klang, "get_http_client", lambda url: _streaming_client(body))
+    provider = klang.KlangProvider(api_key="test", api_url="https://stt.example.com")
+    
+    updates = [u async for u in provider.transcribe_stream("https://example.com/a.mp3")]
+    assert [s.speaker for s in updates[0].segments] == ["A"]
+    assert updates[-1].final and updates[-1].language == "sv"
+
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("module", ["klang", "mistral"])
+async def test_stream_accepts_a_plain_json_response(monkeypatch, module):
+    """A server that ignores stream=true still yields one final update."""
+    body = """{
+        "segments": [
+            {"start": 0, "end": 1, "text": "Hej"},
+            {"start": 1, "end": 2, "text": "allihop"}
+        ],
+        "language": "sv",
+        "duration": 2.0
+    }"""
+    provider = _provider(monkeypatch, module, body, "application/json; charset=utf-8")
+    
+    updates = [u async for u in provider.transcribe_stream("https://example.com/a.mp3")]
+    
+    assert len(updates) == 1 and updates[0].final
+    assert [s.text for s in updates[0].segments] == ["Hej", "allihop"]
+    assert (updates[0].language, updates[0].duration) == ("sv", 2.0)
@@ -0,0 +1,160 @@
+"""Tests for batched translation and the translation memory."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.translation_memory import TranslationMemory, text_hash
+from app.services.translation_service import TranslationService
+
+
+class FakeCompletions:
+    """Translates each string to "<target>:<text>"; can drop the last item once."""
+
+    def __init__(self, drop_last_once=False):
+        self.requests = []
+        self.drop_last_once = drop_last_once
+
+    async def create(self, **kwargs):
+        texts = json.loads(kwargs["messages"][1]["content"])
+        self.requests.append(texts)
+        target = "en" if "to English" in kwargs["messages"][0]["content"] else "sv"
+        translations = [f"{target}:{text}" for text in texts]
+        if self.drop_last_once and len(texts) > 1:
+            self.drop_last_once = False
+            translations = translations[:-1]
+        content = json.dumps({"translations": translations})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeTableMemory(TranslationMemory):
+    """TranslationMemory over a dict instead of the translation_memory table."""
+
+    def __init__(self, rows=None, **kwargs):
+        super().__init__(supabase=object(), max_entries=kwargs.get("max_entries", 100))
+        self.rows = rows if rows is not None else {}
+        self.fetches = 0
+
+    async def _fetch_rows(self, org_id, source_lang, target_lang, hashes):
+        self.fetches += 1
+        return [
+            {"text_hash": h, "translated_text": self.rows[(org_id, source_lang, target_lang, h)]}
+            for h in hashes
+            if (org_id, source_lang, target_lang, h) in self.rows
+        ]
+
+    async def _upsert_rows(self, rows):
+        for row in rows:
+            key = (row["org_id"], row["source_lang"], row["target_lang"], row["text_hash"])
+            self.rows[key] = row["translated_text"]
+
+
+ORG = "org-1"
+
+
+def make_service(memory=None, **kwargs):
+    service = TranslationService(memory=memory or FakeTableMemory())
+    completions = FakeCompletions(**kwargs)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service, completions
+
+
+MEETING = {
+    "meeting_info": {"title": "Styrelsemöte", "key_points": ["Budget", "Rekrytering"]},
+    "decisions": [{"decision": "Öka budgeten", "rationale": "Tillväxt"}],
+    "action_items": [
+        {"title": "Skicka rapport", "description": "Till styrelsen", "owner_name": "Anna"},
+        {"title": "Boka möte", "owner_name": "Erik"},
+    ],
+    "attendees": [{"name": "Anna", "role": "VD"}, {"name": "Erik", "role": "VD"}],
+}
+
+
+async def test_meeting_is_translated_in_one_request():
+    service, completions = make_service()
+    translated = await service.translate_meeting_data(MEETING, "sv", "en", org_id=ORG)
+    assert len(completions.requests) == 1
+    # "VD" appears twice but is sent once
+    assert completions.requests[0].count("VD") == 1
+    assert translated["meeting_info"]["title"] == "en:Styrelsemöte"
+    assert translated["decisions"][0]["rationale"] == "en:Tillväxt"
+    assert translated["action_items"][1]["title"] == "en:Boka möte"
+    assert translated["action_items"][0]["owner_name"] == "Anna"
+    assert [a["role"] for a in translated["attendees"]] == ["en:VD", "en:VD"]
+    # Input is left untouched
+    assert MEETING["attendees"][0]["role"] == "VD"
+
+
+async def test_memory_prevents_repeat_requests():
+    memory = FakeTableMemory()
+    service, completions = make_service(memory)
+    await service.translate_meeting_data(MEETING, "sv", "en", org_id=ORG)
+
+    # A fresh process (empty local layer) still finds everything in the table
+    service, completions = make_service(FakeTableMemory(rows=memory.rows))
+    await service.translate_meeting_data(MEETING, "sv", "en", org_id=ORG)
+    assert completions.requests == []
+
+    # New text only sends what is missing
+    texts = await service.translate_texts(["Budget", "Ny punkt"], "sv", "en", org_id=ORG)
+    assert completions.requests == [["Ny punkt"]]
+    assert texts == {"Budget": "en:Budget", "Ny punkt": "en:Ny punkt"}
+
+
+async def test_memory_is_keyed_by_language_pair():
+    memory = FakeTableMemory(rows={(ORG, "sv", "en", text_hash("Budget")): "Budget (en)"})
+    service, completions = make_service(memory)
+    assert await service.translate_texts(["Budget"], "sv", "en", org_id=ORG) == {"Budget": "Budget (en)"}
+    assert await service.translate_texts(["Budget"], "en", "sv", org_id=ORG) == {"Budget": "sv:Budget"}
+    assert len(completions.requests) == 1
+
+
+async def test_misaligned_response_is_split_and_retried():
+    service, completions = make_service(drop_last_once=True)
+    texts = ["a", "b", "c", "d"]
+    translated = await service.translate_texts(texts, "sv", "en", org_id=ORG)
+    assert translated == {t: f"en:{t}" for t in texts}
+    assert completions.requests == [texts, ["a", "b"], ["c", "d"]]
+
+
+async def test_large_inputs_are_batched(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "translation_batch_max_chars", 10)
+    service, completions = make_service()
+    await service.translate_texts(["12345", "67890", "abcde"], "sv", "en", org_id=ORG)
+    assert completions.requests == [["12345", "67890"], ["abcde"]]
+
+
+async def test_memory_failures_fall_back_to_the_api():
+    class BrokenMemory(FakeTableMemory):
+        async def _fetch_rows(self, *args):
+            raise ConnectionError("table unavailable")
+
+        async def _upsert_rows(self, rows):
+            raise ConnectionError("table unavailable")
+
+    service, completions = make_service(BrokenMemory())
+    assert await service.translate_texts(["Budget"], "sv", "en", org_id=ORG) == {"Budget": "en:Budget"}
+
+
+async def test_missing_api_key_only_matters_for_misses():
+    memory = FakeTableMemory(rows={(ORG, "sv", "en", text_hash("Budget")): "Budget"})
+    service = TranslationService(memory=memory)
+    service.client = None
+    assert await service.translate_texts(["Budget"], "sv", "en", org_id=ORG) == {"Budget": "Budget"}
+    with pytest.raises(ValueError):
+        await service.translate_texts(["Ny punkt"], "sv", "en", org_id=ORG)
+
+
+async def test_memory_is_not_shared_between_orgs():
+    memory = FakeTableMemory(rows={(ORG, "sv", "en", text_hash("Budget")): "Budget (org-1)"})
+    service, completions = make_service(memory)
+    assert await service.translate_texts(["Budget"], "sv", "en", org_id="org-2") == {"Budget": "en:Budget"}
+    assert ("org-2", "sv", "en", text_hash("Budget")) in memory.rows
+    assert await service.translate_texts(["Budget"], "sv", "en", org_id=ORG) == {"Budget": "Budget (org-1)"}
+
+    # Without an org the memory is bypassed entirely
+    fetches = memory.fetches
+    await service.translate_texts(["Budget"], "sv", "en")
+    assert memory.fetches == fetches
+    assert len(completions.requests) == 2
@@ -0,0 +1,112 @@
+"""Tests for transcript chunk embeddings and the in-memory vector index."""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.vector_index import ChunkVectorStore, HashingEmbedder, VectorIndex, quantize
+
+MEETING_A = uuid.uuid4()
+MEETING_B = uuid.uuid4()
+
+TEXTS = [
+    ("Vi beslutade att öka marknadsbudgeten för Q3.", MEETING_A),
+    ("Erik tar fram en rapport om churn till fredag.", MEETING_A),
+    ("The board approved the hiring plan for the sales team.", MEETING_A),
+    ("Churn increased in the enterprise segment last quarter.", MEETING_B),
+    ("We will revisit the marketing budget in Q3.", MEETING_B),
+]
+
+
+async def build_index(dtype="int8"):
+    embedder = HashingEmbedder(dim=256)
+    vectors = await embedder.embed([text for text, _ in TEXTS])
+    rows, scales = quantize(vectors, dtype)
+    index = VectorIndex(embedder.dim, dtype)
+    chunk_ids = [uuid.uuid4() for _ in TEXTS]
+    index.add(chunk_ids, [meeting for _, meeting in TEXTS], rows, scales)
+    return embedder, index, chunk_ids
+
+
+async def test_hashing_embedder_is_stable_and_normalized():
+    embedder = HashingEmbedder(dim=256)
+    first = await embedder.embed(["Churn rapport till fredag", ""])
+    second = await HashingEmbedder(dim=256).embed(["Churn rapport till fredag"])
+    assert np.array_equal(first[0], second[0])
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_quantization_keeps_similarities(dtype):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(20, 128)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    rows, scales = quantize(vectors, dtype)
+    assert rows.dtype == np.dtype(dtype)
+    restored = rows.astype(np.float32) * scales[:, None]
+    assert np.abs(restored @ vectors[0] - vectors @ vectors[0]).max() < 0.02
+
+
+async def test_search_ranks_org_and_meeting_scopes():
+    embedder, index, chunk_ids = await build_index()
+    query = (await embedder.embed(["churn report"]))[0]
+
+    hits = index.search(query, top_k=2)
+    assert {chunk_id for chunk_id, _, _ in hits} == {chunk_ids[1], chunk_ids[3]}
+    assert hits[0][2] >= hits[1][2] > 0
+
+    in_meeting = index.search(query, top_k=5, meeting_id=MEETING_B)
+    assert in_meeting[0][0] == chunk_ids[3]
+    assert {meeting for _, meeting, _ in in_meeting} == {MEETING_B}
+    assert index.search(query, meeting_id=uuid.uuid4()) == []
+
+
+async def test_index_is_updated_incrementally():
+    embedder, index, chunk_ids = await build_index("float16")
+    vector = await embedder.embed(["Budget för Q3 godkänd"])
+    rows, scales = quantize(vector, "float16")
+
+    new_id = uuid.uuid4()
+    # Chunks already in the index are skipped
+    added = index.add(
+        [new_id, chunk_ids[0]],
+        [MEETING_B, MEETING_A],
+        np.concatenate([rows, rows]),
+        np.concatenate([scales, scales]),
+    )
+    assert added == 1
+    assert len(index) == len(TEXTS) + 1
+    assert index.search(vector[0], top_k=1)[0][0] == new_id
+
+    index.discard([new_id])
+    assert new_id not in [chunk_id for chunk_id, _, _ in index.search(vector[0], top_k=10)]
+
+
+async def test_rows_stored_under_another_dtype_are_converted_on_load():
+    embedder = HashingEmbedder(dim=256)
+    vectors = await embedder.embed([text for text, _ in TEXTS])
+    rows, scales = quantize(vectors, "int8")
+    stored = [
+        SimpleNamespace(
+            chunk_id=uuid.uuid4(), meeting_id=meeting, vector=row.tobytes(), scale=float(scale),
+            dtype="int8", created_at=datetime(2024, 3, 15),
+        )
+        for (_, meeting), row, scale in zip(TEXTS, rows, scales)
+    ]
+
+    class FakeDB:
+        async def execute(self, stmt):
+            return SimpleNamespace(all=lambda: stored)
+
+    # EMBEDDING_DTYPE changed from int8 to float16 after these were stored
+    store = ChunkVectorStore(embedder=embedder, dtype="float16", max_orgs=1)
+    index = await store.load(FakeDB(), uuid.uuid4())
+
+    assert len(index) == len(TEXTS)
+    query = (await embedder.embed(["churn in the enterprise segment"]))[0]
+    assert index.search(query, top_k=1)[0][0] == stored[3].chunk_id
+    best = index.search(vectors[0], top_k=1)[0]
+    assert best[0] == stored[0].chunk_id and best[2] == pytest.approx(1.0, abs=0.02)
@@ -0,0 +1,61 @@
+"""Tests for the Whisperflow webhook."""
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import webhooks
+from app.config import settings
+
+BODY = json.dumps({"id": "job-1", "state": "failed"}).encode()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    return TestClient(app)
+
+
+@pytest.fixture
+def pending(monkeypatch):
+    class Pending:
+        async def get(self, job_id):
+            return {"artifact_id": "a", "org_id": "o"}
+
+    resumed = []
+    monkeypatch.setattr(webhooks, "get_pending_jobs", lambda: Pending())
+    import app.worker.tasks.pipeline as pipeline
+    monkeypatch.setattr(pipeline, "resume_pipeline", lambda job_id, context, error=None: resumed.append((job_id, error)))
+    return resumed
+
+
+def sign(body: bytes, secret: str) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_webhook_without_secret_is_not_exposed(client, monkeypatch, pending):
+    monkeypatch.setattr(settings, "whisperflow_webhook_url", "https://api.example.com/webhooks/whisperflow")
+    monkeypatch.setattr(settings, "whisperflow_webhook_secret", "")
+
+    response = client.post("/webhooks/whisperflow", content=BODY)
+    assert response.status_code == 404
+    assert pending == []
+
+
+def test_webhook_requires_a_valid_signature(client, monkeypatch, pending):
+    monkeypatch.setattr(settings, "whisperflow_webhook_url", "https://api.example.com/webhooks/whisperflow")
+    monkeypatch.setattr(settings, "whisperflow_webhook_secret", "s3cret")
+
+    assert client.post("/webhooks/whisperflow", content=BODY).status_code == 401
+    forged = {"X-Whisperflow-Signature": sign(BODY, "guess")}
+    assert client.post("/webhooks/whisperflow", content=BODY, headers=forged).status_code == 401
+    assert pending == []
+
+    signed = {"X-Whisperflow-Signature": sign(BODY, "s3cret")}
+    response = client.post("/webhooks/whisperflow", content=BODY, headers=signed)
+    assert response.json()["status"] == "accepted"
+    assert pending == [("job-1", "Unknown error")]
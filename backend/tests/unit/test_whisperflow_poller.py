@@ -0,0 +1,72 @@
+"""Tests for the shared Whisperflow job poller."""
+import asyncio
+
+import pytest
+
+from app.integrations.whisperflow_poller import WhisperflowJobPoller
+
+
+class FakeClient:
+    """Jobs finish after a fixed number of status sweeps."""
+
+    def __init__(self, sweeps_to_finish, fail=()):
+        self.sweeps_to_finish = sweeps_to_finish
+        self.fail = set(fail)
+        self.status_calls = 0
+        self.base_url = "https://whisperflow.test"
+        self.api_key = "test"
+
+    async def get_transcription_statuses(self, ids):
+        self.status_calls += 1
+        statuses = {}
+        for job_id in ids:
+            if self.status_calls < self.sweeps_to_finish.get(job_id, 1):
+                statuses[job_id] = {"id": job_id, "state": "processing"}
+            elif job_id in self.fail:
+                statuses[job_id] = {"id": job_id, "state": "failed", "error": "bad audio"}
+            else:
+                statuses[job_id] = {"id": job_id, "state": "completed"}
+        return statuses
+
+    async def get_transcription_result(self, job_id):
+        return {"id": job_id, "text": f"text {job_id}"}
+
+
+def poller(client, **kwargs):
+    kwargs.setdefault("min_interval", 0.01)
+    kwargs.setdefault("max_interval", 0.05)
+    return WhisperflowJobPoller(client, **kwargs)
+
+
+async def test_many_jobs_share_one_status_call_per_sweep():
+    client = FakeClient({f"job-{i}": 3 for i in range(50)})
+    jobs = poller(client)
+    results = await asyncio.gather(*(jobs.wait(f"job-{i}", 5) for i in range(50)))
+    assert [r["id"] for r in results] == [f"job-{i}" for i in range(50)]
+    assert client.status_calls == jobs.sweeps == 3
+    assert jobs.tracked == 0
+
+
+async def test_failed_job_raises():
+    jobs = poller(FakeClient({}, fail={"job-1"}))
+    with pytest.raises(ValueError, match="bad audio"):
+        await jobs.wait("job-1", 5)
+
+
+async def test_timeout():
+    jobs = poller(FakeClient({"job-1": 10_000}))
+    with pytest.raises(TimeoutError):
+        await jobs.wait("job-1", 0.1)
+    assert jobs.tracked == 0
+
+
+async def test_interval_backs_off_until_a_job_changes():
+    client = FakeClient({"job-1": 100})
+    jobs = poller(client, min_interval=1.0, max_interval=8.0)
+    jobs._watchers["job-1"] = [asyncio.Queue()]
+    intervals = []
+    for _ in range(6):
+        await jobs.sweep()
+        intervals.append(jobs.interval)
+    # First sweep reports "processing" (a change), then nothing changes
+    assert intervals == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]